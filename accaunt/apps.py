@@ -6,3 +6,7 @@ class AccauntConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'accaunt'
     verbose_name = 'Foydalanuvchilar'
+
+    def ready(self) -> None:
+        # Tenant konteksti keshini eskirtirish signallari
+        import accaunt.signals  # noqa: F401
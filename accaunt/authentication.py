@@ -0,0 +1,62 @@
+"""
+============================================================
+ACCAUNT APP — JWT autentifikatsiya (tenant kontekst bilan)
+============================================================
+TenantJWTAuthentication:
+  simplejwt JWTAuthentication bilan bir xil tekshiruvlar (token, user_id, is_active,
+  CHECK_REVOKE_TOKEN), lekin foydalanuvchi DB dan emas — config.tenant keshidagi
+  skalyar maydonlardan (bitta o'qish) quriladi va request.tenant o'rnatiladi.
+
+  Access tokenda tenant claimlari bo'lsa (accaunt/claims.py) — DB ga ham, tenant keshiga
+  ham bormaydi: faqat claimlar versiyasi (tokver_{user_id}) tekshiriladi. Claimsiz eski
+  tokenlar va CHECK_REVOKE_TOKEN yoqilgan bo'lsa — tenant keshi orqali.
+"""
+
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from config.tenant import get_tenant_context, get_token_version
+
+from .claims import CLAIM_VERSION, CLAIM_WORKER, tenant_from_claims, user_from_claims, user_from_tenant
+
+
+class TenantJWTAuthentication(JWTAuthentication):
+
+    def authenticate(self, request):
+        result = super().authenticate(request)
+        if result is not None:
+            request.tenant = self._tenant
+            getattr(request, '_request', request).tenant = self._tenant
+        return result
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+        if CLAIM_WORKER in validated_token and not api_settings.CHECK_REVOKE_TOKEN:
+            if get_token_version(user_id) != validated_token.get(CLAIM_VERSION):
+                raise AuthenticationFailed(
+                    "Hodim ruxsatlari yoki holati o'zgargan. Tokenni yangilang.", code="token_stale",
+                )
+            self._tenant = tenant_from_claims(validated_token)
+            return user_from_claims(validated_token)
+
+        tenant = get_tenant_context(user_id)
+        if tenant is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not tenant.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        user = user_from_tenant(tenant)
+        if api_settings.CHECK_REVOKE_TOKEN:                 # parol keshda yo'q — DB dan
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+
+        self._tenant = tenant
+        return user
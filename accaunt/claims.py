@@ -0,0 +1,175 @@
+"""
+============================================================
+ACCAUNT APP — JWT tenant claimlari
+============================================================
+Access token ichida (login / token refresh da DB dan bir marta yoziladi):
+  sid  — do'kon ID            wid  — hodim ID          bid — filial ID
+  role — rol                  st   — hodim holati      su  — is_superuser
+  perm — ruxsatlar bitmaskasi (accaunt.models.PERMISSION_BITS)
+  pv   — claimlar versiyasi (config.tenant.token_version — hodim holati izi)
+
+Funksiyalar / klasslar:
+  tenant_claims(user_id)      — DB dan claimlar (hodim yo'q — bo'sh dict)
+  tenant_from_claims(token)   — DB ga bormasdan TenantContext
+  user_from_claims(token)     — DB ga bormasdan request.user (claimdagi maydonlar bilan)
+  user_from_tenant(tenant)    — tenant keshidagi skalyar maydonlardan request.user
+  TenantRefreshToken          — access token har safar yangi claimlar bilan
+
+Tekshiruv (accaunt/authentication.py):
+  pv ≠ get_token_version(user_id) (bitta Redis o'qishi) — rol, holat, ruxsatlar,
+  do'kon / filial yoki foydalanuvchi faolligi o'zgargan: 401 token_stale,
+  frontend /api/v1/auth/token/refresh/ orqali yangi claimlar oladi.
+
+request.user — faqat claimdagi maydonlar yuklangan CustomUser / Worker (store, branch —
+faqat id). Boshqa maydonga birinchi murojaatda obyekt tenant keshidagi skalyar maydonlardan
+(TenantContext.records, get_tenant_context — bitta kesh o'qishi) to'ldiriladi:
+maydonma-maydon SELECT bo'lmaydi. Keshda yo'q maydon (parol) — DB dan.
+"""
+
+import functools
+
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from config.tenant import TenantContext, get_tenant_context, token_version
+
+CLAIM_STORE   = 'sid'
+CLAIM_WORKER  = 'wid'
+CLAIM_BRANCH  = 'bid'
+CLAIM_ROLE    = 'role'
+CLAIM_STATUS  = 'st'
+CLAIM_SUPER   = 'su'
+CLAIM_PERMS   = 'perm'
+CLAIM_VERSION = 'pv'
+
+
+def tenant_claims(user_id) -> dict:
+    """Hodim holati → claimlar (bitta so'rov). Hodim bo'lmasa (superadmin) — {}."""
+    from .models import Worker, permission_mask
+
+    worker = Worker.objects.select_related('user').filter(user_id=user_id).first()
+    if worker is None:
+        return {}
+    return {
+        CLAIM_STORE:   worker.store_id,
+        CLAIM_WORKER:  worker.pk,
+        CLAIM_BRANCH:  worker.branch_id,
+        CLAIM_ROLE:    worker.role,
+        CLAIM_STATUS:  worker.status,
+        CLAIM_SUPER:   worker.user.is_superuser,
+        CLAIM_PERMS:   permission_mask(worker.permissions),
+        CLAIM_VERSION: token_version(worker),
+    }
+
+
+def _stub(model, user_id: int, record: str, /, **values):
+    """
+    Faqat berilgan maydonlar yuklangan obyekt. record — TenantContext.records kaliti
+    ('user', 'worker', 'store', 'branch'): yetishmagan maydonlar shu yerdan olinadi.
+    """
+    names = [f.attname for f in model._meta.concrete_fields if f.attname in values]
+    obj   = model.from_db(DEFAULT_DB_ALIAS, names, [values[name] for name in names])
+    # Deferred maydon DeferredAttribute → instance.refresh_from_db(fields=[...]) orqali yuklanadi
+    obj.refresh_from_db = functools.partial(_hydrate, obj, user_id, record)
+    return obj
+
+
+def _hydrate(obj, user_id: int, record: str, using=None, fields=None, from_queryset=None):
+    """Yetishmagan maydonlar tenant keshidagi yozuvdan; topilmasa yoki to'liq yangilash — DB dan."""
+    del obj.refresh_from_db                              # keyingisi — odatdagi Model.refresh_from_db
+    values = None
+    if fields is not None and from_queryset is None:
+        tenant = get_tenant_context(user_id)
+        values = (tenant.records or {}).get(record) if tenant else None
+    if values is None or values.get('id') != obj.pk:
+        return obj.refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+    for field in obj._meta.concrete_fields:
+        if field.attname not in obj.__dict__ and field.attname in values:
+            obj.__dict__[field.attname] = values[field.attname]
+    missing = [name for name in fields if name not in obj.__dict__]
+    if missing:                                          # keshga yozilmagan (parol)
+        obj.refresh_from_db(using=using, fields=missing)
+
+
+def tenant_from_claims(token) -> TenantContext:
+    """Access token claimlaridan TenantContext (sozlamalar / obuna — jarayon LRU keshidan)."""
+    from config.cache_utils import get_store_settings, get_subscription
+
+    store_id = token.get(CLAIM_STORE)
+    return TenantContext(
+        user_id         = int(token[api_settings.USER_ID_CLAIM]),
+        is_superuser    = token.get(CLAIM_SUPER, False),
+        is_active       = True,
+        worker_id       = token[CLAIM_WORKER],
+        role            = token.get(CLAIM_ROLE),
+        worker_status   = token.get(CLAIM_STATUS),
+        permission_mask = token.get(CLAIM_PERMS, 0),
+        store_id        = store_id,
+        branch_id       = token.get(CLAIM_BRANCH),
+        settings        = get_store_settings(store_id) if store_id else None,
+        subscription    = get_subscription(store_id) if store_id else None,
+    )
+
+
+def _attach_worker(user, worker, store=None, branch=None):
+    worker.user = user                                  # request.user.worker — keshda
+    if store is not None:
+        worker.store = store
+    if branch is not None:
+        worker.branch = branch
+    return user
+
+
+def user_from_claims(token):
+    """Claimlardan request.user (+ worker, store, branch) — boshqa maydonlar tenant keshidan."""
+    from store.models import Branch, Store
+
+    from .models import CustomUser, Worker
+
+    user_id   = int(token[api_settings.USER_ID_CLAIM])
+    store_id  = token.get(CLAIM_STORE)
+    branch_id = token.get(CLAIM_BRANCH)
+
+    # Token faol foydalanuvchiga berilgan; faollik o'zgarsa — pv mos kelmaydi
+    user   = _stub(CustomUser, user_id, 'user', id=user_id, is_active=True, is_superuser=token.get(CLAIM_SUPER, False))
+    worker = _stub(
+        Worker, user_id, 'worker', id=token[CLAIM_WORKER], user_id=user_id, role=token.get(CLAIM_ROLE),
+        store_id=store_id, branch_id=branch_id, status=token.get(CLAIM_STATUS),
+    )
+    return _attach_worker(
+        user, worker,
+        store  = _stub(Store, user_id, 'store', id=store_id) if store_id else None,
+        branch = _stub(Branch, user_id, 'branch', id=branch_id) if branch_id else None,
+    )
+
+
+def user_from_tenant(tenant: TenantContext):
+    """Tenant keshidagi skalyar maydonlardan request.user (+ worker, store, branch); parol — DB dan."""
+    from store.models import Branch, Store
+
+    from .models import CustomUser, Worker
+
+    records = tenant.records or {}
+    user    = _stub(CustomUser, tenant.user_id, 'user', **records.get('user', {'id': tenant.user_id}))
+    if 'worker' not in records:
+        return user
+    return _attach_worker(
+        user, _stub(Worker, tenant.user_id, 'worker', **records['worker']),
+        store  = _stub(Store, tenant.user_id, 'store', **records['store']) if 'store' in records else None,
+        branch = _stub(Branch, tenant.user_id, 'branch', **records['branch']) if 'branch' in records else None,
+    )
+
+
+class TenantRefreshToken(RefreshToken):
+    """
+    Refresh token faqat user_id saqlaydi; undan olingan access token har safar
+    DB dagi joriy claimlar bilan (login va /token/refresh/).
+    """
+
+    @property
+    def access_token(self):
+        access = super().access_token
+        for claim, value in tenant_claims(self[api_settings.USER_ID_CLAIM]).items():
+            access[claim] = value
+        return access
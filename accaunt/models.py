@@ -15,6 +15,7 @@ Ruxsat tizimi:
   - Har bir permission = frontendda bitta bo'lim (sahifa)
   - ROLE_PERMISSIONS — har bir rolning standart permission ro'yxati
   - Worker.permissions — hodimning haqiqiy ruxsatlar ro'yxati (to'g'ridan-to'g'ri JSONField)
+  - PERMISSION_BITS — JWT claim va TenantContext dagi bitmask (kod → bit)
 """
 
 from django.db import models
@@ -67,6 +68,23 @@ ALL_PERMISSIONS: list[str] = [
     'sozlamalar',  # Do'kon sozlamalari
 ]
 
+# JWT dagi ruxsatlar bitmaskasi (accaunt/claims.py): bit i — ALL_PERMISSIONS[i].
+# ⚠️ Tartib o'zgarmasin, yangi kod faqat oxiriga qo'shiladi — chiqarilgan tokenlar shunga bog'liq.
+PERMISSION_BITS: dict[str, int] = {code: 1 << i for i, code in enumerate(ALL_PERMISSIONS)}
+
+
+def permission_mask(codes) -> int:
+    """Permission kodlari → bitmask (noma'lum kodlar hisobga olinmaydi)."""
+    mask = 0
+    for code in codes or ():
+        mask |= PERMISSION_BITS.get(code, 0)
+    return mask
+
+
+def permissions_from_mask(mask: int) -> list[str]:
+    """Bitmask → permission kodlari (ALL_PERMISSIONS tartibida)."""
+    return [code for code, bit in PERMISSION_BITS.items() if mask & bit]
+
 
 # ============================================================
 # ROLLAR VA ULARNING STANDART PERMISSION'LARI
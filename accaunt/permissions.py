@@ -12,12 +12,17 @@ Ishlatilish tartibi (ViewSet da):
 
 Ierarxiya:
     SuperAdmin > Owner > Manager > Sotuvchi
+
+Ma'lumot manbai — request.tenant (config/tenant.py): rol, ruxsatlar, obuna va
+reja bitta keshlangan obyektda. Permission'lar DB / Redis ga bormaydi.
 """
 
 from rest_framework.permissions import BasePermission
 from rest_framework.request import Request
 
-from .models import WorkerRole, WorkerStatus
+from config.tenant import get_request_tenant
+
+from .models import PERMISSION_BITS, WorkerRole, WorkerStatus
 
 
 # ============================================================
@@ -32,6 +37,11 @@ def _get_worker(request: Request):
     return getattr(request.user, 'worker', None)
 
 
+def _get_tenant(request: Request):
+    """So'rovning TenantContext i (config.tenant) yoki None."""
+    return get_request_tenant(request)
+
+
 # ============================================================
 # PERMISSION KLASSLARI
 # ============================================================
@@ -57,8 +67,8 @@ class IsOwner(BasePermission):
     message = "Bu amal faqat do'kon egasi uchun ruxsat etilgan."
 
     def has_permission(self, request: Request, view) -> bool:
-        worker = _get_worker(request)
-        return bool(worker and worker.role == WorkerRole.OWNER)
+        tenant = _get_tenant(request)
+        return bool(tenant and tenant.role == WorkerRole.OWNER)
 
 
 class IsManagerOrAbove(BasePermission):
@@ -72,8 +82,8 @@ class IsManagerOrAbove(BasePermission):
     ALLOWED_ROLES = {WorkerRole.OWNER, WorkerRole.MANAGER}
 
     def has_permission(self, request: Request, view) -> bool:
-        worker = _get_worker(request)
-        return bool(worker and worker.role in self.ALLOWED_ROLES)
+        tenant = _get_tenant(request)
+        return bool(tenant and tenant.role in self.ALLOWED_ROLES)
 
 
 class IsSotuvchiOrAbove(BasePermission):
@@ -84,16 +94,16 @@ class IsSotuvchiOrAbove(BasePermission):
     message = "Bu amal faqat tizim hodimi uchun ruxsat etilgan."
 
     def has_permission(self, request: Request, view) -> bool:
-        worker = _get_worker(request)
-        return bool(worker and worker.status == WorkerStatus.ACTIVE)
+        tenant = _get_tenant(request)
+        return bool(tenant and tenant.has_worker and tenant.worker_status == WorkerStatus.ACTIVE)
 
 
 class CanAccess(BasePermission):
     """
     Muayyan frontend bo'limiga kirish ruxsatini tekshiradi.
 
-    Worker.has_permission(code) metodidan foydalanadi.
-    Hodimning roli + individual extra_permissions hisobga olinadi.
+    request.tenant.permission_mask (JWT claim yoki Worker.permissions) bitmaskasi
+    bo'yicha — bitta AND amali.
 
     Ishlatilishi:
         # Mahsulotlar bo'limiga kirish
@@ -109,11 +119,12 @@ class CanAccess(BasePermission):
             section: Permission kodi (masalan: 'mahsulotlar', 'sotuv')
         """
         self.section = section
+        self.bit     = PERMISSION_BITS.get(section, 0)
         self.message = f"'{section}' bo'limiga kirish ruxsati yo'q."
 
     def has_permission(self, request: Request, view) -> bool:
-        worker = _get_worker(request)
-        return bool(worker and worker.has_permission(self.section))
+        tenant = _get_tenant(request)
+        return bool(tenant and tenant.permission_mask & self.bit)
 
 
 # ============================================================
@@ -147,11 +158,10 @@ class SubscriptionRequired(BasePermission):
         return self
 
     def has_permission(self, request: Request, view) -> bool:
-        worker = _get_worker(request)
-        if not worker:
+        tenant = _get_tenant(request)
+        if not tenant or not tenant.has_worker:
             return False
-        from config.cache_utils import get_subscription
-        sub = get_subscription(worker.store_id)
+        sub = tenant.subscription
         if not sub or not sub.is_active:
             self.message = "Obuna muddati tugagan. To'lov qiling."
             return False
@@ -206,12 +216,11 @@ def _check_limit(request: Request, model_name: str, limit_attr: str) -> bool:
     Umumiy limit tekshiruv funksiyasi.
     max_* = 0 bo'lsa → cheksiz → True qaytaradi.
     """
-    worker = _get_worker(request)
-    if not worker:
+    tenant = _get_tenant(request)
+    if not tenant or not tenant.has_worker:
         return False
 
-    from config.cache_utils import get_subscription
-    sub = get_subscription(worker.store_id)
+    sub = tenant.subscription
     if not sub:
         return True   # Subscription yo'q — tekshirilmaydi
 
@@ -219,22 +228,13 @@ def _check_limit(request: Request, model_name: str, limit_attr: str) -> bool:
     if max_count == 0:
         return True   # Cheksiz
 
-    # Joriy soni
-    from django.apps import apps
-    model_map = {
-        'Branch':    ('store',     'Branch',    {'store': worker.store, 'status': 'active'}),
-        'Warehouse': ('warehouse', 'Warehouse', {'store': worker.store, 'status': 'active'}),
-        'Worker':    ('accaunt',   'Worker',    {'store': worker.store, 'status': 'active'}),
-        'Product':   ('warehouse', 'Product',   {'store': worker.store, 'status': 'active'}),
-    }
-    if model_name not in model_map:
+    # Joriy soni — StoreUsage hisoblagichi (COUNT(*) emas)
+    from subscription.usage import FIELD_BY_MODEL, check_limit
+    if model_name not in FIELD_BY_MODEL:
         return True
 
-    app_label, model_label, filters = model_map[model_name]
-    Model   = apps.get_model(app_label, model_label)
-    current = Model.objects.filter(**filters).count()
-
-    if current >= max_count:
+    ok, max_count, current = check_limit(tenant.store_id, FIELD_BY_MODEL[model_name], plan=sub.plan)
+    if not ok:
         # Permission ob'ektida message o'rnatish
         _check_limit._last_message = (
             f"Tarif rejangiz maksimal {max_count} ta "
@@ -274,12 +274,11 @@ class ReadOnlyIfExpired(BasePermission):
     }
 
     def has_permission(self, request: Request, view) -> bool:
-        worker = _get_worker(request)
-        if not worker:
+        tenant = _get_tenant(request)
+        if not tenant or not tenant.has_worker:
             return True   # Auth view'lar o'zi boshqaradi
 
-        from config.cache_utils import get_subscription
-        sub = get_subscription(worker.store_id)
+        sub = tenant.subscription
 
         # Active yoki trial — to'siq yo'q
         if not sub or sub.is_active:
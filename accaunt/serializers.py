@@ -8,6 +8,7 @@ Serializer'lar ikki guruhga bo'lingan:
    - UserRegistrationSerializer
    - UserLoginSerializer
    - LogoutSerializer
+   - TenantTokenRefreshSerializer — access tokenni yangilash (yangi tenant claimlari)
    - UserChangePasswordSerializer
    - UserPasswordResetSerializer
 
@@ -28,8 +29,10 @@ from django.contrib.auth.tokens import PasswordResetTokenGenerator
 from django.db import transaction
 
 from rest_framework import serializers
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
 from rest_framework_simplejwt.tokens import RefreshToken, TokenError
 
+from .claims import TenantRefreshToken
 from .models import AuditLog, CustomUser, Worker, WorkerKPI, WorkerRole, ALL_PERMISSIONS, ROLE_PERMISSIONS, phone_regex
 from .utils import Util
 
@@ -198,6 +201,14 @@ class LogoutSerializer(serializers.Serializer):
             )
 
 
+class TenantTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Access tokenni yangilash — claimlar (do'kon, rol, ruxsatlar) DB dan qayta olinadi.
+    ROTATE_REFRESH_TOKENS — eski refresh token blacklist ga, yangisi qaytariladi.
+    """
+    token_class = TenantRefreshToken
+
+
 class UserChangePasswordSerializer(serializers.Serializer):
     """
     Parolni o'zgartirish.
@@ -0,0 +1,64 @@
+"""
+============================================================
+ACCAUNT APP — Signallar
+============================================================
+Tenant konteksti (config/tenant.py) keshini eskirtirish:
+  CustomUser, Worker                    — shu foydalanuvchi
+  Store, StoreSettings, Subscription    — do'konning barcha hodimlari
+  Branch                                — filialdagi hodimlar
+  SubscriptionPlan                      — shu rejadagi do'konlar hodimlari
+StoreSettings / Subscription / SubscriptionPlan — get_store_settings / get_subscription
+keshi ham (config/cache_utils.py, barcha jarayonlarda — pub/sub).
+
+Bu signallar accaunt/apps.py da AccauntConfig.ready() orqali ulanadi.
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from config.tenant import invalidate_store_tenants, invalidate_tenant
+
+from .models import CustomUser, Worker
+
+
+@receiver([post_save, post_delete], sender=CustomUser)
+def invalidate_user_tenant(sender, instance, **kwargs) -> None:
+    invalidate_tenant(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=Worker)
+def invalidate_worker_tenant(sender, instance, **kwargs) -> None:
+    invalidate_tenant(instance.user_id)
+
+
+@receiver([post_save, post_delete], sender='store.Store')
+def invalidate_store_tenant(sender, instance, **kwargs) -> None:
+    invalidate_store_tenants(instance.pk)
+
+
+@receiver([post_save, post_delete], sender='store.Branch')
+def invalidate_branch_tenants(sender, instance, **kwargs) -> None:
+    invalidate_tenant(*Worker.objects.filter(branch_id=instance.pk).values_list('user_id', flat=True))
+
+
+@receiver([post_save, post_delete], sender='store.StoreSettings')
+def invalidate_settings_tenants(sender, instance, **kwargs) -> None:
+    from config.cache_utils import invalidate_store_settings
+    invalidate_store_settings(instance.store_id)   # get_store_settings keshi + tenantlar
+
+
+@receiver([post_save, post_delete], sender='subscription.Subscription')
+def invalidate_subscription_tenants(sender, instance, **kwargs) -> None:
+    from config.cache_utils import invalidate_subscription_cache
+    invalidate_subscription_cache(instance.store_id)   # get_subscription keshi + tenantlar
+
+
+@receiver(post_save, sender='subscription.SubscriptionPlan')
+def invalidate_plan_tenants(sender, instance, created, **kwargs) -> None:
+    if created:
+        return
+    from config.cache_utils import invalidate_subscription_cache
+    from subscription.models import Subscription
+
+    for store_id in Subscription.objects.filter(plan=instance).values_list('store_id', flat=True):
+        invalidate_subscription_cache(store_id)
@@ -1,11 +1,13 @@
-from django.test import TestCase
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
 from rest_framework_simplejwt.tokens import RefreshToken
 
-from .models import CustomUser, Permission, Role, Worker
+from .models import ALL_PERMISSIONS, CustomUser, Worker, WorkerRole
 
 
 # =====================================================================
@@ -280,6 +282,8 @@ class UserChangePasswordTest(APITestCase):
 class WorkerPermissionTest(TestCase):
 
     def setUp(self):
+        from .models import Permission, Role   # eski sxema (Permission / Role modellari)
+
         self.perm1 = Permission.objects.create(name='Mahsulot qo\'shish', code='product.add')
         self.perm2 = Permission.objects.create(name='Mahsulot o\'chirish', code='product.delete')
         self.role = Role.objects.create(name='Menejer', code='manager')
@@ -314,3 +318,85 @@ class WorkerPermissionTest(TestCase):
         codes = {p.code for p in all_perms}
         self.assertIn('product.add', codes)
         self.assertIn('product.delete', codes)
+
+
+# =====================================================================
+# 7. JWT TENANT CLAIMLARI
+# =====================================================================
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class TenantClaimsTest(APITestCase):
+    """Access token claimlari bilan so'rov foydalanuvchi / hodim jadvallariga bormaydi."""
+
+    url = '/api/v1/warehouse/products/'
+
+    def setUp(self):
+        from django.core.cache import cache
+        from store.models import Store
+
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.store  = Store.objects.create(name="Test do'kon")
+        self.user   = CustomUser.objects.create_user(
+            username='owner', email='owner@test.uz',
+            phone1='+998901234567', password='Test12345',
+        )
+        self.worker = Worker.objects.create(
+            user=self.user, store=self.store,
+            role=WorkerRole.OWNER, permissions=list(ALL_PERMISSIONS),
+        )
+
+    def _login(self) -> dict:
+        response = self.client.post('/api/v1/auth/login/', {'username': 'owner', 'password': 'Test12345'})
+        self.assertEqual(response.status_code, 200, response.data)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+        return response.data
+
+    def test_claims_and_db_free_authentication(self):
+        from rest_framework_simplejwt.tokens import AccessToken
+        from accaunt.models import permission_mask
+
+        token = AccessToken(self._login()['access'])
+        self.assertEqual((token['sid'], token['wid'], token['role']), (self.store.id, self.worker.id, 'owner'))
+        self.assertEqual(token['perm'], permission_mask(ALL_PERMISSIONS))
+
+        self.assertEqual(self.client.get(self.url).status_code, 200)          # versiya keshga
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        tables = ('accaunt_worker', 'accaunt_customuser', 'store_store"')
+        self.assertFalse([q['sql'] for q in ctx.captured_queries if any(t in q['sql'] for t in tables)])
+
+    def test_changed_permissions_reject_token_until_refresh(self):
+        from rest_framework_simplejwt.tokens import AccessToken
+        from accaunt.models import permission_mask
+
+        tokens = self._login()
+        self.worker.permissions = ['sotuv']
+        self.worker.save()
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.data['code'], 'token_stale')
+
+        response = self.client.post('/api/v1/auth/token/refresh/', {'refresh': tokens['refresh']})
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(AccessToken(response.data['access'])['perm'], permission_mask(['sotuv']))
+        self.assertNotEqual(response.data['refresh'], tokens['refresh'])             # rotatsiya
+
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+        self.assertEqual(self.client.get(self.url).status_code, 403)                 # CanAccess — bitmask
+
+    def test_profile_served_without_per_field_queries(self):
+        """Claimda yo'q maydonlar (ism, telefon, ruxsatlar, do'kon nomi) — tenant keshidan, DB dan emas."""
+        self._login()
+        first = self.client.get(reverse('my-profile'))                           # tenant keshi quriladi
+        self.assertEqual(first.status_code, 200)
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('my-profile'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([q['sql'] for q in ctx.captured_queries], [])
+        self.assertEqual(response.data, first.data)
+        self.assertEqual((response.data['phone1'], response.data['store_name']), ('+998901234567', "Test do'kon"))
+        self.assertEqual(sorted(response.data['worker']['permissions']), sorted(ALL_PERMISSIONS))
@@ -5,6 +5,9 @@ ACCAUNT APP — Custom Throttle Klasslari
 API so'rovlar chastotasini cheklash uchun throttle klasslari.
 
 Throttle tiplari va qo'llanilish joylari:
+  AnonThrottle        — barcha anonim so'rovlar (IP)     20/min   (standart)
+  UserThrottle        — barcha so'rovlar (foydalanuvchi) 200/min  (standart)
+  StoreThrottle       — barcha so'rovlar (do'kon)        SubscriptionPlan.api_requests_per_minute
   LoginThrottle       — POST /auth/login/             5/min
   RegisterThrottle    — POST /auth/register/           3/min
   PasswordResetThrottle — POST /auth/send-reset-email/ 3/hour
@@ -12,17 +15,93 @@ Throttle tiplari va qo'llanilish joylari:
   BulkOperationThrottle — bulk/ endpointlar           10/min
 
 Sozlamalar (settings.py da DEFAULT_THROTTLE_RATES):
+  anon / user / store (obuna yo'q bo'lsa)
   login      → 5/min
   register   → 3/min
   password_reset → 3/hour
   export     → 5/min
   bulk       → 10/min
+
+Hisoblash — config/rate_limit.py (GCRA, Redis Lua): har kalitga bitta son, bitta
+atomar round trip. DRF SimpleRateThrottle dagi vaqtlar ro'yxati ishlatilmaydi.
+Natija request.rate_limit ga yoziladi → RateLimitHeadersMiddleware
+X-RateLimit-* sarlavhalarini qo'shadi; 429 da Retry-After — DRF.
 """
 
 from rest_framework.throttling import AnonRateThrottle, UserRateThrottle
 
+from config.rate_limit import hit
+
+
+def _record(request, decision) -> None:
+    """Eng qattiq (kam qolgan) natija javob sarlavhalariga chiqadi."""
+    target  = getattr(request, '_request', request)
+    current = getattr(target, 'rate_limit', None)
+    if current is None or not decision.allowed or (current.allowed and decision.remaining < current.remaining):
+        target.rate_limit = decision
+
+
+class GCRAThrottleMixin:
+    """SimpleRateThrottle kaliti va rate i bilan, lekin hisob — config.rate_limit.hit."""
+
+    decision = None
+
+    def allow_request(self, request, view) -> bool:
+        rate = self.get_request_rate(request)
+        if rate is None:
+            return True
+        key = self.get_cache_key(request, view)
+        if key is None:
+            return True
+        limit, period = self.parse_rate(rate)
+        self.decision = hit(key, limit, period)
+        _record(request, self.decision)
+        return self.decision.allowed
+
+    def get_request_rate(self, request):
+        return self.rate
+
+    def wait(self):
+        return self.decision.retry_after if self.decision else None
+
+
+class AnonThrottle(GCRAThrottleMixin, AnonRateThrottle):
+    """Anonim so'rovlar — IP asosida."""
+
+
+class UserThrottle(GCRAThrottleMixin, UserRateThrottle):
+    """Autentifikatsiya qilingan — foydalanuvchi asosida (anonim — IP)."""
+
+
+class StoreThrottle(GCRAThrottleMixin, UserRateThrottle):
+    """
+    Do'kon bo'yicha umumiy kvota: bir do'konning barcha xodimlari bitta hisobda.
+    Limit — tarif reja (SubscriptionPlan.api_requests_per_minute, 0 — cheksiz);
+    obuna yo'q bo'lsa — DEFAULT_THROTTLE_RATES['store'].
+    Hodimi yo'q foydalanuvchi (superadmin) va anonim — tekshirilmaydi.
+    """
+    scope = 'store'
+
+    def get_request_rate(self, request):
+        from config.tenant import get_request_tenant
+
+        tenant = get_request_tenant(request)
+        plan   = tenant.plan if tenant else None
+        if plan is None:
+            return self.rate
+        per_minute = getattr(plan, 'api_requests_per_minute', 0)
+        return f'{per_minute}/min' if per_minute else None
+
+    def get_cache_key(self, request, view):
+        from config.tenant import get_request_tenant
+
+        tenant = get_request_tenant(request)
+        if not tenant or not tenant.store_id:
+            return None
+        return self.cache_format % {'scope': self.scope, 'ident': tenant.store_id}
+
 
-class LoginThrottle(AnonRateThrottle):
+class LoginThrottle(AnonThrottle):
     """
     Login so'rovlari uchun throttle.
     Anonim IP asosida — brute-force himoya.
@@ -30,7 +109,7 @@ class LoginThrottle(AnonRateThrottle):
     scope = 'login'
 
 
-class RegisterThrottle(AnonRateThrottle):
+class RegisterThrottle(AnonThrottle):
     """
     Ro'yxatdan o'tish uchun throttle.
     Anonim IP asosida — spam/bot himoya.
@@ -38,7 +117,7 @@ class RegisterThrottle(AnonRateThrottle):
     scope = 'register'
 
 
-class PasswordResetThrottle(AnonRateThrottle):
+class PasswordResetThrottle(AnonThrottle):
     """
     Parol tiklash email yuborish uchun throttle.
     Email tizimini zo'riqtirmaslik uchun soatiga 3 ta.
@@ -46,7 +125,7 @@ class PasswordResetThrottle(AnonRateThrottle):
     scope = 'password_reset'
 
 
-class ExportThrottle(UserRateThrottle):
+class ExportThrottle(UserThrottle):
     """
     Export endpointlari uchun throttle.
     Foydalanuvchi asosida — katta Excel/PDF generatsiyani cheklash.
@@ -54,7 +133,7 @@ class ExportThrottle(UserRateThrottle):
     scope = 'export'
 
 
-class BulkOperationThrottle(UserRateThrottle):
+class BulkOperationThrottle(UserThrottle):
     """
     Bulk operatsiyalar uchun throttle.
     Foydalanuvchi asosida — bulk movements, bulk price update va h.k.
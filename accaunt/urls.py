@@ -13,6 +13,7 @@ from .views import (
     UserRegistrationView,
     UserLoginView,
     LogoutAPIView,
+    TokenRefreshAPIView,
     UserChangePasswordView,
     SendPasswordResetEmailView,
     UserPasswordResetView,
@@ -26,6 +27,7 @@ urlpatterns = [
     # --- Tizimga kirish / chiqish ---
     path('login/',   UserLoginView.as_view(),   name='login'),
     path('logout/',  LogoutAPIView.as_view(),    name='logout'),
+    path('token/refresh/', TokenRefreshAPIView.as_view(), name='token-refresh'),
 
     # --- Parol ---
     path('change-password/',   UserChangePasswordView.as_view(),     name='change-password'),
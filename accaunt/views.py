@@ -8,6 +8,7 @@ View'lar ikki guruhga bo'lingan:
    - UserRegistrationView   — ro'yxatdan o'tish
    - UserLoginView          — tizimga kirish (JWT token qaytaradi)
    - LogoutAPIView          — tizimdan chiqish (token blacklist)
+   - TokenRefreshAPIView    — access tokenni yangilash (claimlar DB dan qayta)
    - UserChangePasswordView — parol o'zgartirish
    - ProfileView            — o'z profilini ko'rish va yangilash
 
@@ -24,10 +25,11 @@ from rest_framework import status, viewsets, mixins
 from rest_framework.decorators import action
 from rest_framework.exceptions import ValidationError
 from rest_framework.filters import SearchFilter
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.views import TokenRefreshView
 from django_filters.rest_framework import DjangoFilterBackend
 
 from .audit_mixin import AuditMixin
+from .claims import TenantRefreshToken
 from .models import CustomUser, Worker, WorkerKPI, AuditLog, WorkerStatus
 from .permissions import IsManagerOrAbove, IsOwner, SubscriptionRequired, WorkerLimitPermission
 from .throttles import LoginThrottle, PasswordResetThrottle, RegisterThrottle
@@ -35,6 +37,7 @@ from .serializers import (
     UserRegistrationSerializer,
     UserLoginSerializer,
     LogoutSerializer,
+    TenantTokenRefreshSerializer,
     UserChangePasswordSerializer,
     SendPasswordResetEmailSerializer,
     UserPasswordResetSerializer,
@@ -58,11 +61,12 @@ from .serializers import (
 def _generate_tokens(user: CustomUser) -> dict:
     """
     Foydalanuvchi uchun JWT access va refresh tokenlarini generatsiya qiladi.
+    Access tokenda tenant claimlari (accaunt/claims.py) — so'rovlar DB siz autentifikatsiya.
 
     Returns:
         {'access': '...', 'refresh': '...'}
     """
-    refresh = RefreshToken.for_user(user)
+    refresh = TenantRefreshToken.for_user(user)
     return {
         'refresh': str(refresh),
         'access':  str(refresh.access_token),
@@ -134,6 +138,18 @@ class UserLoginView(APIView):
         )
 
 
+class TokenRefreshAPIView(TokenRefreshView):
+    """
+    Access tokenni yangilash.
+    POST /api/v1/auth/token/refresh/   {"refresh": "..."}
+
+    Ruxsat: hamma (refresh token o'zi tekshiriladi)
+    Javob: yangi access (joriy do'kon / rol / ruxsatlar claimlari bilan) + yangi refresh.
+    Access token 401 token_stale qaytarsa (ruxsatlar o'zgargan) — shu endpoint chaqiriladi.
+    """
+    serializer_class = TenantTokenRefreshSerializer
+
+
 class LogoutAPIView(APIView):
     """
     Tizimdan chiqish — refresh token blacklist ga qo'shiladi.
@@ -0,0 +1,781 @@
+"""
+============================================================
+CONFIG — Regressiya benchmarklari (checkout, qoldiq, hisobotlar)
+============================================================
+Klasslar / funksiyalar:
+  BENCHMARK_SHAPE / QUICK_SHAPE — sintetik tenant shakli (config/synthetic.py)
+  measure(func, repeat, setup)  — latency p50/p95/p99/maks, SQL soni, cho'qqi RSS → dict
+  BenchmarkSuite                — tenant tayyorlash + keyslar: run(patterns) → {keys: natija}
+  compare(current, baseline)    — chegaralardan oshgan metrikalar → [Regression]
+  build_report / load_report    — JSON hisobot (meta + cases + thresholds)
+  benchmark_database(keepdb)    — vaqtinchalik test bazasi + o'lchov sozlamalari (context manager)
+
+Buyruq: python manage.py run_benchmarks (store/management/commands/run_benchmarks.py)
+
+Keyslar (nomlar barqaror — baseline kaliti):
+  sale.create[items=N]             — SaleViewSet.create, savatda 1 / 5 / 20 / 50 mahsulot
+  sale.create.promo[items=20]      — xuddi shu, har mahsulotga aksiya (Promotion qidiruvi)
+  sale.concurrent[threads=T]       — T oqim bir vaqtda bir xil 5 ta "issiq" mahsulotni sotadi
+                                     (faqat PostgreSQL — SQLite yozuvchilarni ketma-ket qiladi)
+  fifo_deduct[batches=500]         — 500 ta mayda partiyadan yechish (har takror rollback)
+  transfer.confirm[lines=1000]     — TransferViewSet.confirm, ombor → filial
+  audit.confirm[lines=1000]        — StockAuditViewSet.confirm, ± farqli satrlar
+                                     (SQLite da 900 — prefetch parametrlari chegarasi)
+  dashboard[cold] / dashboard[warm] — DashboardView, kesh kaliti o'chirilgan / keshdan
+  export.<view>.<format>[rows=N]   — har eksport view: sana oynasi ~N qatorga (10k / 100k);
+                                     sana filtri yo'q yoki qatorlar kam — [rows=all]
+  import.<kind>[rows=10000]        — har import view, .xlsx fayl (create rejimi)
+
+O'lchov:
+  Latency — to'liq so'rov (APIClient, barcha middleware; oqimli javob oxirigacha o'qiladi).
+  SQL soni — connection.execute_wrapper (config.metrics.RequestStats), oqimlar yig'indisi.
+  Cho'qqi RSS — Linux: /proc/self/status VmHWM, har chaqiruv oldidan clear_refs bilan
+  tiklanadi (tayyorlash bosqichi hisobga kirmaydi); boshqa OS — getrusage (jarayon
+  boshidan beri, shu sababli faqat o'sadi).
+
+Taqqoslash:
+  Metrika yomonlashgan — joriy > baseline × ratio + slack. Standart chegaralar —
+  DEFAULT_THRESHOLDS; baseline faylidagi "thresholds" ({"default": {...},
+  "cases": {"<keys>": {...}}}) ularni almashtiradi. SQL soni aniq (ratio 1, slack 0) —
+  har qo'shimcha so'rov regressiya. Xato bilan tugagan keys ham regressiya.
+
+⚠️ Ma'lumot yoziladi — buyruq vaqtinchalik test bazasida ishlaydi. Natijalar faqat bir
+   xil muhitda (DB, Redis, mashina) taqqoslanadi; meta dagi farqlar ogohlantiriladi.
+"""
+
+import fnmatch
+import io
+import json
+import logging
+import math
+import os
+import platform
+import resource
+import statistics
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, replace
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import connection, transaction
+
+from config.metrics import RequestStats
+from config.synthetic import PRESETS, TenantGenerator
+
+BENCHMARK_SHAPE = replace(
+    PRESETS['small'], stores=1, warehouses=1, products=1000, customers=2000, sales=100_000, days=365,
+)
+QUICK_SHAPE     = replace(BENCHMARK_SHAPE, customers=500, sales=12_000, days=90)
+
+BASKET_SIZES  = (1, 5, 20, 50)
+PROMO_BASKET  = 20
+HOT_SKUS      = 5
+FIFO_BATCHES  = 500
+CONFIRM_LINES = 1000
+EXPORT_ROWS   = (10_000, 100_000)
+IMPORT_ROWS   = 10_000
+
+# metrika → {'ratio', 'slack'}: regressiya — joriy > baseline × ratio + slack
+DEFAULT_THRESHOLDS = {
+    'p50_ms':      {'ratio': 1.25, 'slack': 2.0},
+    'p95_ms':      {'ratio': 1.30, 'slack': 5.0},
+    'queries':     {'ratio': 1.0,  'slack': 0},
+    'peak_rss_mb': {'ratio': 1.20, 'slack': 16.0},
+}
+
+_STATUS = '/proc/self/status'
+
+
+class BenchmarkError(Exception):
+    """Keys kutilgan natijani bermadi (status, qoldiq) — o'lchov yozilmaydi."""
+
+
+# ============================================================
+# O'LCHOV
+# ============================================================
+
+def _reset_peak_rss() -> bool:
+    """Linux: VmHWM ni joriy RSS ga tushirish. Imkon bo'lmasa — False."""
+    try:
+        with open('/proc/self/clear_refs', 'w') as handle:
+            handle.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def _peak_rss_mb() -> float:
+    try:
+        with open(_STATUS) as handle:
+            for line in handle:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024
+
+
+def percentile(ordered: list, q: float) -> float:
+    """Nearest-rank persentil (tartiblangan ro'yxat)."""
+    return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+
+def summarize(samples: list, queries: list, peak_rss: float) -> dict:
+    ordered = sorted(samples)
+    return {
+        'n':           len(ordered),
+        'p50_ms':      round(statistics.median(ordered) * 1000, 3),
+        'p95_ms':      round(percentile(ordered, 0.95) * 1000, 3),
+        'p99_ms':      round(percentile(ordered, 0.99) * 1000, 3),
+        'max_ms':      round(ordered[-1] * 1000, 3),
+        'mean_ms':     round(statistics.fmean(ordered) * 1000, 3),
+        'queries':     int(statistics.median(queries)),
+        'queries_max': max(queries),
+        'peak_rss_mb': round(peak_rss, 1),
+    }
+
+
+def measure(func, repeat: int, setup=None, warmup: int = 1) -> dict:
+    """
+    func(state) ni warmup + repeat marta chaqiradi; state = setup() (vaqt va SQL ga kirmaydi).
+    func qaytargan dict (masalan {'bytes': n}) natijaga qo'shiladi.
+    """
+    samples, queries, extra, peak = [], [], {}, 0.0
+    for n in range(warmup + repeat):
+        state = setup() if setup else None
+        stats = RequestStats()
+        _reset_peak_rss()
+        with connection.execute_wrapper(stats):
+            start   = time.perf_counter()
+            info    = func(state)
+            elapsed = time.perf_counter() - start
+        if n < warmup:
+            continue
+        peak = max(peak, _peak_rss_mb())
+        samples.append(elapsed)
+        queries.append(stats.queries)
+        if isinstance(info, dict):
+            extra.update(info)
+    return {**summarize(samples, queries, peak), **extra}
+
+
+# ============================================================
+# API MIJOZI VA OBUNA
+# ============================================================
+
+class ApiClient:
+    """Haqiqiy JWT (tenant claimlari bilan) — autentifikatsiya yo'li ham o'lchanadi."""
+
+    def __init__(self, user):
+        from rest_framework.test import APIClient
+
+        from accaunt.claims import TenantRefreshToken
+
+        self.api = APIClient()
+        self.api.credentials(HTTP_AUTHORIZATION=f'Bearer {TenantRefreshToken.for_user(user).access_token}')
+
+    def call(self, method: str, url: str, data=None, expect: int = 200, **kwargs):
+        response = getattr(self.api, method)(url, data, **kwargs)
+        size     = 0
+        if response.streaming:
+            for chunk in response.streaming_content:
+                size += len(chunk)
+        else:
+            size = len(response.content)
+        if response.status_code != expect:
+            body = '' if response.streaming else response.content[:300].decode(errors='replace')
+            raise BenchmarkError(f"{method.upper()} {url} → {response.status_code} (kutilgan {expect}): {body}")
+        response.size = size
+        return response
+
+
+def subscribe_unlimited(store_id: int) -> None:
+    """Barcha funksiyalar yoqilgan, limitsiz tarif — keyslar tarif tekshiruviga urilmaydi."""
+    from django.utils import timezone
+
+    from subscription.models import PlanType, Subscription, SubscriptionPlan, SubscriptionStatus
+
+    flags = {
+        field.name: (False if field.name.startswith('has_') else 0)
+        for field in SubscriptionPlan._meta.concrete_fields
+        if field.name.startswith(('has_', 'max_')) or field.name == 'api_requests_per_minute'
+    }
+    flags.update({name: True for name in flags if name.startswith('has_')})
+    plan  = SubscriptionPlan.objects.create(plan_type=PlanType.PRO, name='Benchmark', **flags)
+    today = timezone.localdate()
+    Subscription.objects.update_or_create(
+        store_id=store_id,
+        defaults=dict(plan=plan, status=SubscriptionStatus.ACTIVE,
+                      start_date=today, end_date=today + timedelta(days=365)),
+    )
+
+
+@contextmanager
+def benchmark_database(keepdb: bool = False):
+    """
+    Vaqtinchalik test bazasi (ish bazasiga tegilmaydi) va o'lchov sozlamalari:
+    DEBUG=False (connection.queries to'planmaydi), API kvotalari o'chiq, metrika
+    ogohlantirishlari (sekin so'rov / N+1) jim. Chiqishda baza o'chiriladi.
+    """
+    from django.conf import settings
+    from django.core.management import call_command
+    from django.test.utils import override_settings
+
+    metrics_log = logging.getLogger('config.metrics')
+    log_level   = metrics_log.level
+    metrics_log.setLevel(logging.ERROR)
+
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False, keepdb=keepdb)
+    try:
+        with override_settings(
+            DEBUG              = False,
+            RATE_LIMIT_ENABLED = False,
+            ALLOWED_HOSTS      = [*settings.ALLOWED_HOSTS, 'testserver'],
+        ):
+            if keepdb:
+                call_command('flush', interactive=False, verbosity=0)
+            yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=keepdb)
+        metrics_log.setLevel(log_level)
+
+
+# ============================================================
+# SUITE
+# ============================================================
+
+class BenchmarkSuite:
+    """
+    Bitta sintetik do'kon ustida barcha keyslar. prepare() — tenant, obuna (barcha
+    funksiyalar, limitsiz), issiq mahsulotlar qoldig'i; run() — tanlangan keyslar
+    tartib bilan (importlar oxirida — katalogni kattalashtiradi).
+    """
+
+    def __init__(self, shape=BENCHMARK_SHAPE, seed: int = 42, quick: bool = False,
+                 threads: int = 8, log=None):
+        self.shape   = shape
+        self.seed    = seed
+        self.quick   = quick
+        self.threads = threads
+        self.log     = log or (lambda message: None)
+        self.repeat  = 3 if quick else 20      # tez keyslar takrori (og'irlari — o'zida)
+        # SQLite: prefetch dagi id lar soni max_query_params dan oshsa Django OR zanjiri
+        # quradi va "Expression tree is too large" — satrlar chegaradan pastda
+        self.lines   = CONFIRM_LINES
+        if connection.vendor == 'sqlite':
+            self.lines = min(CONFIRM_LINES, connection.features.max_query_params // 100 * 100)
+
+    # ----------------------------------------------------------
+    # Tayyorlash
+    # ----------------------------------------------------------
+
+    def prepare(self) -> dict:
+        from accaunt.models import Worker, WorkerRole
+        from store.models import Branch
+        from warehouse.models import Product, Warehouse
+
+        started = time.perf_counter()
+        result  = TenantGenerator(self.shape, seed=self.seed, log=self.log).generate()[0]
+        self.store_id = result.store_id
+        subscribe_unlimited(self.store_id)
+
+        owner           = Worker.objects.select_related('user', 'store').get(store_id=self.store_id, role=WorkerRole.OWNER)
+        self.worker     = owner
+        self.client     = ApiClient(owner.user)
+        self.branches   = list(Branch.objects.filter(store_id=self.store_id).order_by('id'))
+        self.warehouse  = Warehouse.objects.filter(store_id=self.store_id).order_by('id').first()
+        # Inventarizatsiya satrlari = joydagi qoldiqlar: alohida omborda aynan self.lines ta;
+        # FIFO — alohida omborda faqat mayda partiyalar
+        self.audited    = Warehouse.objects.create(store_id=self.store_id, name='Benchmark: inventarizatsiya')
+        self.fifo_store = Warehouse.objects.create(store_id=self.store_id, name='Benchmark: FIFO')
+        products        = list(Product.objects.filter(store_id=self.store_id).order_by('id'))
+        self.products   = products
+
+        # Kesishmaydigan to'plamlar: oddiy savat, aksiya, issiq SKU, FIFO
+        basket          = max(BASKET_SIZES)
+        self.pool       = products[:basket]
+        self.promo_pool = products[basket:basket + PROMO_BASKET]
+        self.hot        = products[basket + PROMO_BASKET:basket + PROMO_BASKET + HOT_SKUS]
+        self.fragmented = products[basket + PROMO_BASKET + HOT_SKUS]
+        self._stock_up()
+        self.log(f"Tayyorlandi: do'kon #{self.store_id}, {result.total:,} qator, "
+                 f"{time.perf_counter() - started:.1f}s")
+        return {'store_id': self.store_id, 'rows': result.total, 'seconds': round(result.seconds, 1)}
+
+    def _stock_up(self) -> None:
+        """Keyslar qoldiq yetishmasligiga urilmasligi uchun kirimlar (bitta apply_movements)."""
+        from warehouse.models import MovementType
+        from warehouse.movements import MovementLine, apply_movements
+
+        branch     = self.branches[0]
+        big, lines = Decimal('1000000'), []
+        for product in self.pool + self.promo_pool + self.hot:
+            lines.append(MovementLine(product, MovementType.IN, big, branch=branch, unit_cost=Decimal('1000')))
+        for product in self.products[:self.lines]:
+            for warehouse in (self.warehouse, self.audited):
+                lines.append(MovementLine(product, MovementType.IN, Decimal('1000'), warehouse=warehouse,
+                                          unit_cost=Decimal('1000')))
+        # Mayda partiyalar: har kirim — alohida partiya, har biri 1 dona
+        for n in range(FIFO_BATCHES):
+            lines.append(MovementLine(self.fragmented, MovementType.IN, Decimal('1'), warehouse=self.fifo_store,
+                                      unit_cost=Decimal(1000 + n)))
+        with transaction.atomic():
+            apply_movements(lines, self.worker.store, self.worker)
+
+    # ----------------------------------------------------------
+    # Keyslar katalogi
+    # ----------------------------------------------------------
+
+    def cases(self) -> list:
+        """[(nom, chaqiruvchi)] — tartib bilan."""
+        items = [(f'sale.create[items={n}]', lambda n=n: self._sale_create(self.pool[:n])) for n in BASKET_SIZES]
+        items += [
+            (f'sale.create.promo[items={PROMO_BASKET}]', self._sale_create_promo),
+            (f'sale.concurrent[threads={self.threads}]', self._sale_concurrent),
+            (f'fifo_deduct[batches={FIFO_BATCHES}]',     self._fifo_deduct),
+            (f'transfer.confirm[lines={self.lines}]',    self._transfer_confirm),
+            (f'audit.confirm[lines={self.lines}]',       self._audit_confirm),
+            ('dashboard[cold]',                          lambda: self._dashboard(cold=True)),
+            ('dashboard[warm]',                          lambda: self._dashboard(cold=False)),
+        ]
+        items += self._export_cases()
+        items += [(f'import.{kind}[rows={IMPORT_ROWS}]', lambda kind=kind: self._import(kind)) for kind in _IMPORT_ROWS]
+        return items
+
+    def run(self, patterns=None) -> dict:
+        """patterns — fnmatch shablonlari (bo'sh — hammasi). Keys xatosi natijaga 'error' bo'lib yoziladi."""
+        results = {}
+        for name, func in self.cases():
+            if patterns and not any(fnmatch.fnmatchcase(name, pattern) for pattern in patterns):
+                continue
+            started = time.perf_counter()
+            try:
+                results[name] = func()
+            except BenchmarkError as exc:
+                results[name] = {'error': str(exc)}
+            self.log(_line(name, results[name], time.perf_counter() - started))
+        return results
+
+    # ----------------------------------------------------------
+    # Sotuv
+    # ----------------------------------------------------------
+
+    def _sale_payload(self, products: list, prices: dict) -> dict:
+        total = sum(prices[product.id] for product in products)
+        return {
+            'branch':       self.branches[0].id,
+            'payment_type': 'cash',
+            'paid_amount':  str(total),
+            'items':        [{'product': product.id, 'quantity': '1'} for product in products],
+        }
+
+    def _sale_create(self, products: list, prices: dict = None) -> dict:
+        prices  = prices or {product.id: product.sale_price for product in products}
+        payload = self._sale_payload(products, prices)
+        return measure(lambda _: self.client.call('post', '/api/v1/sales/', payload, expect=201, format='json'),
+                       self.repeat)
+
+    def _sale_create_promo(self) -> dict:
+        from django.utils import timezone
+
+        from warehouse.models import Promotion
+
+        now       = timezone.now()
+        promotion = Promotion.objects.create(
+            store_id=self.store_id, name='Benchmark aksiya', discount_pct=Decimal('10'),
+            valid_from=now - timedelta(days=1), valid_to=now + timedelta(days=30), is_active=True,
+        )
+        promotion.products.set(self.promo_pool)
+        prices = {
+            product.id: product.sale_price - (product.sale_price * promotion.discount_pct / 100).quantize(Decimal('0.01'))
+            for product in self.promo_pool
+        }
+        return self._sale_create(self.promo_pool, prices)
+
+    def _sale_concurrent(self) -> dict:
+        """Har oqim o'z ulanishida; hammasi to'siqda kutib, bir vaqtda boshlaydi."""
+        if connection.vendor != 'postgresql':
+            return {'skipped': f"{connection.vendor}: parallel yozish o'lchanmaydi"}
+
+        from warehouse.models import Stock
+
+        per_thread = max(5, self.repeat)
+        payload    = self._sale_payload(self.hot, {product.id: product.sale_price for product in self.hot})
+        barrier    = threading.Barrier(self.threads)
+        samples, queries, errors = [], [], []
+        lock       = threading.Lock()
+        before     = {s.product_id: s.quantity for s in Stock.objects.filter(branch=self.branches[0], product__in=self.hot)}
+
+        def worker():
+            client = ApiClient(self.worker.user)
+            stats  = RequestStats()
+            try:
+                with connection.execute_wrapper(stats):
+                    barrier.wait()
+                    for _ in range(per_thread):
+                        start = time.perf_counter()
+                        try:
+                            client.call('post', '/api/v1/sales/', payload, expect=201, format='json')
+                        except BenchmarkError as exc:
+                            with lock:
+                                errors.append(str(exc))
+                            continue
+                        with lock:
+                            samples.append(time.perf_counter() - start)
+                with lock:
+                    queries.append(stats.queries)
+            finally:
+                connection.close()
+
+        _reset_peak_rss()
+        threads = [threading.Thread(target=worker) for _ in range(self.threads)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+        if not samples:
+            raise BenchmarkError(f"Parallel sotuvlarning hammasi xato: {errors[:1]}")
+
+        # Invariant: har muvaffaqiyatli sotuv har issiq mahsulotdan aynan 1 dona yechgan
+        after = {s.product_id: s.quantity for s in Stock.objects.filter(branch=self.branches[0], product__in=self.hot)}
+        lost  = [pid for pid in before if before[pid] - after[pid] != len(samples)]
+        if lost:
+            raise BenchmarkError(f"Parallel sotuvdan keyin qoldiq nomuvofiq: mahsulotlar {lost}")
+
+        sales_queries = [round(sum(queries) / len(samples))]
+        return {
+            **summarize(samples, sales_queries, _peak_rss_mb()),
+            'errors':         len(errors),
+            'throughput_rps': round(len(samples) / elapsed, 1),
+        }
+
+    # ----------------------------------------------------------
+    # Qoldiq
+    # ----------------------------------------------------------
+
+    def _fifo_deduct(self) -> dict:
+        from warehouse.utils import fifo_deduct
+
+        location = {'branch': None, 'warehouse': self.fifo_store}
+        qty      = Decimal(FIFO_BATCHES)
+
+        def run(_):
+            with transaction.atomic():
+                deductions, _ = fifo_deduct(self.fragmented, location, qty)
+                transaction.set_rollback(True)
+            if len(deductions) != FIFO_BATCHES:
+                raise BenchmarkError(f"fifo_deduct {len(deductions)} ta partiya qaytardi, kutilgan {FIFO_BATCHES}")
+
+        return measure(run, self.repeat)
+
+    def _transfer_confirm(self) -> dict:
+        lines   = self.products[:self.lines]
+        payload = {
+            'from_warehouse': self.warehouse.id,
+            'to_branch':      self.branches[0].id,
+            'items':          [{'product': product.id, 'quantity': '1'} for product in lines],
+        }
+
+        def setup():
+            response = self.client.call('post', '/api/v1/warehouse/transfers/', payload, expect=201, format='json')
+            return response.data['data']['id']
+
+        def run(pk):
+            self.client.call('post', f'/api/v1/warehouse/transfers/{pk}/confirm/')
+            return {'lines': len(lines)}
+
+        return measure(run, 3, setup=setup)
+
+    def _audit_confirm(self) -> dict:
+        from warehouse.models import StockAuditItem
+
+        def setup():
+            response = self.client.call('post', '/api/v1/warehouse/audits/', {'warehouse': self.audited.id},
+                                        expect=201, format='json')
+            data  = response.data.get('data', response.data)
+            items = list(StockAuditItem.objects.filter(audit_id=data['id']))
+            for n, item in enumerate(items):
+                item.actual_qty = item.expected_qty + (1 if n % 2 or item.expected_qty < 1 else -1)
+            StockAuditItem.objects.bulk_update(items, ['actual_qty'], batch_size=1000)
+            return data['id'], len(items)
+
+        def run(state):
+            pk, lines = state
+            self.client.call('post', f'/api/v1/warehouse/audits/{pk}/confirm/')
+            return {'lines': lines}
+
+        return measure(run, 3, setup=setup)
+
+    # ----------------------------------------------------------
+    # Dashboard
+    # ----------------------------------------------------------
+
+    def _dashboard(self, cold: bool) -> dict:
+        from django.core.cache import cache
+        from django.utils import timezone
+
+        today     = timezone.localdate()
+        date_from = today - timedelta(days=29)
+        url       = f'/api/v1/dashboard/?date_from={date_from}&date_to={today}'
+        key       = f'dashboard_{self.store_id}_None_{date_from}_{today}_10'   # dashboard/views.py kaliti
+
+        return measure(lambda _: self.client.call('get', url), self.repeat,
+                       setup=(lambda: cache.delete(key)) if cold else None)
+
+    # ----------------------------------------------------------
+    # Eksport
+    # ----------------------------------------------------------
+
+    def _export_cases(self) -> list:
+        formats = ('csv',) if self.quick else ('csv', 'excel')
+        sizes   = EXPORT_ROWS[:1] if self.quick else EXPORT_ROWS
+        cases   = []
+        for view, windowed, supported in _EXPORT_VIEWS:
+            for fmt in (f for f in formats if f in supported):
+                if windowed:
+                    for rows in sizes:
+                        cases.append((f'export.{view}.{fmt}[rows={rows}]',
+                                      lambda view=view, fmt=fmt, rows=rows: self._export(view, fmt, rows)))
+                cases.append((f'export.{view}.{fmt}[rows=all]',
+                              lambda view=view, fmt=fmt: self._export(view, fmt, None)))
+        return cases
+
+    def _export(self, view: str, fmt: str, rows: int | None) -> dict:
+        url, qs, day_field = self._export_source(view)
+        params = {'format': fmt}
+        if rows is None:
+            total = qs.count()
+        else:
+            date_from, total = self._window(qs, day_field, rows)
+            if total < rows:
+                return {'skipped': f"{total:,} qator bor — [rows=all] ga qarang"}
+            params['date_from'] = str(date_from)
+
+        def run(_):
+            response = self.client.call('get', url, params)
+            return {'bytes': response.size}
+
+        return {**measure(run, 1 if self.quick else 3), 'rows': total}
+
+    def _export_source(self, view: str) -> tuple:
+        """(URL, eksport qatorlari queryset i, date_from qo'llanadigan maydon)"""
+        from django.db.models import Count
+
+        from expense.models import Expense
+        from trade.models import Sale
+        from warehouse.models import Stock, StockMovement, Supplier, SupplierLedgerEntry
+
+        url = f'/api/v1/export/{view}/'
+        if view == 'supplier-statement':
+            top = (
+                SupplierLedgerEntry.objects.filter(supplier__store_id=self.store_id)
+                .values('supplier_id').annotate(n=Count('id')).order_by('-n').first()
+            )
+            if top is None:
+                raise BenchmarkError("Yetkazib beruvchi daftari bo'sh")
+            return (f"/api/v1/export/suppliers/{top['supplier_id']}/statement/",
+                    SupplierLedgerEntry.objects.filter(supplier_id=top['supplier_id']), None)
+        return {
+            'sales':           (url, Sale.objects.filter(store_id=self.store_id),                  'created_on'),
+            'stock-movements': (url, StockMovement.objects.filter(product__store_id=self.store_id), 'created_on'),
+            'expenses':        (url, Expense.objects.filter(store_id=self.store_id),               'date'),
+            'stocks':          (url, Stock.objects.filter(product__store_id=self.store_id),        None),
+            'suppliers':       (url, Supplier.objects.filter(store_id=self.store_id),              None),
+        }[view]
+
+    def _window(self, qs, field: str, rows: int) -> tuple:
+        """Eng yangi kunlardan orqaga: kamida rows qator yig'iladigan date_from → (sana, qatorlar)."""
+        from django.db.models import Count
+        from django.db.models.functions import TruncDate
+
+        if field != 'date':
+            qs    = qs.annotate(day=TruncDate(field))
+            field = 'day'
+        total, day = 0, None
+        for row in qs.values(field).annotate(n=Count('id')).order_by(f'-{field}'):
+            total += row['n']
+            day    = row[field]
+            if total >= rows:
+                break
+        return day, total
+
+    # ----------------------------------------------------------
+    # Import
+    # ----------------------------------------------------------
+
+    def _import(self, kind: str) -> dict:
+        import itertools
+
+        import openpyxl
+
+        from export.utils.importer import IMPORTERS
+        from export.utils.upload import column_names
+        from warehouse.models import Category
+
+        headers = column_names(IMPORTERS[kind].columns)
+        counter = itertools.count(1)
+        names   = {
+            'categories': list(Category.objects.filter(store_id=self.store_id).values_list('name', flat=True)),
+            'products':   [product.name for product in self.products[:self.lines]],
+            'warehouse':  self.warehouse.name,
+        }
+
+        def setup():
+            tag = next(counter)
+            wb  = openpyxl.Workbook(write_only=True)
+            ws  = wb.create_sheet()
+            ws.append(headers)
+            for n in range(IMPORT_ROWS):
+                ws.append(_IMPORT_ROWS[kind](tag, n, names))
+            buffer = io.BytesIO()
+            wb.save(buffer)
+            buffer.seek(0)
+            buffer.name = f'{kind}.xlsx'
+            return buffer
+
+        def run(buffer):
+            response = self.client.call('post', f'/api/v1/export/{kind}/import/', {'file': buffer}, format='multipart')
+            created  = response.data.get('created', 0)
+            if created != IMPORT_ROWS:
+                raise BenchmarkError(f"import.{kind}: {created} ta yaratildi, xatolar: {response.data.get('errors', [])[:2]}")
+            return {'rows': created}
+
+        return measure(run, 1 if self.quick else 3, setup=setup, warmup=0)
+
+
+# Eksport view lari: (URL bo'lagi, sana oynasi bilanmi, o'lchanadigan formatlar)
+_EXPORT_VIEWS = (
+    ('sales',              True,  ('csv', 'excel')),
+    ('stock-movements',    True,  ('csv', 'excel')),
+    ('expenses',           True,  ('csv', 'excel')),
+    ('stocks',             False, ('csv', 'excel')),
+    ('suppliers',          False, ('csv', 'excel')),
+    ('supplier-statement', False, ('csv',)),
+)
+
+# Import qatorlari: (tag, n, names) → ustunlar (export/views.py dagi shablon tartibida)
+_IMPORT_ROWS = {
+    'products':        lambda tag, n, names: [f"Bench {tag}-{n}", '', '', 1000 + n % 500, 800, 'dona', ''],
+    'customers':       lambda tag, n, names: [f"Mijoz {tag}-{n}", '', '', '', ''],
+    'suppliers':       lambda tag, n, names: [f"Yetkazuvchi {tag}-{n}", '', '', '', ''],
+    'subcategories':   lambda tag, n, names: [f"Sub {tag}-{n}", names['categories'][n % len(names['categories'])]],
+    'stock-movements': lambda tag, n, names: [names['products'][n % len(names['products'])], 1, 'in',
+                                              names['warehouse'], 'warehouse', 1000, '', ''],
+}
+
+
+def _line(name: str, result: dict, seconds: float) -> str:
+    if 'error' in result:
+        return f"  {name:44} XATO: {result['error']}"
+    if 'skipped' in result:
+        return f"  {name:44} o'tkazildi: {result['skipped']}"
+    return (
+        f"  {name:44} p50={result['p50_ms']:9.1f}ms  p95={result['p95_ms']:9.1f}ms  "
+        f"sql={result['queries']:>5}  rss={result['peak_rss_mb']:7.1f}MB  ({seconds:.0f}s)"
+    )
+
+
+# ============================================================
+# HISOBOT VA TAQQOSLASH
+# ============================================================
+
+@dataclass(frozen=True)
+class Regression:
+    case:     str
+    metric:   str
+    baseline: float | None
+    current:  float | None
+    limit:    float | None
+
+    def __str__(self) -> str:
+        if self.metric == 'error':
+            return f"{self.case}: xato — {self.current}"
+        return f"{self.case}: {self.metric} {self.current} > {self.limit:g} (baseline {self.baseline})"
+
+
+def environment() -> dict:
+    import django
+    from django.conf import settings
+
+    return {
+        'db':       connection.vendor,
+        'cache':    settings.CACHES['default']['BACKEND'].rsplit('.', 1)[-1],
+        'python':   platform.python_version(),
+        'django':   django.get_version(),
+        'machine':  platform.machine(),
+        'cpus':     os.cpu_count(),
+    }
+
+
+def build_report(results: dict, shape, seed: int, prepared: dict, thresholds: dict = None) -> dict:
+    from django.utils import timezone
+
+    return {
+        'meta': {
+            **environment(),
+            'created':  timezone.now().isoformat(timespec='seconds'),
+            'shape':    asdict(shape),
+            'seed':     seed,
+            'tenant':   prepared,
+        },
+        'thresholds': thresholds or {'default': DEFAULT_THRESHOLDS, 'cases': {}},
+        'cases':      results,
+    }
+
+
+def load_report(path: str) -> dict:
+    with open(path, encoding='utf-8') as handle:
+        return json.load(handle)
+
+
+def write_report(report: dict, path: str) -> None:
+    with open(path, 'w', encoding='utf-8') as handle:
+        json.dump(report, handle, indent=2, ensure_ascii=False, sort_keys=True)
+        handle.write('\n')
+
+
+def _thresholds(baseline: dict, case: str) -> dict:
+    configured = baseline.get('thresholds') or {}
+    merged     = {metric: dict(limits) for metric, limits in DEFAULT_THRESHOLDS.items()}
+    for source in (configured.get('default') or {}, (configured.get('cases') or {}).get(case) or {}):
+        for metric, limits in source.items():
+            merged.setdefault(metric, {}).update(limits)
+    return merged
+
+
+def compare(current: dict, baseline: dict) -> list:
+    """
+    current / baseline — hisobotlar (build_report). Faqat ikkalasida bor keyslar
+    taqqoslanadi; o'tkazilgan (skipped) keyslar e'tiborsiz. → [Regression]
+    """
+    regressions = []
+    for case, result in current['cases'].items():
+        if 'error' in result:
+            regressions.append(Regression(case, 'error', None, result['error'], None))
+            continue
+        base = baseline.get('cases', {}).get(case)
+        if not base or 'skipped' in result or 'error' in base or 'skipped' in base:
+            continue
+        for metric, limits in _thresholds(baseline, case).items():
+            if metric not in result or metric not in base:
+                continue
+            limit = base[metric] * limits.get('ratio', 1) + limits.get('slack', 0)
+            if result[metric] > limit:
+                regressions.append(Regression(case, metric, base[metric], result[metric], round(limit, 3)))
+    return regressions
+
+
+def meta_differences(current: dict, baseline: dict) -> list:
+    """Taqqoslashni ma'nosiz qiladigan muhit farqlari (ogohlantirish uchun)."""
+    keys = ('db', 'cache', 'machine', 'cpus', 'shape', 'seed')
+    return [
+        f"{key}: {baseline['meta'].get(key)!r} → {current['meta'].get(key)!r}"
+        for key in keys if baseline.get('meta', {}).get(key) != current['meta'].get(key)
+    ]
@@ -3,12 +3,20 @@
 CONFIG — Redis Kesh Yordamchi Funksiyalari
 ============================================================
 Funksiyalar:
-  get_store_settings(store_id)    — StoreSettings ni Redis keshdan olish
+  get_store_settings(store_id)    — StoreSettings (StoreSettingsData) ikki qavatli keshdan
   invalidate_store_settings(...)  — Keshni tozalash (settings o'zgarganda)
+  get_subscription(store_id)      — Subscription (SubscriptionData, .plan — PlanData)
+  invalidate_subscription_cache() — Obuna keshini tozalash
+  store_settings_data(obj) / subscription_data(obj) — model → o'zgarmas qator
 
 ⚠️ QOIDA 3 (HECH QACHON UNUTMA):
   StoreSettings ga har safar DB ga borish — 200 do'kon × ko'p so'rov = sekin.
-  Yechim: Redis kesh, 5 daqiqa TTL.
+  Yechim: jarayon LRU + Redis (config/tiered_cache.py), 5 daqiqa TTL.
+
+Qaytariladigan qiymat:
+  Model obyekti emas — frozen dataclass (modelning barcha maydonlari, attname bo'yicha:
+  settings.allow_debt, sub.plan_id, sub.plan.max_branches). O'zgartirib bo'lmaydi,
+  Redis da ORM obyekt grafi emas — faqat maydon qiymatlari saqlanadi.
 
 Ishlatish (istalgan ViewSet da):
   from config.cache_utils import get_store_settings, invalidate_store_settings
@@ -18,52 +26,116 @@ Ishlatish (istalgan ViewSet da):
   if not settings.allow_debt:
       raise ValidationError("Nasiya bu do'konda o'chirilgan.")
 
-  # Sozlamalar o'zgarganda — keshni tozalash:
+  # Sozlamalar o'zgarganda — keshni tozalash (barcha jarayonlarda, pub/sub):
   invalidate_store_settings(store_id)
 """
 
 import logging
+from dataclasses import fields, make_dataclass
 
-from django.core.cache import cache
+from django.apps import apps
+from django.conf import settings as django_settings
 
-logger = logging.getLogger(__name__)
+from .tiered_cache import TieredCache
 
-# Kesh kaliti formati
-_SETTINGS_KEY = 'store_settings_{store_id}'
+logger = logging.getLogger(__name__)
 
 # TTL: 5 daqiqa (300 soniya)
 _SETTINGS_TTL = 300
 
+# Qator turlari modeldan yasaladi: model maydoni qo'shilsa/o'chirilsa — oshiring
+# (Redis dagi eski picklelar yangi turga tiklanmaydi, kalit nomi o'zgaradi)
+ROW_SCHEMA = 2
 
-def get_store_settings(store_id: int):
-    """
-    StoreSettings obyektini Redis keshdan olish.
 
-    Keshda bo'lmasa → DB dan oladi va keshga yozadi.
-    DB da ham bo'lmasa (signal ishlamamagan bo'lsa) → yaratadi.
+# ============================================================
+# O'ZGARMAS QATORLAR (frozen dataclass)
+# ============================================================
 
-    Qaytaradi: StoreSettings obyekt
-    Raises: StoreSettings.DoesNotExist (agar store topilmasa)
-    """
-    from store.models import StoreSettings
+class FrozenRow:
+    """Model qatori nusxasi. Turi birinchi ishlatilganda model maydonlaridan yasaladi."""
+    __slots__ = ()
+    _label    = None                    # 'store.StoreSettings'
 
-    cache_key = _SETTINGS_KEY.format(store_id=store_id)
+    @classmethod
+    def from_instance(cls, instance, **extra):
+        values = {f.attname: getattr(instance, f.attname) for f in instance._meta.concrete_fields}
+        values.update(extra)
+        return cls(**values)
 
-    # 1. Keshdan olishga urinish
-    cached = cache.get(cache_key)
-    if cached is not None:
-        return cached
+    def as_dict(self) -> dict:
+        return {f.name: getattr(self, f.name) for f in fields(self)}
 
-    # 2. DB dan olish
-    try:
-        settings_obj = (
-            StoreSettings.objects
-            .select_related('store')
-            .get(store_id=store_id)
+    def __reduce__(self):
+        # Dinamik tur — pickle da modul atributi sifatida topilmaydi, yorliq orqali tiklanadi
+        return (_restore_row, (self._label, self.as_dict()))
+
+
+class SubscriptionRow(FrozenRow):
+    __slots__ = ()
+
+    @property
+    def is_active(self) -> bool:
+        """Faol yoki trial bo'lsa True."""
+        from subscription.models import SubscriptionStatus
+        return self.status in (SubscriptionStatus.TRIAL, SubscriptionStatus.ACTIVE)
+
+    @property
+    def days_left(self) -> int:
+        from datetime import date
+        return max(0, (self.end_date - date.today()).days)
+
+
+# yorliq → (asos klass, qo'shimcha maydonlar)
+_ROW_BASES = {
+    'subscription.Subscription': (SubscriptionRow, ['plan']),
+}
+_ROW_TYPES = {}
+
+
+def row_type(label: str):
+    cls = _ROW_TYPES.get(label)
+    if cls is None:
+        model        = apps.get_model(label)
+        base, extra  = _ROW_BASES.get(label, (FrozenRow, []))
+        names        = [f.attname for f in model._meta.concrete_fields] + extra
+        cls          = make_dataclass(
+            f'{model.__name__}Data', names, bases=(base,), frozen=True, slots=True,
+            namespace={'_label': label},
         )
+        cls.__module__ = __name__
+        _ROW_TYPES[label] = cls
+    return cls
+
+
+def _restore_row(label: str, values: dict):
+    return row_type(label)(**values)
+
+
+def store_settings_data(settings_obj):
+    return row_type('store.StoreSettings').from_instance(settings_obj)
+
+
+def subscription_data(sub):
+    plan = row_type('subscription.SubscriptionPlan').from_instance(sub.plan)
+    return row_type('subscription.Subscription').from_instance(sub, plan=plan)
+
+
+# ============================================================
+# STORE SETTINGS
+# ============================================================
+
+def _load_store_settings(store_id: int):
+    """
+    DB dan olish. DB da bo'lmasa (signal ishlamamagan bo'lsa) → yaratadi.
+    Raises: Store.DoesNotExist (agar store topilmasa)
+    """
+    from store.models import Store, StoreSettings
+
+    try:
+        settings_obj = StoreSettings.objects.get(store_id=store_id)
     except StoreSettings.DoesNotExist:
         # Signal ishlamagan yoki eski do'kon — avtomatik yaratamiz
-        from store.models import Store
         store = Store.objects.get(id=store_id)
         settings_obj, created = StoreSettings.objects.get_or_create(store=store)
         if created:
@@ -71,71 +143,83 @@ def get_store_settings(store_id: int):
                 f"get_store_settings: StoreSettings topilmadi, yaratildi "
                 f"(store_id={store_id}). Signal to'g'ri ulanganmi?"
             )
+    return store_settings_data(settings_obj)
 
-    # 3. Keshga yozish
-    cache.set(cache_key, settings_obj, timeout=_SETTINGS_TTL)
-    return settings_obj
 
+_settings_cache = TieredCache(f'store_settings_v{ROW_SCHEMA}', _load_store_settings, ttl=_SETTINGS_TTL)
 
-def invalidate_subscription_cache(store_id: int) -> None:
-    """
-    Do'kon obuna keshini tozalash.
 
-    Qachon chaqirish kerak:
-      - AdminSubscriptionViewSet da plan/status o'zgarganda
-      - To'lov qo'shilganda
-      - Celery task da subscription expired bo'lganda
+def get_store_settings(store_id: int):
+    """
+    Do'kon sozlamalari: jarayon LRU → Redis → DB.
 
-    Keyingi get_subscription() chaqiruvida DB dan yangi ma'lumot olinadi.
+    Qaytaradi: StoreSettingsData (frozen dataclass, StoreSettings maydonlari)
+    Raises: Store.DoesNotExist (agar store topilmasa)
     """
-    from django.conf import settings as django_settings
-    cache_key = f'subscription_{store_id}'
-    cache.delete(cache_key)
-    logger.debug(f"Subscription keshi tozalandi: store_id={store_id}")
+    return _settings_cache.get(store_id)
 
 
-def get_subscription(store_id: int):
+def invalidate_store_settings(store_id: int) -> None:
     """
-    Subscription obyektini Redis keshdan olish.
+    Do'kon sozlamalari keshini tozalash.
 
-    TTL: settings.SUBSCRIPTION_CACHE_TTL (default: 3600 — 1 soat)
-    Keshda yo'q bo'lsa → DB dan oladi va keshga yozadi.
-    Subscription yo'q bo'lsa → None qaytaradi.
+    Qachon chaqirish kerak:
+      - StoreSettingsViewSet.perform_update() da
+      - Boshqa joylarda StoreSettings o'zgartirilganda (save() — signal o'zi chaqiradi)
+
+    Barcha jarayonlarda eskiradi (pub/sub); keyingi get_store_settings() — DB dan.
     """
-    from django.conf import settings as django_settings
-    from subscription.models import Subscription
+    _settings_cache.invalidate(store_id)
+    logger.debug(f"StoreSettings keshi tozalandi: store_id={store_id}")
 
-    cache_key = f'subscription_{store_id}'
-    ttl       = getattr(django_settings, 'SUBSCRIPTION_CACHE_TTL', 3600)
+    from config.tenant import invalidate_store_tenants
+    invalidate_store_tenants(store_id)   # request.tenant.settings ham
 
-    cached = cache.get(cache_key)
-    if cached is not None:
-        return cached
 
-    try:
-        sub = (
-            Subscription.objects
-            .select_related('plan', 'store')
-            .get(store_id=store_id)
-        )
-    except Subscription.DoesNotExist:
+# ============================================================
+# SUBSCRIPTION
+# ============================================================
+
+def _load_subscription(store_id: int):
+    from subscription.models import Subscription
+
+    sub = Subscription.objects.select_related('plan').filter(store_id=store_id).first()
+    if sub is None:
         logger.warning(f"get_subscription: store_id={store_id} uchun obuna topilmadi.")
         return None
+    return subscription_data(sub)
 
-    cache.set(cache_key, sub, timeout=ttl)
-    return sub
 
+_subscription_cache = TieredCache(
+    f'subscription_v{ROW_SCHEMA}', _load_subscription,
+    ttl=getattr(django_settings, 'SUBSCRIPTION_CACHE_TTL', 3600),
+)
 
-def invalidate_store_settings(store_id: int) -> None:
+
+def get_subscription(store_id: int):
     """
-    Do'kon sozlamalari keshini tozalash.
+    Do'kon obunasi: jarayon LRU → Redis → DB.
+
+    TTL: settings.SUBSCRIPTION_CACHE_TTL (default: 3600 — 1 soat)
+    Qaytaradi: SubscriptionData (.is_active, .days_left, .plan — PlanData) yoki None.
+    Obunasiz do'kon ham keshlanadi (MISSING) — Subscription yaratilganda signal eskirtiradi.
+    """
+    return _subscription_cache.get(store_id)
+
+
+def invalidate_subscription_cache(store_id: int) -> None:
+    """
+    Do'kon obuna keshini tozalash.
 
     Qachon chaqirish kerak:
-      - StoreSettingsViewSet.perform_update() da
-      - Boshqa joylarda StoreSettings o'zgartirilganda
+      - AdminSubscriptionViewSet da plan/status o'zgarganda
+      - To'lov qo'shilganda
+      - Celery task da subscription expired bo'lganda
 
-    Keyingi get_store_settings() chaqiruvida DB dan yangi ma'lumot olinadi.
+    Barcha jarayonlarda eskiradi (pub/sub); keyingi get_subscription() — DB dan.
     """
-    cache_key = _SETTINGS_KEY.format(store_id=store_id)
-    cache.delete(cache_key)
-    logger.debug(f"StoreSettings keshi tozalandi: store_id={store_id}")
+    _subscription_cache.invalidate(store_id)
+    logger.debug(f"Subscription keshi tozalandi: store_id={store_id}")
+
+    from config.tenant import invalidate_store_tenants
+    invalidate_store_tenants(store_id)   # request.tenant.subscription ham
@@ -0,0 +1,298 @@
+"""
+============================================================
+CONFIG — Jarayon ichidagi metrikalar (Prometheus text)
+============================================================
+Klasslar / funksiyalar:
+  Counter / Histogram      — label qiymatlari bo'yicha seriyalar (bitta qulf, bisect)
+  RequestStats             — bitta so'rov: SQL soni / vaqti (execute_wrapper), kesh hit/miss
+  record_cache(name, hit)  — kesh qatlamlari chaqiradi (umumiy + joriy so'rov hisobiga)
+  observe_request(...)     — InstrumentationMiddleware (config/middleware.py) yakunida
+  metrics_view             — GET /metrics/ (Prometheus text format 0.0.4)
+
+Metrikalar (view — "ViewSet.action", masalan ProductViewSet.list):
+  crm_http_requests_total{view,status}
+  crm_http_request_duration_seconds{view}        — histogram
+  crm_db_queries_per_request{view}               — histogram
+  crm_db_duration_seconds_per_request{view}      — histogram
+  crm_http_response_size_bytes{view}             — histogram (oqimli javoblar — Content-Length bo'lsa)
+  crm_cache_requests_total{cache,result}         — hit / miss (kesh qatlami bo'yicha)
+  crm_view_cache_requests_total{view,result}
+  crm_db_repeated_query_requests_total{view}     — bir xil SQL ≥ METRICS_N_PLUS_ONE_THRESHOLD (N+1)
+
+Narxi: so'rovga bir nechta perf_counter, SQL uchun dict yangilash, yakunda 6-7 ta bisect —
+mikrosekundlar. Production da yoqilgan holda qoldiriladi (METRICS_ENABLED).
+
+Cheklov: qiymatlar jarayon ichida — har gunicorn worker o'z hisobini beradi
+(crm_process_info{pid}). Prometheus har scrape da bitta worker javobini oladi; to'liq manzara
+uchun worker lar sum() bilan yig'iladi yoki har biri alohida scrape qilinadi.
+"""
+
+import hmac
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden, HttpResponseNotFound
+
+logger = logging.getLogger(__name__)
+
+_lock     = threading.Lock()
+_registry = []
+_current  = ContextVar('request_stats', default=None)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS   = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+SIZE_BUCKETS    = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# Bitta so'rovda shuncha turli SQL shablon — undan keyingilari faqat sanaladi (import va h.k.)
+_MAX_TEMPLATES = 500
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(names: tuple, values: tuple, extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+# ============================================================
+# METRIKA TURLARI
+# ============================================================
+
+class Counter:
+    kind = 'counter'
+
+    def __init__(self, name: str, help_text: str, labels: tuple):
+        self.name      = name
+        self.help_text = help_text
+        self.labels    = labels
+        self._series   = {}               # label qiymatlari → son
+        _registry.append(self)
+
+    def inc(self, values: tuple, n: int = 1) -> None:
+        with _lock:
+            self._series[values] = self._series.get(values, 0) + n
+
+    def value(self, values: tuple) -> int:
+        return self._series.get(values, 0)
+
+    def render(self, lines: list) -> None:
+        with _lock:
+            series = list(self._series.items())
+        for values, count in series:
+            lines.append(f'{self.name}{_labels(self.labels, values)} {count}')
+
+    def reset(self) -> None:
+        with _lock:
+            self._series.clear()
+
+
+class Histogram:
+    kind = 'histogram'
+
+    def __init__(self, name: str, help_text: str, labels: tuple, buckets: tuple):
+        self.name      = name
+        self.help_text = help_text
+        self.labels    = labels
+        self.buckets   = tuple(buckets)
+        self._series   = {}               # label qiymatlari → [bucket sonlari (+Inf bilan), yig'indi, soni]
+        _registry.append(self)
+
+    def observe(self, values: tuple, value: float) -> None:
+        index = bisect_left(self.buckets, value)
+        with _lock:
+            series = self._series.get(values)
+            if series is None:
+                series = self._series[values] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def count(self, values: tuple) -> int:
+        series = self._series.get(values)
+        return series[2] if series else 0
+
+    def render(self, lines: list) -> None:
+        with _lock:
+            series = [(values, list(counts), total, n) for values, (counts, total, n) in self._series.items()]
+        for values, counts, total, n in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), counts):
+                cumulative += count
+                le = 'le="%s"' % bound
+                lines.append(f'{self.name}_bucket{_labels(self.labels, values, le)} {cumulative}')
+            lines.append(f'{self.name}_sum{_labels(self.labels, values)} {total}')
+            lines.append(f'{self.name}_count{_labels(self.labels, values)} {n}')
+
+    def reset(self) -> None:
+        with _lock:
+            self._series.clear()
+
+
+REQUESTS       = Counter('crm_http_requests_total', "So'rovlar soni", ('view', 'status'))
+LATENCY        = Histogram('crm_http_request_duration_seconds', "So'rov vaqti", ('view',), LATENCY_BUCKETS)
+DB_QUERIES     = Histogram('crm_db_queries_per_request', "So'rovdagi SQL soni", ('view',), QUERY_BUCKETS)
+DB_TIME        = Histogram('crm_db_duration_seconds_per_request', "So'rovdagi SQL vaqti", ('view',), LATENCY_BUCKETS)
+RESPONSE_SIZE  = Histogram('crm_http_response_size_bytes', "Javob hajmi", ('view',), SIZE_BUCKETS)
+CACHE          = Counter('crm_cache_requests_total', "Kesh o'qishlari", ('cache', 'result'))
+VIEW_CACHE     = Counter('crm_view_cache_requests_total', "View bo'yicha kesh o'qishlari", ('view', 'result'))
+REPEATED_QUERY = Counter('crm_db_repeated_query_requests_total', "Bir xil SQL takrorlangan so'rovlar (N+1)", ('view',))
+
+
+def reset() -> None:
+    """Barcha seriyalarni tozalash (testlar)."""
+    for metric in _registry:
+        metric.reset()
+    _reported.clear()
+
+
+def render() -> str:
+    lines = []
+    for metric in _registry:
+        lines.append(f'# HELP {metric.name} {metric.help_text}')
+        lines.append(f'# TYPE {metric.name} {metric.kind}')
+        metric.render(lines)
+    lines.append('# TYPE crm_process_info gauge')
+    lines.append(f'crm_process_info{{pid="{os.getpid()}"}} 1')
+    return '\n'.join(lines) + '\n'
+
+
+# ============================================================
+# SO'ROV HISOBI
+# ============================================================
+
+class RequestStats:
+    """connection.execute_wrapper sifatida ulanadi; kesh hisobi — record_cache orqali."""
+    __slots__ = ('queries', 'db_time', 'sql', 'cache_hits', 'cache_misses')
+
+    def __init__(self):
+        self.queries      = 0
+        self.db_time      = 0.0
+        self.sql          = {}            # SQL shablon (parametrlarsiz) → [soni, vaqti]
+        self.cache_hits   = 0
+        self.cache_misses = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.queries += 1
+            self.db_time += elapsed
+            item = self.sql.get(sql)
+            if item is not None:
+                item[0] += 1
+                item[1] += elapsed
+            elif len(self.sql) < _MAX_TEMPLATES:
+                self.sql[sql] = [1, elapsed]
+
+    def top(self, n: int = 5) -> list:
+        """Eng ko'p vaqt olgan SQL shablonlar: [(sql, soni, vaqti)]."""
+        items = sorted(self.sql.items(), key=lambda item: item[1][1], reverse=True)[:n]
+        return [(sql, count, elapsed) for sql, (count, elapsed) in items]
+
+    def repeated(self, threshold: int) -> list:
+        return [(sql, count) for sql, (count, _) in self.sql.items() if count >= threshold]
+
+
+def start_request() -> tuple:
+    stats = RequestStats()
+    return stats, _current.set(stats)
+
+
+def finish_request(token) -> None:
+    _current.reset(token)
+
+
+def record_cache(name: str, hit: bool, n: int = 1) -> None:
+    if not n:
+        return
+    CACHE.inc((name, 'hit' if hit else 'miss'), n)
+    stats = _current.get()
+    if stats is not None:
+        if hit:
+            stats.cache_hits += n
+        else:
+            stats.cache_misses += n
+
+
+_reported = set()          # (view, sql) — N+1 ogohlantirishi jarayonda bir marta
+
+
+def observe_request(request, response, stats: RequestStats, elapsed: float, view: str) -> None:
+    LATENCY.observe((view,), elapsed)
+    REQUESTS.inc((view, response.status_code))
+    DB_QUERIES.observe((view,), stats.queries)
+    DB_TIME.observe((view,), stats.db_time)
+    if stats.cache_hits:
+        VIEW_CACHE.inc((view, 'hit'), stats.cache_hits)
+    if stats.cache_misses:
+        VIEW_CACHE.inc((view, 'miss'), stats.cache_misses)
+
+    size = None
+    if not response.streaming:
+        size = len(response.content)
+    elif response.has_header('Content-Length'):
+        size = int(response['Content-Length'])
+    if size is not None:
+        RESPONSE_SIZE.observe((view,), size)
+
+    repeated = stats.repeated(settings.METRICS_N_PLUS_ONE_THRESHOLD)
+    if repeated:
+        REPEATED_QUERY.inc((view,))
+        for sql, count in repeated:
+            if (view, sql) not in _reported and len(_reported) < _MAX_TEMPLATES:
+                _reported.add((view, sql))
+                logger.warning("N+1 ehtimoli: %s — bitta so'rovda %d× %s", view, count, sql[:300])
+
+    if elapsed * 1000 >= settings.METRICS_SLOW_REQUEST_MS:
+        top = ''.join(
+            f"\n  {count}× {spent * 1000:.1f} ms  {sql[:300]}" for sql, count, spent in stats.top()
+        )
+        logger.warning(
+            "Sekin so'rov: %s %s (%s) — %.0f ms, %d SQL / %.0f ms, status %s%s",
+            request.method, request.path, view, elapsed * 1000,
+            stats.queries, stats.db_time * 1000, response.status_code, top,
+        )
+
+
+def view_label(request) -> str:
+    """"ViewSet.action" (DRF), "APIView.get", funksiya nomi yoki "unresolved" (404)."""
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unresolved'
+    func    = match.func
+    cls     = getattr(func, 'cls', None) or getattr(func, 'view_class', None)
+    name    = cls.__name__ if cls is not None else (match.url_name or func.__name__)
+    method  = request.method.lower()
+    actions = getattr(func, 'actions', None)
+    return f"{name}.{actions.get(method, method) if actions else method}"
+
+
+# ============================================================
+# /metrics/
+# ============================================================
+
+def metrics_view(request):
+    """
+    Prometheus scrape endpointi.
+    METRICS_TOKEN o'rnatilgan bo'lsa — "Authorization: Bearer <token>" shart;
+    o'rnatilmagan bo'lsa — faqat DEBUG rejimida ochiq.
+    """
+    token = settings.METRICS_TOKEN
+    if token:
+        given = request.headers.get('Authorization', '')
+        if not hmac.compare_digest(given, f'Bearer {token}'):
+            return HttpResponseForbidden()
+    elif not settings.DEBUG:
+        return HttpResponseNotFound()
+    return HttpResponse(render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -1,5 +1,14 @@
+import math
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
 from django.http import HttpResponse
 
+from config import metrics
+from superadmin import profiling
+
 
 class HealthCheckMiddleware:
     """
@@ -21,3 +30,79 @@ class HealthCheckMiddleware:
         if request.path_info == '/health/':
             return HttpResponse("OK", content_type="text/plain")
         return self.get_response(request)
+
+
+class RateLimitHeadersMiddleware:
+    """
+    Throttle natijasi (accaunt/throttles.py → request.rate_limit) javob sarlavhalariga:
+      X-RateLimit-Limit     — oynadagi limit
+      X-RateLimit-Remaining — qolgan so'rovlar
+      X-RateLimit-Reset     — kvota to'liq tiklanguncha soniya
+    429 javobidagi Retry-After ni DRF o'zi qo'yadi.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        decision = getattr(request, 'rate_limit', None)
+        if decision is not None:
+            response['X-RateLimit-Limit']     = str(decision.limit)
+            response['X-RateLimit-Remaining'] = str(decision.remaining)
+            response['X-RateLimit-Reset']     = str(math.ceil(decision.reset_after))
+        return response
+
+
+class InstrumentationMiddleware:
+    """
+    Har so'rov (config/metrics.py): vaqt, SQL soni va vaqti (connection.execute_wrapper),
+    kesh hit/miss, javob hajmi — "ViewSet.action" bo'yicha histogrammalar.
+    Bir xil SQL METRICS_N_PLUS_ONE_THRESHOLD martadan ko'p — N+1 deb belgilanadi;
+    METRICS_SLOW_REQUEST_MS dan sekin so'rov — eng og'ir SQL lar bilan logga.
+
+    HealthCheckMiddleware dan keyin (qolgan middleware'lar ham o'lchanadi).
+    Oqimli javob (StreamingHttpResponse) — vaqt sarlavhalargacha o'lchanadi.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled      = settings.METRICS_ENABLED
+
+    def __call__(self, request):
+        if not self.enabled or request.path_info == '/metrics/':
+            return self.get_response(request)
+
+        stats, token = metrics.start_request()
+        start        = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(stats))
+                response = self.get_response(request)
+        finally:
+            metrics.finish_request(token)
+        metrics.observe_request(request, response, stats, time.perf_counter() - start, metrics.view_label(request))
+        return response
+
+
+class ProfilingMiddleware:
+    """
+    Superadmin yoqqan profillash (superadmin/profiling.py): ProfilingRule ga mos yoki
+    imzolangan X-Profile sarlavhali so'rovlar cProfile + SQL trace bilan bajariladi.
+    Qoida ham, sarlavha ham yo'q — bitta META o'qishi va bo'sh tuple tekshiruvi.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.header_key   = profiling.header_meta_key()
+
+    def __call__(self, request):
+        header = request.META.get(self.header_key)
+        rules  = profiling.active_rules()
+        if header is None and not rules:
+            return self.get_response(request)
+        target = profiling.match(request, rules, header)
+        if target is None:
+            return self.get_response(request)
+        return profiling.profile_request(request, self.get_response, *target)
@@ -0,0 +1,83 @@
+"""
+============================================================
+CONFIG — ORM So'rov Yordamchilari
+============================================================
+Ro'yxat endpointlarida hisoblanadigan maydonlarni (soni, yig'indisi)
+har bir qator uchun alohida so'rov yubormasdan — bitta SQL ichida
+annotatsiya sifatida olish uchun yordamchilar.
+
+Nega Count() emas?
+  Count('products') + Count('subcategories') bir vaqtda JOIN qilinsa,
+  qatorlar ko'payib ketadi (products × subcategories). Korrelyatsiyalangan
+  subquery har bir munosabatni alohida hisoblaydi — JOIN portlashi yo'q.
+
+Sana parametrlari:
+  parse_day_start('2026-01-31', 'as_of') → shu kun boshidagi aware datetime.
+  created_on__date__gte o'rniga created_on__gte/__lt diapazoni — indeks ishlaydi.
+
+Ishlatish:
+  from django.db.models import OuterRef
+  from config.query_utils import SubqueryCount, SubquerySum
+
+  Category.objects.annotate(
+      product_count=SubqueryCount(
+          Product.objects.filter(category=OuterRef('pk'))
+      ),
+  )
+  Product.objects.annotate(
+      stock_total=SubquerySum(
+          Stock.objects.filter(product=OuterRef('pk')), 'quantity'
+      ),
+  )
+"""
+
+from datetime import datetime
+
+from django.db.models import DecimalField, IntegerField, Subquery
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from rest_framework.exceptions import ValidationError
+
+
+class SubqueryCount(Subquery):
+    """
+    Korrelyatsiyalangan COUNT(*) subquery.
+    Bo'sh to'plam uchun 0 qaytaradi (NULL emas).
+    """
+    template     = '(SELECT COUNT(*) FROM (%(subquery)s) _count)'
+    output_field = IntegerField()
+
+    def __init__(self, queryset, **extra):
+        # Faqat pk tanlanadi — ichki SELECT yengil bo'lsin
+        super().__init__(queryset.order_by().values('pk'), **extra)
+
+
+class SubquerySum(Subquery):
+    """
+    Korrelyatsiyalangan SUM(field) subquery.
+    Bo'sh to'plam uchun 0 qaytaradi (COALESCE).
+    """
+    template = '(SELECT COALESCE(SUM(%(sum_field)s), 0) FROM (%(subquery)s) _sum)'
+
+    def __init__(self, queryset, field: str, output_field=None, **extra):
+        if output_field is None:
+            output_field = DecimalField(max_digits=18, decimal_places=3)
+        super().__init__(
+            queryset.order_by().values(field),
+            output_field=output_field,
+            sum_field=field,
+            **extra,
+        )
+
+
+def parse_day_start(value, field: str):
+    """
+    'YYYY-MM-DD' → shu kun boshidagi aware datetime (indeksli diapazon uchun).
+    Bo'sh qiymat → None; noto'g'ri format → ValidationError({field: ...}).
+    """
+    if not value:
+        return None
+    day = parse_date(value)
+    if day is None:
+        raise ValidationError({field: "Sana formati noto'g'ri. YYYY-MM-DD bo'lishi kerak."})
+    return timezone.make_aware(datetime.combine(day, datetime.min.time()))
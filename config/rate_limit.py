@@ -0,0 +1,112 @@
+"""
+============================================================
+CONFIG — Atomar rate limit (GCRA, Redis Lua)
+============================================================
+Funksiyalar:
+  hit(key, limit, period) — bitta so'rovni hisobga olish → RateDecision
+  RateDecision            — allowed, limit, remaining, retry_after, reset_after
+
+Algoritm — GCRA (token bucket ning bitta sonli ko'rinishi):
+  Har kalit uchun Redis da bitta son — TAT (keyingi "nazariy kelish vaqti", ms).
+  interval = period / limit. So'rov ruxsat: TAT - limit*interval <= hozir.
+  Ruxsat bo'lsa TAT = max(TAT, hozir) + interval. Sliding window bilan bir xil
+  natija (limit ta so'rov istalgan period oynasida), lekin:
+    - kalit qiymati — bitta son (DRF SimpleRateThrottle — vaqtlar ro'yxati,
+      har so'rovda butunlay o'qilib qayta yoziladi)
+    - tekshirish + yozish bitta EVALSHA (atomar, parallel so'rovlar poygasi yo'q)
+    - vaqt Redis dan (TIME) — app serverlar soati farqi ta'sir qilmaydi
+  Narxi so'rovlar chastotasiga bog'liq emas: har doim bitta round trip, O(1) xotira.
+
+Backend:
+  django_redis — Lua skript. Boshqa backend (locmem — testlar) — xuddi shu algoritm
+  Python da cache.get/set bilan (jarayon ichida). DummyCache — hamma so'rov o'tadi.
+  Redis xatosi — so'rov o'tkaziladi (fail open), ogohlantirish logga yoziladi.
+  RATE_LIMIT_ENABLED=False — hisoblanmaydi, hamma so'rov o'tadi (benchmarklar).
+"""
+
+import logging
+import math
+import time
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+# KEYS[1] — kalit; ARGV[1] — interval (ms), ARGV[2] — limit
+# Qaytaradi: {ruxsat (1/0), qolgan, qayta urinish (ms), to'liq tiklanish (ms)}
+_GCRA_LUA = """
+redis.replicate_commands()
+local t        = redis.call('TIME')
+local now      = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local interval = tonumber(ARGV[1])
+local limit    = tonumber(ARGV[2])
+local tat      = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then tat = now end
+local allow_at = tat + interval - limit * interval
+if allow_at > now then
+  return {0, 0, allow_at - now, tat - now}
+end
+local new_tat = tat + interval
+redis.call('SET', KEYS[1], new_tat, 'PX', new_tat - now)
+return {1, math.floor((now - (new_tat - limit * interval)) / interval), 0, new_tat - now}
+"""
+
+_script = {}
+
+
+@dataclass(frozen=True)
+class RateDecision:
+    allowed:     bool
+    limit:       int
+    remaining:   int
+    retry_after: float      # soniya (ruxsat bo'lmasa)
+    reset_after: float      # soniya — kvota to'liq tiklanguncha
+
+
+def _redis_enabled() -> bool:
+    return settings.CACHES['default']['BACKEND'].startswith('django_redis')
+
+
+def _hit_redis(key: str, interval: int, limit: int) -> tuple:
+    from django_redis import get_redis_connection
+
+    client = get_redis_connection('default')
+    script = _script.get(id(client))
+    if script is None:
+        script = _script[id(client)] = client.register_script(_GCRA_LUA)   # EVALSHA, NOSCRIPT da EVAL
+    return script(keys=[key], args=[interval, limit])
+
+
+def _hit_local(key: str, interval: int, limit: int) -> tuple:
+    now = int(time.time() * 1000)
+    tat = max(cache.get(key) or now, now)
+    allow_at = tat + interval - limit * interval
+    if allow_at > now:
+        return 0, 0, allow_at - now, tat - now
+    new_tat = tat + interval
+    cache.set(key, new_tat, timeout=math.ceil((new_tat - now) / 1000))
+    return 1, (now - (new_tat - limit * interval)) // interval, 0, new_tat - now
+
+
+def hit(key: str, limit: int, period: int) -> RateDecision:
+    """key bo'yicha bitta so'rov: period soniyada limit ta."""
+    if not settings.RATE_LIMIT_ENABLED:
+        return RateDecision(True, limit, limit, 0, 0)
+    interval = max(1, period * 1000 // limit)
+    try:
+        if _redis_enabled():
+            allowed, remaining, retry_ms, reset_ms = _hit_redis(cache.make_key(f'rl:{key}'), interval, limit)
+        else:
+            allowed, remaining, retry_ms, reset_ms = _hit_local(f'rl:{key}', interval, limit)
+    except Exception as exc:
+        logger.warning("Rate limit tekshirilmadi (%s): %s — so'rov o'tkazildi", key, exc)
+        return RateDecision(True, limit, limit, 0, 0)
+    return RateDecision(
+        allowed     = bool(allowed),
+        limit       = limit,
+        remaining   = max(0, int(remaining)),
+        retry_after = int(retry_ms) / 1000,
+        reset_after = int(reset_ms) / 1000,
+    )
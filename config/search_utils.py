@@ -0,0 +1,313 @@
+"""
+============================================================
+CONFIG — Qidiruv Yordamchilari (mahsulot / mijoz)
+============================================================
+Funksiyalar:
+  normalize_search_text(text)  — nomni qidiruv uchun normallashtirish
+                                 (kichik harf, kirill → lotin, apostrof yo'q)
+  phone_search_prefix(text)    — telefon bo'lagini '+998...' prefiksiga aylantirish
+  ranked_search(qs, q, ...)    — reytingli qidiruv (prefiks > so'z boshi > trigram)
+  get_search_limit(request)    — ?limit= (SEARCH_RESULT_LIMIT / SEARCH_RESULT_MAX_LIMIT)
+
+Klasslar:
+  PrefixIndex                  — do'kon bo'yicha xotiradagi prefiks indeksi
+                                 (autocomplete uchun, DB ga bormasdan)
+  PrefixIndexRegistry          — do'kon → PrefixIndex registri (versiya + TTL)
+
+Normallashtirish:
+  Kassir "Кока кола", "koka-kola" yoki "KOKA KOLA" deb yozsa ham
+  bitta natija chiqishi kerak. Shuning uchun Product/Customer da
+  search_name ustuni saqlanadi (save() da to'ldiriladi) va qidiruv
+  so'rovi ham xuddi shu funksiya bilan normallashtiriladi.
+
+    "Oʻzbekiston Choy"  → "ozbekiston choy"
+    "Ўзбекистон чой"    → "ozbekiston choy"
+    "Coca-Cola 0.5L"    → "coca cola 0 5l"
+
+Indekslar (faqat PostgreSQL — migratsiyada vendor tekshiriladi):
+  search_name  — GIN (gin_trgm_ops): LIKE '%...%' va trigram o'xshashlik
+  barcode      — btree (varchar_pattern_ops): LIKE '...%' prefiks
+  phone        — btree (varchar_pattern_ops): LIKE '...%' prefiks
+"""
+
+import bisect
+import re
+import threading
+import time
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Case, IntegerField, Q, Value, When
+
+
+# ============================================================
+# NORMALLASHTIRISH
+# ============================================================
+
+# O'zbek kirill → lotin (2023 imlo, apostroflar keyin olib tashlanadi)
+_CYRILLIC_TO_LATIN = {
+    'а': 'a',  'б': 'b',  'в': 'v',  'г': 'g',  'д': 'd',  'е': 'e',
+    'ё': 'yo', 'ж': 'j',  'з': 'z',  'и': 'i',  'й': 'y',  'к': 'k',
+    'л': 'l',  'м': 'm',  'н': 'n',  'о': 'o',  'п': 'p',  'р': 'r',
+    'с': 's',  'т': 't',  'у': 'u',  'ф': 'f',  'х': 'x',  'ц': 'ts',
+    'ч': 'ch', 'ш': 'sh', 'щ': 'sh', 'ъ': '',   'ы': 'i',  'ь': '',
+    'э': 'e',  'ю': 'yu', 'я': 'ya', 'ў': 'o',  'қ': 'q',  'ғ': 'g',
+    'ҳ': 'h',
+}
+_TRANSLIT_TABLE = str.maketrans(_CYRILLIC_TO_LATIN)
+
+# Barcha apostrof turlari: o'/oʻ/o‘/o’/o` — hammasi tashlab yuboriladi
+_APOSTROPHES = re.compile(r"['`ʻʼ‘’´]")
+_NON_ALNUM   = re.compile(r'[^0-9a-z]+')
+
+
+def normalize_search_text(text: str) -> str:
+    """
+    Qidiruv uchun matnni normallashtiradi.
+
+    Qadamlar: casefold → kirill→lotin → apostroflarni o'chirish →
+    harf/raqam bo'lmagan belgilar → bitta bo'sh joy.
+    """
+    if not text:
+        return ''
+    text = text.casefold().translate(_TRANSLIT_TABLE)
+    text = _APOSTROPHES.sub('', text)
+    return _NON_ALNUM.sub(' ', text).strip()
+
+
+def phone_search_prefix(text: str):
+    """
+    Telefon bo'lagini saqlangan format ('+998XXXXXXXXX') prefiksiga aylantiradi.
+
+      "90 123"        → "+99890123"
+      "+998 90 123"   → "+99890123"
+      "99890"         → "+99890"
+    Raqamlar 3 tadan kam bo'lsa — None (telefon qidiruvi emas).
+    """
+    digits = re.sub(r'\D', '', text or '')
+    if len(digits) < 3:
+        return None
+    if digits.startswith('998') and len(digits) > 9:
+        return '+' + digits
+    return '+998' + digits
+
+
+def get_search_limit(request) -> int:
+    """?limit= ni o'qiydi: default SEARCH_RESULT_LIMIT, maks. SEARCH_RESULT_MAX_LIMIT."""
+    default = getattr(settings, 'SEARCH_RESULT_LIMIT', 20)
+    maximum = getattr(settings, 'SEARCH_RESULT_MAX_LIMIT', 50)
+    try:
+        limit = int(request.query_params.get('limit', default))
+    except (TypeError, ValueError):
+        limit = default
+    return max(1, min(limit, maximum))
+
+
+# ============================================================
+# REYTINGLI QIDIRUV (DB)
+# ============================================================
+
+# Reyting ballari — katta = yuqorida
+RANK_CODE_EXACT   = 100
+RANK_CODE_PREFIX  = 80
+RANK_NAME_EXACT   = 70
+RANK_NAME_PREFIX  = 60
+RANK_WORD_PREFIX  = 40
+RANK_FUZZY        = 10
+
+
+def _word_prefix_q(field: str, token: str) -> Q:
+    """token nomning istalgan so'zi boshida: 'token...' yoki '... token...'"""
+    return Q(**{f'{field}__startswith': token}) | Q(**{f'{field}__contains': f' {token}'})
+
+
+def ranked_search(queryset, q: str, *, name_field: str = 'search_name',
+                  code_field: str = None, code_prefix: str = None):
+    """
+    Reytingli qidiruv querysetini qaytaradi (kesilmagan — [:limit] chaqiruvchida).
+
+    Moslik sharti (OR):
+      - har bir so'z nomdagi biror so'z boshida (AND)
+      - code_field (barcode/phone) code_prefix bilan boshlanadi
+      - PostgreSQL: trigram so'z o'xshashligi (imlo xatolari uchun)
+
+    Tartib: search_rank DESC → (PG) search_similarity DESC → nom.
+
+    Args:
+        name_field:  normallashtirilgan nom ustuni (search_name)
+        code_field:  prefiks bo'yicha qidiriladigan kod ustuni (barcode / phone)
+        code_prefix: kod prefiksi; berilmasa — q.strip() ishlatiladi
+    """
+    norm = normalize_search_text(q)
+    raw  = (q or '').strip()
+    if not norm and not raw:
+        return queryset.none()
+
+    match = Q(pk__in=[])
+    whens = []
+
+    if code_field:
+        code = code_prefix if code_prefix is not None else raw
+        if code:
+            match |= Q(**{f'{code_field}__startswith': code})
+            whens += [
+                When(**{code_field: code}, then=Value(RANK_CODE_EXACT)),
+                When(**{f'{code_field}__startswith': code}, then=Value(RANK_CODE_PREFIX)),
+            ]
+
+    if norm:
+        name_match = Q()
+        for token in norm.split():
+            name_match &= _word_prefix_q(name_field, token)
+        match |= name_match
+        whens += [
+            When(**{name_field: norm}, then=Value(RANK_NAME_EXACT)),
+            When(**{f'{name_field}__startswith': norm}, then=Value(RANK_NAME_PREFIX)),
+            When(name_match, then=Value(RANK_WORD_PREFIX)),
+        ]
+
+    ordering = ['-search_rank']
+    if norm and connection.vendor == 'postgresql':
+        # Trigram: "kokakola" → "koka kola" (GIN gin_trgm_ops indeksidan foydalanadi)
+        from django.contrib.postgres.search import TrigramWordSimilarity
+        queryset = queryset.annotate(search_similarity=TrigramWordSimilarity(norm, name_field))
+        match   |= Q(**{f'{name_field}__trigram_word_similar': norm})
+        ordering.append('-search_similarity')
+
+    ordering.append(name_field)
+    return (
+        queryset
+        .filter(match)
+        .annotate(search_rank=Case(*whens, default=Value(RANK_FUZZY), output_field=IntegerField()))
+        .order_by(*ordering)
+    )
+
+
+# ============================================================
+# XOTIRADAGI PREFIKS INDEKSI (AUTOCOMPLETE)
+# ============================================================
+
+class PrefixIndex:
+    """
+    Bitta do'kon uchun xotiradagi prefiks indeksi.
+
+    Har bir yozuvning nomidagi so'zlar va kodi (barcode) saralangan
+    massivda saqlanadi; prefiks qidiruv — bisect (O(log n) + natija).
+    Har harf uchun alohida tugun (dict) saqlaydigan klassik trie ga
+    nisbatan 100k mahsulotda xotira bir necha barobar kam.
+
+    entries: [(id, search_name, code, payload_dict), ...]
+    """
+
+    def __init__(self, entries):
+        pairs         = []
+        self._names   = {}
+        self._payload = {}
+        for obj_id, search_name, code, payload in entries:
+            self._names[obj_id]   = search_name or ''
+            self._payload[obj_id] = payload
+            for token in set((search_name or '').split()):
+                pairs.append((token, obj_id))
+            if code:
+                pairs.append((code, obj_id))
+        pairs.sort()
+        self._keys = [key for key, _ in pairs]
+        self._ids  = [obj_id for _, obj_id in pairs]
+        self.built_at = time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self._payload)
+
+    def _prefix_ids(self, prefix: str):
+        start = bisect.bisect_left(self._keys, prefix)
+        for i in range(start, len(self._keys)):
+            if not self._keys[i].startswith(prefix):
+                break
+            yield self._keys[i], self._ids[i]
+
+    def search(self, q: str, limit: int = 20) -> list:
+        """
+        Reytingli prefiks qidiruv — ranked_search() bilan bir xil ball tizimi.
+        Qaytaradi: payload dict lar ro'yxati (eng mosi birinchi).
+        """
+        norm   = normalize_search_text(q)
+        raw    = (q or '').strip()
+        tokens = norm.split()
+        scored = {}
+        # Qisqa prefiks (masalan 'a') minglab moslik berishi mumkin — nomzodlar cheklanadi
+        candidates = max(limit * 20, 500)
+
+        if raw:
+            for key, obj_id in self._prefix_ids(raw):
+                if len(scored) >= candidates:
+                    break
+                rank = RANK_CODE_EXACT if key == raw else RANK_CODE_PREFIX
+                scored[obj_id] = max(scored.get(obj_id, 0), rank)
+
+        if tokens:
+            # Eng uzun so'z bo'yicha nomzodlar, qolganlari nom ichida tekshiriladi
+            anchor = max(tokens, key=len)
+            for _, obj_id in self._prefix_ids(anchor):
+                if len(scored) >= candidates:
+                    break
+                name  = self._names[obj_id]
+                words = name.split()
+                if not all(any(w.startswith(t) for w in words) for t in tokens):
+                    continue
+                if name == norm:
+                    rank = RANK_NAME_EXACT
+                elif name.startswith(norm):
+                    rank = RANK_NAME_PREFIX
+                else:
+                    rank = RANK_WORD_PREFIX
+                scored[obj_id] = max(scored.get(obj_id, 0), rank)
+
+        best = sorted(scored.items(), key=lambda item: (-item[1], self._names[item[0]]))
+        return [self._payload[obj_id] for obj_id, _ in best[:limit]]
+
+
+class PrefixIndexRegistry:
+    """
+    Do'kon → PrefixIndex jarayon ichidagi registr.
+
+    Eskirish:
+      - invalidate(store_id)  — shu jarayonda darhol o'chiradi va kesh
+                                versiyasini oshiradi (boshqa worker'lar uchun)
+      - versiya keshda o'zgargan yoki TTL o'tgan bo'lsa → qayta quriladi
+    """
+
+    def __init__(self, name: str, loader, ttl: int = 300):
+        self._name   = name
+        self._loader = loader
+        self._ttl    = ttl
+        self._items  = {}
+        self._lock   = threading.Lock()
+
+    def _version_key(self, store_id: int) -> str:
+        return f'{self._name}_version_{store_id}'
+
+    def _current_version(self, store_id: int):
+        from django.core.cache import cache
+        return cache.get(self._version_key(store_id))
+
+    def get(self, store_id: int) -> PrefixIndex:
+        version = self._current_version(store_id)
+        item    = self._items.get(store_id)
+        if item is not None:
+            index, built_version = item
+            fresh = time.monotonic() - index.built_at < self._ttl
+            if fresh and built_version == version:
+                return index
+        with self._lock:
+            index = PrefixIndex(self._loader(store_id))
+            self._items[store_id] = (index, version)
+        return index
+
+    def invalidate(self, store_id: int) -> None:
+        from django.core.cache import cache
+        self._items.pop(store_id, None)
+        key = self._version_key(store_id)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, timeout=None)
@@ -35,6 +35,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',  # Trigram qidiruv lookup'lari (faqat PostgreSQL da faol)
 
     # --- Uchinchi tomon kutubxonalar ---
     'rest_framework',                           # Django REST Framework
@@ -66,6 +67,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'config.middleware.HealthCheckMiddleware',     # BIRINCHI — health check ALLOWED_HOSTS dan oldin
+    'config.middleware.InstrumentationMiddleware', # vaqt / SQL / kesh metrikalari (config/metrics.py)
+    'config.middleware.ProfilingMiddleware',       # superadmin profillashi (superadmin/profiling.py)
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',       # CORS — CommonMiddleware DAN OLDIN bo'lishi shart
@@ -74,6 +77,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'config.middleware.RateLimitHeadersMiddleware',   # X-RateLimit-* (accaunt/throttles.py)
 ]
 
 
@@ -171,19 +175,21 @@ REST_FRAMEWORK = {
         'accaunt.permissions.ReadOnlyIfExpired',
     ],
 
-    # JWT orqali autentifikatsiya
+    # JWT orqali autentifikatsiya (+ request.tenant — config/tenant.py)
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'accaunt.authentication.TenantJWTAuthentication',
     ],
 
-    # So'rovlar chastotasini cheklash (Throttling)
+    # So'rovlar chastotasini cheklash (Throttling) — Redis GCRA (config/rate_limit.py)
     'DEFAULT_THROTTLE_CLASSES': [
-        'rest_framework.throttling.AnonRateThrottle',  # Anonim foydalanuvchilar
-        'rest_framework.throttling.UserRateThrottle',  # Autentifikatsiya qilinganlar
+        'accaunt.throttles.AnonThrottle',    # Anonim foydalanuvchilar (IP)
+        'accaunt.throttles.UserThrottle',    # Autentifikatsiya qilinganlar
+        'accaunt.throttles.StoreThrottle',   # Do'kon bo'yicha — tarif reja kvotasi
     ],
     'DEFAULT_THROTTLE_RATES': {
         'anon':           '20/min',   # Anonim: minutiga 20 so'rov
         'user':           '200/min',  # Foydalanuvchi: minutiga 200 so'rov
+        'store':          '600/min',  # Do'kon (obunasiz): reja bo'lsa — api_requests_per_minute
         'login':          '5/min',    # Login: minutiga 5 urinish (brute-force himoya)
         'register':       '3/min',    # Ro'yxatdan o'tish: minutiga 3 ta (spam himoya)
         'password_reset': '3/hour',   # Parol tiklash: soatiga 3 ta (email spam himoya)
@@ -241,6 +247,13 @@ CORS_ALLOW_HEADERS = [
     'content-type', 'dnt', 'origin', 'user-agent',
     'x-csrftoken', 'x-requested-with',
     'x-idempotency-key',  # Offline rejim uchun (BOSQICH 18)
+    'x-profile',          # Superadmin profillash sarlavhasi (superadmin/profiling.py)
+]
+
+# Frontend o'qiy oladigan javob sarlavhalari (accaunt/throttles.py)
+CORS_EXPOSE_HEADERS = [
+    'retry-after', 'x-ratelimit-limit', 'x-ratelimit-remaining', 'x-ratelimit-reset',
+    'x-profile-id',
 ]
 
 
@@ -356,6 +369,51 @@ CELERY_BEAT_SCHEDULE = {
         },
     },
 
+    # Supplier.debt_balance keshini daftar (SupplierLedgerEntry) bilan solishtirish
+    'verify-supplier-ledger-daily': {
+        'task':     'warehouse.tasks.verify_supplier_ledger',
+        'schedule': crontab(hour=3, minute=30),   # Har kuni 03:30
+        'options': {
+            'expires': 3600,  # 1 soat ichida bajarilmasa — bekor qilinadi
+        },
+    },
+
+    # StoreUsage (tarif limiti hisoblagichlari) — haqiqiy sonlar bilan solishtirish
+    'reconcile-store-usage-daily': {
+        'task':     'subscription.tasks.reconcile_store_usage',
+        'schedule': crontab(hour=4, minute=0),    # Har kuni 04:00
+        'options': {
+            'expires': 3600,
+        },
+    },
+
+    # Eksport artefaktlari: muddati o'tgan fayllar + osilib qolgan joblar
+    'cleanup-export-jobs': {
+        'task':     'export.tasks.cleanup_export_jobs',
+        'schedule': crontab(minute='*/30'),       # Har 30 daqiqada
+        'options': {
+            'expires': 1800,
+        },
+    },
+
+    # Import fayllari: eski dry-run fayllari + osilib qolgan joblar
+    'cleanup-import-jobs': {
+        'task':     'export.tasks.cleanup_import_jobs',
+        'schedule': crontab(minute='15,45'),      # Har 30 daqiqada (eksport tozalashdan keyin)
+        'options': {
+            'expires': 1800,
+        },
+    },
+
+    # So'rov profillari: eski .prof fayllar + muddati o'tgan qoidalar
+    'cleanup-request-profiles': {
+        'task':     'superadmin.tasks.cleanup_request_profiles',
+        'schedule': crontab(hour=3, minute=30),   # Har kuni 03:30
+        'options': {
+            'expires': 3600,
+        },
+    },
+
     # BOSQICH 20 — Har kuni 00:01 da obuna muddatlarini tekshirish
     'check-subscription-expiry-daily': {
         'task':     'subscription.tasks.check_subscription_expiry',
@@ -366,6 +424,36 @@ CELERY_BEAT_SCHEDULE = {
     },
 }
 
+# Og'ir vazifalar alohida navbatda — API bilan bog'liq vazifalarga xalaqit bermaydi
+#   celery -A config worker -Q exports --concurrency=2 --prefetch-multiplier=1
+CELERY_TASK_ROUTES = {
+    'export.tasks.run_export_job': {'queue': 'exports'},
+    'export.tasks.run_import_job': {'queue': 'exports'},
+}
+
+# ============================================================
+# EXPORT JOBLARI (fon rejimidagi eksport, export.ExportJob)
+# ============================================================
+# Artefaktlar: STORAGES['exports'] (masalan S3) yoki MEDIA_ROOT/exports/
+
+EXPORT_JOB_TTL_HOURS         = int(os.environ.get('EXPORT_JOB_TTL_HOURS', 24))          # fayl saqlanish muddati
+EXPORT_JOB_FRESHNESS_MINUTES = int(os.environ.get('EXPORT_JOB_FRESHNESS_MINUTES', 10))  # dedup oynasi
+EXPORT_JOB_STALE_MINUTES     = 120    # shundan uzoq pending/running → failed
+EXPORT_JOB_PROGRESS_EVERY    = 5000   # progress har N qatorda yoziladi
+
+# ============================================================
+# IMPORT (yuklangan .xlsx / .csv, export/utils/upload.py)
+# ============================================================
+
+IMPORT_MAX_ROWS    = int(os.environ.get('IMPORT_MAX_ROWS', 50000))   # fayldagi ma'lumot qatorlari
+IMPORT_MAX_FILE_MB = int(os.environ.get('IMPORT_MAX_FILE_MB', 20))   # yuklangan fayl hajmi
+
+# Fon importi (export.ImportJob, ?async=1): fayl STORAGES['exports'] / MEDIA_ROOT/imports/
+IMPORT_JOB_TTL_HOURS       = int(os.environ.get('IMPORT_JOB_TTL_HOURS', 24))   # dry-run fayli (commit uchun)
+IMPORT_JOB_STALE_MINUTES   = 120    # shundan uzoq pending/running → failed
+IMPORT_JOB_PROGRESS_EVERY  = 1000   # progress har N qatorda yoziladi
+IMPORT_JOB_MAX_ERRORS      = 1000   # job da saqlanadigan qator xatolari
+
 # ============================================================
 # SUBSCRIPTION SOZLAMALARI (B20)
 # ============================================================
@@ -379,9 +467,100 @@ SUBSCRIPTION_EXPIRY_NOTIFY = [10, 3, 1]
 # Redis kesh TTL (soniya) — cache_utils.py da ishlatiladi
 SUBSCRIPTION_CACHE_TTL = 3600  # 1 soat
 
+# request.tenant (foydalanuvchi + hodim + do'kon + sozlamalar + obuna) keshi — config/tenant.py.
+# Model o'zgarganda signal orqali darhol eskiradi; TTL — obuna muddati o'tishi uchun zaxira
+TENANT_CONTEXT_TTL = 300  # 5 daqiqa
+
+# JWT claimlari versiyasi (tokver_{user_id}) — config/tenant.py. Signal bilan darhol eskiradi;
+# TTL — zaxira (access token muddati bilan bir xil)
+TOKEN_VERSION_TTL = 60 * 60 * 24
+
+# get_store_settings / get_subscription — jarayon LRU qavati (config/tiered_cache.py).
+# Eskirtirish Redis pub/sub orqali darhol; LOCAL_TTL — xabar yo'qolsa zaxira
+TIERED_CACHE_MAXSIZE       = 1024
+TIERED_CACHE_LOCAL_TTL     = 60     # soniya
+TIERED_CACHE_LOCK_WAIT     = 2      # boshqa jarayon yuklayotganda kutish, soniya
+CACHE_INVALIDATION_CHANNEL = 'crm:cache-invalidate'
+
 # ============================================================
 # UMUMIY CHEKLOVLAR
 # ============================================================
 
 # Bir so'rovda maksimal QR/barcode bosib chiqarish soni — warehouse/views.py
 QR_BULK_MAX_PRODUCTS = 500
+
+# Valyuta kurslari jadvali jarayon xotirasida (warehouse/rates.py) — soniya.
+# Kurs yozilganda darhol eskiradi; TTL — boshqa worker'dagi o'zgarishlar uchun zaxira
+EXCHANGE_RATE_CACHE_TTL = 600
+
+# ============================================================
+# YORLIQLAR (QR / EAN-13 — warehouse/labels.py)
+# ============================================================
+
+# Chizilgan rasmlar keshi (kalit = ETag = kod + tur + format + o'lcham) — soniya
+LABEL_CACHE_TTL = 7 * 24 * 3600
+
+# bulk-qr: keshda yo'q rasmlar shu jarayonlar sonida chiziladi (< 2 — joyida)
+LABEL_RENDER_WORKERS = min(4, os.cpu_count() or 1)
+
+# Keshda yo'q rasmlar shundan kam bo'lsa pool ishlatilmaydi (jarayonga uzatish narxi)
+LABEL_POOL_MIN_BATCH = 32
+
+# PDF stiker varag'ida maksimal stikerlar soni (mahsulotlar × copies)
+LABEL_SHEET_MAX_STICKERS = 5000
+
+# ============================================================
+# QIDIRUV SOZLAMALARI (mahsulot / mijoz — config/search_utils.py)
+# ============================================================
+
+# ?q= natijalari soni: default va maksimal (?limit=)
+SEARCH_RESULT_LIMIT     = 20
+SEARCH_RESULT_MAX_LIMIT = 50
+
+# Xotiradagi autocomplete indeksi (GET /products/autocomplete/)
+# False bo'lsa — autocomplete DB reytingli qidiruvidan foydalanadi
+PRODUCT_SEARCH_INDEX_ENABLED = True
+PRODUCT_SEARCH_INDEX_TTL     = 300  # soniya — boshqa worker'dagi o'zgarishlar uchun zaxira
+
+# ============================================================
+# API KVOTALARI (config/rate_limit.py — accaunt/throttles.py)
+# ============================================================
+
+# False — barcha throttle lar so'rovni o'tkazadi (run_benchmarks, yuklama testlari)
+RATE_LIMIT_ENABLED = True
+
+# ============================================================
+# METRIKALAR (config/metrics.py — GET /metrics/, Prometheus)
+# ============================================================
+
+METRICS_ENABLED = True
+
+# /metrics/ uchun "Authorization: Bearer <token>"; bo'sh — faqat DEBUG da ochiq
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+
+# Shundan sekin so'rovlar eng og'ir SQL lari bilan logga yoziladi (ms)
+METRICS_SLOW_REQUEST_MS = 1000
+
+# Bitta so'rovda bir xil SQL shablon shuncha marta — N+1 deb belgilanadi
+METRICS_N_PLUS_ONE_THRESHOLD = 10
+
+# ============================================================
+# PROFILLASH (superadmin/profiling.py — superadmin yoqadi)
+# ============================================================
+
+# Imzolangan sarlavha nomi va amal qilish muddati (soniya)
+PROFILING_HEADER         = 'X-Profile'
+PROFILING_HEADER_MAX_AGE = 15 * 60
+
+# Faol qoidalar ro'yxati har jarayonda shuncha soniyada bir marta keshdan yangilanadi (DB siz)
+PROFILING_RULES_REFRESH = 10
+
+# Qoida muddati chegarasi (daqiqa)
+PROFILING_MAX_DURATION_MINUTES = 24 * 60
+
+# Bitta profilda saqlanadigan SQL lar va summary dagi funksiyalar soni
+PROFILING_SQL_TRACE_LIMIT = 1000
+PROFILING_SUMMARY_LINES   = 60
+
+# Profil fayllari: STORAGES['profiles'] yoki MEDIA_ROOT/profiles/, shuncha kun saqlanadi
+PROFILING_ARTIFACT_TTL_DAYS = 7
@@ -226,6 +226,12 @@ LOGGING = {
             'level': 'ERROR',
             'propagate': True,
         },
+        # Sekin so'rovlar va N+1 ogohlantirishlari (config/metrics.py)
+        'config.metrics': {
+            'handlers': ['console'],
+            'level': 'WARNING',
+            'propagate': False,
+        },
     },
 }
 
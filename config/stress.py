@@ -0,0 +1,598 @@
+"""
+============================================================
+CONFIG — Qoldiq izchilligi stress testi (parallel kassirlar)
+============================================================
+Klasslar / funksiyalar:
+  STRESS_SHAPE / DEFAULT_MIX   — sintetik tenant shakli, amallar ulushi
+  StressHarness                — tenant + issiq SKU qoldig'i; run(workers, ...) → hisobot
+  check_invariants(store_id)   — Stock == harakatlar daftari == ochiq partiyalar → [buzilish]
+  LockTimer / LockSampler      — SELECT ... FOR UPDATE vaqti / PostgreSQL da qulf kutayotganlar
+
+Buyruq: python manage.py stress_stock (warehouse/management/commands/stress_stock.py)
+
+Nima uchun:
+  Sotuv, transfer.confirm, inventarizatsiya va OUT harakat Stock / StockBatch
+  qatorlarini item tartibida (global tartibsiz) qulflaydi. Bir xil "issiq" SKU larni
+  ko'p kassir sotganda — qulf kutish va vaqti-vaqti bilan deadlock. Harness shu
+  yuklamani takrorlaydi va qulflash / batching o'zgarishini raqam bilan ko'rsatadi.
+
+Yuklama (har ishchi — alohida ulanish, haqiqiy API + JWT):
+  sale      — POST /api/v1/sales/, savatda 1..basket ta issiq SKU (Zipf taqsimoti)
+  return    — POST /api/v1/sale-returns/ + PATCH .../confirm/
+  transfer  — POST /api/v1/warehouse/transfers/ + .../confirm/ (ombor ⇄ filial)
+  receipt   — POST /api/v1/warehouse/movements/ (IN, unit_cost — yangi partiya)
+  writeoff  — POST /api/v1/warehouse/movements/ (OUT — FIFO yechish)
+
+O'lchov:
+  Amal bo'yicha: ok / rad etilgan (4xx) / deadlock / lock_timeout / xato, latency
+  p50/p95/p99, FOR UPDATE so'rovlarida o'tgan vaqt. Umumiy: o'tkazuvchanlik (amal/s),
+  PostgreSQL: qulf kutgan backend-soniyalar (pg_stat_activity namunasi) va server
+  deadlock hisoblagichi (pg_stat_database).
+
+Tekshiruv (yuklamadan keyin): check_invariants + muvaffaqiyatli amallar soni ==
+bazadagi sotuv / tasdiqlangan qaytarish / transferlar soni.
+
+⚠️ Parallel rejim faqat PostgreSQL da (SQLite yozuvchilarni ketma-ket qiladi).
+   Oqimlar (thread) — GIL Python qismini ketma-ket qiladi, DB kutishlari parallel;
+   jarayonlar (process, fork) — to'liq parallel, Linux.
+"""
+
+import logging
+import multiprocessing
+import random
+import threading
+import time
+from collections import defaultdict
+from dataclasses import asdict, replace
+from decimal import Decimal
+
+from django.db import DatabaseError, connection, connections, transaction
+from django.db.models import F, Q, Sum
+
+from config.benchmark import ApiClient, environment, percentile, subscribe_unlimited
+from config.synthetic import PRESETS, TenantGenerator
+
+STRESS_SHAPE = replace(PRESETS['tiny'], branches=3, products=200, customers=50, sales=2_000, days=30)
+
+DEFAULT_MIX = {'sale': 60, 'return': 8, 'transfer': 10, 'receipt': 15, 'writeoff': 7}
+HOT_SKUS    = 20
+BASKET      = 5
+STOCK_UP    = Decimal('100000')       # issiq SKU qoldig'i har joyda — sotuv yetishmasligiga urilmaydi
+UNIT_COST   = Decimal('1000')
+
+OUTCOMES    = ('ok', 'rejected', 'deadlock', 'lock_timeout', 'serialization', 'error')
+_SQLSTATES  = {'40P01': 'deadlock', '55P03': 'lock_timeout', '40001': 'serialization'}
+_MAX_NOTES  = 5
+_QTY        = Decimal('0.001')
+
+
+class StressError(Exception):
+    """Kutilmagan javob (5xx, noma'lum status) — 'error' sifatida hisoblanadi."""
+
+
+def classify(exc: BaseException) -> str:
+    """DB xatosi → natija turi (SQLSTATE: psycopg2 pgcode / psycopg sqlstate)."""
+    seen = exc
+    for _ in range(5):
+        if seen is None:
+            break
+        code = getattr(seen, 'pgcode', None) or getattr(seen, 'sqlstate', None)
+        if code in _SQLSTATES:
+            return _SQLSTATES[code]
+        seen = seen.__cause__ or seen.__context__
+    if 'database is locked' in str(exc):
+        return 'lock_timeout'
+    return 'error'
+
+
+def parse_mix(value: str) -> dict:
+    """'sale=70,transfer=30' → {'sale': 70, 'transfer': 30}."""
+    mix = {}
+    for part in filter(None, (item.strip() for item in value.split(','))):
+        name, _, weight = part.partition('=')
+        if name not in DEFAULT_MIX:
+            raise ValueError(f"Noma'lum amal: {name} (mavjud: {', '.join(DEFAULT_MIX)})")
+        mix[name] = int(weight)
+    if not mix or min(mix.values()) < 0 or not sum(mix.values()):
+        raise ValueError("Ulushlar musbat bo'lishi kerak.")
+    return mix
+
+
+# ============================================================
+# QULF O'LCHOVI
+# ============================================================
+
+class LockTimer:
+    """connection.execute_wrapper: SELECT ... FOR UPDATE so'rovlari soni va vaqti (kutish + o'qish)."""
+
+    def __init__(self):
+        self.count   = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        if 'FOR UPDATE' not in sql:
+            return execute(sql, params, many, context)
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count   += 1
+            self.seconds += time.perf_counter() - start
+
+
+class LockSampler(threading.Thread):
+    """
+    PostgreSQL: har interval da shu bazada qulf kutayotgan backendlar soni
+    (pg_stat_activity.wait_event_type = 'Lock'). wait_seconds — backend-soniyalar.
+    """
+
+    _SQL = (
+        "SELECT count(*) FROM pg_stat_activity "
+        "WHERE datname = current_database() AND wait_event_type = 'Lock'"
+    )
+
+    def __init__(self, interval: float = 0.02):
+        super().__init__(daemon=True)
+        self.interval     = interval
+        self.wait_seconds = 0.0
+        self.max_waiting  = 0
+        self.samples      = 0
+        self._stop_event  = threading.Event()
+
+    def run(self):
+        last = time.perf_counter()
+        try:
+            while not self._stop_event.wait(self.interval):
+                with connection.cursor() as cursor:
+                    cursor.execute(self._SQL)
+                    waiting = cursor.fetchone()[0]
+                now  = time.perf_counter()
+                self.wait_seconds += waiting * (now - last)
+                self.max_waiting   = max(self.max_waiting, waiting)
+                self.samples      += 1
+                last = now
+        finally:
+            connection.close()
+
+    def stop(self) -> dict:
+        self._stop_event.set()
+        self.join()
+        return {
+            'lock_wait_s':      round(self.wait_seconds, 3),
+            'max_lock_waiters': self.max_waiting,
+            'lock_samples':     self.samples,
+        }
+
+
+def server_deadlocks() -> int | None:
+    """pg_stat_database.deadlocks (server hisoblagichi); PostgreSQL emas — None."""
+    if connection.vendor != 'postgresql':
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_stat_clear_snapshot()")
+        cursor.execute("SELECT deadlocks FROM pg_stat_database WHERE datname = current_database()")
+        return cursor.fetchone()[0]
+
+
+# ============================================================
+# INVARIANTLAR
+# ============================================================
+
+def check_invariants(store_id: int) -> list:
+    """
+    Joy × mahsulot bo'yicha qoldiq izchilligi:
+      1. Stock.quantity == Σ IN − Σ OUT (harakatlar daftari), Stock.quantity ≥ 0
+      2. Partiya: 0 ≤ qty_left ≤ qty_received
+      3. Σ ochiq qty_left ≤ Stock.quantity ≤ Σ qty_left + partiyasiz kirimlar
+         (qaytarish / sotuvni bekor qilish partiya yaratmaydi; bunday kirim
+         bo'lmagan joyda — aniq tenglik)
+    Qaytaradi: buzilishlar ro'yxati (bo'sh — izchil).
+    """
+    from warehouse.models import MovementType, Stock, StockBatch, StockMovement
+
+    def by_key(rows, value):
+        # SQLite SUM(decimal) — float; maydon aniqligiga (3 xona) keltiriladi
+        return {
+            (row['branch_id'], row['warehouse_id'], row['product_id']): Decimal(str(row[value])).quantize(_QTY)
+            for row in rows
+        }
+
+    zero      = Decimal('0')
+    key_cols  = ('branch_id', 'warehouse_id', 'product_id')
+    stocks    = by_key(Stock.objects.filter(product__store_id=store_id).values(*key_cols, 'quantity'), 'quantity')
+    movements = StockMovement.objects.filter(product__store_id=store_id)
+    ledger    = by_key(
+        movements.values(*key_cols).annotate(
+            net=Sum('quantity', filter=Q(movement_type=MovementType.IN), default=zero)
+            - Sum('quantity', filter=Q(movement_type=MovementType.OUT), default=zero),
+        ),
+        'net',
+    )
+    unbatched = by_key(
+        movements.filter(movement_type=MovementType.IN, batch__isnull=True)
+        .values(*key_cols).annotate(qty=Sum('quantity')),
+        'qty',
+    )
+    batches   = StockBatch.objects.filter(product__store_id=store_id)
+    open_qty  = by_key(batches.values(*key_cols).annotate(left=Sum('qty_left')), 'left')
+
+    problems    = []
+    bad_batches = batches.filter(Q(qty_left__lt=0) | Q(qty_left__gt=F('qty_received')))
+    for batch_id, code, left, received in bad_batches.values_list('id', 'batch_code', 'qty_left', 'qty_received'):
+        left = Decimal(str(left)).quantize(_QTY)
+        if not 0 <= left <= received:
+            problems.append(f"partiya #{batch_id} {code}: qty_left {left}, qabul qilingan {received}")
+
+    for key in sorted(stocks.keys() | ledger.keys(), key=lambda item: tuple(x or 0 for x in item)):
+        branch_id, warehouse_id, product_id = key
+        where    = f"mahsulot #{product_id} {'filial' if branch_id else 'ombor'} #{branch_id or warehouse_id}"
+        quantity = stocks.get(key)
+        if quantity is None:
+            problems.append(f"{where}: Stock yo'q, harakatlar bo'yicha {ledger[key]}")
+            continue
+        if quantity != ledger.get(key, zero):
+            problems.append(f"{where}: Stock {quantity} ≠ harakatlar {ledger.get(key, zero)}")
+        if quantity < 0:
+            problems.append(f"{where}: manfiy qoldiq {quantity}")
+        left = open_qty.get(key, zero)
+        if not left <= quantity <= left + unbatched.get(key, zero):
+            problems.append(
+                f"{where}: Stock {quantity}, ochiq partiyalar {left}, partiyasiz kirim {unbatched.get(key, zero)}"
+            )
+    return problems
+
+
+
+# ============================================================
+# HARNESS
+# ============================================================
+
+class StressHarness:
+    """
+    prepare() — sintetik do'kon, limitsiz obuna, issiq SKU lar har joyda STOCK_UP
+    qoldiq bilan; run() — ishchilar muddat / ops tugaguncha aralash amallar
+    bajaradi, so'ng invariantlar va muvaffaqiyatli amallar soni tekshiriladi.
+    """
+
+    def __init__(self, shape=STRESS_SHAPE, seed: int = 42, mix: dict = None,
+                 hot: int = HOT_SKUS, basket: int = BASKET, log=None):
+        self.shape  = shape
+        self.seed   = seed
+        self.mix    = mix or dict(DEFAULT_MIX)
+        self.hot_n  = hot
+        self.basket = max(1, min(basket, hot))
+        self.log    = log or (lambda message: None)
+
+    # ----------------------------------------------------------
+    # Tayyorlash
+    # ----------------------------------------------------------
+
+    def prepare(self) -> dict:
+        from accaunt.models import Worker, WorkerRole
+        from store.models import Branch
+        from warehouse.models import MovementType, Product, Warehouse
+        from warehouse.movements import MovementLine, apply_movements
+
+        result        = TenantGenerator(self.shape, seed=self.seed, log=self.log).generate()[0]
+        self.store_id = result.store_id
+        subscribe_unlimited(self.store_id)
+
+        self.owner = Worker.objects.select_related('user', 'store').get(store_id=self.store_id, role=WorkerRole.OWNER)
+        branches   = list(Branch.objects.filter(store_id=self.store_id).order_by('id'))
+        warehouse  = (
+            Warehouse.objects.filter(store_id=self.store_id).order_by('id').first()
+            or Warehouse.objects.create(store_id=self.store_id, name='Stress: ombor')
+        )
+        products   = list(Product.objects.filter(store_id=self.store_id, status='active').order_by('id')[:self.hot_n])
+        if len(products) < self.hot_n:
+            raise StressError(f"{self.hot_n} ta issiq SKU kerak, faol mahsulotlar: {len(products)}")
+
+        self.branches  = [branch.id for branch in branches]
+        self.warehouse = warehouse.id
+        self.hot       = [(product.id, product.sale_price) for product in products]
+        self.weights   = [1 / (rank + 1) for rank in range(len(products))]      # Zipf (s=1)
+
+        locations = [{'branch': branch} for branch in branches] + [{'warehouse': warehouse}]
+        with transaction.atomic():
+            apply_movements([
+                MovementLine(product, MovementType.IN, STOCK_UP, unit_cost=UNIT_COST, **location)
+                for location in locations for product in products
+            ], self.owner.store, self.owner)
+
+        problems = check_invariants(self.store_id)
+        if problems:
+            raise StressError(f"Yuklamadan oldin nomuvofiqlik: {problems[:3]}")
+        self.log(f"Tayyorlandi: do'kon #{self.store_id}, {len(branches)} filial, "
+                 f"{len(products)} issiq SKU, {result.total:,} qator")
+        return {'store_id': self.store_id, 'rows': result.total}
+
+    # ----------------------------------------------------------
+    # Amallar — '' (muvaffaqiyat) yoki rad etish sababi (4xx)
+    # ----------------------------------------------------------
+
+    def _pick(self, rng, count: int) -> list:
+        chosen = {}
+        while len(chosen) < count:
+            product_id, price = rng.choices(self.hot, self.weights)[0]
+            chosen[product_id] = price
+        return list(chosen.items())
+
+    @staticmethod
+    def _send(client, method: str, url: str, data, expect: int):
+        response = getattr(client, method)(url, data, format='json')
+        if response.status_code == expect:
+            return response, ''
+        reason = f"{method.upper()} {url} → {response.status_code}: {response.content[:200].decode(errors='replace')}"
+        if 400 <= response.status_code < 500:
+            return None, reason
+        raise StressError(reason)
+
+    def _op_sale(self, client, rng) -> str:
+        items   = self._pick(rng, rng.randint(1, self.basket))
+        payload = {
+            'branch':       rng.choice(self.branches),
+            'payment_type': 'cash',
+            'paid_amount':  str(sum(price for _, price in items)),
+            'items':        [{'product': product_id, 'quantity': '1'} for product_id, _ in items],
+        }
+        return self._send(client, 'post', '/api/v1/sales/', payload, 201)[1]
+
+    def _op_return(self, client, rng) -> str:
+        payload = {
+            'branch': rng.choice(self.branches),
+            'reason': 'Stress',
+            'items':  [
+                {'product': product_id, 'quantity': '1', 'unit_price': str(price)}
+                for product_id, price in self._pick(rng, rng.randint(1, min(2, self.basket)))
+            ],
+        }
+        response, rejected = self._send(client, 'post', '/api/v1/sale-returns/', payload, 201)
+        if rejected:
+            return rejected
+        url = f"/api/v1/sale-returns/{response.data['data']['id']}/confirm/"
+        return self._send(client, 'patch', url, None, 200)[1]
+
+    def _op_transfer(self, client, rng) -> str:
+        branch  = rng.choice(self.branches)
+        payload = (
+            {'from_warehouse': self.warehouse, 'to_branch': branch} if rng.random() < 0.7
+            else {'from_branch': branch, 'to_warehouse': self.warehouse}
+        )
+        payload['items'] = [
+            {'product': product_id, 'quantity': '1'}
+            for product_id, _ in self._pick(rng, rng.randint(1, self.basket))
+        ]
+        response, rejected = self._send(client, 'post', '/api/v1/warehouse/transfers/', payload, 201)
+        if rejected:
+            return rejected
+        url = f"/api/v1/warehouse/transfers/{response.data['data']['id']}/confirm/"
+        return self._send(client, 'post', url, None, 200)[1]
+
+    def _op_receipt(self, client, rng) -> str:
+        location = {'warehouse': self.warehouse} if rng.random() < 0.7 else {'branch': rng.choice(self.branches)}
+        payload  = {
+            'product':       self._pick(rng, 1)[0][0],
+            'movement_type': 'in',
+            'quantity':      '10',
+            'unit_cost':     str(UNIT_COST),
+            **location,
+        }
+        return self._send(client, 'post', '/api/v1/warehouse/movements/', payload, 201)[1]
+
+    def _op_writeoff(self, client, rng) -> str:
+        payload = {
+            'product':       self._pick(rng, 1)[0][0],
+            'movement_type': 'out',
+            'quantity':      '1',
+            'branch':        rng.choice(self.branches),
+        }
+        return self._send(client, 'post', '/api/v1/warehouse/movements/', payload, 201)[1]
+
+    # ----------------------------------------------------------
+    # Ishchilar
+    # ----------------------------------------------------------
+
+    def _worker(self, index: int, start_at: float, duration: float, ops: float, lock_timeout: int) -> dict:
+        """Bitta kassir: o'z ulanishi, o'z JWT si, o'z tasodifiy ketma-ketligi."""
+        rng    = random.Random(self.seed * 1000 + index)
+        client = ApiClient(self.owner.user).api
+        timer  = LockTimer()
+        stats  = defaultdict(lambda: {'latency': [], 'lock': [], **dict.fromkeys(OUTCOMES, 0)})
+        notes  = []
+        names, weights = zip(*self.mix.items())
+
+        if lock_timeout and connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT set_config('lock_timeout', %s, false)", [f'{lock_timeout}ms'])
+
+        with connection.execute_wrapper(timer):
+            time.sleep(max(0.0, start_at - time.time()))
+            deadline, done = start_at + duration, 0
+            while done < ops and time.time() < deadline:
+                name   = rng.choices(names, weights)[0]
+                locked = timer.seconds
+                start  = time.perf_counter()
+                try:
+                    reason  = getattr(self, f'_op_{name}')(client, rng)
+                    outcome = 'rejected' if reason else 'ok'
+                except DatabaseError as exc:
+                    outcome, reason = classify(exc), f"{type(exc).__name__}: {exc}"
+                except StressError as exc:
+                    outcome, reason = 'error', str(exc)
+                elapsed = time.perf_counter() - start
+                entry   = stats[name]
+                entry[outcome] += 1
+                if outcome == 'ok':
+                    entry['latency'].append(elapsed)
+                    entry['lock'].append(timer.seconds - locked)
+                elif len(notes) < _MAX_NOTES:
+                    notes.append(f"{name} [{outcome}] {reason[:300]}")
+                done += 1
+        return {'ops': {name: dict(entry) for name, entry in stats.items()}, 'notes': notes}
+
+    def _spawn(self, workers: int, duration: float, ops: float, mode: str, lock_timeout: int) -> tuple:
+        """Ishchilarni bir vaqtda boshlaydi (umumiy start_at). → (natijalar, start_at)"""
+        start_at = time.time() + 0.5 + 0.05 * workers
+        args     = (start_at, duration, ops, lock_timeout)
+
+        def run(index):
+            try:
+                return self._worker(index, *args)
+            except Exception as exc:
+                return {'failed': f"{type(exc).__name__}: {exc}"}
+            finally:
+                connection.close()
+
+        if mode == 'thread':
+            results = [None] * workers
+
+            def target(index):
+                results[index] = run(index)
+
+            threads = [threading.Thread(target=target, args=(index,)) for index in range(workers)]
+        else:
+            context = multiprocessing.get_context('fork')
+            queue   = context.Queue()
+            connections.close_all()              # fork — ota ulanishlari bolaga o'tmasin
+            threads = [context.Process(target=lambda index: queue.put(run(index)), args=(index,))
+                       for index in range(workers)]
+
+        for thread in threads:
+            thread.start()
+        if mode != 'thread':
+            results = [queue.get() for _ in threads]
+        for thread in threads:
+            thread.join()
+        return results, start_at
+
+    # ----------------------------------------------------------
+    # Ishga tushirish
+    # ----------------------------------------------------------
+
+    def _counts(self) -> dict:
+        from trade.models import Sale, SaleReturn, SaleReturnStatus
+        from warehouse.models import Transfer, TransferStatus
+
+        return {
+            'sale':     Sale.objects.filter(store_id=self.store_id).count(),
+            'return':   SaleReturn.objects.filter(store_id=self.store_id, status=SaleReturnStatus.CONFIRMED).count(),
+            'transfer': Transfer.objects.filter(store_id=self.store_id, status=TransferStatus.CONFIRMED).count(),
+        }
+
+    def run(self, workers: int = 8, duration: float = 30.0, ops: int = None,
+            mode: str = 'thread', lock_timeout: int = 0) -> dict:
+        """
+        workers ta ishchi duration soniya (yoki har biri ops ta amal — qaysi oldin).
+        workers=1, mode='thread' — joriy oqimda (testlar, SQLite). → hisobot dict
+        """
+        from django.utils import timezone
+
+        if workers > 1 and connection.vendor != 'postgresql':
+            raise StressError(f"{connection.vendor}: parallel yuklama faqat PostgreSQL da (workers=1 ishlating).")
+        if mode == 'process' and 'fork' not in multiprocessing.get_all_start_methods():
+            raise StressError("process rejimi fork talab qiladi (Linux).")
+        if not duration and not ops:
+            raise StressError("duration yoki ops berilishi kerak.")
+        duration = duration or float('inf')
+        limit    = ops or float('inf')
+
+        before    = self._counts()
+        deadlocks = server_deadlocks()
+        sampler   = LockSampler() if workers > 1 and connection.vendor == 'postgresql' else None
+
+        # Deadlock / 5xx har biri django.request ga traceback yozadi — hisobotda sanaladi
+        request_log = logging.getLogger('django.request')
+        log_level   = request_log.level
+        request_log.setLevel(logging.CRITICAL)
+        try:
+            if sampler:
+                sampler.start()
+            if workers == 1 and mode == 'thread':
+                start_at = time.time()
+                results  = [self._worker(0, start_at, duration, limit, lock_timeout)]
+            else:
+                results, start_at = self._spawn(workers, duration, limit, mode, lock_timeout)
+            elapsed = max(time.time() - start_at, 1e-9)
+        finally:
+            request_log.setLevel(log_level)
+            locks = sampler.stop() if sampler else {}
+
+        failed = [result['failed'] for result in results if 'failed' in result]
+        if failed:
+            raise StressError(f"{len(failed)} ta ishchi ishga tushmadi: {failed[0]}")
+
+        merged = defaultdict(lambda: {'latency': [], 'lock': [], **dict.fromkeys(OUTCOMES, 0)})
+        notes  = []
+        for result in results:
+            notes += result['notes']
+            for name, entry in result['ops'].items():
+                for key, value in entry.items():
+                    merged[name][key] += value
+        operations = {name: _summarize_op(entry, elapsed) for name, entry in sorted(merged.items())}
+
+        # Har muvaffaqiyatli amal bazada aynan bir marta (yo'qolgan / ikki marta yozilgan yo'q)
+        after    = self._counts()
+        problems = [
+            f"{name}: muvaffaqiyatli {operations.get(name, {}).get('ok', 0)}, bazada {after[name] - before[name]}"
+            for name in after if after[name] - before[name] != operations.get(name, {}).get('ok', 0)
+        ]
+        problems += check_invariants(self.store_id)
+
+        totals = {
+            'attempts':       sum(op['attempts'] for op in operations.values()),
+            **{outcome: sum(op[outcome] for op in operations.values()) for outcome in OUTCOMES},
+            'elapsed_s':      round(elapsed, 2),
+            **locks,
+        }
+        totals['throughput_ops'] = round(totals['ok'] / elapsed, 2)
+        if deadlocks is not None:
+            totals['server_deadlocks'] = server_deadlocks() - deadlocks
+        return {
+            'meta': {
+                **environment(),
+                'created':         timezone.now().isoformat(timespec='seconds'),
+                'workers':         workers,
+                'mode':            mode,
+                'duration_s':      None if duration == float('inf') else duration,
+                'ops_per_worker':  ops,
+                'lock_timeout_ms': lock_timeout,
+                'hot_skus':        len(self.hot),
+                'basket':          self.basket,
+                'mix':             self.mix,
+                'seed':            self.seed,
+                'shape':           asdict(self.shape),
+            },
+            'operations': operations,
+            'totals':     totals,
+            'notes':      notes[:20],
+            'invariants': problems,
+        }
+
+
+def _summarize_op(entry: dict, elapsed: float) -> dict:
+    summary = {outcome: entry[outcome] for outcome in OUTCOMES}
+    summary['attempts']       = sum(summary.values())
+    summary['throughput_ops'] = round(entry['ok'] / elapsed, 2)
+    if entry['latency']:
+        ordered = sorted(entry['latency'])
+        locks   = sorted(entry['lock'])
+        summary.update({
+            'p50_ms':       round(percentile(ordered, 0.50) * 1000, 2),
+            'p95_ms':       round(percentile(ordered, 0.95) * 1000, 2),
+            'p99_ms':       round(percentile(ordered, 0.99) * 1000, 2),
+            'lock_ms_mean': round(sum(locks) / len(locks) * 1000, 2),
+            'lock_ms_p95':  round(percentile(locks, 0.95) * 1000, 2),
+        })
+    return summary
+
+
+def compare_runs(current: dict, baseline: dict) -> list:
+    """Ikki hisobot farqi (o'qish uchun): [(metrika, baseline, joriy), ...]."""
+    rows = [
+        (f'totals.{key}', baseline['totals'].get(key), current['totals'].get(key))
+        for key in ('throughput_ops', 'deadlock', 'lock_timeout', 'error', 'lock_wait_s', 'max_lock_waiters')
+    ]
+    for name, op in current['operations'].items():
+        base = baseline['operations'].get(name, {})
+        rows += [(f'{name}.{key}', base.get(key), op.get(key)) for key in ('p95_ms', 'lock_ms_p95', 'deadlock')]
+    return [row for row in rows if row[1] is not None or row[2] is not None]
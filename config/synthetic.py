@@ -0,0 +1,1068 @@
+"""
+============================================================
+CONFIG — Sintetik tenant ma'lumotlari generatori
+============================================================
+Klasslar / funksiyalar:
+  TenantShape          — bitta do'kon "shakli" (filiallar, omborlar, katalog, sotuvlar, davr ...)
+  PRESETS              — tayyor shakllar: tiny | small | medium | large (~10M qator)
+  estimate_rows(shape) — taxminiy qatorlar soni (generatsiyadan oldin ko'rsatiladi)
+  TenantGenerator      — generate(): do'konlarni birma-bir quradi → [GeneratedStore]
+
+Buyruq: python manage.py generate_tenants (store/management/commands/generate_tenants.py)
+
+Takrorlanuvchanlik:
+  Har do'kon o'z random.Random(f"{seed}-{n}") generatoriga ega — bir xil seed + shakl
+  bir xil ma'lumot beradi (id lar va barcode dagi do'kon raqamidan tashqari);
+  do'konlar soni oldingi do'konlar ma'lumotiga ta'sir qilmaydi.
+
+Model (kunma-kun, vaqt tartibida — kecha bilan tugaydi):
+  Ochilish   — omborlarga har mahsulot yetkazib beruvchidan kirim (StockMovement IN +
+               StockBatch + SupplierLedgerEntry), filiallarga eng mashhur 60% — Transfer
+  Kun boshi  — navbatdagi hodisalar: nasiya to'lovlari (FIFO taqsimot), qaytarishlar;
+               haftada bir — yetkazib beruvchilarga to'lov (ochiq kirimlar FIFO yopiladi);
+               xarajatlar
+  Sotuvlar   — hafta kuni bo'yicha ko'p/kam; filial vazni; savatda 1–10 mahsulot
+               (ko'pi 1–3); mahsulot mashhurligi Zipf; to'lov: naqd 55%, karta 30%,
+               aralash 8%, nasiya 7%; har qator — SaleItem + StockMovement(OUT, FIFO tannarx)
+  Kun oxiri  — qoldig'i buyurtma nuqtasidan tushgan mahsulotlar filial bo'yicha bitta
+               Transfer bilan to'ldiriladi (ombor yetmasa — avval ombor kirimi).
+               Kun ichida yetmay qolsa — shoshilinch transfer (sotuvdan oldin; filialning
+               buyurtma nuqtasidan tushgan boshqa mahsulotlari ham qo'shiladi)
+
+Invariantlar (testlar tekshiradi):
+  Stock.quantity == Σ IN − Σ OUT (joy + mahsulot); 0 ≤ StockBatch.qty_left ≤ qty_received
+  Supplier.debt_balance == Σ daftar; Customer.debt_balance == oxirgi daftar balance ==
+  Σ Sale.debt_open; CustomerStats, StoreUsage — yakunda to'liq
+
+Yozish:
+  Id lar oldindan ajratiladi (_Ids) — bog'lanishlar Python da, bazadan id qaytishi kutilmaydi.
+  PostgreSQL — COPY FROM STDIN (batch_size qatordan), boshqalar — bulk_create.
+  Holati oxirigacha o'zgaradigan qatorlar (Stock, StockBatch, Supplier + daftari, Customer,
+  nasiya sotuvlari) xotirada yuritiladi va do'kon yakunida yoziladi. Har do'kon — bitta
+  tranzaksiya (FK lar DEFERRABLE — yozish tartibi ahamiyatsiz).
+  Signal yuborilmaydi: StoreUsage — recount(), CustomerStats — xotiradan.
+
+⚠️ Faqat dev / staging bazada: PostgreSQL id bloklari setval bilan olinadi, SQLite da
+   MAX(id) dan davom etiladi — parallel yozuvchilar bilan ishlatilmaydi.
+"""
+
+import heapq
+import io
+import itertools
+import json
+import math
+import random
+import sys
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from accaunt.models import ROLE_PERMISSIONS, CustomUser, Worker, WorkerRole, WorkerStatus
+from config.search_utils import normalize_search_text
+from expense.models import Expense, ExpenseCategory
+from store.models import Branch, Store, StoreStatus
+from subscription.usage import recount
+from trade.models import (
+    Customer,
+    CustomerGroup,
+    CustomerLedgerEntry,
+    CustomerPayment,
+    CustomerPaymentAllocation,
+    CustomerPaymentType,
+    CustomerStats,
+    LedgerEntryType,
+    PaymentType,
+    Sale,
+    SaleItem,
+    SaleReturn,
+    SaleReturnItem,
+    SaleReturnStatus,
+    SaleStatus,
+)
+from warehouse.models import (
+    ActiveStatus,
+    Category,
+    MovementType,
+    Product,
+    ProductUnit,
+    Stock,
+    StockBatch,
+    StockMovement,
+    SubCategory,
+    Supplier,
+    SupplierLedgerEntry,
+    SupplierLedgerEntryType,
+    SupplierPayment,
+    SupplierPaymentType,
+    Transfer,
+    TransferItem,
+    TransferStatus,
+    Warehouse,
+)
+from warehouse.utils import allocate_barcodes
+
+
+# ============================================================
+# SHAKL
+# ============================================================
+
+@dataclass(frozen=True)
+class TenantShape:
+    """Bitta do'kon hajmi; stores — nechta shunday do'kon."""
+    stores:         int   = 1
+    branches:       int   = 3        # do'kon boshiga
+    warehouses:     int   = 1        # 0 — filiallar yetkazib beruvchidan to'g'ridan-to'g'ri oladi
+    sellers:        int   = 2        # filial boshiga
+    categories:     int   = 20
+    subcategories:  int   = 4        # kategoriya boshiga
+    products:       int   = 2_000
+    customers:      int   = 1_000
+    suppliers:      int   = 20
+    sales:          int   = 20_000   # do'kon boshiga, butun davr
+    days:           int   = 90
+    customer_share: float = 0.3      # mijoz biriktirilgan sotuvlar (nasiyadan tashqari)
+    return_rate:    float = 0.02     # qaytariladigan sotuvlar (nasiyasizlardan)
+    repay_rate:     float = 0.7      # to'lanadigan nasiya sotuvlar
+    expense_rate:   float = 0.4      # filial-kun boshiga xarajat ehtimoli
+
+
+PRESETS = {
+    'tiny':   TenantShape(branches=2, sellers=1, categories=4, subcategories=2, products=60,
+                          customers=30, suppliers=3, sales=300, days=14),
+    'small':  TenantShape(),
+    'medium': TenantShape(stores=2, branches=5, warehouses=2, sellers=3, categories=40, subcategories=5,
+                          products=20_000, customers=10_000, suppliers=60, sales=200_000, days=365),
+    'large':  TenantShape(stores=3, branches=10, warehouses=3, sellers=4, categories=80, subcategories=6,
+                          products=50_000, customers=30_000, suppliers=150, sales=500_000, days=730),
+}
+
+# Savatdagi mahsulotlar soni: 1..10 (og'irliklar — kassa cheklari taqsimotiga yaqin)
+ITEM_COUNTS  = tuple(range(1, 11))
+ITEM_WEIGHTS = (30, 22, 15, 10, 7, 5, 4, 3, 2, 2)
+MEAN_ITEMS   = sum(n * w for n, w in zip(ITEM_COUNTS, ITEM_WEIGHTS)) / sum(ITEM_WEIGHTS)
+
+PAYMENT_MIX = (
+    (PaymentType.CASH,  55),
+    (PaymentType.CARD,  30),
+    (PaymentType.MIXED, 8),
+    (PaymentType.DEBT,  7),
+)
+PAYMENT_TYPES = tuple(kind for kind, _ in PAYMENT_MIX)
+PAYMENT_CUM   = tuple(itertools.accumulate(weight for _, weight in PAYMENT_MIX))
+
+# Dushanba..yakshanba (o'rtacha 1)
+WEEKDAY_FACTORS = (0.9, 0.9, 0.95, 1.0, 1.1, 1.2, 0.95)
+
+OPEN_SECONDS  = 9 * 3600        # 09:00
+CLOSE_SECONDS = 21 * 3600       # 21:00
+WEIGHT_SHARE  = 0.12            # kg da sotiladigan mahsulotlar ulushi
+ASSORTMENT    = 0.6             # ochilishda filialga olib kelinadigan eng mashhur mahsulotlar
+
+_FIRST_NAMES = [
+    'Aziz', 'Bekzod', 'Dilshod', 'Jasur', 'Otabek', 'Sardor', 'Sherzod', 'Ulug\'bek',
+    'Anvar', 'Rustam', 'Nodira', 'Dilnoza', 'Gulnora', 'Madina', 'Malika', 'Shahnoza',
+    'Zarina', 'Kamola', 'Feruza', 'Sevara',
+]
+_LAST_NAMES = [
+    'Karimov', 'Rahimov', 'Toshmatov', 'Yusupov', 'Aliyev', 'Ergashev', 'Saidov',
+    'Nazarov', 'Qodirov', 'Xolmatov', 'Abdullayev', 'Mirzayev', 'Sobirov', 'Hamidov',
+]
+_STREETS = ['Amir Temur', 'Navoiy', 'Bobur', 'Mustaqillik', 'Chilonzor', 'Yunusobod', 'Buyuk Ipak Yo\'li']
+_CATEGORIES = [
+    'Ichimliklar', 'Sut mahsulotlari', 'Non mahsulotlari', 'Go\'sht', 'Shirinliklar',
+    'Yog\'lar', 'Don mahsulotlari', 'Konservalar', 'Choy va qahva', 'Maishiy kimyo',
+    'Gigiyena', 'Meva', 'Sabzavot', 'Muzlatilgan', 'Bolalar uchun', 'Ziravorlar',
+    'Tamaki', 'Uy jihozlari', 'Kantselyariya', 'Hayvonlar uchun',
+]
+_SUBCATEGORIES = ['Mahalliy', 'Import', 'Premium', 'Ekonom', 'Ulgurji', 'Klassik', 'Yangi', 'Aksiya']
+_PRODUCT_WORDS = [
+    'coca', 'cola', 'pepsi', 'fanta', 'choy', 'qahva', 'shakar', 'un', 'guruch', 'yog',
+    'sut', 'qatiq', 'non', 'tuxum', 'kolbasa', 'pishloq', 'sovun', 'shampun', 'pasta',
+    'salfetka', 'konfet', 'shokolad', 'pechenye', 'sharbat', 'suv', 'makaron', 'tuz',
+]
+_SIZES    = ['0.5L', '1L', '1.5L', '2L', '100g', '250g', '500g', '1kg', '5kg']
+_COMPANIES = ['Asia Trade', 'Orient Food', 'Baraka', 'Silk Road', 'Navro\'z', 'Samarqand Savdo', 'Farg\'ona Agro']
+_RETURN_REASONS = ['Sifatsiz', 'Muddati o\'tgan', 'Mijoz fikridan qaytdi', 'Noto\'g\'ri mahsulot']
+
+# nom → (minimal, maksimal summa, ehtimol og'irligi)
+_EXPENSE_CATEGORIES = {
+    'Ijara':     (3_000_000, 15_000_000, 1),
+    'Kommunal':  (300_000,   2_500_000,  3),
+    'Maosh':     (2_000_000, 8_000_000,  2),
+    'Transport': (50_000,    600_000,    6),
+    'Boshqa':    (20_000,    400_000,    8),
+}
+
+_CUSTOMER_GROUPS = (('Oddiy', 0), ('Doimiy', 3), ('VIP', 5))
+
+
+def estimate_rows(shape: TenantShape) -> int:
+    """Taxminiy qatorlar soni (barcha do'konlar): restock va qaytarishlar o'rtacha olinadi."""
+    staff     = 2 + shape.branches * shape.sellers
+    reference = (
+        shape.branches + shape.warehouses + staff * 2
+        + shape.categories * (1 + shape.subcategories)
+        + shape.products + shape.suppliers + shape.customers * 2
+    )
+    locations = shape.warehouses or shape.branches
+    opening   = shape.products * locations * 4
+    items     = shape.sales * MEAN_ITEMS
+    sales     = shape.sales + items * 2 + items * 0.25          # + restock transferlari
+    returns   = shape.sales * shape.return_rate * 3
+    debts     = shape.sales * 0.07 * (1 + shape.repay_rate * 3)
+    expenses  = shape.days * shape.branches * shape.expense_rate
+    return int(shape.stores * (reference + opening + sales + returns + debts + expenses))
+
+
+@dataclass
+class GeneratedStore:
+    store_id: int
+    name:     str
+    rows:     dict = field(default_factory=dict)     # model nomi → qatorlar soni
+    seconds:  float = 0.0
+
+    @property
+    def total(self) -> int:
+        return sum(self.rows.values())
+
+
+# ============================================================
+# YOZISH QATLAMI
+# ============================================================
+
+class _Ids:
+    """
+    Oldindan ajratilgan primary key lar — qatorlar bir-biriga Python da bog'lanadi
+    (COPY id qaytarmaydi). PostgreSQL — sekvensiyadan block ta (setval), boshqalar —
+    MAX(id) dan ketma-ket.
+    """
+
+    def __init__(self, block: int = 10_000):
+        self.block = block
+        self.pools = {}                    # model → [keyingi, oxirgi]
+
+    def __call__(self, model) -> int:
+        pool = self.pools.get(model)
+        if pool is None or pool[0] > pool[1]:
+            pool = self.pools[model] = self._reserve(model)
+        value    = pool[0]
+        pool[0] += 1
+        return value
+
+    def _reserve(self, model) -> list:
+        if connection.vendor == 'postgresql':
+            table = model._meta.db_table
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT setval(pg_get_serial_sequence(%s, 'id'), "
+                    "nextval(pg_get_serial_sequence(%s, 'id')) + %s - 1)",
+                    [table, table, self.block],
+                )
+                last = cursor.fetchone()[0]
+            return [last - self.block + 1, last]
+        start = (model.objects.aggregate(last=Max('pk'))['last'] or 0) + 1
+        return [start, sys.maxsize]
+
+
+@contextmanager
+def _explicit_dates(model):
+    """bulk_create da auto_now / auto_now_add berilgan vaqtni bosib ketmasin."""
+    fields = [f for f in model._meta.concrete_fields if getattr(f, 'auto_now', False) or getattr(f, 'auto_now_add', False)]
+    saved  = [(f, f.auto_now, f.auto_now_add) for f in fields]
+    for f in fields:
+        f.auto_now = f.auto_now_add = False
+    try:
+        yield
+    finally:
+        for f, auto_now, auto_now_add in saved:
+            f.auto_now, f.auto_now_add = auto_now, auto_now_add
+
+
+def _copy_value(value) -> str:
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (list, dict)):
+        value = json.dumps(value)
+    elif not isinstance(value, str):
+        return str(value)
+    return value.replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n').replace('\r', '\\r')
+
+
+class _Writer:
+    """Bitta model uchun bufer: to'lganda COPY (PostgreSQL) yoki bulk_create."""
+
+    def __init__(self, model, fields: tuple, use_copy: bool, batch_size: int):
+        meta    = model._meta
+        missing = [
+            f.attname for f in meta.concrete_fields
+            if not f.null and f.attname not in fields
+        ]
+        if missing:
+            # COPY da tushib qolgan NOT NULL ustun — DB xatosi; bulk_create da sezilmaydi
+            raise ValueError(f"{meta.label}: majburiy maydonlar berilmagan: {missing}")
+        self.model      = model
+        self.fields     = fields
+        self.use_copy   = use_copy
+        self.batch_size = batch_size
+        self.rows       = []
+        self.written    = 0
+        self.sql        = 'COPY {} ({}) FROM STDIN'.format(
+            connection.ops.quote_name(meta.db_table),
+            ', '.join(connection.ops.quote_name(meta.get_field(name).column) for name in fields),
+        )
+
+    def add(self, row) -> None:
+        self.rows.append(row)
+        if len(self.rows) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self.rows:
+            return
+        if self.use_copy:
+            self._copy()
+        else:
+            with _explicit_dates(self.model):
+                self.model.objects.bulk_create(
+                    [self.model(**dict(zip(self.fields, row))) for row in self.rows],
+                    batch_size=self.batch_size,
+                )
+        self.written += len(self.rows)
+        self.rows     = []
+
+    def _copy(self) -> None:
+        buffer = io.StringIO()
+        for row in self.rows:
+            buffer.write('\t'.join(_copy_value(value) for value in row))
+            buffer.write('\n')
+        with connection.cursor() as cursor:
+            raw = cursor.cursor
+            if hasattr(raw, 'copy_expert'):          # psycopg2
+                buffer.seek(0)
+                raw.copy_expert(self.sql, buffer)
+            else:                                    # psycopg 3
+                with raw.copy(self.sql) as copy:
+                    copy.write(buffer.getvalue())
+
+
+_FIELDS = {
+    Branch:          ('id', 'store_id', 'name', 'address', 'phone', 'status', 'created_on'),
+    Warehouse:       ('id', 'name', 'address', 'store_id', 'status', 'created_on'),
+    CustomUser:      ('id', 'password', 'last_login', 'is_superuser', 'username', 'first_name', 'last_name',
+                      'email', 'is_staff', 'is_active', 'date_joined', 'phone1', 'phone2', 'status', 'created_on'),
+    Worker:          ('id', 'user_id', 'role', 'store_id', 'branch_id', 'salary', 'status', 'permissions',
+                      'created_on'),
+    Category:        ('id', 'name', 'description', 'store_id', 'status', 'created_on'),
+    SubCategory:     ('id', 'name', 'description', 'category_id', 'store_id', 'status', 'created_on'),
+    Product:         ('id', 'name', 'search_name', 'category_id', 'subcategory_id', 'unit', 'purchase_price',
+                      'sale_price', 'price_currency_id', 'barcode', 'image', 'store_id', 'status', 'created_on'),
+    Supplier:        ('id', 'store_id', 'name', 'phone', 'company', 'address', 'debt_balance', 'description',
+                      'status', 'created_on', 'updated_on'),
+    CustomerGroup:   ('id', 'name', 'discount', 'store_id', 'created_on'),
+    Customer:        ('id', 'name', 'search_name', 'phone', 'address', 'debt_balance', 'group_id', 'store_id',
+                      'status', 'created_on'),
+    CustomerStats:   ('customer_id', 'purchase_count', 'total_spent', 'returned_amount', 'last_purchase_on',
+                      'updated_on'),
+    ExpenseCategory: ('id', 'name', 'store_id', 'status', 'created_on'),
+    Expense:         ('id', 'category_id', 'branch_id', 'store_id', 'worker_id', 'smena_id', 'amount',
+                      'description', 'date', 'receipt_image', 'created_on'),
+    Stock:           ('id', 'product_id', 'branch_id', 'warehouse_id', 'quantity', 'updated_on'),
+    StockMovement:   ('id', 'product_id', 'branch_id', 'warehouse_id', 'movement_type', 'quantity', 'unit_cost',
+                      'description', 'worker_id', 'supplier_id', 'created_on'),
+    StockBatch:      ('id', 'batch_code', 'product_id', 'branch_id', 'warehouse_id', 'unit_cost', 'qty_received',
+                      'qty_left', 'movement_id', 'store_id', 'received_at'),
+    SupplierPayment: ('id', 'supplier_id', 'amount', 'payment_type', 'description', 'smena_id', 'worker_id',
+                      'created_on'),
+    SupplierLedgerEntry: ('id', 'store_id', 'supplier_id', 'entry_type', 'amount', 'balance', 'open_amount',
+                          'movement_id', 'payment_id', 'description', 'created_on'),
+    Transfer:        ('id', 'from_branch_id', 'from_warehouse_id', 'to_branch_id', 'to_warehouse_id', 'store_id',
+                      'worker_id', 'status', 'description', 'confirmed_at', 'created_on'),
+    TransferItem:    ('id', 'transfer_id', 'product_id', 'quantity', 'description'),
+    Sale:            ('id', 'branch_id', 'store_id', 'worker_id', 'customer_id', 'smena_id', 'payment_type',
+                      'total_price', 'discount_amount', 'paid_amount', 'cash_amount', 'card_amount', 'debt_amount',
+                      'debt_open', 'status', 'description', 'created_on'),
+    SaleItem:        ('id', 'sale_id', 'product_id', 'quantity', 'original_price', 'item_discount_pct',
+                      'item_discount_amt', 'unit_price', 'total_price', 'unit_cost'),
+    SaleReturn:      ('id', 'sale_id', 'branch_id', 'store_id', 'worker_id', 'customer_id', 'smena_id', 'reason',
+                      'total_amount', 'status', 'created_on'),
+    SaleReturnItem:  ('id', 'sale_return_id', 'product_id', 'quantity', 'unit_price', 'total_price'),
+    CustomerPayment: ('id', 'store_id', 'customer_id', 'amount', 'payment_type', 'description', 'smena_id',
+                      'worker_id', 'created_on'),
+    CustomerPaymentAllocation: ('id', 'payment_id', 'sale_id', 'amount'),
+    CustomerLedgerEntry: ('id', 'store_id', 'customer_id', 'entry_type', 'amount', 'balance', 'sale_id',
+                          'sale_return_id', 'payment_id', 'worker_id', 'description', 'created_on'),
+}
+
+# Oxirigacha o'zgaradigan qatorlardagi indekslar
+_SALE_DEBT_OPEN = _FIELDS[Sale].index('debt_open')
+_BATCH_LEFT     = _FIELDS[StockBatch].index('qty_left')
+_BATCH_RECEIVED = _FIELDS[StockBatch].index('qty_received')
+_LEDGER_OPEN    = _FIELDS[SupplierLedgerEntry].index('open_amount')
+
+
+def _qty(milli: int) -> Decimal:
+    """Miqdorlar ichkarida butun mingdan birlarda (kg → g) — Decimal faqat yozishda."""
+    return Decimal(milli).scaleb(-3)
+
+
+def _zipf_cum(n: int, exponent: float, rng: random.Random) -> tuple:
+    """Tasodifiy tartibdagi Zipf og'irliklari → (indekslar, kumulyativ og'irliklar, ulushlar)."""
+    order   = list(range(n))
+    rng.shuffle(order)
+    weights = [0.0] * n
+    for rank, index in enumerate(order):
+        weights[index] = 1 / (rank + 1) ** exponent
+    total = sum(weights)
+    return order, tuple(itertools.accumulate(weights)), [w / total for w in weights]
+
+
+# ============================================================
+# GENERATOR
+# ============================================================
+
+class TenantGenerator:
+    """
+    shape bo'yicha shape.stores ta do'kon. use_copy=None — PostgreSQL da COPY.
+    password=None — kirib bo'lmaydigan parol (impersonatsiya / token bilan ishlatiladi).
+    log(message) — jarayon haqida qisqa xabarlar.
+    """
+
+    def __init__(self, shape: TenantShape, seed: int = 42, use_copy: bool | None = None,
+                 batch_size: int = 10_000, password: str | None = None, log=None):
+        self.shape      = shape
+        self.seed       = seed
+        self.use_copy   = connection.vendor == 'postgresql' if use_copy is None else use_copy
+        self.batch_size = batch_size
+        self.password   = make_password(password)        # bitta hash — barcha foydalanuvchilarga
+        self.log        = log or (lambda message: None)
+        self.ids        = _Ids()
+
+    def generate(self) -> list:
+        results = []
+        for index in range(self.shape.stores):
+            started = time.perf_counter()
+            with transaction.atomic():
+                result = _StoreBuilder(self, index).build()
+            if connection.vendor == 'postgresql':
+                with connection.cursor() as cursor:
+                    cursor.execute('ANALYZE')
+            result.seconds = time.perf_counter() - started
+            results.append(result)
+        return results
+
+
+class _StoreBuilder:
+    """Bitta do'kon: ma'lumotnomalar → ochilish qoldig'i → kunma-kun tarix → yakuniy holat."""
+
+    def __init__(self, generator: TenantGenerator, index: int):
+        self.g       = generator
+        self.shape   = generator.shape
+        self.ids     = generator.ids
+        self.rng     = random.Random(f'{generator.seed}-{index}')
+        self.index   = index
+        self.out     = {
+            model: _Writer(model, fields, generator.use_copy, generator.batch_size)
+            for model, fields in _FIELDS.items()
+        }
+        self.events  = []                    # (vaqt, tartib, funksiya, argumentlar)
+        self.counter = itertools.count()
+        self.days    = {}                    # sana → yarim tun (aware)
+
+        self.lots          = {}              # ((branch_id, warehouse_id), p) → _Lot
+        self.batch_rows    = []
+        self.batch_seq     = {}              # sana → shu kungi oxirgi partiya raqami
+        self.low           = {}              # branch_id → {p} (buyurtma nuqtasidan past)
+        self.sup_balance   = []
+        self.sup_open      = []              # supplier → deque(ochiq kirim yozuvlari)
+        self.sup_ledger    = []
+        self.cust_balance  = []
+        self.cust_open     = []              # customer → deque([sale_id, ochiq, sale_row])
+        self.cust_stats    = {}              # customer → [soni, summa, qaytarilgan, oxirgi]
+        self.debt_sales    = []
+
+    # ----------------------------------------------------------
+    # Yordamchilar
+    # ----------------------------------------------------------
+
+    def put(self, model, row) -> None:
+        self.out[model].add(row)
+
+    def _at(self, day: date, seconds: int) -> datetime:
+        midnight = self.days.get(day)
+        if midnight is None:
+            midnight = self.days[day] = timezone.make_aware(datetime.combine(day, datetime.min.time()))
+        return midnight + timedelta(seconds=seconds)
+
+    def _schedule(self, when: datetime, func, *args) -> None:
+        if when < self.now:
+            heapq.heappush(self.events, (when, next(self.counter), func, args))
+
+    def _phone(self) -> str:
+        return f"+99890{self.rng.randrange(10 ** 7):07d}"
+
+    def _person(self) -> tuple:
+        return self.rng.choice(_FIRST_NAMES), self.rng.choice(_LAST_NAMES)
+
+    # ----------------------------------------------------------
+    # Asosiy tartib
+    # ----------------------------------------------------------
+
+    def build(self) -> GeneratedStore:
+        shape          = self.shape
+        self.now       = timezone.now()
+        self.first_day = timezone.localdate() - timedelta(days=shape.days)
+        self.opened    = self._at(self.first_day - timedelta(days=1), 8 * 3600)
+
+        self._store()
+        self._staff()
+        self._catalog()
+        self._opening_stock()
+        self._history()
+        self._finish()
+
+        return GeneratedStore(
+            store_id = self.store.id,
+            name     = self.store.name,
+            rows     = {model.__name__: writer.written for model, writer in self.out.items() if writer.written},
+        )
+
+    def _store(self) -> None:
+        # ORM orqali — signallar StoreSettings va trial obunani yaratadi
+        self.store = Store.objects.create(
+            name    = f"Sintetik do'kon {self.g.seed}-{self.index + 1}",
+            address = f"{self.rng.choice(_STREETS)} ko'chasi, {self.rng.randint(1, 120)}",
+            phone   = self._phone(),
+        )
+        Store.objects.filter(pk=self.store.id).update(created_on=self.opened)
+        self.g.log(f"Do'kon #{self.store.id} '{self.store.name}'")
+
+    def _staff(self) -> None:
+        shape, rng, store_id = self.shape, self.rng, self.store.id
+        usernames = itertools.count(1)
+
+        def worker(role: str, branch_id) -> int:
+            user_id    = self.ids(CustomUser)
+            username   = f"syn{store_id}_{next(usernames)}"
+            first, last = self._person()
+            self.put(CustomUser, (
+                user_id, self.g.password, None, False, username, first, last,
+                f"{username}@synthetic.local", False, True, self.opened, self._phone(), None, True, self.opened,
+            ))
+            worker_id = self.ids(Worker)
+            self.put(Worker, (
+                worker_id, user_id, role, store_id, branch_id, rng.randrange(3_000_000, 9_000_000, 100_000),
+                WorkerStatus.ACTIVE, list(ROLE_PERMISSIONS[role]), self.opened,
+            ))
+            return worker_id
+
+        self.branch_ids = []
+        for n in range(shape.branches):
+            branch_id = self.ids(Branch)
+            self.put(Branch, (
+                branch_id, store_id, f"Filial {n + 1}",
+                f"{rng.choice(_STREETS)} ko'chasi, {rng.randint(1, 120)}", self._phone(),
+                StoreStatus.ACTIVE, self.opened,
+            ))
+            self.branch_ids.append(branch_id)
+        self.branch_cum = tuple(itertools.accumulate(rng.uniform(0.6, 1.4) for _ in self.branch_ids))
+
+        self.warehouse_ids = []
+        for n in range(shape.warehouses):
+            warehouse_id = self.ids(Warehouse)
+            self.put(Warehouse, (
+                warehouse_id, f"Ombor {n + 1}", f"{rng.choice(_STREETS)} ko'chasi, {rng.randint(1, 120)}",
+                store_id, ActiveStatus.ACTIVE, self.opened,
+            ))
+            self.warehouse_ids.append(warehouse_id)
+        # Filial → uni ta'minlaydigan ombor; ombor → nechta filialni ta'minlaydi
+        self.supplying = {
+            branch_id: self.warehouse_ids[n % len(self.warehouse_ids)]
+            for n, branch_id in enumerate(self.branch_ids)
+        } if self.warehouse_ids else {}
+        self.served = {w: max(1, list(self.supplying.values()).count(w)) for w in self.warehouse_ids}
+
+        worker(WorkerRole.OWNER, None)
+        self.manager = worker(WorkerRole.MANAGER, self.branch_ids[0] if self.branch_ids else None)
+        self.sellers = {
+            branch_id: [worker(WorkerRole.SELLER, branch_id) for _ in range(max(1, shape.sellers))]
+            for branch_id in self.branch_ids
+        }
+
+    def _catalog(self) -> None:
+        shape, rng, store_id, opened = self.shape, self.rng, self.store.id, self.opened
+
+        subcategories = []
+        category_ids  = []
+        for c in range(shape.categories):
+            category_id = self.ids(Category)
+            base        = _CATEGORIES[c % len(_CATEGORIES)]
+            name        = base if c < len(_CATEGORIES) else f"{base} {c // len(_CATEGORIES) + 1}"
+            self.put(Category, (category_id, name, '', store_id, ActiveStatus.ACTIVE, opened))
+            category_ids.append(category_id)
+            children = []
+            for k in range(shape.subcategories):
+                sub_id = self.ids(SubCategory)
+                word   = _SUBCATEGORIES[k % len(_SUBCATEGORIES)]
+                sub    = word if k < len(_SUBCATEGORIES) else f"{word} {k // len(_SUBCATEGORIES) + 1}"
+                self.put(SubCategory, (sub_id, sub, '', category_id, store_id, ActiveStatus.ACTIVE, opened))
+                children.append(sub_id)
+            subcategories.append(children)
+
+        # Yetkazib beruvchilar — qarzi yakunda ma'lum (yozish _finish da)
+        self.supplier_rows = []
+        for s in range(shape.suppliers):
+            company = rng.choice(_COMPANIES)
+            self.supplier_rows.append([
+                self.ids(Supplier), store_id, f"{company} {s + 1}", self._phone(), f"{company} MChJ",
+                f"{rng.choice(_STREETS)} ko'chasi", 0, '', ActiveStatus.ACTIVE, opened, opened,
+            ])
+            self.sup_balance.append(0)
+            self.sup_open.append(deque())
+
+        # Mahsulotlar: parallel ro'yxatlar (tez kirish)
+        barcodes        = allocate_barcodes(store_id, shape.products)
+        self.p_id       = []
+        self.p_cost     = []
+        self.p_price    = []
+        self.p_weight   = []
+        self.p_supplier = []
+        for i in range(shape.products):
+            product_id = self.ids(Product)
+            weight     = rng.random() < WEIGHT_SHARE
+            cost       = max(500, int(round(rng.lognormvariate(9.6, 0.9), -2)))
+            price      = int(round(cost * rng.uniform(1.12, 1.45), -2))
+            name       = ' '.join(rng.sample(_PRODUCT_WORDS, 2)).title()
+            name       = f"{name} {'' if weight else rng.choice(_SIZES) + ' '}#{i + 1}"
+            c          = rng.randrange(len(category_ids)) if category_ids else None
+            self.put(Product, (
+                product_id, name, normalize_search_text(name),
+                category_ids[c] if c is not None else None,
+                rng.choice(subcategories[c]) if c is not None and subcategories[c] else None,
+                ProductUnit.KG if weight else ProductUnit.DONA, cost, price, None, barcodes[i], None,
+                store_id, ActiveStatus.ACTIVE, opened,
+            ))
+            self.p_id.append(product_id)
+            self.p_cost.append(cost)
+            self.p_price.append(price)
+            self.p_weight.append(weight)
+            self.p_supplier.append(rng.randrange(shape.suppliers) if shape.suppliers else None)
+
+        self.popular, self.p_cum, share = _zipf_cum(shape.products, 0.9, rng)
+        # Filialdagi kunlik talab (mingdan birlarda) → buyurtma nuqtasi va hajmi
+        picks_per_day = shape.sales / max(1, shape.days) / max(1, shape.branches) * MEAN_ITEMS
+        self.reorder, self.order = [], []
+        for p in range(shape.products):
+            daily = picks_per_day * share[p] * (1200 if self.p_weight[p] else 1400)
+            self.reorder.append(max(1000, math.ceil(daily * 3 / 1000) * 1000))
+            self.order.append(max(5000, math.ceil(daily * 14 / 1000) * 1000))
+
+        group_ids = []
+        for name, discount in _CUSTOMER_GROUPS:
+            group_id = self.ids(CustomerGroup)
+            self.put(CustomerGroup, (group_id, name, discount, store_id, opened))
+            group_ids.append(group_id)
+
+        # Mijozlar — qarzi yakunda ma'lum
+        self.customer_rows = []
+        for _ in range(shape.customers):
+            first, last = self._person()
+            name        = f"{first} {last}"
+            self.customer_rows.append([
+                self.ids(Customer), name, normalize_search_text(name), self._phone(),
+                f"{rng.choice(_STREETS)} ko'chasi", 0,
+                rng.choices(group_ids, weights=(80, 15, 5))[0], store_id, ActiveStatus.ACTIVE, opened,
+            ])
+            self.cust_balance.append(0)
+            self.cust_open.append(deque())
+        self.c_cum = _zipf_cum(shape.customers, 0.7, rng)[1] if shape.customers else ()
+
+        self.expense_categories = []
+        for name, (low, high, weight) in _EXPENSE_CATEGORIES.items():
+            category_id = self.ids(ExpenseCategory)
+            self.put(ExpenseCategory, (category_id, name, store_id, ActiveStatus.ACTIVE, opened))
+            self.expense_categories.append((category_id, low, high, weight))
+        self.expense_cum = tuple(itertools.accumulate(c[3] for c in self.expense_categories))
+
+    # ----------------------------------------------------------
+    # Ombor: kirim, FIFO, transfer
+    # ----------------------------------------------------------
+
+    def _lot(self, location: tuple, p: int) -> list:
+        """[qoldiq, partiyalardagi qoldiq, deque(partiya qatorlari), oxirgi o'zgarish]."""
+        lot = self.lots.get((location, p))
+        if lot is None:
+            lot = self.lots[(location, p)] = [0, 0, deque(), self.opened]
+        return lot
+
+    def _batch_code(self, when: datetime) -> str:
+        day = timezone.localtime(when).date()
+        seq = self.batch_seq[day] = self.batch_seq.get(day, 0) + 1
+        return f"S{self.store.id}-{day.strftime('%y-%m-%d')}-{seq:04d}"
+
+    def _movement(self, location: tuple, p: int, kind: str, qty: int, unit_cost, description: str,
+                  when: datetime, worker_id=None, supplier_id=None) -> int:
+        movement_id = self.ids(StockMovement)
+        self.put(StockMovement, (
+            movement_id, self.p_id[p], location[0], location[1], kind, _qty(qty), unit_cost,
+            description, worker_id, supplier_id, when,
+        ))
+        lot     = self._lot(location, p)
+        lot[0] += qty if kind == MovementType.IN else -qty
+        lot[3]  = when
+        return movement_id
+
+    def _add_batch(self, location: tuple, p: int, qty: int, unit_cost: int, movement_id: int, when) -> None:
+        row = [
+            self.ids(StockBatch), self._batch_code(when), self.p_id[p], location[0], location[1],
+            unit_cost, qty, qty, movement_id, self.store.id, when,
+        ]
+        self.batch_rows.append(row)
+        lot     = self._lot(location, p)
+        lot[1] += qty
+        lot[2].append(row)
+
+    def _take(self, location: tuple, p: int, qty: int) -> int:
+        """FIFO yechish → o'rtacha birlik tannarxi (so'm). Partiyalar yetarli bo'lishi shart."""
+        lot       = self._lot(location, p)
+        batches   = lot[2]
+        need, cost = qty, 0
+        unit_cost = self.p_cost[p]
+        while need and batches:
+            row       = batches[0]
+            used      = min(row[_BATCH_LEFT], need)
+            unit_cost = row[5]
+            cost     += used * unit_cost
+            need     -= used
+            row[_BATCH_LEFT] -= used
+            if not row[_BATCH_LEFT]:
+                batches.popleft()
+        cost   += need * unit_cost                 # himoya: partiyasiz qism oxirgi narxda
+        lot[1] -= qty - need
+        return round(cost / qty)
+
+    def _receive(self, location: tuple, p: int, qty: int, when: datetime) -> None:
+        """Yetkazib beruvchidan kirim: harakat + partiya + kreditorlik daftari."""
+        s           = self.p_supplier[p]
+        supplier_id = self.supplier_rows[s][0] if s is not None else None
+        unit_cost   = int(round(self.p_cost[p] * self.rng.uniform(0.97, 1.03), -2)) or self.p_cost[p]
+        movement_id = self._movement(
+            location, p, MovementType.IN, qty, unit_cost, f"Kirim: {self.p_id[p]} × {_qty(qty)}",
+            when, self.manager, supplier_id,
+        )
+        self._add_batch(location, p, qty, unit_cost, movement_id, when)
+        if s is not None:
+            amount  = round(qty * unit_cost / 1000)
+            balance = self.sup_balance[s] = self.sup_balance[s] + amount
+            row     = [
+                self.ids(SupplierLedgerEntry), self.store.id, supplier_id, SupplierLedgerEntryType.RECEIPT,
+                amount, balance, min(amount, max(balance, 0)), movement_id, None,
+                f"Kirim #{movement_id}", when,
+            ]
+            self.sup_ledger.append(row)
+            if row[_LEDGER_OPEN]:
+                self.sup_open[s].append(row)
+
+    def _transfer(self, warehouse_id: int, branch_id: int, items: list, when: datetime, description: str) -> None:
+        """Ombor → filial, darhol tasdiqlangan. Ombor yetmasa — avval yetkazib beruvchidan kirim."""
+        transfer_id = self.ids(Transfer)
+        self.put(Transfer, (
+            transfer_id, None, warehouse_id, branch_id, None, self.store.id, self.manager,
+            TransferStatus.CONFIRMED, description, when, when,
+        ))
+        source, target = (None, warehouse_id), (branch_id, None)
+        for p, qty in items:
+            lot = self._lot(source, p)
+            if lot[1] < qty:
+                refill = max(qty - lot[1], self.order[p] * self.served[warehouse_id] * 2)
+                self._receive(source, p, refill, when - timedelta(minutes=30))
+            self.put(TransferItem, (self.ids(TransferItem), transfer_id, self.p_id[p], _qty(qty), ''))
+            unit_cost = self._take(source, p, qty)
+            self._movement(source, p, MovementType.OUT, qty, unit_cost, f"Transfer #{transfer_id} chiqim",
+                           when, self.manager)
+            movement_id = self._movement(target, p, MovementType.IN, qty, unit_cost,
+                                         f"Transfer #{transfer_id} kirim", when, self.manager)
+            self._add_batch(target, p, qty, unit_cost, movement_id, when)
+
+    def _restock(self, branch_id: int, items: list, when: datetime, description: str) -> None:
+        if self.warehouse_ids:
+            self._transfer(self.supplying[branch_id], branch_id, items, when, description)
+        else:
+            for p, qty in items:
+                self._receive((branch_id, None), p, qty, when)
+
+    def _opening_stock(self) -> None:
+        shape = self.shape
+        for warehouse_id in self.warehouse_ids:
+            for p in range(shape.products):
+                self._receive((None, warehouse_id), p, self.order[p] * self.served[warehouse_id] * 2, self.opened)
+        assortment = sorted(self.popular[:math.ceil(shape.products * ASSORTMENT)])
+        for branch_id in self.branch_ids:
+            self._restock(
+                branch_id, [(p, self.order[p]) for p in assortment],
+                self.opened + timedelta(hours=1), "Ochilish qoldig'i",
+            )
+        self.g.log(f"  ochilish qoldig'i: {len(self.lots):,} joy × mahsulot")
+
+    # ----------------------------------------------------------
+    # Tarix
+    # ----------------------------------------------------------
+
+    def _day_counts(self) -> list:
+        """Aniq shape.sales ta sotuv kunlarga: hafta kuni omili × ±15% shovqin."""
+        shape, rng = self.shape, self.rng
+        weights = [
+            WEEKDAY_FACTORS[(self.first_day + timedelta(days=d)).weekday()] * rng.uniform(0.85, 1.15)
+            for d in range(shape.days)
+        ]
+        total  = sum(weights)
+        counts = [int(shape.sales * w / total) for w in weights]
+        for d in rng.sample(range(shape.days), shape.sales - sum(counts)):
+            counts[d] += 1
+        return counts
+
+    def _history(self) -> None:
+        shape = self.shape
+        if shape.days <= 0 or not self.branch_ids:
+            return
+        counts   = self._day_counts()
+        progress = max(1, shape.days // 10)
+        done     = 0
+        for d, n in enumerate(counts):
+            day = self.first_day + timedelta(days=d)
+            end = self._at(day + timedelta(days=1), 0)
+            while self.events and self.events[0][0] < end:
+                when, _, func, args = heapq.heappop(self.events)
+                func(when, *args)
+            if d % 7 == 6:
+                self._pay_suppliers(self._at(day, 8 * 3600 + 1800))
+            self._expenses(day)
+            for seconds in sorted(self.rng.randrange(OPEN_SECONDS, CLOSE_SECONDS) for _ in range(n)):
+                self._sale(self._at(day, seconds))
+            self._end_of_day(day)
+            done += n
+            if (d + 1) % progress == 0:
+                self.g.log(f"  {day}: {done:,} sotuv")
+
+    def _sale(self, when: datetime) -> None:
+        rng       = self.rng
+        branch_id = rng.choices(self.branch_ids, cum_weights=self.branch_cum)[0]
+        location  = (branch_id, None)
+        worker_id = rng.choice(self.sellers[branch_id])
+        count     = rng.choices(ITEM_COUNTS, weights=ITEM_WEIGHTS)[0]
+        picks     = dict.fromkeys(rng.choices(range(self.shape.products), cum_weights=self.p_cum, k=count))
+        payment   = rng.choices(PAYMENT_TYPES, cum_weights=PAYMENT_CUM)[0]
+        customer  = None
+        if self.customer_rows and (payment == PaymentType.DEBT or rng.random() < self.shape.customer_share):
+            customer = rng.choices(range(len(self.customer_rows)), cum_weights=self.c_cum)[0]
+        elif payment == PaymentType.DEBT:
+            payment = PaymentType.CASH
+
+        sale_id = self.ids(Sale)
+        total   = 0
+        lines   = []
+        for p in picks:
+            qty = rng.randrange(200, 3001, 100) if self.p_weight[p] else rng.choices((1, 2, 3, 4, 6), (70, 18, 6, 3, 3))[0] * 1000
+            lot = self._lot(location, p)
+            if lot[1] < qty:
+                self._urgent(branch_id, p, qty - lot[1], when - timedelta(minutes=2))
+            unit_cost = self._take(location, p, qty)
+            price     = self.p_price[p]
+            line      = round(price * qty / 1000)
+            self.put(SaleItem, (
+                self.ids(SaleItem), sale_id, self.p_id[p], _qty(qty), None, 0, None, price, line, unit_cost,
+            ))
+            self._movement(location, p, MovementType.OUT, qty, unit_cost, f"Sotuv #{sale_id}", when, worker_id)
+            if lot[1] < self.reorder[p]:
+                self.low.setdefault(branch_id, set()).add(p)
+            total += line
+            lines.append((p, qty, price))
+
+        paid, cash, card, debt = total, 0, 0, 0
+        if payment == PaymentType.MIXED:
+            cash = int(round(total * rng.uniform(0.2, 0.8), -2))
+            card = total - cash
+            if cash <= 0 or card <= 0:
+                payment, cash, card = PaymentType.CASH, 0, 0
+        elif payment == PaymentType.DEBT:
+            paid = int(round(total * rng.choice((0, 0, 0, 0.3, 0.5)), -2))
+            debt = total - paid
+            if debt <= 0:
+                payment, paid, debt = PaymentType.CASH, total, 0
+
+        customer_id = self.customer_rows[customer][0] if customer is not None else None
+        row = [
+            sale_id, branch_id, self.store.id, worker_id, customer_id, None, payment,
+            total, 0, paid, cash, card, debt, debt, SaleStatus.COMPLETED, '', when,
+        ]
+        if customer is not None:
+            stats = self.cust_stats.setdefault(customer, [0, 0, 0, None])
+            stats[0] += 1
+            stats[1] += total
+            stats[3]  = when
+
+        if debt:
+            # Qarz keyin FIFO to'lovlar bilan kamayadi — qator yakunda yoziladi
+            self.debt_sales.append(row)
+            self.cust_open[customer].append([sale_id, debt, row])
+            self._customer_entry(customer, LedgerEntryType.SALE, debt, when, worker_id,
+                                 f"Nasiya sotuv #{sale_id}", sale_id=sale_id)
+            if rng.random() < self.shape.repay_rate:
+                self._schedule(
+                    self._at(timezone.localtime(when).date() + timedelta(days=rng.randint(3, 45)),
+                             8 * 3600 + rng.randrange(1800)),
+                    self._repay, customer, debt,
+                )
+            return
+
+        self.put(Sale, row)
+        if rng.random() < self.shape.return_rate:
+            p, qty, price = rng.choice(lines)
+            self._schedule(when + timedelta(days=rng.randint(1, 7)), self._return,
+                           sale_id, branch_id, customer, p, qty if self.p_weight[p] else 1000, price)
+
+    def _customer_entry(self, customer: int, kind: str, amount: int, when, worker_id, description: str,
+                        sale_id=None, payment_id=None) -> None:
+        balance = self.cust_balance[customer] = self.cust_balance[customer] + amount
+        self.put(CustomerLedgerEntry, (
+            self.ids(CustomerLedgerEntry), self.store.id, self.customer_rows[customer][0], kind, amount,
+            balance, sale_id, None, payment_id, worker_id, description, when,
+        ))
+
+    def _repay(self, when: datetime, customer: int, amount: int) -> None:
+        """Nasiya to'lovi: eng eski ochiq sotuvdan boshlab (FIFO)."""
+        open_sales = self.cust_open[customer]
+        amount     = min(amount, sum(entry[1] for entry in open_sales))
+        if amount <= 0:
+            return
+        payment_id   = self.ids(CustomerPayment)
+        payment_type = self.rng.choice((CustomerPaymentType.CASH, CustomerPaymentType.CARD))
+        self.put(CustomerPayment, (
+            payment_id, self.store.id, self.customer_rows[customer][0], amount, payment_type, '',
+            None, self.manager, when,
+        ))
+        left = amount
+        while left and open_sales:
+            entry = open_sales[0]
+            take  = min(entry[1], left)
+            self.put(CustomerPaymentAllocation, (self.ids(CustomerPaymentAllocation), payment_id, entry[0], take))
+            entry[1]                  -= take
+            entry[2][_SALE_DEBT_OPEN] -= take
+            left                      -= take
+            if not entry[1]:
+                open_sales.popleft()
+        label = CustomerPaymentType(payment_type).label
+        self._customer_entry(customer, LedgerEntryType.PAYMENT, -amount, when, self.manager,
+                             f"Qarz to'lovi #{payment_id} ({label})", payment_id=payment_id)
+
+    def _return(self, when: datetime, sale_id, branch_id, customer, p, qty, price) -> None:
+        """Tasdiqlangan qaytarish: harakat (IN, partiyasiz — trade/views.py kabi) + qoldiq."""
+        return_id = self.ids(SaleReturn)
+        amount    = round(price * qty / 1000)
+        worker_id = self.rng.choice(self.sellers[branch_id])
+        self.put(SaleReturn, (
+            return_id, sale_id, branch_id, self.store.id, worker_id,
+            self.customer_rows[customer][0] if customer is not None else None, None,
+            self.rng.choice(_RETURN_REASONS), amount, SaleReturnStatus.CONFIRMED, when,
+        ))
+        self.put(SaleReturnItem, (self.ids(SaleReturnItem), return_id, self.p_id[p], _qty(qty), price, amount))
+        self._movement((branch_id, None), p, MovementType.IN, qty, price,
+                       f"Qaytarish #{return_id} tasdiqlandi", when, worker_id)
+        if customer is not None:
+            stats     = self.cust_stats[customer]
+            stats[1] -= amount
+            stats[2] += amount
+
+    def _pay_suppliers(self, when: datetime) -> None:
+        """Haftalik: qarzi bor har yetkazib beruvchiga qarzning 60–100% i; ochiq kirimlar FIFO yopiladi."""
+        rng = self.rng
+        for s, balance in enumerate(self.sup_balance):
+            amount = min(balance, int(round(balance * rng.uniform(0.6, 1.0), -3)))
+            if amount <= 0:
+                continue
+            payment_id   = self.ids(SupplierPayment)
+            payment_type = rng.choices(SupplierPaymentType.values, weights=(3, 2, 5))[0]
+            supplier_id  = self.supplier_rows[s][0]
+            self.put(SupplierPayment, (payment_id, supplier_id, amount, payment_type, '', None, self.manager, when))
+            self.sup_balance[s] = balance - amount
+            self.sup_ledger.append([
+                self.ids(SupplierLedgerEntry), self.store.id, supplier_id, SupplierLedgerEntryType.PAYMENT,
+                -amount, self.sup_balance[s], 0, None, payment_id, f"To'lov #{payment_id}", when,
+            ])
+            left, opened = amount, self.sup_open[s]
+            while left and opened:
+                row  = opened[0]
+                take = min(row[_LEDGER_OPEN], left)
+                row[_LEDGER_OPEN] -= take
+                left              -= take
+                if not row[_LEDGER_OPEN]:
+                    opened.popleft()
+
+    def _expenses(self, day: date) -> None:
+        rng = self.rng
+        for branch_id in self.branch_ids:
+            if rng.random() >= self.shape.expense_rate:
+                continue
+            category_id, low, high, _ = rng.choices(self.expense_categories, cum_weights=self.expense_cum)[0]
+            self.put(Expense, (
+                self.ids(Expense), category_id, branch_id, self.store.id, rng.choice(self.sellers[branch_id]),
+                None, rng.randrange(low, high, 1000), '', day, None,
+                self._at(day, rng.randrange(OPEN_SECONDS, CLOSE_SECONDS)),
+            ))
+
+    def _low_items(self, branch_id: int, skip: int = -1) -> list:
+        """Filialning buyurtma nuqtasidan tushgan mahsulotlari (ro'yxat bo'shatiladi)."""
+        return [
+            (p, self.order[p]) for p in sorted(self.low.pop(branch_id, ()))
+            if p != skip and self._lot((branch_id, None), p)[1] < self.reorder[p]
+        ]
+
+    def _urgent(self, branch_id: int, p: int, missing: int, when: datetime) -> None:
+        """Sotuvga yetmadi — shu mahsulot va filialning boshqa kam qolganlari bitta transferda."""
+        qty = max(self.order[p], math.ceil(missing / 1000) * 1000)
+        self._restock(branch_id, [(p, qty)] + self._low_items(branch_id, skip=p), when, "Shoshilinch to'ldirish")
+
+    def _end_of_day(self, day: date) -> None:
+        when = self._at(day, CLOSE_SECONDS + 1800)
+        for branch_id in sorted(self.low):
+            items = self._low_items(branch_id)
+            if items:
+                self._restock(branch_id, items, when, "Kun yakuni: to'ldirish")
+
+    # ----------------------------------------------------------
+    # Yakun
+    # ----------------------------------------------------------
+
+    def _finish(self) -> None:
+        for (location, p), (quantity, _, _, updated) in self.lots.items():
+            self.put(Stock, (self.ids(Stock), self.p_id[p], location[0], location[1], _qty(quantity), updated))
+        for row in self.batch_rows:
+            row[_BATCH_RECEIVED] = _qty(row[_BATCH_RECEIVED])
+            row[_BATCH_LEFT]     = _qty(row[_BATCH_LEFT])
+            self.put(StockBatch, row)
+        for row in self.sup_ledger:
+            self.put(SupplierLedgerEntry, row)
+        for s, row in enumerate(self.supplier_rows):
+            row[6] = self.sup_balance[s]
+            self.put(Supplier, row)
+        for c, row in enumerate(self.customer_rows):
+            row[5] = self.cust_balance[c]
+            self.put(Customer, row)
+        for c, (count, spent, returned, last) in self.cust_stats.items():
+            self.put(CustomerStats, (self.customer_rows[c][0], count, spent, returned, last, self.now))
+        for row in self.debt_sales:
+            self.put(Sale, row)
+        for writer in self.out.values():
+            writer.flush()
+        recount(self.store.id)
@@ -0,0 +1,266 @@
+"""
+============================================================
+CONFIG — So'rov tenant konteksti (request.tenant)
+============================================================
+Klasslar / funksiyalar:
+  TenantContext              — foydalanuvchi + hodim (rol, ruxsatlar, filial) + do'kon +
+                               sozlamalar + obuna: bitta o'zgarmas obyekt
+  get_tenant_context(user_id)— keshdan (bitta o'qish) yoki DB dan (bitta so'rov) qurish
+  get_request_tenant(request)— request.tenant; yo'q bo'lsa request.user dan quradi
+  get_token_version(user_id) — JWT claimlari versiyasi (accaunt/claims.py tekshiradi)
+  invalidate_tenant(user_id) / invalidate_store_tenants(store_id) — eskirtirish
+
+Nima uchun:
+  Har bir so'rovda: JWT → CustomUser (DB), request.user.worker (DB), worker.store (DB),
+  ReadOnlyIfExpired → get_subscription (Redis, Subscription+Plan+Store grafi),
+  SubscriptionRequired / CanAccess — yana, view — get_store_settings (Redis).
+  Endi: accaunt.authentication.TenantJWTAuthentication bitta kesh o'qishi bilan
+  TenantContext oladi, permission'lar va view'lar request.tenant dan o'qiydi.
+
+Kesh:
+  Kalit — tenant_v{TENANT_CONTEXT_SCHEMA}_{user_id} (foydalanuvchi bo'yicha;
+  sxema versiyasi — TenantContext tuzilishi o'zgarsa eski yozuvlar o'qilmaydi).
+  TTL — TENANT_CONTEXT_TTL (obuna muddati kabi vaqtga bog'liq qiymatlar uchun zaxira).
+  Eskirtirish — accaunt/signals.py: CustomUser, Worker, Store, Branch,
+  StoreSettings, Subscription, SubscriptionPlan saqlanganda/o'chirilganda.
+  .update() bilan o'zgartirilganda — chaqiruvchi invalidate_* ni o'zi chaqiradi.
+
+request.user:
+  Keshda model obyektlari emas — faqat skalyar maydonlar (TenantContext.records:
+  user / worker / store / branch → {maydon: qiymat}, parolsiz). request.user va
+  request.user.worker.store accaunt/claims.py user_from_tenant() da shulardan
+  quriladi — mavjud kod DB ga bormaydi; parol kerak bo'lsa (CHECK_REVOKE_TOKEN) — DB dan.
+
+Token versiyasi:
+  Kalit — tokver_{user_id}, qiymat — hodim holatining izi (rol, holat, ruxsatlar, do'kon,
+  filial, foydalanuvchi faolligi). Hisoblagich emas — Redis tozalansa ham DB dan bir xil
+  qiymat qayta hisoblanadi. invalidate_tenant ikkala kalitni ham o'chiradi.
+"""
+
+import hashlib
+from dataclasses import dataclass, field
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from .metrics import record_cache
+
+# TenantContext tuzilishi o'zgarsa oshiriladi
+TENANT_CONTEXT_SCHEMA = 5
+
+MANAGER_ROLES = frozenset({'owner', 'manager'})
+
+# Keshga yozilmaydigan maydonlar
+_RECORD_EXCLUDE = frozenset({'password'})
+
+
+@dataclass(frozen=True)
+class TenantContext:
+    user_id:        int
+    is_superuser:   bool
+    is_active:      bool
+    worker_id:      int | None       = None
+    role:           str | None       = None
+    worker_status:  str | None       = None
+    permission_mask: int             = 0        # accaunt.models.PERMISSION_BITS
+    store_id:       int | None       = None
+    branch_id:      int | None       = None
+    settings:       object           = None     # StoreSettingsData (config.cache_utils)
+    subscription:   object           = None     # SubscriptionData: .is_active, .plan (PlanData)
+    # request.user / worker / store / branch skalyar maydonlari — taqqoslash/reprga kirmaydi
+    records:        dict             = field(default=None, compare=False, repr=False)
+
+    @property
+    def has_worker(self) -> bool:
+        return self.worker_id is not None
+
+    @property
+    def is_owner(self) -> bool:
+        return self.role == 'owner'
+
+    @property
+    def is_manager_or_above(self) -> bool:
+        return self.role in MANAGER_ROLES
+
+    @property
+    def plan(self):
+        return self.subscription.plan if self.subscription else None
+
+    @property
+    def permissions(self) -> frozenset:
+        from accaunt.models import permissions_from_mask
+        return frozenset(permissions_from_mask(self.permission_mask))
+
+    def has_permission(self, code: str) -> bool:
+        from accaunt.models import PERMISSION_BITS
+        return bool(self.permission_mask & PERMISSION_BITS.get(code, 0))
+
+    def has_feature(self, feature: str) -> bool:
+        """Obuna faol va rejada funksiya bor."""
+        sub = self.subscription
+        return bool(sub and sub.is_active and getattr(sub.plan, feature, False))
+
+
+# ============================================================
+# QURISH VA KESH
+# ============================================================
+
+def _cache_key(user_id: int) -> str:
+    return f'tenant_v{TENANT_CONTEXT_SCHEMA}_{user_id}'
+
+
+def _record(obj) -> dict:
+    """Model obyektining skalyar maydonlari (attname → qiymat), parolsiz."""
+    return {
+        f.attname: getattr(obj, f.attname)
+        for f in obj._meta.concrete_fields
+        if f.attname not in _RECORD_EXCLUDE
+    }
+
+
+def build_tenant_context(user_id: int) -> TenantContext | None:
+    """
+    DB dan qurish: hodim bo'lsa — bitta so'rov (user, store, branch, settings, obuna, reja
+    select_related), hodim bo'lmasa (superadmin) — faqat foydalanuvchi.
+    """
+    from accaunt.models import CustomUser, Worker, permission_mask
+    from config.cache_utils import get_store_settings, store_settings_data, subscription_data
+
+    worker = (
+        Worker.objects
+        .select_related('user', 'store', 'branch', 'store__settings', 'store__subscription__plan')
+        .filter(user_id=user_id)
+        .first()
+    )
+    if worker is None:
+        user = CustomUser.objects.filter(pk=user_id).first()
+        if user is None:
+            return None
+        return TenantContext(
+            user_id=user.pk, is_superuser=user.is_superuser, is_active=user.is_active,
+            records={'user': _record(user)},
+        )
+
+    user    = worker.user
+    store   = worker.store
+    records = {'user': _record(user), 'worker': _record(worker)}
+    if store is not None:
+        records['store'] = _record(store)
+    if worker.branch is not None:
+        records['branch'] = _record(worker.branch)
+    store_settings = subscription = None
+    if store is not None:
+        store_settings = getattr(store, 'settings', None)
+        if store_settings is not None:
+            store_settings = store_settings_data(store_settings)
+        else:
+            store_settings = get_store_settings(store.id)   # signal ishlamagan — yaratadi
+        sub = getattr(store, 'subscription', None)
+        if sub is not None:
+            subscription = subscription_data(sub)
+
+    return TenantContext(
+        user_id       = user.pk,
+        is_superuser  = user.is_superuser,
+        is_active     = user.is_active,
+        worker_id     = worker.pk,
+        role          = worker.role,
+        worker_status = worker.status,
+        permission_mask = permission_mask(worker.permissions),
+        store_id      = worker.store_id,
+        branch_id     = worker.branch_id,
+        settings      = store_settings,
+        subscription  = subscription,
+        records       = records,
+    )
+
+
+def get_tenant_context(user_id: int) -> TenantContext | None:
+    """Keshdan — bitta o'qish; yo'q bo'lsa qurib keshga yozadi."""
+    key     = _cache_key(user_id)
+    context = cache.get(key)
+    record_cache('tenant', context is not None)
+    if context is None:
+        context = build_tenant_context(user_id)
+        if context is not None:
+            cache.set(key, context, timeout=settings.TENANT_CONTEXT_TTL)
+    return context
+
+
+def get_request_tenant(request) -> TenantContext | None:
+    """
+    request.tenant (TenantJWTAuthentication o'rnatadi). Boshqa autentifikatsiya
+    (force_authenticate, sessiya) bo'lsa — request.user bo'yicha quriladi va saqlanadi.
+    """
+    tenant = getattr(request, 'tenant', None)
+    if tenant is not None:
+        return tenant
+    user = getattr(request, 'user', None)
+    if not user or not user.is_authenticated:
+        return None
+    tenant = get_tenant_context(user.pk)
+    request.tenant = tenant
+    if hasattr(request, '_request'):
+        request._request.tenant = tenant
+    return tenant
+
+
+# ============================================================
+# TOKEN VERSIYASI
+# ============================================================
+
+def _version_key(user_id: int) -> str:
+    return f'tokver_{user_id}'
+
+
+def token_version(worker) -> str:
+    """JWT claimlariga ta'sir qiladigan holat izi: o'zgarsa — eski access tokenlar rad etiladi."""
+    from accaunt.models import permission_mask
+
+    user  = worker.user
+    state = (
+        worker.pk, worker.store_id, worker.branch_id, worker.role, worker.status,
+        permission_mask(worker.permissions), user.is_active, user.status, user.is_superuser,
+    )
+    return hashlib.blake2b(repr(state).encode(), digest_size=6).hexdigest()
+
+
+def get_token_version(user_id: int) -> str | None:
+    """Keshdan — bitta o'qish; yo'q bo'lsa DB dan (bitta so'rov). Hodim yo'q — None."""
+    from accaunt.models import Worker
+
+    key     = _version_key(user_id)
+    version = cache.get(key)
+    record_cache('token_version', version is not None)
+    if version is None:
+        worker  = Worker.objects.select_related('user').filter(user_id=user_id).first()
+        version = token_version(worker) if worker else ''
+        cache.set(key, version, timeout=settings.TOKEN_VERSION_TTL)
+    return version or None
+
+
+# ============================================================
+# ESKIRTIRISH
+# ============================================================
+
+def _delete(keys: list) -> None:
+    if not keys:
+        return
+    cache.delete_many(keys)
+    # Tranzaksiya ichida bo'lsa — commit dan keyin yana: parallel so'rov
+    # eski (commit bo'lmagan) holatni qayta keshlab qo'ygan bo'lishi mumkin
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def invalidate_tenant(*user_ids) -> None:
+    user_ids = [user_id for user_id in user_ids if user_id]
+    _delete([_cache_key(user_id) for user_id in user_ids] + [_version_key(user_id) for user_id in user_ids])
+
+
+def invalidate_store_tenants(store_id: int) -> None:
+    """Do'kon darajasidagi o'zgarish (sozlama, obuna, do'kon) — barcha hodimlari uchun."""
+    from accaunt.models import Worker
+
+    if store_id:
+        invalidate_tenant(*Worker.objects.filter(store_id=store_id).values_list('user_id', flat=True))
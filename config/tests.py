@@ -0,0 +1,561 @@
+"""
+============================================================
+CONFIG — Testlar
+============================================================
+Test guruhlari:
+  1. Tenant konteksti — JWT + permission'lar bitta kesh o'qishi, request.tenant, eskirtirish
+  2. Sozlamalar / obuna keshi — jarayon LRU + Redis qavati, single-flight, pub/sub eskirtirish,
+     obunasiz do'kon (MISSING belgisi)
+  3. API kvotalari — GCRA throttle (bitta son), do'kon bo'yicha reja limiti, X-RateLimit-*
+  4. Metrikalar — so'rov vaqti / SQL / kesh histogrammalari, N+1, sekin so'rov logi, /metrics/
+  5. Sintetik tenantlar — takrorlanuvchanlik, qoldiq = harakatlar, FIFO, qarz daftarlari
+  6. Benchmarklar — o'lchash (SQL, persentil), baseline chegaralari, API orqali keyslar
+  7. Stress harness — aralash amallardan keyin Stock == harakatlar == partiyalar
+"""
+
+import io
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from rest_framework.test import APITestCase
+
+from accaunt.models import ALL_PERMISSIONS, CustomUser, Worker, WorkerRole
+from store.models import Store
+from warehouse.models import Stock, StockBatch, StockMovement, SupplierLedgerEntry
+
+
+class TenantTestMixin:
+    """Do'kon + owner hodim + autentifikatsiya."""
+
+    def setUp(self):
+        self.store = Store.objects.create(name="Test do'kon")
+        self.user  = CustomUser.objects.create_user(
+            username='owner', email='owner@test.uz',
+            phone1='+998901234567', password='Test12345',
+        )
+        self.worker = Worker.objects.create(
+            user=self.user, store=self.store,
+            role=WorkerRole.OWNER, permissions=list(ALL_PERMISSIONS),
+        )
+        self.client.force_authenticate(self.user)
+
+    def _subscribe(self, **features):
+        """Do'konga faol obuna (PRO reja, berilgan has_* / limit maydonlari bilan)."""
+        from subscription.models import PlanType, Subscription, SubscriptionPlan, SubscriptionStatus
+        plan = SubscriptionPlan.objects.create(plan_type=PlanType.PRO, name='Pro', **features)
+        today = timezone.localdate()
+        Subscription.objects.update_or_create(
+            store=self.store,
+            defaults=dict(plan=plan, status=SubscriptionStatus.ACTIVE,
+                          start_date=today, end_date=today + timedelta(days=30)),
+        )
+
+    def _make_products(self, count: int) -> list:
+        from warehouse.models import Product
+        return [
+            Product.objects.create(
+                store=self.store, name=f"Mahsulot {i:03d}",
+                sale_price=Decimal('10000'), barcode=f"20{i:011d}",
+            )
+            for i in range(count)
+        ]
+
+
+# ============================================================
+# 1. TENANT KONTEKSTI — request.tenant
+# ============================================================
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class TenantContextTest(TenantTestMixin, APITestCase):
+    """JWT → TenantContext keshi: autentifikatsiya va permission'lar DB ga bormaydi."""
+
+    TENANT_TABLES = ('accaunt_customuser', 'accaunt_worker', 'store_store', 'subscription_')
+
+    def setUp(self):
+        super().setUp()
+        from django.core.cache import cache
+        from rest_framework_simplejwt.tokens import RefreshToken
+
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self._subscribe()
+        self.client.force_authenticate(None)
+        token = RefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def _tenant_queries(self, url: str) -> list:
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, getattr(response, 'data', None))
+        return [q['sql'] for q in ctx.captured_queries if any(t in q['sql'] for t in self.TENANT_TABLES)]
+
+    def test_auth_and_permissions_use_single_cache_read(self):
+        from config.tenant import get_tenant_context
+
+        self.assertTrue(self._tenant_queries('/api/v1/warehouse/categories/'))   # birinchi — quriladi
+        self.assertEqual(self._tenant_queries('/api/v1/warehouse/categories/'), [])
+
+        tenant = get_tenant_context(self.user.pk)
+        self.assertEqual((tenant.store_id, tenant.role), (self.store.id, WorkerRole.OWNER))
+        self.assertTrue(tenant.has_permission('mahsulotlar'))
+        self.assertTrue(tenant.subscription.is_active)
+        self.assertEqual(tenant.plan.plan_type, 'pro')
+        with self.assertRaises(AttributeError):
+            tenant.settings.allow_debt = True
+
+    def test_context_invalidated_on_change(self):
+        from config.tenant import get_tenant_context
+        from store.models import StoreSettings
+
+        self._tenant_queries('/api/v1/warehouse/categories/')
+
+        store_settings = StoreSettings.objects.get(store=self.store)
+        store_settings.low_stock_threshold = 42
+        store_settings.save()
+        self.assertEqual(get_tenant_context(self.user.pk).settings.low_stock_threshold, 42)
+
+        self.worker.permissions = ['sotuv']
+        self.worker.save()
+        self.assertEqual(self.client.get('/api/v1/warehouse/categories/').status_code, 403)
+
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get('/api/v1/warehouse/categories/').status_code, 401)
+
+    def test_cache_holds_scalars_only(self):
+        """Keshda model obyektlari va parol xeshi yo'q; request.user shu maydonlardan quriladi."""
+        import pickle
+        from django.db.models import Model
+        from config.tenant import get_tenant_context
+
+        first = self.client.get('/api/v1/auth/profil/')
+        self.assertEqual(first.status_code, 200, first.data)
+
+        tenant = get_tenant_context(self.user.pk)
+        self.assertEqual(set(tenant.records), {'user', 'worker', 'store'})
+        values = [value for record in tenant.records.values() for value in record.values()]
+        self.assertFalse(any(isinstance(value, Model) for value in values))
+        self.assertNotIn('password', tenant.records['user'])
+        self.assertNotIn(self.user.password.encode(), pickle.dumps(tenant))
+
+        self.assertEqual(self._tenant_queries('/api/v1/auth/profil/'), [])
+        response = self.client.get('/api/v1/auth/profil/')
+        self.assertEqual(response.data, first.data)
+        self.assertEqual(response.data['store_name'], "Test do'kon")
+
+
+# ============================================================
+# 2. SOZLAMALAR / OBUNA KESHI — IKKI QAVAT
+# ============================================================
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class TieredCacheTest(TenantTestMixin, APITestCase):
+    """get_store_settings / get_subscription: frozen dataclass, jarayon LRU, eskirtirish."""
+
+    def test_store_settings_local_hit_and_invalidation(self):
+        import pickle
+        from dataclasses import FrozenInstanceError
+        from config.cache_utils import _settings_cache, get_store_settings
+        from store.models import StoreSettings
+
+        first = get_store_settings(self.store.id)
+        with self.assertNumQueries(0):
+            self.assertIs(get_store_settings(self.store.id), first)   # jarayon qavati — Redis ga ham bormaydi
+        with self.assertRaises(FrozenInstanceError):
+            first.allow_debt = True
+        self.assertEqual(pickle.loads(pickle.dumps(first)), first)
+
+        _settings_cache.drop_local(self.store.id)                      # boshqa jarayon: Redis qavati
+        with self.assertNumQueries(0):
+            self.assertEqual(get_store_settings(self.store.id), first)
+
+        store_settings = StoreSettings.objects.get(store=self.store)
+        store_settings.low_stock_threshold = 17
+        store_settings.save()                                          # signal → invalidate
+        self.assertEqual(get_store_settings(self.store.id).low_stock_threshold, 17)
+
+    def test_subscription_row_and_plan_change(self):
+        from config.cache_utils import get_subscription
+
+        self._subscribe(max_products=10)
+        sub = get_subscription(self.store.id)
+        self.assertTrue(sub.is_active)
+        self.assertEqual((sub.plan.plan_type, sub.plan.max_products), ('pro', 10))
+
+        plan = self.store.subscription.plan
+        plan.max_products = 20
+        plan.save()                                                    # reja signali → do'kon obunasi
+        self.assertEqual(get_subscription(self.store.id).plan.max_products, 20)
+
+    def test_missing_subscription_cached_until_created(self):
+        from config.cache_utils import _subscription_cache, get_subscription
+
+        with self.assertLogs('config.cache_utils', level='WARNING'):
+            self.assertIsNone(get_subscription(self.store.id))
+        with self.assertNumQueries(0):
+            self.assertIsNone(get_subscription(self.store.id))        # MISSING — jarayon qavati
+        _subscription_cache.drop_local(self.store.id)
+        with self.assertNumQueries(0):
+            self.assertIsNone(get_subscription(self.store.id))        # Redis qavati (pickle)
+
+        self._subscribe()                                              # post_save → invalidate
+        self.assertTrue(get_subscription(self.store.id).is_active)
+
+    def test_single_flight_and_pubsub_dispatch(self):
+        import threading
+        from config.tiered_cache import TieredCache, _dispatch
+
+        calls   = []
+        started = threading.Event()
+
+        def loader(key):
+            calls.append(key)
+            started.wait(1)
+            return ('qiymat', key)
+
+        tiered  = TieredCache('test_single_flight', loader, ttl=60)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(tiered.get(5))) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        started.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(calls, [5])
+        self.assertEqual(results, [('qiymat', 5)] * 8)
+
+        _dispatch(b'test_single_flight:5')                             # boshqa jarayon xabari
+        self.assertIsNone(tiered._get_local(5))
+        self.assertEqual(tiered.get(5), ('qiymat', 5))                 # Redis qavatida hali bor
+        self.assertEqual(calls, [5])
+
+
+# ============================================================
+# 3. API KVOTALARI — GCRA THROTTLE
+# ============================================================
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class RateLimitTest(TenantTestMixin, APITestCase):
+    """Do'kon kvotasi reja bo'yicha, barcha xodimlar uchun umumiy; sarlavhalar va 429."""
+
+    url = '/api/v1/warehouse/products/'
+
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        super().setUp()
+        self._subscribe(api_requests_per_minute=3)
+
+    def test_store_quota_headers_and_retry_after(self):
+        remaining = []
+        for _ in range(3):
+            response = self.client.get(self.url)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response['X-RateLimit-Limit'], '3')
+            remaining.append(int(response['X-RateLimit-Remaining']))
+        self.assertEqual(remaining, [2, 1, 0])
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['X-RateLimit-Remaining'], '0')
+        self.assertGreaterEqual(int(response['Retry-After']), 1)
+
+    def test_quota_shared_by_store_workers(self):
+        from django.core.cache import cache
+
+        other = CustomUser.objects.create_user(
+            username='sotuvchi', email='sotuvchi@test.uz',
+            phone1='+998901234568', password='Test12345',
+        )
+        Worker.objects.create(user=other, store=self.store, role=WorkerRole.SELLER,
+                              permissions=list(ALL_PERMISSIONS))
+        for _ in range(2):
+            self.assertEqual(self.client.get(self.url).status_code, 200)
+        self.client.force_authenticate(other)
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+        self.assertEqual(self.client.get(self.url).status_code, 429)
+
+        self.assertIsInstance(cache.get(f'rl:throttle_store_{self.store.id}'), int)   # vaqtlar ro'yxati emas
+
+    def test_zero_means_unlimited(self):
+        from subscription.models import SubscriptionPlan
+
+        plan = SubscriptionPlan.objects.get()
+        plan.api_requests_per_minute = 0
+        plan.save()                                   # signal — obuna keshi eskiradi
+        for _ in range(5):
+            response = self.client.get(self.url)
+            self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['X-RateLimit-Limit'], '3')
+
+
+# ============================================================
+# 4. METRIKALAR — INSTRUMENTATSIYA MIDDLEWARE
+# ============================================================
+
+class MetricsTest(TenantTestMixin, APITestCase):
+    """Har so'rov view.action bo'yicha histogrammalarga; N+1 va sekin so'rov logga."""
+
+    def setUp(self):
+        from config import metrics
+        metrics.reset()
+        super().setUp()
+
+    @override_settings(METRICS_TOKEN='scrape-token')
+    def test_view_histograms_and_prometheus_endpoint(self):
+        from config import metrics
+
+        self._make_products(3)
+        self.assertEqual(self.client.get('/api/v1/warehouse/products/').status_code, 200)
+        view = ('ProductViewSet.list',)
+        self.assertEqual(metrics.LATENCY.count(view), 1)
+        self.assertEqual(metrics.DB_QUERIES.count(view), 1)
+        self.assertEqual(metrics.REQUESTS.value(('ProductViewSet.list', 200)), 1)
+        self.assertGreater(metrics.DB_QUERIES._series[view][1], 0)                   # SQL soni yig'indisi
+
+        self.client.force_authenticate(None)
+        self.assertEqual(self.client.get('/metrics/').status_code, 403)
+        response = self.client.get('/metrics/', HTTP_AUTHORIZATION='Bearer scrape-token')
+        self.assertEqual(response.status_code, 200)
+        body = response.content.decode()
+        self.assertIn('crm_http_request_duration_seconds_bucket{view="ProductViewSet.list",le="+Inf"} 1', body)
+        self.assertIn('# TYPE crm_db_queries_per_request histogram', body)
+
+    @override_settings(METRICS_SLOW_REQUEST_MS=0, METRICS_N_PLUS_ONE_THRESHOLD=5)
+    def test_repeated_sql_flagged_and_slow_log_lists_top_queries(self):
+        from django.http import HttpResponse
+        from django.test import RequestFactory
+        from config import metrics
+        from config.middleware import InstrumentationMiddleware
+        from warehouse.models import Product
+
+        products = self._make_products(6)
+
+        def n_plus_one(request):
+            names = [Product.objects.get(pk=product.pk).name for product in products]
+            return HttpResponse(','.join(names))
+
+        with self.assertLogs('config.metrics', level='WARNING') as logs:
+            response = InstrumentationMiddleware(n_plus_one)(RequestFactory().get('/n-plus-one/'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(metrics.REPEATED_QUERY.value(('unresolved',)), 1)
+        self.assertTrue(any('N+1' in line and '6×' in line for line in logs.output))
+        self.assertTrue(any("Sekin so'rov" in line and 'warehouse_product' in line for line in logs.output))
+        self.assertEqual(metrics.RESPONSE_SIZE.count(('unresolved',)), 1)
+
+
+# ============================================================
+# 5. SINTETIK TENANTLAR — GENERATOR INVARIANTLARI
+# ============================================================
+
+class SyntheticTenantTest(APITestCase):
+    """Generator yozgan ma'lumot ilova yozganidek izchil: qoldiq, partiya, qarz daftarlari."""
+
+    def _generate(self, seed: int = 7):
+        from config.synthetic import PRESETS, TenantGenerator
+        return TenantGenerator(PRESETS['tiny'], seed=seed).generate()[0]
+
+    def _fingerprint(self, store_id: int) -> tuple:
+        from django.db.models import Sum
+        from trade.models import Sale
+
+        sales = Sale.objects.filter(store_id=store_id)
+        return (
+            sales.count(),
+            sales.aggregate(total=Sum('total_price'), debt=Sum('debt_amount')),
+            Stock.objects.filter(product__store_id=store_id).aggregate(qty=Sum('quantity'))['qty'],
+        )
+
+    def test_generated_store_is_consistent(self):
+        from django.db.models import F, Q, Sum
+        from config.synthetic import PRESETS
+        from subscription.usage import get_usage
+        from trade.models import Customer, Sale
+
+        shape  = PRESETS['tiny']
+        result = self._generate()
+        store  = result.store_id
+        self.assertEqual(Sale.objects.filter(store_id=store).count(), shape.sales)
+        self.assertEqual(result.rows['Sale'], shape.sales)
+
+        # Qoldiq == Σ IN − Σ OUT (joy va mahsulot bo'yicha)
+        moved = {
+            (row['branch_id'], row['warehouse_id'], row['product_id']): row['inn'] - row['out']
+            for row in StockMovement.objects.filter(product__store_id=store)
+            .values('branch_id', 'warehouse_id', 'product_id')
+            .annotate(
+                inn=Sum('quantity', filter=Q(movement_type='in'), default=Decimal('0')),
+                out=Sum('quantity', filter=Q(movement_type='out'), default=Decimal('0')),
+            )
+        }
+        stocks = {
+            (row['branch_id'], row['warehouse_id'], row['product_id']): row['quantity']
+            for row in Stock.objects.filter(product__store_id=store)
+            .values('branch_id', 'warehouse_id', 'product_id', 'quantity')
+        }
+        self.assertEqual(stocks, moved)
+
+        # FIFO partiyalar: 0 ≤ qty_left ≤ qty_received; qoldiq ≥ ochiq partiyalar
+        batches = StockBatch.objects.filter(product__store_id=store)
+        self.assertFalse(batches.filter(Q(qty_left__lt=0) | Q(qty_left__gt=F('qty_received'))).exists())
+        for row in batches.values('branch_id', 'warehouse_id', 'product_id').annotate(left=Sum('qty_left')):
+            self.assertGreaterEqual(stocks[(row['branch_id'], row['warehouse_id'], row['product_id'])], row['left'])
+
+        # Qarz daftarlari
+        self.assertEqual(SupplierLedgerEntry.verify_balances(store), [])
+        for customer in Customer.objects.filter(store_id=store):
+            debt = Sale.objects.filter(customer=customer).aggregate(debt=Sum('debt_open', default=0))['debt']
+            self.assertEqual(customer.debt_balance, debt)
+        self.assertEqual(get_usage(store).products, shape.products)
+
+    def test_same_seed_reproduces_data(self):
+        first  = self._fingerprint(self._generate(seed=3).store_id)
+        second = self._fingerprint(self._generate(seed=3).store_id)
+        other  = self._fingerprint(self._generate(seed=4).store_id)
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, other)
+
+    def test_command_estimate_and_validation(self):
+        from django.core.management import CommandError, call_command
+
+        out = io.StringIO()
+        call_command('generate_tenants', '--preset', 'tiny', '--stores', '2', '--estimate', stdout=out)
+        self.assertIn("do'konlar: 2", out.getvalue())
+        self.assertFalse(Store.objects.exists())
+        with self.assertRaises(CommandError):
+            call_command('generate_tenants', '--preset', 'tiny', '--products', '0', stdout=out)
+
+
+# ============================================================
+# 6. BENCHMARKLAR — O'LCHASH VA BASELINE TAQQOSLASH
+# ============================================================
+
+class BenchmarkTest(APITestCase):
+    """run_benchmarks asosi: keyslar haqiqiy API orqali o'tadi, regressiya chegaralari."""
+
+    def _report(self, **cases) -> dict:
+        from config.benchmark import DEFAULT_THRESHOLDS
+        return {'meta': {}, 'thresholds': {'default': DEFAULT_THRESHOLDS, 'cases': {}}, 'cases': cases}
+
+    def test_compare_thresholds(self):
+        from config.benchmark import compare
+
+        baseline = self._report(
+            fast={'p50_ms': 10.0, 'p95_ms': 12.0, 'queries': 20},
+            skipped={'skipped': 'PostgreSQL kerak'},
+        )
+        # ratio + slack ichida — regressiya emas
+        self.assertEqual(compare(self._report(fast={'p50_ms': 14.0, 'p95_ms': 20.0, 'queries': 20}), baseline), [])
+
+        current = self._report(
+            fast={'p50_ms': 40.0, 'p95_ms': 12.0, 'queries': 21},
+            skipped={'skipped': 'PostgreSQL kerak'},
+            broken={'error': 'status 500'},
+        )
+        found = {(item.case, item.metric) for item in compare(current, baseline)}
+        self.assertEqual(found, {('fast', 'p50_ms'), ('fast', 'queries'), ('broken', 'error')})
+
+        # Keys bo'yicha chegara standartni almashtiradi
+        baseline['thresholds']['cases']['fast'] = {'p50_ms': {'ratio': 5}, 'queries': {'slack': 1}}
+        self.assertEqual(compare(current, baseline)[0].metric, 'error')
+        self.assertEqual(len(compare(current, baseline)), 1)
+
+    def test_measure_counts_queries_outside_setup(self):
+        from config.benchmark import measure
+
+        result = measure(
+            lambda _: {'rows': Store.objects.count()},
+            repeat=4, setup=lambda: list(Store.objects.all()),
+        )
+        self.assertEqual((result['n'], result['queries'], result['rows']), (4, 1, 0))
+        self.assertLessEqual(result['p50_ms'], result['max_ms'])
+        self.assertGreater(result['peak_rss_mb'], 0)
+
+    def test_suite_runs_cases_through_api(self):
+        from dataclasses import replace
+
+        from config.benchmark import BenchmarkSuite
+        from config.synthetic import PRESETS
+
+        suite    = BenchmarkSuite(replace(PRESETS['tiny'], products=120), seed=5, quick=True)
+        prepared = suite.prepare()
+        self.assertGreater(prepared['rows'], 0)
+
+        results = suite.run(['sale.create?items=5?', 'fifo_deduct*'])
+        self.assertEqual(set(results), {'sale.create[items=5]', 'fifo_deduct[batches=500]'})
+        self.assertNotIn('error', results['sale.create[items=5]'])
+        self.assertGreater(results['sale.create[items=5]']['queries'], 0)
+        self.assertNotIn('error', results['fifo_deduct[batches=500]'])
+
+    @override_settings(RATE_LIMIT_ENABLED=False)
+    def test_rate_limit_can_be_disabled(self):
+        from config.rate_limit import hit
+
+        decisions = [hit('bench', limit=1, period=60) for _ in range(3)]
+        self.assertTrue(all(decision.allowed for decision in decisions))
+
+
+# ============================================================
+# 7. STRESS HARNESS — QOLDIQ INVARIANTLARI
+# ============================================================
+
+class StockStressTest(APITestCase):
+    """stress_stock asosi: aralash amallar API orqali, invariantlar buzilishni topadi."""
+
+    def _harness(self):
+        from dataclasses import replace
+
+        from config.stress import STRESS_SHAPE, StressHarness
+
+        harness = StressHarness(replace(STRESS_SHAPE, products=60, sales=150, days=7), seed=3, hot=8, basket=3)
+        harness.prepare()
+        return harness
+
+    def test_mixed_run_keeps_stock_consistent(self):
+        harness = self._harness()
+        report  = harness.run(workers=1, duration=None, ops=40)
+
+        self.assertEqual(report['invariants'], [])
+        self.assertEqual(report['totals']['attempts'], 40)
+        self.assertEqual(report['totals']['ok'], 40, report['notes'])
+        self.assertLessEqual(set(report['operations']), set(harness.mix))
+        self.assertIn('p95_ms', report['operations']['sale'])
+
+    def test_invariants_detect_drift(self):
+        from django.db.models import F
+        from config.stress import check_invariants
+
+        harness = self._harness()
+        product_id, branch_id = harness.hot[0][0], harness.branches[0]
+        Stock.objects.filter(product_id=product_id, branch_id=branch_id).update(quantity=F('quantity') + 1)
+        StockBatch.objects.filter(product_id=product_id, warehouse_id=harness.warehouse).update(
+            qty_left=F('qty_received') + 1,
+        )
+
+        problems = check_invariants(harness.store_id)
+        self.assertTrue(any(f"mahsulot #{product_id} filial #{branch_id}: Stock" in p for p in problems), problems)
+        self.assertTrue(any(p.startswith('partiya #') for p in problems), problems)
+
+    def test_helpers(self):
+        from config.stress import StressError, StressHarness, classify, parse_mix
+
+        class Deadlock(Exception):
+            pgcode = '40P01'
+
+        wrapped = RuntimeError('wrapper')
+        wrapped.__cause__ = Deadlock()
+        self.assertEqual(classify(wrapped), 'deadlock')
+        self.assertEqual(classify(RuntimeError('boshqa')), 'error')
+
+        self.assertEqual(parse_mix('sale=3, transfer=1'), {'sale': 3, 'transfer': 1})
+        for value in ('sotuv=1', 'sale=0'):
+            with self.assertRaises(ValueError):
+                parse_mix(value)
+        if connection.vendor != 'postgresql':
+            with self.assertRaises(StressError):
+                StressHarness().run(workers=2, ops=1)
@@ -0,0 +1,283 @@
+"""
+============================================================
+CONFIG — Ikki qavatli kesh (jarayon LRU + Redis) va pub/sub
+============================================================
+Klasslar / funksiyalar:
+  TieredCache(name, loader, ttl) — get(key) / invalidate(key)
+  invalidate_all()               — barcha jarayon qavatlarini tozalash (testlar, qayta ulanish)
+
+Qavatlar:
+  1. Jarayon xotirasi — OrderedDict LRU (TIERED_CACHE_MAXSIZE ta, TIERED_CACHE_LOCAL_TTL
+     soniya). Qiymatlar o'zgarmas (frozen dataclass) — nusxalanmaydi, qulflanmaydi.
+  2. Django cache (production — Redis) — ttl soniya.
+  3. loader(key) — DB.
+
+Single-flight:
+  Jarayon ichida — kalit bo'yicha threading.Lock: bir vaqtda bitta thread yuklaydi,
+  qolganlari natijani kutadi. Jarayonlar orasida — cache.add(lock) : bitta jarayon DB ga
+  boradi, boshqalar Redis ga yozilishini qisqa kutadi (TIERED_CACHE_LOCK_WAIT), keyin
+  o'zlari yuklaydi (qulf egasi o'lgan bo'lsa ham so'rov osilib qolmaydi).
+
+Eskirtirish:
+  invalidate(key) — shu jarayon LRU + Redis kaliti o'chiriladi va Redis pub/sub kanaliga
+  (CACHE_INVALIDATION_CHANNEL) xabar yuboriladi. Har gunicorn / Celery jarayonida birinchi
+  get() da tinglovchi daemon thread ishga tushadi va xabar kelganda o'z LRU sidan o'chiradi.
+  Ulanish uzilsa — butun LRU tozalanadi (o'tkazib yuborilgan xabarlar bo'lishi mumkin).
+  Yuklash paytida eskirtirish kelsa — natija LRU ga yozilmaydi (avlod hisoblagichi).
+
+Yo'q yozuv:
+  loader None qaytarsa — ikkala qavatga MISSING belgisi yoziladi (obunasiz do'kon har
+  so'rovda DB ga bormaydi), get() None qaytaradi. Yozuv paydo bo'lganda — odatdagi
+  invalidate(key) (post_save signali) belgini o'chiradi.
+
+  Pub/sub faqat django_redis backend bilan; boshqa backendda (locmem) — faqat jarayon
+  ichida eskiradi, qolganlari TIERED_CACHE_LOCAL_TTL dan keyin. DummyCache (kesh o'chiq) —
+  jarayon qavati ham o'chiq.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.signals import setting_changed
+from django.db import transaction
+from django.dispatch import receiver
+
+from .metrics import record_cache
+
+logger = logging.getLogger(__name__)
+
+_registry = {}                  # name → TieredCache
+_listener = {'pid': None}       # tinglovchi thread qaysi jarayonda ishga tushgan
+_listener_lock = threading.Lock()
+
+
+def _backend() -> str:
+    return settings.CACHES['default']['BACKEND']
+
+
+def _local_enabled() -> bool:
+    return not _backend().endswith('DummyCache')
+
+
+def _pubsub_enabled() -> bool:
+    return _backend().startswith('django_redis')
+
+
+class _Missing:
+    """loader None qaytargan kalit belgisi. Pickle dan keyin ham o'sha obyekt (is)."""
+
+    def __reduce__(self):
+        return 'MISSING'
+
+    def __repr__(self) -> str:
+        return 'MISSING'
+
+
+MISSING = _Missing()
+
+
+class TieredCache:
+    """
+    Kalit → o'zgarmas qiymat. loader(key) picklanadigan qiymat yoki None qaytaradi
+    (None — MISSING belgisi sifatida keshlanadi).
+    """
+
+    def __init__(self, name: str, loader, ttl: int):
+        self.name     = name
+        self.loader   = loader
+        self.ttl      = ttl
+        self._local   = OrderedDict()      # key → (qiymat, muddati)
+        self._lock    = threading.Lock()
+        self._flights = {}                 # key → threading.Lock
+        self._gen     = 0                  # har eskirtirishda oshadi
+        self.hits     = {'local': 0, 'remote': 0, 'load': 0}
+        _registry[name] = self
+
+    def _remote_key(self, key) -> str:
+        return f'{self.name}_{key}'
+
+    # ----------------------------------------------------------
+    # O'QISH
+    # ----------------------------------------------------------
+
+    def _get_local(self, key):
+        item = self._local.get(key)
+        if item is None:
+            return None
+        value, expires = item
+        if expires < time.monotonic():
+            self._local.pop(key, None)
+            return None
+        try:
+            self._local.move_to_end(key)
+        except KeyError:               # parallel eskirtirish
+            pass
+        return value
+
+    def _set_local(self, key, value, gen: int) -> None:
+        with self._lock:
+            if gen != self._gen:       # yuklash paytida eskirtirildi — eski qiymat
+                return
+            self._local[key] = (value, time.monotonic() + settings.TIERED_CACHE_LOCAL_TTL)
+            self._local.move_to_end(key)
+            while len(self._local) > settings.TIERED_CACHE_MAXSIZE:
+                self._local.popitem(last=False)
+
+    def get(self, key):
+        value = self._get(key)
+        return None if value is MISSING else value
+
+    def _get(self, key):
+        if not _local_enabled():
+            return self._get_remote(key)
+
+        value = self._get_local(key)
+        if value is not None:
+            self.hits['local'] += 1
+            record_cache(self.name, True)
+            return value
+
+        _ensure_listener()
+        with self._lock:
+            flight = self._flights.setdefault(key, threading.Lock())
+            gen    = self._gen
+        with flight:
+            value = self._get_local(key)          # kutganimizda boshqa thread yuklagan
+            if value is None:
+                value = self._get_remote(key)
+                if value is not None:
+                    self._set_local(key, value, gen)
+        with self._lock:
+            self._flights.pop(key, None)
+        return value
+
+    def _get_remote(self, key):
+        remote_key = self._remote_key(key)
+        value      = cache.get(remote_key)
+        if value is not None:
+            self.hits['remote'] += 1
+            record_cache(self.name, True)
+            return value
+
+        lock_key = f'{remote_key}_lock'
+        if not cache.add(lock_key, os.getpid(), timeout=10):
+            # Boshqa jarayon yuklayapti — Redis ga yozilishini kutamiz
+            deadline = time.monotonic() + settings.TIERED_CACHE_LOCK_WAIT
+            while time.monotonic() < deadline:
+                time.sleep(0.01)
+                value = cache.get(remote_key)
+                if value is not None:
+                    self.hits['remote'] += 1
+                    record_cache(self.name, True)
+                    return value
+        try:
+            self.hits['load'] += 1
+            record_cache(self.name, False)
+            value = self.loader(key)
+            if value is None:
+                value = MISSING
+            cache.set(remote_key, value, timeout=self.ttl)
+        finally:
+            cache.delete(lock_key)
+        return value
+
+    # ----------------------------------------------------------
+    # ESKIRTIRISH
+    # ----------------------------------------------------------
+
+    def drop_local(self, key=None) -> None:
+        """Faqat shu jarayon qavati (key=None — hammasi)."""
+        with self._lock:
+            self._gen += 1
+            if key is None:
+                self._local.clear()
+            else:
+                self._local.pop(key, None)
+
+    def invalidate(self, key) -> None:
+        """Shu jarayon + Redis + boshqa jarayonlar (pub/sub). Tranzaksiyada — commit dan keyin yana."""
+        def drop():
+            self.drop_local(key)
+            cache.delete(self._remote_key(key))
+            _publish(self.name, key)
+
+        drop()
+        transaction.on_commit(drop)
+
+
+def invalidate_all() -> None:
+    for tiered in _registry.values():
+        tiered.drop_local()
+
+
+@receiver(setting_changed)
+def _on_cache_settings_changed(sender, setting, **kwargs) -> None:
+    # override_settings(CACHES=...) — boshqa backend, jarayon qavati eskirgan
+    if setting == 'CACHES':
+        invalidate_all()
+
+
+# ============================================================
+# PUB/SUB
+# ============================================================
+
+def _redis():
+    from django_redis import get_redis_connection
+    return get_redis_connection('default')
+
+
+def _publish(name: str, key) -> None:
+    if not _pubsub_enabled():
+        return
+    try:
+        _redis().publish(settings.CACHE_INVALIDATION_CHANNEL, f'{name}:{key}')
+    except Exception as exc:
+        # Redis vaqtincha ishlamasa — boshqa jarayonlar LOCAL_TTL dan keyin yangilanadi
+        logger.warning("Kesh eskirtirish xabari yuborilmadi (%s:%s): %s", name, key, exc)
+
+
+def _dispatch(message: bytes | str) -> None:
+    if isinstance(message, bytes):
+        message = message.decode()
+    name, _, key = message.partition(':')
+    tiered = _registry.get(name)
+    if tiered is None:
+        return
+    try:
+        key = int(key)
+    except ValueError:
+        pass
+    tiered.drop_local(key)
+
+
+def _listen() -> None:
+    channel = settings.CACHE_INVALIDATION_CHANNEL
+    while True:
+        try:
+            pubsub = _redis().pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(channel)
+            invalidate_all()   # obuna bo'lgunga qadar kelgan xabarlar o'tkazib yuborilgan
+            for message in pubsub.listen():
+                if message.get('type') == 'message':
+                    _dispatch(message['data'])
+        except Exception as exc:
+            logger.warning("Kesh pub/sub tinglovchisi uzildi: %s — qayta ulanadi", exc)
+            invalidate_all()
+            time.sleep(1)
+
+
+def _ensure_listener() -> None:
+    """Har jarayonda (fork dan keyin ham) bitta tinglovchi thread."""
+    pid = os.getpid()
+    if _listener['pid'] == pid or not _pubsub_enabled():
+        return
+    with _listener_lock:
+        if _listener['pid'] == pid:
+            return
+        _listener['pid'] = pid
+        threading.Thread(target=_listen, name='cache-invalidation', daemon=True).start()
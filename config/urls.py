@@ -8,6 +8,7 @@ URL tuzilmasi:
   /admin/                       — Django admin panel
   /api/v1/auth/                 — Autentifikatsiya (accaunt.urls)
   /api/v1/                      — Worker CRUD (accaunt.api_urls)
+  /metrics/                     — Prometheus metrikalari (config/metrics.py)
   /swagger/                     — Swagger UI (development)
   /redoc/                       — ReDoc UI (development)
 
@@ -21,6 +22,8 @@ from django.conf import settings
 from django.conf.urls.static import static
 from django.http import HttpResponse
 
+from config.metrics import metrics_view
+
 
 def health_check(request):
     return HttpResponse("OK", content_type="text/plain", status=200)
@@ -59,6 +62,9 @@ urlpatterns = [
     # Railway health check
     path('health/', health_check, name='health-check'),
 
+    # Prometheus scrape (METRICS_TOKEN bilan)
+    path('metrics/', metrics_view, name='metrics'),
+
     # Django admin
     path('admin/', admin.site.urls),
 
@@ -30,6 +30,7 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from accaunt.permissions import SubscriptionRequired
+from config.metrics import record_cache
 
 from .utils import (
     calc_branches,
@@ -99,6 +100,7 @@ class DashboardView(APIView):
         )
 
         cached = cache.get(cache_key)
+        record_cache('dashboard', cached is not None)
         if cached is not None:
             return Response(cached)
 
@@ -24,7 +24,7 @@ from accaunt.permissions import CanAccess, IsManagerOrAbove
 
 from store.models import Smena, SmenaStatus
 
-from config.cache_utils import get_store_settings
+from config.tenant import get_request_tenant
 
 from .models import Expense, ExpenseCategory
 from .serializers import (
@@ -201,7 +201,7 @@ class ExpenseViewSet(AuditMixin, viewsets.ModelViewSet):
 
     def perform_create(self, serializer):
         worker   = self.request.user.worker
-        settings = get_store_settings(worker.store_id)
+        settings = get_request_tenant(self.request).settings
 
         # Ochiq smenani topish (shift yoqilgan bo'lsa)
         current_smena = None
@@ -0,0 +1,27 @@
+from django.contrib import admin
+
+from .models import ExportJob, ImportJob
+
+
+@admin.register(ExportJob)
+class ExportJobAdmin(admin.ModelAdmin):
+    """
+    Fon eksportlari — holat, progress, muddat.
+    """
+    list_display    = ('id', 'store', 'kind', 'file_format', 'status', 'rows_processed', 'rows_total', 'created_on', 'expires_at')
+    list_filter     = ('status', 'file_format', 'kind')
+    search_fields   = ('store__name', 'kind')
+    readonly_fields = ('params_hash', 'created_on', 'started_on', 'finished_on')
+    raw_id_fields   = ('store', 'worker')
+
+
+@admin.register(ImportJob)
+class ImportJobAdmin(admin.ModelAdmin):
+    """
+    Fon importlari — holat, progress, natija.
+    """
+    list_display    = ('id', 'store', 'kind', 'mode', 'dry_run', 'status', 'rows_processed', 'created', 'updated', 'error_count', 'created_on')
+    list_filter     = ('status', 'kind', 'dry_run')
+    search_fields   = ('store__name', 'kind', 'file_name')
+    readonly_fields = ('errors', 'created_on', 'started_on', 'finished_on')
+    raw_id_fields   = ('store', 'worker')
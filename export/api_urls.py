@@ -10,10 +10,19 @@ EXPORT (yuklab olish):
   GET /api/v1/export/stocks/                 ?branch &warehouse
   GET /api/v1/export/stock-movements/        ?format=excel|pdf &date_from &date_to &branch &warehouse &movement_type
   GET /api/v1/export/suppliers/              ?format=excel|pdf &status
+  GET /api/v1/export/suppliers/{id}/statement/ ?date_from &date_to   → CSV (oqimli, daftar bo'yicha)
+  (format: excel | pdf | csv | jsonl.gz; stocks — pdf siz)
+
+FON REJIMI (ExportJob):
+  GET /api/v1/export/<yuqoridagi endpoint>?...&async=1  → 202 {message, data: job}
+  GET /api/v1/export/jobs/                    ?status &kind
+  GET /api/v1/export/jobs/{id}/               → holat, rows_processed / rows_total, progress
+  GET /api/v1/export/jobs/{id}/download/      → tayyor fayl (409 — hali tayyor emas)
 
 IMPORT (shablon + yuklash):
   GET  /api/v1/export/products/template/         → bo'sh .xlsx
-  POST /api/v1/export/products/import/           → {created, skipped, errors}
+  POST /api/v1/export/products/import/           → {created, updated, skipped, errors}
+                                                   ?mode=create (standart) | upsert
   GET  /api/v1/export/customers/template/
   POST /api/v1/export/customers/import/
   GET  /api/v1/export/stock-movements/template/
@@ -22,13 +31,23 @@ IMPORT (shablon + yuklash):
   POST /api/v1/export/suppliers/import/
   GET  /api/v1/export/subcategories/template/
   POST /api/v1/export/subcategories/import/
+  (har bir POST: ?dry_run=1 — faqat tekshirish, bazaga yozilmaydi)
+
+FON IMPORTI (ImportJob):
+  POST /api/v1/export/<import endpoint>?async=1[&dry_run=1]  → 202 {message, data: job}
+  GET  /api/v1/export/import-jobs/            ?status &kind
+  GET  /api/v1/export/import-jobs/{id}/       → holat, progress, created/updated/skipped, errors
+  POST /api/v1/export/import-jobs/{id}/commit/ → dry-run ni xuddi shu fayl bilan yozish (409 — mumkin emas)
 """
 
 from django.urls import path
+from rest_framework.routers import DefaultRouter
 
 from .views import (
     CustomerImportView,
     ExpenseExportView,
+    ExportJobViewSet,
+    ImportJobViewSet,
     ProductImportView,
     StockExportView,
     StockMovementExportView,
@@ -36,6 +55,7 @@ from .views import (
     SubCategoryImportView,
     SupplierExportView,
     SupplierImportView,
+    SupplierStatementExportView,
     SaleExportView,
 )
 
@@ -46,6 +66,7 @@ urlpatterns = [
     path('stocks/',                StockExportView.as_view(),          name='export-stocks'),
     path('stock-movements/',       StockMovementExportView.as_view(),  name='export-stock-movements'),
     path('suppliers/',             SupplierExportView.as_view(),       name='export-suppliers'),
+    path('suppliers/<int:pk>/statement/', SupplierStatementExportView.as_view(), name='export-supplier-statement'),
 
     # ---- IMPORT — Mahsulot ----
     path('products/template/',     ProductImportView.as_view(),        name='import-products-template'),
@@ -67,3 +88,10 @@ urlpatterns = [
     path('subcategories/template/', SubCategoryImportView.as_view(),   name='import-subcategories-template'),
     path('subcategories/import/',   SubCategoryImportView.as_view(),   name='import-subcategories'),
 ]
+
+# ---- FON EKSPORTI / IMPORTI (ExportJob, ImportJob) ----
+router = DefaultRouter()
+router.register(r'jobs',        ExportJobViewSet, basename='export-job')
+router.register(r'import-jobs', ImportJobViewSet, basename='import-job')
+
+urlpatterns += router.urls
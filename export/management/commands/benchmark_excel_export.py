@@ -0,0 +1,136 @@
+"""
+============================================================
+EXPORT — Excel eksport xotira benchmarki
+============================================================
+Bir xil sintetik qatorlarni (sotuvlar eksporti shaklida, 13 ustun) ikki usulda
+.xlsx ga yozadi va cho'qqi xotira (tracemalloc) hamda vaqtni o'lchaydi:
+
+  legacy    — eski usul: qatorlar ro'yxati + oddiy Workbook + har katakka
+              Font/Alignment + ikkinchi aylanish (ustun kengligi) + BytesIO
+  streaming — write_excel(): generator + write-only + nomlangan stillar +
+              namunadan ustun kengligi + vaqtinchalik fayl
+
+Ishlatish:
+  python manage.py benchmark_excel_export
+  python manage.py benchmark_excel_export --rows 1000 10000 100000
+  python manage.py benchmark_excel_export --skip-legacy   # faqat yangi dvigatel
+
+Kutilgan natija: streaming cho'qqi xotirasi qatorlar soniga deyarli bog'liq
+emas, legacy esa chiziqli o'sadi.
+"""
+
+import io
+import random
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+import openpyxl
+from openpyxl.styles import Font
+from openpyxl.utils import get_column_letter
+from django.core.management.base import BaseCommand
+
+from export.utils.excel import DATA_ALIGN, HEADER_ALIGN, HEADER_FILL, HEADER_FONT, write_excel
+
+
+_HEADERS = [
+    '#', 'Sana', 'Filial', 'Kassir', 'Mijoz',
+    "To'lov turi", 'Jami summa', 'Chegirma', 'Naqd',
+    'Karta', 'Nasiya', 'Holat', 'Smena',
+]
+
+
+def _rows(count: int, seed: int):
+    """Sotuvlar eksporti shaklidagi sintetik qatorlar (generator)."""
+    rng   = random.Random(seed)
+    start = datetime(2025, 1, 1)
+    for i in range(1, count + 1):
+        total = float(rng.randint(1, 500) * 1000)
+        yield [
+            i,
+            (start + timedelta(minutes=i)).strftime('%d.%m.%Y %H:%M'),
+            f"Filial {rng.randint(1, 5)}",
+            f"Kassir {rng.randint(1, 20)}",
+            f"Mijoz {rng.randint(1, 5000)}" if rng.random() < 0.3 else '',
+            rng.choice(['Naqd', 'Karta', 'Nasiya']),
+            total,
+            0.0,
+            total,
+            0.0,
+            0.0,
+            'Yakunlangan',
+            f"#{rng.randint(1, 900)}",
+        ]
+
+
+def _legacy_excel(headers: list, rows: list) -> bytes:
+    """Eski make_excel_response tanasi (taqqoslash uchun, o'zgarishsiz)."""
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.row_dimensions[1].height = 32
+    for col_idx, header in enumerate(headers, start=1):
+        cell = ws.cell(row=1, column=col_idx, value=header)
+        cell.font      = HEADER_FONT
+        cell.fill      = HEADER_FILL
+        cell.alignment = HEADER_ALIGN
+    for row_idx, row in enumerate(rows, start=2):
+        ws.row_dimensions[row_idx].height = 20
+        for col_idx, val in enumerate(row, start=1):
+            cell = ws.cell(row=row_idx, column=col_idx, value=val)
+            cell.alignment = DATA_ALIGN
+            if isinstance(val, (int, float)) and col_idx > 1:
+                cell.font = Font(color='00B050' if val >= 0 else 'FF0000')
+    for col_idx, header in enumerate(headers, start=1):
+        max_len = len(str(header))
+        for row in rows:
+            val = row[col_idx - 1] if col_idx - 1 < len(row) else ''
+            max_len = max(max_len, len(str(val)) if val is not None else 0)
+        ws.column_dimensions[get_column_letter(col_idx)].width = min(max_len + 4, 40)
+    ws.freeze_panes = 'A2'
+    buffer = io.BytesIO()
+    wb.save(buffer)
+    return buffer.getvalue()
+
+
+def _measure(func) -> tuple[float, float, int]:
+    """→ (soniya, cho'qqi MB, fayl hajmi bayt)"""
+    tracemalloc.start()
+    started = time.perf_counter()
+    size    = func()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1024 / 1024, size
+
+
+class Command(BaseCommand):
+    help = "Excel eksport xotira benchmarki (legacy vs write-only oqimli dvigatel)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, nargs='+', default=[1_000, 10_000, 100_000],
+                            help="Qatorlar soni (bir nechta qiymat)")
+        parser.add_argument('--seed', type=int, default=42, help="Tasodifiy generator urug'i")
+        parser.add_argument('--skip-legacy', action='store_true', help="Eski usulni o'lchamaslik")
+
+    def handle(self, *args, **options):
+        seed = options['seed']
+        self.stdout.write("{:>10}  {:<10} {:>8}  {:>10}  {:>9}".format('qatorlar', 'usul', 'vaqt', "cho'qqi", 'fayl'))
+
+        for count in options['rows']:
+            if not options['skip_legacy']:
+                def legacy():
+                    return len(_legacy_excel(_HEADERS, list(_rows(count, seed))))
+                self._report(count, 'legacy', _measure(legacy))
+
+            def streaming():
+                with tempfile.TemporaryFile() as tmp:
+                    write_excel(tmp, _HEADERS, _rows(count, seed))
+                    return tmp.tell()
+            self._report(count, 'streaming', _measure(streaming))
+
+    def _report(self, count: int, label: str, result: tuple):
+        elapsed, peak_mb, size = result
+        self.stdout.write(
+            f"{count:>10,}  {label:<10} {elapsed:7.2f}s  {peak_mb:8.1f}MB  {size / 1024 / 1024:7.1f}MB"
+        )
@@ -0,0 +1,132 @@
+"""
+============================================================
+EXPORT — PDF hisobot benchmarki
+============================================================
+Bir xil sintetik qatorlarni (sotuvlar eksporti shaklida, 13 ustun, gorizontal
+sahifa) ikki usulda .pdf ga yozadi va vaqt hamda cho'qqi xotirani (tracemalloc)
+o'lchaydi:
+
+  legacy    — eski usul: har katak Paragraph + bitta ulkan Table + har toq
+              qator uchun alohida BACKGROUND buyrug'i + BytesIO
+  paginated — write_pdf(): iteratordan sahifama-sahifa Table bo'laklari,
+              oddiy satr kataklar, bir marta qurilgan stillar, tayyor sahifa
+              oqimi darhol siqiladi, vaqtinchalik fayl
+
+Ishlatish:
+  python manage.py benchmark_pdf_export
+  python manage.py benchmark_pdf_export --rows 1000 10000 100000
+  python manage.py benchmark_pdf_export --skip-legacy        # faqat yangi generator
+  python manage.py benchmark_pdf_export --legacy-max 10000   # legacy faqat shu hajmgacha
+
+Eslatma: tracemalloc vaqtni bir necha barobar oshiradi — vaqt ustuni faqat
+usullarni o'zaro taqqoslash uchun. Legacy 100 000 qatorda bir necha soat va
+GB lab xotira oladi — shuning uchun standart holatda u --legacy-max (20 000)
+dan katta hajmlarda o'tkazib yuboriladi.
+"""
+
+import io
+import tempfile
+
+from django.core.management.base import BaseCommand
+from reportlab.lib.pagesizes import A4, landscape
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.lib.units import mm
+from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+from export.management.commands.benchmark_excel_export import _HEADERS, _measure, _rows
+from export.utils import pdf as pdf_utils
+from export.utils.pdf import (
+    COLOR_BORDER,
+    COLOR_HEADER,
+    COLOR_ROW_ODD,
+    COLOR_WHITE,
+    write_pdf,
+)
+
+
+def _legacy_pdf(title: str, headers: list, rows) -> bytes:
+    """Eski write_pdf tanasi (taqqoslash uchun; ta'sirsiz ROWBACKGROUND buyruqlarisiz)."""
+    pdf_utils._try_register_font()
+    font_name = pdf_utils._FONT_NAME
+    buffer    = io.BytesIO()
+    doc = SimpleDocTemplate(
+        buffer,
+        pagesize=landscape(A4),
+        leftMargin=15 * mm,
+        rightMargin=15 * mm,
+        topMargin=15 * mm,
+        bottomMargin=15 * mm,
+    )
+    title_style = ParagraphStyle(
+        'Title', fontName=font_name, fontSize=14, textColor=COLOR_HEADER, spaceAfter=6, leading=18,
+    )
+    cell_style = ParagraphStyle('Cell', fontName=font_name, fontSize=8, leading=11, wordWrap='LTR')
+    col_width  = (landscape(A4)[0] - 30 * mm) / len(headers)
+
+    table_data = [[
+        Paragraph(f'<b>{h}</b>', ParagraphStyle(
+            'H', fontName=font_name, fontSize=9, textColor=COLOR_WHITE, leading=12,
+        ))
+        for h in headers
+    ]]
+    for row in rows:
+        table_data.append([Paragraph(str(v) if v is not None else '', cell_style) for v in row])
+
+    table_style_cmds = [
+        ('BACKGROUND', (0, 0), (-1, 0), COLOR_HEADER),
+        ('TEXTCOLOR',  (0, 0), (-1, 0), COLOR_WHITE),
+        ('ALIGN',      (0, 0), (-1, 0), 'CENTER'),
+        ('VALIGN',     (0, 0), (-1, -1), 'MIDDLE'),
+        ('FONTNAME',   (0, 0), (-1, 0), font_name),
+        ('FONTSIZE',   (0, 0), (-1, 0), 9),
+        ('GRID',       (0, 0), (-1, -1), 0.4, COLOR_BORDER),
+        ('TOPPADDING', (0, 0), (-1, -1), 4),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
+        ('LEFTPADDING', (0, 0), (-1, -1), 5),
+        ('RIGHTPADDING', (0, 0), (-1, -1), 5),
+    ]
+    for i in range(1, len(table_data)):
+        if i % 2 == 1:
+            table_style_cmds.append(('BACKGROUND', (0, i), (-1, i), COLOR_ROW_ODD))
+
+    table = Table(table_data, colWidths=[col_width] * len(headers), repeatRows=1)
+    table.setStyle(TableStyle(table_style_cmds))
+    doc.build([Paragraph(title, title_style), Spacer(1, 4 * mm), table])
+    return buffer.getvalue()
+
+
+class Command(BaseCommand):
+    help = "PDF hisobot benchmarki (legacy bitta Table vs sahifama-sahifa generator)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, nargs='+', default=[1_000, 10_000, 100_000],
+                            help="Qatorlar soni (bir nechta qiymat)")
+        parser.add_argument('--seed', type=int, default=42, help="Tasodifiy generator urug'i")
+        parser.add_argument('--skip-legacy', action='store_true', help="Eski usulni o'lchamaslik")
+        parser.add_argument('--legacy-max', type=int, default=20_000,
+                            help="Eski usul shu qatorlar sonigacha o'lchanadi")
+
+    def handle(self, *args, **options):
+        seed = options['seed']
+        self.stdout.write("{:>10}  {:<10} {:>8}  {:>10}  {:>9}".format('qatorlar', 'usul', 'vaqt', "cho'qqi", 'fayl'))
+
+        for count in options['rows']:
+            if not options['skip_legacy']:
+                if count <= options['legacy_max']:
+                    def legacy():
+                        return len(_legacy_pdf('Sotuvlar hisoboti', _HEADERS, _rows(count, seed)))
+                    self._report(count, 'legacy', _measure(legacy))
+                else:
+                    self.stdout.write(f"{count:>10,}  {'legacy':<10} o'tkazib yuborildi (--legacy-max)")
+
+            def paginated():
+                with tempfile.TemporaryFile() as tmp:
+                    write_pdf(tmp, 'Sotuvlar hisoboti', _HEADERS, _rows(count, seed), landscape_mode=True)
+                    return tmp.tell()
+            self._report(count, 'paginated', _measure(paginated))
+
+    def _report(self, count: int, label: str, result: tuple):
+        elapsed, peak_mb, size = result
+        self.stdout.write(
+            f"{count:>10,}  {label:<10} {elapsed:7.2f}s  {peak_mb:8.1f}MB  {size / 1024 / 1024:7.1f}MB"
+        )
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.11 on 2026-10-19 03:20
+
+import django.db.models.deletion
+import export.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('accaunt', '0006_workerkpi'),
+        ('store', '0008_rename_note_to_description'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(max_length=30, verbose_name='Eksport turi')),
+                ('file_format', models.CharField(choices=[('excel', 'Excel (.xlsx)'), ('pdf', 'PDF'), ('csv', 'CSV'), ('jsonl.gz', 'JSON Lines (.jsonl.gz)')], default='excel', max_length=10, verbose_name='Format')),
+                ('params', models.JSONField(blank=True, default=dict, verbose_name='Parametrlar')),
+                ('params_hash', models.CharField(max_length=64, verbose_name='Parametrlar xeshi')),
+                ('status', models.CharField(choices=[('pending', 'Navbatda'), ('running', 'Bajarilmoqda'), ('done', 'Tayyor'), ('failed', 'Xato'), ('expired', "Muddati o'tgan")], default='pending', max_length=10, verbose_name='Holati')),
+                ('rows_processed', models.PositiveIntegerField(default=0, verbose_name='Qayta ishlangan qatorlar')),
+                ('rows_total', models.PositiveIntegerField(blank=True, null=True, verbose_name='Jami qatorlar (taxminiy)')),
+                ('file', models.FileField(blank=True, max_length=255, storage=export.models.export_storage, upload_to=export.models.export_upload_to, verbose_name='Fayl')),
+                ('file_name', models.CharField(blank=True, max_length=100, verbose_name='Fayl nomi')),
+                ('file_size', models.PositiveBigIntegerField(default=0, verbose_name='Fayl hajmi (bayt)')),
+                ('error', models.TextField(blank=True, verbose_name='Xato')),
+                ('created_on', models.DateTimeField(auto_now_add=True, verbose_name='Yaratilgan vaqti')),
+                ('started_on', models.DateTimeField(blank=True, null=True, verbose_name='Boshlangan vaqti')),
+                ('finished_on', models.DateTimeField(blank=True, null=True, verbose_name='Tugagan vaqti')),
+                ('expires_at', models.DateTimeField(blank=True, null=True, verbose_name='Amal qilish muddati')),
+                ('store', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='export_jobs', to='store.store', verbose_name="Do'kon")),
+                ('worker', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='export_jobs', to='accaunt.worker', verbose_name='Hodim')),
+            ],
+            options={
+                'verbose_name': 'Eksport vazifasi',
+                'verbose_name_plural': 'Eksport vazifalari',
+                'ordering': ['-created_on'],
+                'indexes': [models.Index(fields=['store', 'params_hash'], name='export_job_dedup_idx'), models.Index(fields=['status', 'expires_at'], name='export_job_cleanup_idx')],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('status__in', ['pending', 'running'])), fields=('store', 'params_hash'), name='export_job_one_active')],
+            },
+        ),
+    ]
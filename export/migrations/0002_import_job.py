@@ -0,0 +1,50 @@
+# Generated by Django 5.2.11 on 2026-10-19 05:00
+
+import django.db.models.deletion
+import export.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accaunt', '0006_workerkpi'),
+        ('export', '0001_export_job'),
+        ('store', '0008_rename_note_to_description'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(max_length=30, verbose_name='Import turi')),
+                ('mode', models.CharField(default='create', max_length=10, verbose_name='Rejim')),
+                ('dry_run', models.BooleanField(default=False, verbose_name='Faqat tekshirish')),
+                ('status', models.CharField(choices=[('pending', 'Navbatda'), ('running', 'Bajarilmoqda'), ('done', 'Tayyor'), ('failed', 'Xato'), ('expired', "Muddati o'tgan")], default='pending', max_length=10, verbose_name='Holati')),
+                ('file', models.FileField(blank=True, max_length=255, storage=export.models.export_storage, upload_to=export.models.import_upload_to, verbose_name='Yuklangan fayl')),
+                ('file_name', models.CharField(blank=True, max_length=100, verbose_name='Fayl nomi')),
+                ('rows_total', models.PositiveIntegerField(blank=True, null=True, verbose_name='Jami qatorlar (taxminiy)')),
+                ('rows_processed', models.PositiveIntegerField(default=0, verbose_name='Tekshirilgan qatorlar')),
+                ('rows_planned', models.PositiveIntegerField(default=0, verbose_name='Yoziladigan qatorlar')),
+                ('rows_written', models.PositiveIntegerField(default=0, verbose_name='Yozilgan qatorlar')),
+                ('created', models.PositiveIntegerField(default=0, verbose_name='Yaratilgan')),
+                ('updated', models.PositiveIntegerField(default=0, verbose_name='Yangilangan')),
+                ('skipped', models.PositiveIntegerField(default=0, verbose_name="O'tkazib yuborilgan")),
+                ('error_count', models.PositiveIntegerField(default=0, verbose_name='Xatoli qatorlar')),
+                ('errors', models.JSONField(blank=True, default=list, verbose_name='Qator xatolari')),
+                ('error', models.TextField(blank=True, verbose_name='Xato')),
+                ('created_on', models.DateTimeField(auto_now_add=True, verbose_name='Yaratilgan vaqti')),
+                ('started_on', models.DateTimeField(blank=True, null=True, verbose_name='Boshlangan vaqti')),
+                ('finished_on', models.DateTimeField(blank=True, null=True, verbose_name='Tugagan vaqti')),
+                ('store', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='import_jobs', to='store.store', verbose_name="Do'kon")),
+                ('worker', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='import_jobs', to='accaunt.worker', verbose_name='Hodim')),
+            ],
+            options={
+                'verbose_name': 'Import vazifasi',
+                'verbose_name_plural': 'Import vazifalari',
+                'ordering': ['-created_on'],
+                'indexes': [models.Index(fields=['store', 'created_on'], name='import_job_store_idx'), models.Index(fields=['status', 'finished_on'], name='import_job_cleanup_idx')],
+            },
+        ),
+    ]
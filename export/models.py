@@ -0,0 +1,373 @@
+"""
+============================================================
+EXPORT APP — Modellar
+============================================================
+Modellar:
+  ExportFormat     — Eksport formati (TextChoices): excel|pdf|csv|jsonl.gz
+  ExportJobStatus  — Fon eksporti holati (TextChoices): pending|running|done|failed|expired
+  ExportJob        — Fon rejimidagi eksport (Celery, 'exports' navbati) + tayyor fayl
+  ImportJobStatus  — Fon importi holati (TextChoices): pending|running|done|failed|expired
+  ImportJob        — Fon rejimidagi import: yuklangan fayl + progress + qator xatolari
+
+ExportJob hayot sikli:
+  pending  → yaratildi, navbatda (run_export_job)
+  running  → worker bajarmoqda (rows_processed / rows_total — progress)
+  done     → fayl saqlandi, expires_at gacha yuklab olish mumkin
+  failed   → xato (error maydonida) yoki osilib qolgan (cleanup_export_jobs)
+  expired  → muddati o'tdi, fayl o'chirildi (cleanup_export_jobs)
+
+Deduplikatsiya:
+  params_hash = sha256(kind + format + parametrlar). Bir do'konda bir xil
+  parametrli faol (pending/running) job faqat bitta (partial unique constraint);
+  yangilik oynasi (EXPORT_JOB_FRESHNESS_MINUTES) ichida tugagan job qayta ishlatiladi.
+
+Saqlash:
+  STORAGES['exports'] aniqlangan bo'lsa (masalan S3) — o'sha, aks holda
+  MEDIA_ROOT/exports/ (lokal disk). Fayl yo'lida tasodifiy token bor.
+  Import fayllari — o'sha storage da imports/ ostida.
+
+ImportJob hayot sikli:
+  pending  → fayl saqlandi, navbatda (run_import_job)
+  running  → validatsiya (rows_processed / rows_total), so'ng yozish (rows_written / rows_planned)
+  done     → natija: created / updated / skipped / errors. dry_run job fayli saqlanib
+             qoladi — POST .../commit/ xuddi shu faylni yozish uchun qayta navbatga qo'yadi
+  failed   → fayl darajasidagi xato (header, limit) yoki osilib qolgan
+  expired  → dry_run fayli IMPORT_JOB_TTL_HOURS dan keyin o'chirildi
+"""
+
+import uuid
+
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage, storages
+from django.db import models
+from django.db.models import Q, UniqueConstraint
+
+from store.models import Store
+
+
+# ============================================================
+# CHOICES
+# ============================================================
+
+class ExportFormat(models.TextChoices):
+    EXCEL = 'excel',    'Excel (.xlsx)'
+    PDF   = 'pdf',      'PDF'
+    CSV   = 'csv',      'CSV'
+    JSONL = 'jsonl.gz', 'JSON Lines (.jsonl.gz)'
+
+
+class ExportJobStatus(models.TextChoices):
+    PENDING = 'pending', 'Navbatda'
+    RUNNING = 'running', 'Bajarilmoqda'
+    DONE    = 'done',    'Tayyor'
+    FAILED  = 'failed',  'Xato'
+    EXPIRED = 'expired', "Muddati o'tgan"
+
+
+ACTIVE_EXPORT_STATUSES = (ExportJobStatus.PENDING, ExportJobStatus.RUNNING)
+
+
+class ImportJobStatus(models.TextChoices):
+    PENDING = 'pending', 'Navbatda'
+    RUNNING = 'running', 'Bajarilmoqda'
+    DONE    = 'done',    'Tayyor'
+    FAILED  = 'failed',  'Xato'
+    EXPIRED = 'expired', "Muddati o'tgan"
+
+
+ACTIVE_IMPORT_STATUSES = (ImportJobStatus.PENDING, ImportJobStatus.RUNNING)
+
+
+# ============================================================
+# SAQLASH JOYI
+# ============================================================
+
+def export_storage():
+    """Artefaktlar saqlanadigan storage: STORAGES['exports'] yoki lokal MEDIA_ROOT."""
+    if 'exports' in settings.STORAGES:
+        return storages['exports']
+    return FileSystemStorage()
+
+
+def export_upload_to(instance, filename: str) -> str:
+    """exports/{store_id}/{tasodifiy_token}/{fayl_nomi} — yo'lni taxmin qilib bo'lmaydi."""
+    return f"exports/{instance.store_id}/{uuid.uuid4().hex}/{filename}"
+
+
+def import_upload_to(instance, filename: str) -> str:
+    """imports/{store_id}/{tasodifiy_token}/{fayl_nomi}"""
+    return f"imports/{instance.store_id}/{uuid.uuid4().hex}/{filename}"
+
+
+# ============================================================
+# EXPORT JOB
+# ============================================================
+
+class ExportJob(models.Model):
+    """
+    Fon rejimidagi eksport (Celery task: export.tasks.run_export_job).
+
+    kind   — eksport turi (export.views.EXPORT_VIEWS kaliti: sales, expenses, ...)
+    params — so'rov parametrlari (date_from, branch, ...) — task shular bilan
+             ExportSpec ni qayta quradi.
+    """
+    store          = models.ForeignKey(
+        Store,
+        on_delete=models.CASCADE,
+        related_name='export_jobs',
+        verbose_name="Do'kon"
+    )
+    worker         = models.ForeignKey(
+        'accaunt.Worker',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='export_jobs',
+        verbose_name="Hodim"
+    )
+    kind           = models.CharField(
+        max_length=30,
+        verbose_name="Eksport turi"
+    )
+    file_format    = models.CharField(
+        max_length=10,
+        choices=ExportFormat.choices,
+        default=ExportFormat.EXCEL,
+        verbose_name="Format"
+    )
+    params         = models.JSONField(
+        default=dict,
+        blank=True,
+        verbose_name="Parametrlar"
+    )
+    params_hash    = models.CharField(
+        max_length=64,
+        verbose_name="Parametrlar xeshi"
+    )
+    status         = models.CharField(
+        max_length=10,
+        choices=ExportJobStatus.choices,
+        default=ExportJobStatus.PENDING,
+        verbose_name="Holati"
+    )
+    rows_processed = models.PositiveIntegerField(
+        default=0,
+        verbose_name="Qayta ishlangan qatorlar"
+    )
+    rows_total     = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        verbose_name="Jami qatorlar (taxminiy)"
+    )
+    file           = models.FileField(
+        upload_to=export_upload_to,
+        storage=export_storage,
+        max_length=255,
+        blank=True,
+        verbose_name="Fayl"
+    )
+    file_name      = models.CharField(
+        max_length=100,
+        blank=True,
+        verbose_name="Fayl nomi"
+    )
+    file_size      = models.PositiveBigIntegerField(
+        default=0,
+        verbose_name="Fayl hajmi (bayt)"
+    )
+    error          = models.TextField(
+        blank=True,
+        verbose_name="Xato"
+    )
+    created_on     = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name="Yaratilgan vaqti"
+    )
+    started_on     = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name="Boshlangan vaqti"
+    )
+    finished_on    = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name="Tugagan vaqti"
+    )
+    expires_at     = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name="Amal qilish muddati"
+    )
+
+    class Meta:
+        verbose_name        = 'Eksport vazifasi'
+        verbose_name_plural = 'Eksport vazifalari'
+        ordering            = ['-created_on']
+        indexes             = [
+            models.Index(fields=['store', 'params_hash'], name='export_job_dedup_idx'),
+            models.Index(fields=['status', 'expires_at'], name='export_job_cleanup_idx'),
+        ]
+        constraints         = [
+            # Bir xil parametrli faol job do'konda faqat bitta (parallel so'rovlar poygasi)
+            UniqueConstraint(
+                fields=['store', 'params_hash'],
+                condition=Q(status__in=['pending', 'running']),
+                name='export_job_one_active',
+            ),
+        ]
+
+    def __str__(self):
+        return f"ExportJob #{self.pk} {self.kind}.{self.file_format} ({self.status})"
+
+    @property
+    def progress(self) -> int | None:
+        """Foiz (0–100) yoki None (jami noma'lum)."""
+        if self.status == ExportJobStatus.DONE:
+            return 100
+        if not self.rows_total:
+            return None
+        return min(99, self.rows_processed * 100 // self.rows_total)
+
+
+# ============================================================
+# IMPORT JOB
+# ============================================================
+
+class ImportJob(models.Model):
+    """
+    Fon rejimidagi import (Celery task: export.tasks.run_import_job).
+
+    kind    — import turi (export.utils.importer.IMPORTERS kaliti: products, customers, ...)
+    mode    — create | upsert (ImportMode)
+    dry_run — faqat validatsiya: natija hisoblanadi, bazaga yozilmaydi
+    errors  — qator xatolari [{row, error}] (IMPORT_JOB_MAX_ERRORS gacha; jami — error_count)
+    """
+    store          = models.ForeignKey(
+        Store,
+        on_delete=models.CASCADE,
+        related_name='import_jobs',
+        verbose_name="Do'kon"
+    )
+    worker         = models.ForeignKey(
+        'accaunt.Worker',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='import_jobs',
+        verbose_name="Hodim"
+    )
+    kind           = models.CharField(
+        max_length=30,
+        verbose_name="Import turi"
+    )
+    mode           = models.CharField(
+        max_length=10,
+        default='create',
+        verbose_name="Rejim"
+    )
+    dry_run        = models.BooleanField(
+        default=False,
+        verbose_name="Faqat tekshirish"
+    )
+    status         = models.CharField(
+        max_length=10,
+        choices=ImportJobStatus.choices,
+        default=ImportJobStatus.PENDING,
+        verbose_name="Holati"
+    )
+    file           = models.FileField(
+        upload_to=import_upload_to,
+        storage=export_storage,
+        max_length=255,
+        blank=True,
+        verbose_name="Yuklangan fayl"
+    )
+    file_name      = models.CharField(
+        max_length=100,
+        blank=True,
+        verbose_name="Fayl nomi"
+    )
+    rows_total     = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        verbose_name="Jami qatorlar (taxminiy)"
+    )
+    rows_processed = models.PositiveIntegerField(
+        default=0,
+        verbose_name="Tekshirilgan qatorlar"
+    )
+    rows_planned   = models.PositiveIntegerField(
+        default=0,
+        verbose_name="Yoziladigan qatorlar"
+    )
+    rows_written   = models.PositiveIntegerField(
+        default=0,
+        verbose_name="Yozilgan qatorlar"
+    )
+    created        = models.PositiveIntegerField(
+        default=0,
+        verbose_name="Yaratilgan"
+    )
+    updated        = models.PositiveIntegerField(
+        default=0,
+        verbose_name="Yangilangan"
+    )
+    skipped        = models.PositiveIntegerField(
+        default=0,
+        verbose_name="O'tkazib yuborilgan"
+    )
+    error_count    = models.PositiveIntegerField(
+        default=0,
+        verbose_name="Xatoli qatorlar"
+    )
+    errors         = models.JSONField(
+        default=list,
+        blank=True,
+        verbose_name="Qator xatolari"
+    )
+    error          = models.TextField(
+        blank=True,
+        verbose_name="Xato"
+    )
+    created_on     = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name="Yaratilgan vaqti"
+    )
+    started_on     = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name="Boshlangan vaqti"
+    )
+    finished_on    = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name="Tugagan vaqti"
+    )
+
+    class Meta:
+        verbose_name        = 'Import vazifasi'
+        verbose_name_plural = 'Import vazifalari'
+        ordering            = ['-created_on']
+        indexes             = [
+            models.Index(fields=['store', 'created_on'], name='import_job_store_idx'),
+            models.Index(fields=['status', 'finished_on'], name='import_job_cleanup_idx'),
+        ]
+
+    def __str__(self):
+        suffix = ' dry-run' if self.dry_run else ''
+        return f"ImportJob #{self.pk} {self.kind}{suffix} ({self.status})"
+
+    @property
+    def progress(self) -> int | None:
+        """
+        Foiz (0–100) yoki None (jami noma'lum). dry_run — faqat validatsiya;
+        aks holda validatsiya 0–50, yozish 50–100.
+        """
+        if self.status == ImportJobStatus.DONE:
+            return 100
+        if self.rows_planned:
+            return min(99, 50 + self.rows_written * 50 // self.rows_planned)
+        if not self.rows_total:
+            return None
+        share = 100 if self.dry_run else 50
+        return min(99, self.rows_processed * share // self.rows_total)
@@ -0,0 +1,58 @@
+"""
+============================================================
+EXPORT APP — Serializer'lar
+============================================================
+Serializer'lar:
+  ExportJobSerializer — fon eksporti holati, progress, yuklab olish havolasi
+  ImportJobSerializer — fon importi holati, progress, natija va qator xatolari
+"""
+
+from rest_framework import serializers
+
+from .models import ExportJob, ExportJobStatus, ImportJob, ImportJobStatus
+
+
+class ExportJobSerializer(serializers.ModelSerializer):
+    """Fon eksporti. GET /api/v1/export/jobs/{id}/"""
+    status_display = serializers.CharField(source='get_status_display', read_only=True)
+    progress       = serializers.IntegerField(read_only=True)
+    download_url   = serializers.SerializerMethodField()
+
+    class Meta:
+        model  = ExportJob
+        fields = (
+            'id', 'kind', 'file_format', 'params',
+            'status', 'status_display',
+            'rows_processed', 'rows_total', 'progress',
+            'file_name', 'file_size', 'download_url', 'error',
+            'created_on', 'started_on', 'finished_on', 'expires_at',
+        )
+        read_only_fields = fields
+
+    def get_download_url(self, obj: ExportJob) -> str | None:
+        if obj.status != ExportJobStatus.DONE:
+            return None
+        path    = f'/api/v1/export/jobs/{obj.pk}/download/'
+        request = self.context.get('request')
+        return request.build_absolute_uri(path) if request else path
+
+
+class ImportJobSerializer(serializers.ModelSerializer):
+    """Fon importi. GET /api/v1/export/import-jobs/{id}/"""
+    status_display = serializers.CharField(source='get_status_display', read_only=True)
+    progress       = serializers.IntegerField(read_only=True)
+    can_commit     = serializers.SerializerMethodField()
+
+    class Meta:
+        model  = ImportJob
+        fields = (
+            'id', 'kind', 'mode', 'dry_run', 'file_name',
+            'status', 'status_display',
+            'rows_total', 'rows_processed', 'rows_planned', 'rows_written', 'progress',
+            'created', 'updated', 'skipped', 'error_count', 'errors', 'error', 'can_commit',
+            'created_on', 'started_on', 'finished_on',
+        )
+        read_only_fields = fields
+
+    def get_can_commit(self, obj: ImportJob) -> bool:
+        return obj.dry_run and obj.status == ImportJobStatus.DONE and bool(obj.file)
@@ -0,0 +1,95 @@
+"""
+============================================================
+EXPORT APP — Celery Tasklar
+============================================================
+Tasklar:
+  run_export_job      — ExportJob ni bajarish (fayl yaratish va saqlash)
+  cleanup_export_jobs — muddati o'tgan fayllarni o'chirish, osilib qolgan joblarni yopish
+  run_import_job      — ImportJob ni bajarish (validatsiya → bo'laklab yozish)
+  cleanup_import_jobs — eski dry-run fayllarini o'chirish, osilib qolgan importlarni yopish
+
+Navbat:
+  run_export_job / run_import_job 'exports' navbatiga yo'naltiriladi (CELERY_TASK_ROUTES) —
+  og'ir eksportlar boshqa vazifalar bilan bitta worker da raqobatlashmaydi:
+    celery -A config worker -Q exports --concurrency=2 --prefetch-multiplier=1
+
+Celery Beat jadval (config/settings/base.py da belgilangan):
+  cleanup_export_jobs → har 30 daqiqada
+  cleanup_import_jobs → har 30 daqiqada (:15, :45)
+"""
+
+import logging
+
+from celery import shared_task
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(
+    name='export.tasks.run_export_job',
+    acks_late=True,              # worker o'lsa — task qayta yetkaziladi (claim takrorni to'xtatadi)
+    soft_time_limit=60 * 60,     # 1 soat
+    time_limit=60 * 60 + 120,
+)
+def run_export_job(job_id: int):
+    """ExportJob #job_id ni bajaradi. Natija — job holati (done/failed)."""
+    from .utils.jobs import execute_export_job
+
+    job = execute_export_job(job_id)
+    if job is None:
+        logger.info("ExportJob #%s allaqachon olingan — o'tkazib yuborildi", job_id)
+        return None
+    logger.info(
+        "ExportJob #%s: %s, %s qator, %s bayt",
+        job.pk, job.status, job.rows_processed, job.file_size,
+    )
+    return job.status
+
+
+@shared_task(name='export.tasks.cleanup_export_jobs')
+def cleanup_export_jobs():
+    """Muddati o'tgan artefaktlarni o'chirish va osilib qolgan joblarni yopish."""
+    from .utils.jobs import cleanup_expired_jobs
+
+    result = cleanup_expired_jobs()
+    if result['expired'] or result['stale']:
+        logger.info(
+            "Eksport tozalash: muddati o'tgan=%s, osilib qolgan=%s",
+            result['expired'], result['stale'],
+        )
+    return result
+
+
+@shared_task(
+    name='export.tasks.run_import_job',
+    acks_late=True,
+    soft_time_limit=60 * 60,
+    time_limit=60 * 60 + 120,
+)
+def run_import_job(job_id: int):
+    """ImportJob #job_id ni bajaradi. Natija — job holati (done/failed)."""
+    from .utils.jobs import execute_import_job
+
+    job = execute_import_job(job_id)
+    if job is None:
+        logger.info("ImportJob #%s allaqachon olingan — o'tkazib yuborildi", job_id)
+        return None
+    logger.info(
+        "ImportJob #%s: %s, %s qator, yaratildi=%s, yangilandi=%s, xato=%s",
+        job.pk, job.status, job.rows_processed, job.created, job.updated, job.error_count,
+    )
+    return job.status
+
+
+@shared_task(name='export.tasks.cleanup_import_jobs')
+def cleanup_import_jobs():
+    """Eski dry-run fayllarini o'chirish va osilib qolgan importlarni yopish."""
+    from .utils.jobs import cleanup_import_jobs as cleanup
+
+    result = cleanup()
+    if result['expired'] or result['stale']:
+        logger.info(
+            "Import tozalash: muddati o'tgan=%s, osilib qolgan=%s",
+            result['expired'], result['stale'],
+        )
+    return result
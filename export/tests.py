@@ -0,0 +1,565 @@
+"""
+============================================================
+EXPORT APP — Testlar
+============================================================
+Test guruhlari:
+  1. Eksport — write-only Excel dvigateli, oqimli csv / jsonl.gz formatlari,
+     fon rejimi (ExportJob: progress, yuklab olish, deduplikatsiya, tozalash)
+  2. Import — oqimli .xlsx/.csv parser (header, limitlar, turlar), bulk pipeline
+     (xotirada validatsiya, barcode bloki, upsert), dry-run va fon rejimi
+     (ImportJob: bashorat, progress, xuddi shu fayl bilan commit)
+"""
+
+import csv
+import gzip
+import io
+import json
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from decimal import Decimal
+
+import openpyxl
+
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from rest_framework.test import APITestCase
+
+from accaunt.models import ALL_PERMISSIONS, CustomUser, Worker, WorkerRole
+from store.models import Store
+from warehouse.models import Category, Product, Stock, SubCategory, Supplier, Warehouse
+
+
+class ExportTestMixin:
+    """Do'kon + owner hodim + autentifikatsiya; mahsulot, obuna va yuklash yordamchilari."""
+
+    def setUp(self):
+        self.store = Store.objects.create(name="Test do'kon")
+        self.user  = CustomUser.objects.create_user(
+            username='owner', email='owner@test.uz',
+            phone1='+998901234567', password='Test12345',
+        )
+        self.worker = Worker.objects.create(
+            user=self.user, store=self.store,
+            role=WorkerRole.OWNER, permissions=list(ALL_PERMISSIONS),
+        )
+        self.client.force_authenticate(self.user)
+
+    def _make_products(self, count: int, warehouse=None):
+        """count ta mahsulot (ixtiyoriy: ombordagi qoldiq bilan) yaratadi."""
+        start    = Product.objects.filter(store=self.store).count()
+        products = []
+        for i in range(start, start + count):
+            product = Product.objects.create(
+                store=self.store, name=f"Mahsulot {i:03d}",
+                sale_price=Decimal('10000'), barcode=f"20{i:011d}",
+            )
+            if warehouse:
+                Stock.objects.create(product=product, warehouse=warehouse, quantity=Decimal('5'))
+            products.append(product)
+        return products
+
+    def _subscribe(self, **features):
+        """Do'konga faol obuna (PRO reja, berilgan has_* funksiyalar bilan)."""
+        from subscription.models import PlanType, Subscription, SubscriptionPlan, SubscriptionStatus
+        plan = SubscriptionPlan.objects.create(plan_type=PlanType.PRO, name='Pro', **features)
+        today = timezone.localdate()
+        Subscription.objects.update_or_create(
+            store=self.store,
+            defaults=dict(plan=plan, status=SubscriptionStatus.ACTIVE,
+                          start_date=today, end_date=today + timedelta(days=30)),
+        )
+
+    def _upload(self, url: str, headers: list, rows: list):
+        """Xotirada .xlsx yasab import endpointiga yuboradi → (data, so'rovlar soni)."""
+        wb = openpyxl.Workbook()
+        ws = wb.active
+        ws.append(headers)
+        for row in rows:
+            ws.append(row)
+        buffer = io.BytesIO()
+        wb.save(buffer)
+        buffer.seek(0)
+        buffer.name = 'import.xlsx'
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(url, {'file': buffer}, format='multipart')
+        self.assertEqual(response.status_code, 200, getattr(response, 'data', None))
+        return response.data, len(ctx.captured_queries)
+
+
+# ============================================================
+# 1. EKSPORT — OQIMLI EXCEL / CSV / JSONL.GZ
+# ============================================================
+
+class ExcelExportTest(ExportTestMixin, APITestCase):
+    """Eksport qatorlari generatordan bir marta o'qiladi, javob — vaqtinchalik fayldan oqim."""
+
+    def test_write_excel_from_generator(self):
+        from export.utils import excel
+
+        consumed = []
+
+        def rows():
+            for i in range(1, excel.EXCEL_WIDTH_SAMPLE + 11):
+                consumed.append(i)
+                yield [i, f"Mahsulot {i}", Decimal('-5') if i % 2 else Decimal('7.5'), None]
+
+        buffer = io.BytesIO()
+        excel.write_excel(buffer, ['#', 'Nomi', 'Farq', 'Izoh'], rows())
+        self.assertEqual(len(consumed), excel.EXCEL_WIDTH_SAMPLE + 10)
+
+        ws = openpyxl.load_workbook(io.BytesIO(buffer.getvalue())).active
+        self.assertEqual(ws.max_row, excel.EXCEL_WIDTH_SAMPLE + 11)
+        self.assertEqual(ws.freeze_panes, 'A2')
+        self.assertEqual(ws['A1'].style, excel.STYLE_HEADER)
+        self.assertEqual(ws['C2'].style, excel.STYLE_NUM_NEG)
+        self.assertEqual(ws['C3'].style, excel.STYLE_NUM_POS)
+        self.assertEqual(ws[f'B{ws.max_row}'].value, f"Mahsulot {excel.EXCEL_WIDTH_SAMPLE + 10}")
+
+    def test_write_pdf_paginated_from_generator(self):
+        from reportlab.platypus import Paragraph
+        from export.utils import pdf
+
+        def rows():
+            for i in range(1, 301):
+                yield [i, f"Mahsulot {i}", 'Juda uzun izoh matni ' * 5 if i % 50 == 0 else None]
+
+        buffer = io.BytesIO()
+        pdf.write_pdf(buffer, 'Hisobot & test', ['#', 'Nomi', 'Izoh'], rows())
+        content = buffer.getvalue()
+        self.assertTrue(content.startswith(b'%PDF'))
+        self.assertGreater(content.count(b'/Type /Page\n'), 3)
+
+        # Sig'adigan matn — oddiy satr; uzun matn oldindan qatorlarga bo'linadi;
+        # Paragraph — faqat so'zning o'zi ustunga sig'maganda
+        styles = pdf._report_styles(pdf._FONT_NAME)
+        self.assertEqual(pdf._cell('Mahsulot 1', 100, 10, styles['cell']), ('Mahsulot 1', 1))
+        wrapped, lines = pdf._cell('Juda uzun izoh matni ' * 5, 100, 10, styles['cell'])
+        self.assertEqual(wrapped.count('\n') + 1, lines)
+        self.assertGreater(lines, 1)
+        barcode, lines = pdf._cell('4780000000001' * 3, 40, 5, styles['cell'])
+        self.assertIsInstance(barcode, Paragraph)
+        self.assertGreater(lines, 1)
+
+    def test_reportlab_internals_used_by_pdf(self):
+        """_ReportDocTemplate tayanadigan reportlab ichki API — versiya yangilansa shu test yiqiladi."""
+        from django.http import FileResponse
+        from reportlab.platypus import PageBreak, Paragraph
+        from export.utils import pdf
+
+        styles = pdf._report_styles(pdf._FONT_NAME)
+        doc    = pdf._ReportDocTemplate(io.BytesIO(), pagesize=pdf.A4)
+        for name in ('_startBuild', '_endBuild', 'handle_flowable', 'clean_hanging'):
+            self.assertTrue(callable(getattr(doc, name, None)), name)
+
+        doc.open()
+        at_top, available = doc.fresh_frame()
+        self.assertTrue(at_top)
+        self.assertGreater(available, 0)
+        doc.add([Paragraph('1', styles['cell']), PageBreak(), Paragraph('2', styles['cell'])])
+        pages = doc.canv._doc.Pages.pages
+        self.assertEqual(len(pages), 1)
+        self.assertIsNotNone(pages[0].Contents)   # tayyor sahifa darhol siqilgan
+        self.assertIsNone(pages[0].stream)
+        doc.close()
+
+        response = pdf.make_pdf_response('hisobot.pdf', 'Hisobot', ['#'], iter([[1], [2]]))
+        self.assertIsInstance(response, FileResponse)
+        self.assertTrue(b''.join(response.streaming_content).startswith(b'%PDF'))
+        response.close()
+
+    def _export(self, url: str) -> tuple[int, bytes]:
+        """→ (so'rovlar soni, fayl tarkibi)"""
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+            content  = b''.join(response.streaming_content)
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries), content
+
+    def test_supplier_export_streamed_constant_queries(self):
+        self._subscribe(has_export=True)
+        for i in range(3):
+            Supplier.objects.create(store=self.store, name=f"Yetkazuvchi {i}", debt_balance=Decimal('100'))
+        few, _ = self._export('/api/v1/export/suppliers/')
+        for i in range(3, 30):
+            Supplier.objects.create(store=self.store, name=f"Yetkazuvchi {i}")
+
+        many, content = self._export('/api/v1/export/suppliers/?format=excel')
+        self.assertEqual(many, few)
+
+        ws = openpyxl.load_workbook(io.BytesIO(content)).active
+        self.assertEqual(ws.max_row, 31)
+        self.assertEqual([c.value for c in ws[2]][:2], [1, 'Yetkazuvchi 0'])
+        self.assertEqual(ws['F2'].value, 100)
+
+    def test_stock_export_csv_raw_values(self):
+        """csv — API kalitlari, xom Decimal qiymatlar, joylashuv SQL da."""
+        self._subscribe(has_export=True)
+        warehouse = Warehouse.objects.create(store=self.store, name='Asosiy ombor')
+        self._make_products(2, warehouse=warehouse)
+
+        _, content = self._export('/api/v1/export/stocks/?format=csv')
+        rows = list(csv.DictReader(io.StringIO(content.decode('utf-8-sig'))))
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[0]['product_name'], 'Mahsulot 000')
+        self.assertEqual(rows[0]['quantity'], '5.000')
+        self.assertEqual(rows[0]['location_type'], 'warehouse')
+        self.assertEqual(rows[0]['location_name'], 'Asosiy ombor')
+
+    def test_movement_export_jsonl_gz(self):
+        """jsonl.gz — har qatorda bitta JSON obyekt, gzip konteyner."""
+        self._subscribe(has_export=True)
+        warehouse = Warehouse.objects.create(store=self.store, name='Asosiy ombor')
+        product   = self._make_products(1)[0]
+        supplier  = Supplier.objects.create(store=self.store, name='Ulgurji savdo')
+        self.user.first_name = 'Ali'
+        self.user.save(update_fields=['first_name'])
+        response = self.client.post('/api/v1/warehouse/movements/', {
+            'product': product.id, 'warehouse': warehouse.id, 'movement_type': 'in',
+            'quantity': '3', 'unit_cost': '1500.50', 'supplier': supplier.id,
+        }, format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+
+        _, content = self._export('/api/v1/export/stock-movements/?format=jsonl.gz')
+        lines = gzip.decompress(content).decode('utf-8').splitlines()
+        self.assertEqual(len(lines), 1)
+        row = json.loads(lines[0])
+        self.assertEqual(row['movement_type'], 'in')
+        self.assertEqual(row['unit_cost'], '1500.50')
+        self.assertEqual(row['worker_name'], 'Ali')
+        self.assertEqual(row['supplier_name'], 'Ulgurji savdo')
+        self.assertTrue(row['created_on'].endswith('Z'))
+
+
+class ExportJobTest(ExportTestMixin, APITestCase):
+    """?async=1 → ExportJob (eager Celery): progress, fayl, dedup, muddati o'tishi."""
+
+    def setUp(self):
+        super().setUp()
+        self._subscribe(has_export=True)
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        override = override_settings(MEDIA_ROOT=self.media_root)
+        override.enable()
+        self.addCleanup(override.disable)
+        for i in range(5):
+            Supplier.objects.create(store=self.store, name=f"Yetkazuvchi {i}")
+
+    def _start(self, url: str):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.get(url)
+        self.assertIn(response.status_code, (200, 202), response.data)
+        return response
+
+    def test_async_export_done_and_downloadable(self):
+        response = self._start('/api/v1/export/suppliers/?format=csv&async=1&status=active')
+        self.assertEqual(response.status_code, 202)
+        job_id = response.data['data']['id']
+
+        job = self.client.get(f'/api/v1/export/jobs/{job_id}/').data
+        self.assertEqual(job['status'], 'done')
+        self.assertEqual(job['rows_total'], 5)
+        self.assertEqual(job['rows_processed'], 5)
+        self.assertEqual(job['progress'], 100)
+        self.assertEqual(job['params'], {'status': 'active'})
+        self.assertEqual(job['file_name'], 'yetkazib_beruvchilar.csv')
+
+        download = self.client.get(f'/api/v1/export/jobs/{job_id}/download/')
+        self.assertEqual(download.status_code, 200)
+        lines = b''.join(download.streaming_content).decode('utf-8-sig').splitlines()
+        self.assertEqual(len(lines), 1 + 5)
+
+    def test_identical_request_reuses_job(self):
+        first  = self._start('/api/v1/export/suppliers/?format=excel&async=1')
+        second = self._start('/api/v1/export/suppliers/?async=1&format=excel')
+        other  = self._start('/api/v1/export/suppliers/?format=csv&async=1')
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(first.data['data']['id'], second.data['data']['id'])
+        self.assertNotEqual(first.data['data']['id'], other.data['data']['id'])
+
+    def test_cleanup_expires_artifact(self):
+        from export.models import ExportJob
+        from export.tasks import cleanup_export_jobs
+
+        job_id = self._start('/api/v1/export/suppliers/?format=csv&async=1').data['data']['id']
+        job    = ExportJob.objects.get(pk=job_id)
+        path   = job.file.path
+        ExportJob.objects.filter(pk=job_id).update(expires_at=timezone.now() - timedelta(minutes=1))
+
+        self.assertEqual(cleanup_export_jobs()['expired'], 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'expired')
+        self.assertFalse(job.file)
+        self.assertFalse(os.path.exists(path))
+        self.assertEqual(self.client.get(f'/api/v1/export/jobs/{job_id}/download/').status_code, 409)
+
+    def _job(self, **fields):
+        from export.models import ExportJob
+        from export.views import SupplierExportView
+
+        return ExportJob.objects.create(
+            store=self.store, worker=self.worker, kind=SupplierExportView.export_kind,
+            file_format='csv', params={}, params_hash=f"hash-{ExportJob.objects.count()}", **fields,
+        )
+
+    def test_cleanup_stale_by_queue_and_run_time(self):
+        """pending — created_on dan, running — started_on dan eskiradi."""
+        from export.models import ExportJob
+        from export.utils.jobs import cleanup_expired_jobs
+
+        now, old = timezone.now(), timezone.now() - timedelta(days=1)
+        pending      = self._job()
+        queued_long  = self._job(status='running', started_on=now)
+        running_long = self._job(status='running', started_on=old)
+        ExportJob.objects.filter(pk__in=[pending.pk, queued_long.pk, running_long.pk]).update(created_on=old)
+
+        self.assertEqual(cleanup_expired_jobs()['stale'], 2)
+        statuses = dict(ExportJob.objects.values_list('pk', 'status'))
+        self.assertEqual(
+            (statuses[pending.pk], statuses[queued_long.pk], statuses[running_long.pk]),
+            ('failed', 'running', 'failed'),
+        )
+
+    def test_failed_job_not_resurrected(self):
+        """Bajarilish paytida cleanup failed qilgan job done bo'lib qolmaydi, fayl saqlanmaydi."""
+        from unittest import mock
+
+        from export.models import ExportJob
+        from export.utils.jobs import execute_export_job
+        from export.views import SupplierExportView
+
+        original = SupplierExportView.build_export
+
+        def build_export(view, store, params):
+            ExportJob.objects.filter(status='running').update(status='failed')   # parallel cleanup
+            return original(view, store, params)
+
+        job = self._job()
+        with mock.patch.object(SupplierExportView, 'build_export', build_export):
+            job = execute_export_job(job.pk)
+        self.assertEqual(job.status, 'failed')
+        self.assertFalse(job.file)
+        self.assertEqual([name for _, _, files in os.walk(self.media_root) for name in files], [])
+
+
+# ============================================================
+# 2. IMPORT — BULK PIPELINE
+# ============================================================
+
+class BulkImportTest(ExportTestMixin, APITestCase):
+    """Qatorlar xotirada tekshiriladi, yozish bo'laklab — so'rovlar soni qatorlarga bog'liq emas."""
+
+    def setUp(self):
+        super().setUp()
+        self._subscribe(has_export=True)
+
+    def _product_rows(self, count: int, start: int = 0) -> list:
+        return [[f"Yangi {i}", '', '', '1500', '1000', 'kg', ''] for i in range(start, start + count)]
+
+    def test_product_import_validation_and_barcode_block(self):
+        from export.views import PRODUCT_HEADERS
+
+        existing = self._make_products(1)[0]
+        rows = self._product_rows(3) + [
+            ['Yangi 0', '', '', '2000', '', 'dona', ''],              # faylda takror
+            [existing.name, '', '', '2000', '', 'dona', ''],          # bazada bor
+            ['Narxsiz', '', '', 'abc', '', 'dona', ''],               # noto'g'ri narx
+            ['Begona', '', '', '100', '', 'dona', existing.barcode],  # barcode band
+        ]
+        data, _ = self._upload('/api/v1/export/products/import/', PRODUCT_HEADERS, rows)
+
+        self.assertEqual((data['created'], data['updated'], data['skipped']), (3, 0, 2))
+        self.assertEqual([e['row'] for e in data['errors']], [5, 6, 7, 8])
+        self.assertIn('2-qator', data['errors'][0]['error'])
+
+        imported = Product.objects.filter(store=self.store, name__startswith='Yangi').order_by('barcode')
+        barcodes = [p.barcode for p in imported]
+        prefix   = f"20{self.store.id:05d}"
+        self.assertEqual([b[7:12] for b in barcodes], ['00001', '00002', '00003'])
+        self.assertTrue(all(b.startswith(prefix) and len(b) == 13 for b in barcodes))
+        self.assertEqual(imported[0].search_name, 'yangi 0')
+        self.assertEqual(imported[0].unit, 'kg')
+
+    def test_product_import_queries_do_not_scale(self):
+        from export.views import PRODUCT_HEADERS
+
+        _, small = self._upload('/api/v1/export/products/import/', PRODUCT_HEADERS, self._product_rows(5))
+        _, large = self._upload('/api/v1/export/products/import/', PRODUCT_HEADERS, self._product_rows(60, start=5))
+        self.assertEqual(small, large)
+        self.assertEqual(Product.objects.filter(store=self.store).count(), 65)
+
+    def test_product_upsert_updates_existing(self):
+        from export.views import PRODUCT_HEADERS
+
+        existing = self._make_products(1)[0]
+        rows = [[existing.name, '', '', '777', '500', 'dona', ''], ['Yangi', '', '', '10', '', 'dona', '']]
+        data, _ = self._upload('/api/v1/export/products/import/?mode=upsert', PRODUCT_HEADERS, rows)
+
+        self.assertEqual((data['created'], data['updated'], data['errors']), (1, 1, []))
+        existing.refresh_from_db()
+        self.assertEqual(existing.sale_price, Decimal('777'))
+        self.assertEqual(existing.barcode, f"20{0:011d}")   # mavjud barcode saqlanadi
+
+    def test_csv_upload_header_and_limits(self):
+        from django.core.files.uploadedfile import SimpleUploadedFile
+
+        url = '/api/v1/export/products/import/'
+
+        def post(content: str, name: str = 'import.csv'):
+            upload = SimpleUploadedFile(name, content.encode('utf-8-sig'), content_type='text/csv')
+            return self.client.post(url, {'file': upload}, format='multipart')
+
+        response = post("nom;sale_price;barcode\nCSV mahsulot;1500,5;\n;;\nIkkinchi;abc;\n")
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(response.data['created'], 1)
+        self.assertEqual(response.data['errors'], [{'row': 4, 'error': 'sale_price noto\'g\'ri: "abc"'}])
+        self.assertEqual(Product.objects.get(store=self.store, name='CSV mahsulot').sale_price, Decimal('1500.50'))
+
+        # Header mos emas — ma'lumot o'qilmaydi
+        response = post("name,price\nA,1\n")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('nom, sale_price', response.data['detail'])
+
+        # Qatorlar limiti oqim o'rtasida — hech narsa yozilmaydi
+        with override_settings(IMPORT_MAX_ROWS=2):
+            response = post("nom,sale_price\nL1,1\nL2,1\nL3,1\n")
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Product.objects.filter(store=self.store, name__startswith='L').exists())
+
+        with override_settings(IMPORT_MAX_FILE_MB=0):
+            response = post("nom,sale_price\nX,1\n")
+        self.assertEqual(response.status_code, 400)
+
+    def test_iter_upload_typed_rows(self):
+        from export.utils.upload import DECIMAL, Column, iter_upload
+
+        wb = openpyxl.Workbook()
+        ws = wb.active
+        ws.append(['Nom', 'Narx', 'Barcode', 'Ortiqcha'])
+        ws.append(['A', 12.5, 4600000000000.0, 'x'])
+        ws.append([None, None, None, None])
+        ws.append(['B', 'yo\'q', None, None])
+        buffer = io.BytesIO()
+        wb.save(buffer)
+        buffer.seek(0)
+
+        columns = (Column('nom', required=True), Column('narx', DECIMAL), Column('barcode'), Column('izoh'))
+        rows    = list(iter_upload(buffer, columns))
+        self.assertEqual([r.num for r in rows], [2, 4])
+        self.assertEqual(rows[0].values, {'nom': 'A', 'narx': Decimal('12.5'), 'barcode': '4600000000000', 'izoh': ''})
+        self.assertIsNone(rows[0].error)
+        self.assertIn('narx', rows[1].error)
+
+    def test_subcategory_and_supplier_import(self):
+        from export.views import SUBCAT_HEADERS, SUPPLIER_HEADERS
+
+        category = Category.objects.create(store=self.store, name='Ichimliklar')
+        data, _  = self._upload('/api/v1/export/subcategories/import/', SUBCAT_HEADERS, [
+            ['Gazli', 'ichimliklar'], ['Gazli', 'Ichimliklar'], ['Sharbat', "Yo'q"],
+        ])
+        self.assertEqual((data['created'], data['skipped'], len(data['errors'])), (1, 1, 2))
+        self.assertTrue(SubCategory.objects.filter(store=self.store, category=category, name='Gazli').exists())
+
+        # upsert — o'chirilgan subkategoriya qayta faollashmaydi
+        SubCategory.objects.filter(store=self.store, name='Gazli').update(status='inactive')
+        data, _ = self._upload('/api/v1/export/subcategories/import/?mode=upsert', SUBCAT_HEADERS, [
+            ['Gazli', 'Ichimliklar'], ['Sharbat', 'Ichimliklar'],
+        ])
+        self.assertEqual((data['created'], data['updated'], data['skipped']), (1, 0, 1))
+        self.assertEqual(SubCategory.objects.get(store=self.store, name='Gazli').status, 'inactive')
+
+        Supplier.objects.create(store=self.store, name='Eski')
+        data, _ = self._upload('/api/v1/export/suppliers/import/?mode=upsert', SUPPLIER_HEADERS, [
+            ['Eski', 'Yangi MCHJ', '', '', ''], ['Yangi', '', '+998901112233', '', ''],
+        ])
+        self.assertEqual((data['created'], data['updated']), (1, 1))
+        self.assertEqual(Supplier.objects.get(store=self.store, name='Eski').company, 'Yangi MCHJ')
+
+
+class ImportJobTest(ExportTestMixin, APITestCase):
+    """?dry_run=1 / ?async=1 → ImportJob (eager Celery): bashorat, progress, commit, fayl tozalanishi."""
+
+    URL = '/api/v1/export/products/import/'
+
+    def setUp(self):
+        super().setUp()
+        self._subscribe(has_export=True)
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        override = override_settings(MEDIA_ROOT=self.media_root)
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def _file(self, rows: list):
+        from export.views import PRODUCT_HEADERS
+
+        wb = openpyxl.Workbook()
+        ws = wb.active
+        ws.append(PRODUCT_HEADERS)
+        for row in rows:
+            ws.append(row)
+        buffer = io.BytesIO()
+        wb.save(buffer)
+        buffer.seek(0)
+        buffer.name = 'import.xlsx'
+        return buffer
+
+    def _rows(self) -> list:
+        return [
+            ['Yangi 1', '', '', '1500', '', 'dona', ''],
+            ['Yangi 2', '', '', '2500', '', 'dona', ''],
+            ['Narxsiz', '', '', 'abc', '', 'dona', ''],
+        ]
+
+    def test_sync_dry_run_writes_nothing(self):
+        response = self.client.post(f'{self.URL}?dry_run=1', {'file': self._file(self._rows())}, format='multipart')
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual((response.data['created'], len(response.data['errors'])), (2, 1))
+        self.assertTrue(response.data['dry_run'])
+        self.assertFalse(Product.objects.filter(store=self.store).exists())
+
+    def test_async_dry_run_then_commit_same_file(self):
+        from export.models import ImportJob
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                f'{self.URL}?async=1&dry_run=1', {'file': self._file(self._rows())}, format='multipart',
+            )
+        self.assertEqual(response.status_code, 202, response.data)
+        job_id = response.data['data']['id']
+
+        job = self.client.get(f'/api/v1/export/import-jobs/{job_id}/').data
+        self.assertEqual(job['status'], 'done')
+        self.assertTrue(job['dry_run'])
+        self.assertEqual((job['rows_total'], job['rows_processed'], job['progress']), (3, 3, 100))
+        self.assertEqual((job['created'], job['error_count']), (2, 1))
+        self.assertEqual(job['errors'][0]['row'], 4)
+        self.assertTrue(job['can_commit'])
+        self.assertFalse(Product.objects.filter(store=self.store).exists())
+
+        path = ImportJob.objects.get(pk=job_id).file.path
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(f'/api/v1/export/import-jobs/{job_id}/commit/')
+        self.assertEqual(response.status_code, 202, response.data)
+
+        job = self.client.get(f'/api/v1/export/import-jobs/{job_id}/').data
+        self.assertEqual((job['status'], job['dry_run'], job['rows_written']), ('done', False, 2))
+        self.assertFalse(job['can_commit'])
+        self.assertEqual(Product.objects.filter(store=self.store).count(), 2)
+        self.assertFalse(os.path.exists(path))
+
+        # Ikkinchi marta commit — mumkin emas
+        self.assertEqual(self.client.post(f'/api/v1/export/import-jobs/{job_id}/commit/').status_code, 409)
+
+    def test_async_bad_header_rejected_before_queueing(self):
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        from export.models import ImportJob
+
+        upload   = SimpleUploadedFile('import.csv', b'name,price\nA,1\n', content_type='text/csv')
+        response = self.client.post(f'{self.URL}?async=1', {'file': upload}, format='multipart')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(ImportJob.objects.exists())
@@ -0,0 +1,58 @@
+"""
+============================================================
+CSV HELPER — oqimli (streaming) javob
+============================================================
+Funksiyalar:
+  iter_csv                    — headers + rows (iterator) → CSV matn bo'laklari
+  make_csv_streaming_response — headers + rows (iterator) → StreamingHttpResponse (.csv)
+
+Qatorlar generator/iterator sifatida beriladi — butun fayl xotirada
+yig'ilmaydi. Qatorlar CSV_BATCH_ROWS tadan csv.writer.writerows() bilan
+(C darajasida) yoziladi va bitta bo'lak bo'lib yuboriladi — har bir qator
+uchun alohida Python obyekti/yield yo'q. values_list() kortejlari to'g'ridan-
+to'g'ri berilishi mumkin: Decimal va sana qiymatlari str() orqali yoziladi.
+UTF-8 BOM bilan boshlanadi (Excel kirill/lotin harflarni to'g'ri ochishi uchun).
+"""
+
+import csv
+import io
+import itertools
+
+from django.http import StreamingHttpResponse
+
+
+# Bitta bo'lakdagi qatorlar soni
+CSV_BATCH_ROWS = 1000
+
+
+def iter_csv(headers: list[str], rows):
+    """headers + rows → CSV matn bo'laklari (generator)."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    buffer.write('\ufeff')
+    writer.writerow(headers)
+
+    rows = iter(rows)
+    while True:
+        writer.writerows(itertools.islice(rows, CSV_BATCH_ROWS))
+        chunk = buffer.getvalue()
+        if not chunk:
+            return
+        yield chunk
+        buffer.seek(0)
+        buffer.truncate()
+
+
+def make_csv_streaming_response(filename: str, headers: list[str], rows) -> StreamingHttpResponse:
+    """
+    headers: ['Sana', 'Summa', ...]
+    rows:    iterator — [['01.01.2026', 1000], ...] yoki values_list() kortejlari
+
+    → StreamingHttpResponse (Content-Type: text/csv)
+    """
+    response = StreamingHttpResponse(
+        iter_csv(headers, rows),
+        content_type='text/csv; charset=utf-8',
+    )
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
@@ -3,17 +3,36 @@
 EXCEL HELPER — openpyxl asosida
 ============================================================
 Funksiyalar:
-  make_excel_response   — headers + rows → HttpResponse (.xlsx)
+  write_excel           — headers + rows (istalgan iterator) → fayl obyekti (.xlsx)
+  make_excel_response   — write_excel + vaqtinchalik fayl → FileResponse (oqimli)
   make_template         — bo'sh shablon faylini yaratish
-  parse_excel_upload    — yuklangan faylni o'qib dict list qaytarish
+
+Import fayllarini o'qish — export/utils/upload.py (iter_upload: .xlsx / .csv oqimi).
+
+Export dvigateli (write_excel):
+  - openpyxl write-only rejimi: qatorlar xotirada saqlanmaydi, to'g'ridan-to'g'ri
+    diskdagi XML ga yoziladi. rows — ro'yxat emas, generator bo'lishi mumkin
+    (masalan, queryset.values_list(...).iterator(chunk_size=...)).
+  - Stillar — nomlangan (NamedStyle), workbook da bir marta ro'yxatdan o'tadi;
+    har bir katakka yangi Font/Alignment obyekti yaratilmaydi.
+  - Ustun kengligi — faqat birinchi EXCEL_WIDTH_SAMPLE qatordan hisoblanadi
+    (butun ma'lumotni ikkinchi marta aylanib chiqish yo'q).
+  - Tayyor fayl vaqtinchalik faylga yoziladi va FileResponse orqali bo'laklab
+    yuboriladi — worker xotirasida fayl nusxasi saqlanmaydi.
+  Natija: qatorlar soni oshsa ham xotira sarfi deyarli o'zgarmaydi
+  (benchmark: python manage.py benchmark_excel_export).
 """
 
 import io
+import itertools
+import tempfile
+from decimal import Decimal
 
 import openpyxl
-from openpyxl.styles import Alignment, Font, PatternFill
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Font, NamedStyle, PatternFill
 from openpyxl.utils import get_column_letter
-from django.http import HttpResponse
+from django.http import FileResponse, HttpResponse
 
 
 # ============================================================
@@ -25,62 +44,115 @@ HEADER_FILL  = PatternFill(fill_type='solid', fgColor='2E75B6')
 HEADER_ALIGN = Alignment(horizontal='center', vertical='center', wrap_text=True)
 DATA_ALIGN   = Alignment(vertical='center', wrap_text=True)
 
+XLSX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+# Ustun kengligini hisoblash uchun namunaviy qatorlar soni
+EXCEL_WIDTH_SAMPLE = 500
+# FileResponse bo'lagi (bayt)
+EXCEL_STREAM_BLOCK = 64 * 1024
+
+# Nomlangan stillar — har bir workbook ga bir marta qo'shiladi
+STYLE_HEADER   = 'crm_header'
+STYLE_TEXT     = 'crm_text'
+STYLE_NUM_POS  = 'crm_num_pos'
+STYLE_NUM_NEG  = 'crm_num_neg'
+
+
+def _named_styles() -> list[NamedStyle]:
+    return [
+        NamedStyle(name=STYLE_HEADER,  font=HEADER_FONT, fill=HEADER_FILL, alignment=HEADER_ALIGN),
+        NamedStyle(name=STYLE_TEXT,    alignment=DATA_ALIGN),
+        NamedStyle(name=STYLE_NUM_POS, font=Font(color='00B050'), alignment=DATA_ALIGN),
+        NamedStyle(name=STYLE_NUM_NEG, font=Font(color='FF0000'), alignment=DATA_ALIGN),
+    ]
+
 
 # ============================================================
 # ASOSIY FUNKSIYALAR
 # ============================================================
 
-def make_excel_response(filename: str, headers: list[str], rows: list[list]) -> HttpResponse:
-    """
-    headers: ['Nomi', 'Miqdori', ...]
-    rows:    [['Mahsulot A', 10, ...], ...]
+def _is_number(val) -> bool:
+    return isinstance(val, (int, float, Decimal)) and not isinstance(val, bool)
 
-    → HttpResponse (Content-Type: application/vnd.openxmlformats...)
-    """
-    wb = openpyxl.Workbook()
-    ws = wb.active
-    ws.title = 'Ma\'lumotlar'
-    ws.row_dimensions[1].height = 32
 
-    # Header qator
-    for col_idx, header in enumerate(headers, start=1):
-        cell = ws.cell(row=1, column=col_idx, value=header)
-        cell.font  = HEADER_FONT
-        cell.fill  = HEADER_FILL
-        cell.alignment = HEADER_ALIGN
+def _column_widths(headers: list[str], sample: list) -> list[float]:
+    """Ustun kengligi: sarlavha va namunaviy qatorlardagi eng uzun qiymat (maks 40)."""
+    widths = [len(str(h)) for h in headers]
+    for row in sample:
+        for col_idx, val in enumerate(row[:len(widths)]):
+            if val is not None:
+                widths[col_idx] = max(widths[col_idx], len(str(val)))
+    return [min(w + 4, 40) for w in widths]
 
-    # Ma'lumot qatorlari
-    for row_idx, row in enumerate(rows, start=2):
-        ws.row_dimensions[row_idx].height = 20
-        for col_idx, val in enumerate(row, start=1):
-            cell = ws.cell(row=row_idx, column=col_idx, value=val)
-            cell.alignment = DATA_ALIGN
-            # Musbat/manfiy sonlarni yashil/qizil rang
-            if isinstance(val, (int, float)) and col_idx > 1:
-                cell.font = Font(
-                    color='00B050' if val >= 0 else 'FF0000'
-                )
-
-    # Ustun kengliklarini avtomatik sozlash
-    for col_idx, header in enumerate(headers, start=1):
-        col_letter = get_column_letter(col_idx)
-        max_len = len(str(header))
-        for row in rows:
-            val = row[col_idx - 1] if col_idx - 1 < len(row) else ''
-            max_len = max(max_len, len(str(val)) if val is not None else 0)
-        ws.column_dimensions[col_letter].width = min(max_len + 4, 40)
 
-    # Freeze header
-    ws.freeze_panes = 'A2'
+def write_excel(target, headers: list[str], rows, sheet_title: str = "Ma'lumotlar") -> None:
+    """
+    headers: ['Nomi', 'Miqdori', ...]
+    rows:    [['Mahsulot A', 10, ...], ...] yoki istalgan iterator/generator
+    target:  fayl yo'li yoki yozish uchun ochilgan binary fayl obyekti
 
-    buffer = io.BytesIO()
-    wb.save(buffer)
-    buffer.seek(0)
+    rows faqat bir marta aylanib chiqiladi. Birinchi ustundan keyingi sonlar —
+    musbat yashil, manfiy qizil (avvalgi formatlash saqlangan).
+    """
+    wb = openpyxl.Workbook(write_only=True)
+    for style in _named_styles():
+        wb.add_named_style(style)
+
+    ws = wb.create_sheet(title=sheet_title)
+    ws.freeze_panes                  = 'A2'
+    ws.row_dimensions[1].height      = 32
+    ws.sheet_format.defaultRowHeight = 20
+    ws.sheet_format.customHeight     = True
+
+    # Ustun kengligi — yozishdan OLDIN o'rnatilishi shart (write-only)
+    rows   = iter(rows)
+    sample = list(itertools.islice(rows, EXCEL_WIDTH_SAMPLE))
+    for col_idx, width in enumerate(_column_widths(headers, sample), start=1):
+        ws.column_dimensions[get_column_letter(col_idx)].width = width
+
+    header_row = []
+    for header in headers:
+        cell       = WriteOnlyCell(ws, value=header)
+        cell.style = STYLE_HEADER
+        header_row.append(cell)
+    ws.append(header_row)
+
+    for row in itertools.chain(sample, rows):
+        out = []
+        for col_idx, val in enumerate(row):
+            if val is None or (col_idx == 0 and _is_number(val)):
+                out.append(val)
+                continue
+            cell = WriteOnlyCell(ws, value=val)
+            if _is_number(val):
+                cell.style = STYLE_NUM_POS if val >= 0 else STYLE_NUM_NEG
+            else:
+                cell.style = STYLE_TEXT
+            out.append(cell)
+        ws.append(out)
+
+    wb.save(target)
+
+
+def make_excel_response(filename: str, headers: list[str], rows) -> FileResponse:
+    """
+    headers: ['Nomi', 'Miqdori', ...]
+    rows:    [['Mahsulot A', 10, ...], ...] yoki generator (tavsiya etiladi)
 
-    response = HttpResponse(
-        buffer.getvalue(),
-        content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-    )
+    Fayl vaqtinchalik faylga yoziladi va bo'laklab yuboriladi.
+    Javob yopilganda vaqtinchalik fayl avtomatik o'chadi.
+    → FileResponse (Content-Type: application/vnd.openxmlformats...)
+    """
+    tmp = tempfile.TemporaryFile(suffix='.xlsx')
+    try:
+        write_excel(tmp, headers, rows)
+    except BaseException:
+        tmp.close()
+        raise
+    tmp.seek(0)
+
+    response = FileResponse(tmp, content_type=XLSX_CONTENT_TYPE)
+    response.block_size = EXCEL_STREAM_BLOCK
     response['Content-Disposition'] = f'attachment; filename="{filename}"'
     return response
 
@@ -121,41 +193,7 @@ def make_template(filename: str, headers: list[str], notes: dict[str, str] | Non
 
     response = HttpResponse(
         buffer.getvalue(),
-        content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+        content_type=XLSX_CONTENT_TYPE,
     )
     response['Content-Disposition'] = f'attachment; filename="{filename}"'
     return response
-
-
-def parse_excel_upload(file) -> list[dict]:
-    """
-    Yuklangan Excel faylni o'qib, dict list qaytaradi.
-    1-qator — header (kalit), 2-qatordan boshlab — ma'lumot.
-
-    Qaytaradi: [{'nom': 'Mahsulot A', 'sale_price': '5000', ...}, ...]
-    """
-    try:
-        wb = openpyxl.load_workbook(file, read_only=True, data_only=True)
-    except Exception:
-        raise ValueError("Fayl noto'g'ri formatda. Faqat .xlsx qabul qilinadi.")
-
-    ws = wb.active
-    rows = list(ws.iter_rows(values_only=True))
-
-    if not rows:
-        raise ValueError("Fayl bo'sh.")
-
-    headers = [str(h).strip() if h is not None else '' for h in rows[0]]
-    result  = []
-
-    for row_data in rows[1:]:
-        # Butunlay bo'sh qatorlarni o'tkazib yuborish
-        if all(v is None or str(v).strip() == '' for v in row_data):
-            continue
-        row_dict = {}
-        for h, v in zip(headers, row_data):
-            row_dict[h] = str(v).strip() if v is not None else ''
-        result.append(row_dict)
-
-    wb.close()
-    return result
@@ -0,0 +1,631 @@
+"""
+============================================================
+IMPORT PIPELINE — katta fayllarni bo'laklab bulk_create
+============================================================
+Klasslar:
+  RowError               — qator xatosi (javobdagi errors ro'yxatiga tushadi)
+  ImportResult           — natija: created / updated / skipped / errors / dry_run
+  ImportPlan             — validate() natijasi (yoziladigan obyektlar)
+  BulkImporter           — umumiy pipeline (asos klass)
+  ProductImporter        — mahsulotlar (nom + barcode unikal, barcode bloki)
+  CustomerImporter       — mijozlar
+  SupplierImporter       — yetkazib beruvchilar
+  SubCategoryImporter    — subkategoriyalar
+  StockMovementImporter  — kirim/chiqim (warehouse.movements.apply_movements)
+  IMPORTERS              — kind → importer (import view lari va ImportJob)
+
+Bosqichlar (BulkImporter.run = validate → commit):
+  1. O'qish      — iter_upload(file, columns) generatoridan birma-bir: turga keltirilgan,
+                   sxema bo'yicha tekshirilgan qatorlar (export/utils/upload.py)
+  2. Validatsiya — xotirada: preload() oldindan yuklagan nom/barcode to'plamlari
+                   bilan; fayl ichidagi takrorlar ham (birinchi uchragan qator qoladi)
+  3. Tayyorlash  — prepare(): yetishmagan barcodelar bitta blokda
+                   (allocate_barcodes), search_name (bulk_create save() chaqirmaydi)
+  ── validate() shu yerda tugaydi: dry_run=True — natija (created/updated = yoziladigan
+     qatorlar soni) qaytadi, bazaga hech narsa yozilmaydi. commit() xuddi shu rejani yozadi.
+  4. Yozish      — IMPORT_CHUNK_SIZE bo'laklarda bulk_create. Bo'lak IntegrityError
+                   bersa (parallel yozuv) — shu bo'lak qatorma-qator qayta yoziladi,
+                   xato aynan o'sha qatorga yoziladi.
+
+Rejimlar (?mode=):
+  create — mavjud yozuv o'tkazib yuboriladi (skipped), eski xatti-harakat
+  upsert — mavjud yozuv fayldagi qiymatlar bilan yangilanadi (updated):
+           unique_fields bo'lsa  → bulk_create(update_conflicts=True)
+           bo'lmasa (Customer)   → bulk_update (preload qilingan pk bo'yicha)
+
+So'rovlar soni qatorlar soniga bog'liq emas:
+  preload (1–3) + barcode bloki (1) + har bo'lakka 1 ta INSERT.
+"""
+
+from dataclasses import dataclass, field
+from decimal import Decimal
+
+from django.db import DatabaseError, transaction
+
+from config.search_utils import normalize_search_text
+from subscription.usage import PRODUCTS, add_usage, check_limit
+from trade.models import Customer, CustomerGroup
+from store.models import Branch
+from warehouse.models import Category, Product, ProductUnit, SubCategory, Supplier, Warehouse
+from warehouse.movements import MovementLine, apply_movements
+from warehouse.utils import allocate_barcodes, product_prefix_index
+
+from .upload import DECIMAL, Column
+
+
+IMPORT_CHUNK_SIZE = 1000
+
+
+class ImportMode:
+    CREATE = 'create'
+    UPSERT = 'upsert'
+    ALL    = (CREATE, UPSERT)
+
+
+class RowError(Exception):
+    """Qator validatsiya xatosi — xabar foydalanuvchiga qaytariladi."""
+
+
+def chunked(items: list, size: int = IMPORT_CHUNK_SIZE):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+@dataclass
+class ImportResult:
+    created: int  = 0
+    updated: int  = 0
+    skipped: int  = 0
+    errors:  list = field(default_factory=list)
+    dry_run: bool = False
+
+    def error(self, row_num: int, message: str) -> None:
+        self.errors.append({'row': row_num, 'error': message})
+
+    def as_dict(self) -> dict:
+        return {
+            'created': self.created,
+            'updated': self.updated,
+            'skipped': self.skipped,
+            'errors':  sorted(self.errors, key=lambda e: e['row']),
+            'dry_run': self.dry_run,
+        }
+
+
+@dataclass
+class ImportPlan:
+    """validate() natijasi — commit() shu rejani yozadi. [(qator_raqami, obyekt), ...]"""
+    new:     list = field(default_factory=list)
+    updates: list = field(default_factory=list)
+
+
+# ============================================================
+# UMUMIY PIPELINE
+# ============================================================
+
+class BulkImporter:
+    """
+    Asos klass. Voris aniqlaydi:
+      columns        — fayl sxemasi (Column ro'yxati): iter_upload va shablon uchun
+      model          — Django model
+      unique_fields  — upsert uchun ON CONFLICT maydonlari (None → bulk_update)
+      update_fields  — upsert da yangilanadigan maydonlar (bo'sh → mavjud yozuv o'tkazib yuboriladi)
+      usage_field    — StoreUsage hisoblagichi (bulk_create signal yubormaydi), None — yo'q
+      preload()      — mavjud yozuvlar: self.existing = {kalit: pk}
+      build(row)     — dict → saqlanmagan model obyekti (xato → RowError)
+      key(obj)       — tabiiy kalit (takror tekshiruvi)
+    Ixtiyoriy: describe(obj), check(obj, existing_pk), prepare(new, updates), after_import().
+    """
+    kind           = None    # IMPORTERS kaliti (ImportJob.kind)
+    columns        = ()
+    model          = None
+    unique_fields  = None
+    update_fields  = ()
+    usage_field    = None
+    progress_every = 1000    # validate() progressi har N qatorda
+
+    def __init__(self, store, mode: str = ImportMode.CREATE, chunk_size: int = IMPORT_CHUNK_SIZE, worker=None):
+        self.store      = store
+        self.mode       = mode
+        self.chunk_size = chunk_size
+        self.worker     = worker
+        self.existing   = {}
+
+    # ----------------------------------------------------------
+    # Voris uchun
+    # ----------------------------------------------------------
+
+    def preload(self) -> None:
+        raise NotImplementedError
+
+    def build(self, row: dict):
+        raise NotImplementedError
+
+    def key(self, obj) -> tuple:
+        raise NotImplementedError
+
+    def describe(self, obj) -> str:
+        return f'"{obj.name}"'
+
+    def check(self, obj, existing_pk) -> None:
+        """Qo'shimcha unikal tekshiruvlar (masalan barcode). Xato → RowError."""
+
+    def prepare(self, new: list, updates: list) -> None:
+        """Yozishdan oldin: avtomatik maydonlar (barcode, search_name)."""
+
+    def after_import(self) -> None:
+        """Yozishdan keyin: keshlar (bulk_create signal yubormaydi)."""
+
+    # ----------------------------------------------------------
+    # Yordamchilar
+    # ----------------------------------------------------------
+
+    def text(self, row: dict, key: str, field_name: str, required: bool = False) -> str:
+        """Qatordan matn: bo'sh/uzunlik tekshiruvi model maydonining max_length i bo'yicha."""
+        value = row.get(key) or ''
+        if required and not value:
+            raise RowError(f"{key} maydoni bo'sh.")
+        max_length = self.model._meta.get_field(field_name).max_length
+        if max_length and len(value) > max_length:
+            raise RowError(f"{key} juda uzun (maksimal {max_length} belgi).")
+        return value
+
+    def decimal(self, row: dict, key: str, field_name: str, required: bool = False) -> Decimal:
+        """Qatordan son (parser Decimal ga keltirgan): max_digits / decimal_places chegarasida."""
+        value = row.get(key)
+        if value is None:
+            if required:
+                raise RowError(f"{key} maydoni bo'sh.")
+            return Decimal('0')
+        model_field = self.model._meta.get_field(field_name)
+        limit = Decimal(10) ** (model_field.max_digits - model_field.decimal_places)
+        if abs(value) >= limit:
+            raise RowError(f'{key} juda katta: "{value}"')
+        return value.quantize(Decimal(1).scaleb(-model_field.decimal_places))
+
+    # ----------------------------------------------------------
+    # Pipeline: validate (dry-run va commit uchun umumiy) → commit
+    # ----------------------------------------------------------
+
+    def run(self, rows, dry_run: bool = False, on_validate=None, on_write=None) -> ImportResult:
+        """
+        rows — UploadRow iteratori (iter_upload). Yozish butun oqim o'qilgandan keyin
+        boshlanadi: oqim o'rtasida UploadError (qatorlar limiti) — hech narsa yozilmaydi.
+        dry_run=True — faqat validate(): created/updated — yoziladigan qatorlar soni.
+        on_validate(o'qilgan_qatorlar), on_write(yozilgan_qatorlar) — progress (ImportJob).
+        """
+        result = ImportResult(dry_run=dry_run)
+        plan   = self.validate(rows, result, on_progress=on_validate)
+        if dry_run:
+            result.created = len(plan.new)
+            result.updated = len(plan.updates)
+        else:
+            self.commit(plan, result, on_progress=on_write)
+        return result
+
+    def validate(self, rows, result: ImportResult, on_progress=None) -> 'ImportPlan':
+        """Butun faylni o'qib tekshiradi — bazaga yozmaydi. Qaytaradi: ImportPlan."""
+        self.preload()
+
+        plan  = ImportPlan()
+        seen  = {}   # kalit → birinchi qator raqami (fayl ichidagi takrorlar)
+        count = 0
+
+        for upload_row in rows:
+            count += 1
+            if on_progress and count % self.progress_every == 0:
+                on_progress(count)
+            row_num = upload_row.num
+            if upload_row.error:
+                result.error(row_num, upload_row.error)
+                continue
+            try:
+                obj = self.build(upload_row.values)
+            except RowError as exc:
+                result.error(row_num, str(exc))
+                continue
+
+            key = self.key(obj)
+            if key in seen:
+                result.skipped += 1
+                result.error(row_num, f"{self.describe(obj)} faylda takrorlangan ({seen[key]}-qator bilan) — o'tkazib yuborildi.")
+                continue
+            seen[key] = row_num
+
+            existing_pk = self.existing.get(key)
+            if existing_pk is not None and (self.mode != ImportMode.UPSERT or not self.update_fields):
+                result.skipped += 1
+                result.error(row_num, f"{self.describe(obj)} allaqachon mavjud — o'tkazib yuborildi.")
+                continue
+
+            try:
+                self.check(obj, existing_pk)
+            except RowError as exc:
+                result.error(row_num, str(exc))
+                continue
+
+            if existing_pk is None:
+                plan.new.append((row_num, obj))
+            else:
+                obj.pk = existing_pk
+                plan.updates.append((row_num, obj))
+
+        if on_progress:
+            on_progress(count)
+        try:
+            self.prepare(plan.new, plan.updates)
+        except RowError as exc:
+            for row_num, _ in plan.new + plan.updates:
+                result.error(row_num, str(exc))
+            return ImportPlan()
+        return plan
+
+    def commit(self, plan: 'ImportPlan', result: ImportResult, on_progress=None) -> None:
+        """Rejani IMPORT_CHUNK_SIZE bo'laklarda yozadi (har bo'lak — alohida tranzaksiya)."""
+        result.created = self._write(plan.new, result, on_progress=on_progress)
+        offset         = len(plan.new)
+        result.updated = self._write(
+            plan.updates, result, update=True,
+            on_progress=(lambda done: on_progress(offset + done)) if on_progress else None,
+        )
+        if result.created or result.updated:
+            self.after_import()
+
+    def _write(self, pairs: list, result: ImportResult, update: bool = False, on_progress=None) -> int:
+        written = 0
+        done    = 0
+        for chunk in chunked(pairs, self.chunk_size):
+            try:
+                with transaction.atomic():
+                    self._save([obj for _, obj in chunk], update)
+                written += len(chunk)
+            except DatabaseError:
+                # Bo'lakda xato (parallel yozuv, DB cheklovi) — qatorma-qator, aniq xato bilan
+                for row_num, obj in chunk:
+                    try:
+                        with transaction.atomic():
+                            self._save([obj], update)
+                        written += 1
+                    except DatabaseError as exc:
+                        result.error(row_num, f"{self.describe(obj)}: {exc}")
+            done += len(chunk)
+            if on_progress:
+                on_progress(done)
+        return written
+
+    def _save(self, objs: list, update: bool) -> None:
+        if not update:
+            self.model.objects.bulk_create(objs)
+            if self.usage_field:
+                add_usage(self.store.id, self.usage_field, len(objs))   # shu bo'lak tranzaksiyasida
+        elif self.unique_fields:
+            for obj in objs:
+                obj.pk = None
+            self.model.objects.bulk_create(
+                objs,
+                update_conflicts=True,
+                unique_fields=self.unique_fields,
+                update_fields=self.update_fields,
+            )
+        else:
+            self.model.objects.bulk_update(objs, self.update_fields)
+
+
+# ============================================================
+# MAHSULOT
+# ============================================================
+
+class ProductImporter(BulkImporter):
+    """
+    Unikal: (store, name) va (store, barcode).
+    Barcode bo'sh — yangi mahsulotga blok bilan EAN-13 ajratiladi (allocate_barcodes);
+    upsert da mavjud mahsulot barcodei saqlanadi.
+    Tarif limiti (max_products) — yangi qatorlar soni bilan bir marta tekshiriladi.
+    """
+    kind          = 'products'
+    columns       = (
+        Column('nom', required=True),
+        Column('kategoriya'),
+        Column('subkategoriya'),
+        Column('sale_price', DECIMAL, required=True),
+        Column('purchase_price', DECIMAL),
+        Column('birlik'),
+        Column('barcode'),
+    )
+    model         = Product
+    unique_fields = ['store', 'name']
+    update_fields = ['category', 'subcategory', 'sale_price', 'purchase_price', 'unit', 'barcode']
+    usage_field   = PRODUCTS
+
+    def preload(self) -> None:
+        self.units   = {u.value for u in ProductUnit}
+        self.cats    = {c.name.lower(): c for c in Category.objects.filter(store=self.store)}
+        self.subcats = {s.name.lower(): s for s in SubCategory.objects.filter(category__store=self.store)}
+
+        self.existing         = {}
+        self.barcode_owner    = {}   # barcode → mahsulot nomi (baza + fayl)
+        self.existing_barcode = {}   # nom → mavjud barcode
+        for pk, name, barcode in self.model.objects.filter(store=self.store).values_list('id', 'name', 'barcode'):
+            self.existing[(name,)] = pk
+            if barcode:
+                self.barcode_owner[barcode] = name
+                self.existing_barcode[name] = barcode
+
+    def build(self, row: dict):
+        nom = self.text(row, 'nom', 'name', required=True)
+
+        sale_price     = self.decimal(row, 'sale_price', 'sale_price', required=True)
+        purchase_price = self.decimal(row, 'purchase_price', 'purchase_price')
+        unit = (row.get('birlik') or 'dona').lower()
+        if unit not in self.units:
+            unit = 'dona'
+
+        return self.model(
+            store          = self.store,
+            name           = nom,
+            category       = self.cats.get(row.get('kategoriya', '').lower()),
+            subcategory    = self.subcats.get(row.get('subkategoriya', '').lower()),
+            sale_price     = sale_price,
+            purchase_price = purchase_price,
+            unit           = unit,
+            barcode        = self.text(row, 'barcode', 'barcode') or None,
+        )
+
+    def key(self, obj) -> tuple:
+        return (obj.name,)
+
+    def check(self, obj, existing_pk) -> None:
+        if not obj.barcode:
+            return
+        owner = self.barcode_owner.get(obj.barcode)
+        if owner is not None and owner != obj.name:
+            raise RowError(f'Barcode "{obj.barcode}" boshqa mahsulotda ("{owner}") — o\'tkazib yuborildi.')
+        self.barcode_owner[obj.barcode] = obj.name
+
+    def prepare(self, new: list, updates: list) -> None:
+        ok, limit, current = check_limit(self.store.id, PRODUCTS, len(new))
+        if not ok:
+            raise RowError(
+                f"Tarif rejangiz maksimal {limit} ta mahsulotga ruxsat beradi: hozirda {current} ta, "
+                f"faylda {len(new)} ta yangi — yana {max(0, limit - current)} ta qo'shish mumkin."
+            )
+
+        for _, obj in updates:
+            if not obj.barcode:
+                obj.barcode = self.existing_barcode.get(obj.name)
+
+        missing = [obj for _, obj in new + updates if not obj.barcode]
+        try:
+            barcodes = allocate_barcodes(self.store.id, len(missing), reserved=self.barcode_owner)
+        except ValueError as exc:
+            raise RowError(str(exc))
+        for obj, barcode in zip(missing, barcodes):
+            obj.barcode = barcode
+
+        for _, obj in new:
+            obj.search_name = normalize_search_text(obj.name)
+
+    def after_import(self) -> None:
+        product_prefix_index.invalidate(self.store.id)
+
+
+# ============================================================
+# MIJOZ
+# ============================================================
+
+class CustomerImporter(BulkImporter):
+    """Bazada unikal cheklov yo'q — upsert bulk_update orqali (nom bo'yicha)."""
+    kind          = 'customers'
+    columns       = (
+        Column('ism', required=True),
+        Column('telefon'),
+        Column('manzil'),
+        Column('guruh'),
+        Column('izoh'),
+    )
+    model         = Customer
+    update_fields = ['phone', 'address', 'group']
+
+    def preload(self) -> None:
+        self.groups   = {g.name.lower(): g for g in CustomerGroup.objects.filter(store=self.store)}
+        self.existing = {}
+        for pk, name in self.model.objects.filter(store=self.store).values_list('id', 'name').order_by('id'):
+            self.existing.setdefault((name,), pk)
+
+    def build(self, row: dict):
+        return self.model(
+            store   = self.store,
+            name    = self.text(row, 'ism', 'name', required=True),
+            phone   = self.text(row, 'telefon', 'phone'),
+            address = self.text(row, 'manzil', 'address'),
+            group   = self.groups.get(row.get('guruh', '').lower()),
+        )
+
+    def key(self, obj) -> tuple:
+        return (obj.name,)
+
+    def prepare(self, new: list, updates: list) -> None:
+        for _, obj in new:
+            obj.search_name = normalize_search_text(obj.name)
+
+
+# ============================================================
+# YETKAZIB BERUVCHI
+# ============================================================
+
+class SupplierImporter(BulkImporter):
+    kind          = 'suppliers'
+    columns       = (
+        Column('nom', required=True),
+        Column('kompaniya'),
+        Column('telefon'),
+        Column('manzil'),
+        Column('izoh'),
+    )
+    model         = Supplier
+    unique_fields = ['store', 'name']
+    update_fields = ['company', 'phone', 'address', 'description']
+
+    def preload(self) -> None:
+        self.existing = {
+            (name,): pk
+            for pk, name in self.model.objects.filter(store=self.store).values_list('id', 'name')
+        }
+
+    def build(self, row: dict):
+        return self.model(
+            store       = self.store,
+            name        = self.text(row, 'nom', 'name', required=True),
+            company     = self.text(row, 'kompaniya', 'company'),
+            phone       = self.text(row, 'telefon', 'phone'),
+            address     = row.get('manzil', ''),
+            description = row.get('izoh', ''),
+        )
+
+    def key(self, obj) -> tuple:
+        return (obj.name,)
+
+
+# ============================================================
+# SUBKATEGORIYA
+# ============================================================
+
+class SubCategoryImporter(BulkImporter):
+    kind          = 'subcategories'
+    columns       = (
+        Column('nom', required=True),
+        Column('kategoriya', required=True),
+    )
+    model         = SubCategory
+    unique_fields = ['store', 'category', 'name']
+    # Faylda nom/kategoriyadan boshqa ustun yo'q — upsert mavjudini o'zgartirmaydi
+    # (o'chirilgan subkategoriya qayta faollashmaydi)
+
+    def preload(self) -> None:
+        self.cats     = {c.name.lower(): c for c in Category.objects.filter(store=self.store)}
+        self.existing = {
+            (category_id, name): pk
+            for pk, category_id, name in (
+                self.model.objects.filter(store=self.store).values_list('id', 'category_id', 'name')
+            )
+        }
+
+    def build(self, row: dict):
+        nom      = self.text(row, 'nom', 'name', required=True)
+        category = self.cats.get(row.get('kategoriya', '').lower())
+        if category is None:
+            raise RowError(f'Kategoriya topilmadi: "{row.get("kategoriya")}"')
+        return self.model(store=self.store, category=category, name=nom)
+
+    def key(self, obj) -> tuple:
+        return (obj.category_id, obj.name)
+
+    def describe(self, obj) -> str:
+        return f'"{obj.name}" ({obj.category.name})'
+
+
+# ============================================================
+# KIRIM / CHIQIM HARAKATLARI
+# ============================================================
+
+class StockMovementImporter(BulkImporter):
+    """
+    Qatorlar MovementLine ga aylantiriladi va warehouse.movements.apply_movements ga
+    beriladi (partiya, FIFO, AVCO, supplier qarzi — bulk). Rejim ahamiyatsiz (faqat qo'shish).
+    validate() qoldiq yetarliligini ham tekshiradi (check_only) — dry-run va commit uchun bir xil;
+    commit() bo'laklab, har bo'lak o'z tranzaksiyasida (qoldiq o'zgargan bo'lsa — qator xatosi).
+    """
+    kind    = 'stock-movements'
+    columns = (
+        Column('mahsulot', required=True),
+        Column('miqdor', DECIMAL, required=True),
+        Column('harakat_turi', required=True, choices=('in', 'out')),
+        Column('joy_nomi', required=True),
+        Column('joy_turi', required=True, choices=('branch', 'warehouse')),
+        Column('tannarx', DECIMAL),
+        Column('yetkazib_beruvchi'),
+        Column('izoh'),
+    )
+
+    def preload(self) -> None:
+        self.products   = {p.name.lower(): p for p in Product.objects.filter(store=self.store, status='active')}
+        self.branches   = {b.name.lower(): b for b in Branch.objects.filter(store=self.store, status='active')}
+        self.warehouses = {w.name.lower(): w for w in Warehouse.objects.filter(store=self.store, status='active')}
+        self.suppliers  = {s.name.lower(): s for s in Supplier.objects.filter(store=self.store, status='active')}
+
+    def build(self, row: dict) -> MovementLine:
+        product = self.products.get(row['mahsulot'].lower())
+        if not product:
+            raise RowError(f'Mahsulot topilmadi: "{row["mahsulot"]}"')
+
+        miqdor = row['miqdor']
+        if miqdor <= 0:
+            raise RowError(f'Noto\'g\'ri miqdor: "{miqdor}"')
+
+        branch    = None
+        warehouse = None
+        if row['joy_turi'] == 'branch':
+            branch = self.branches.get(row['joy_nomi'].lower())
+            if not branch:
+                raise RowError(f'Filial topilmadi: "{row["joy_nomi"]}"')
+        else:
+            warehouse = self.warehouses.get(row['joy_nomi'].lower())
+            if not warehouse:
+                raise RowError(f'Ombor topilmadi: "{row["joy_nomi"]}"')
+
+        unit_cost = row['tannarx']
+        if unit_cost is not None and unit_cost < 0:
+            raise RowError(f'Noto\'g\'ri tannarx: "{unit_cost}"')
+
+        sup_nom = row['yetkazib_beruvchi'].lower()
+        return MovementLine(
+            product       = product,
+            movement_type = row['harakat_turi'],
+            quantity      = miqdor,
+            branch        = branch,
+            warehouse     = warehouse,
+            unit_cost     = unit_cost,
+            supplier      = self.suppliers.get(sup_nom) if sup_nom else None,
+            description   = row['izoh'],
+        )
+
+    def key(self, obj) -> tuple:
+        return (id(obj),)   # harakatlar takrorlanishi mumkin — har qator alohida
+
+    def prepare(self, new: list, updates: list) -> None:
+        for row_num, line in new:
+            line.ref = row_num
+
+    def validate(self, rows, result: ImportResult, on_progress=None) -> ImportPlan:
+        plan    = super().validate(rows, result, on_progress=on_progress)
+        checked = apply_movements([line for _, line in plan.new], self.store, self.worker, check_only=True)
+        if checked.shortages:
+            short = {line.ref for line, _ in checked.shortages}
+            for line, message in checked.shortages:
+                result.error(line.ref, message)
+            plan.new = [(row_num, line) for row_num, line in plan.new if row_num not in short]
+        return plan
+
+    def commit(self, plan: ImportPlan, result: ImportResult, on_progress=None) -> None:
+        done = 0
+        for chunk in chunked(plan.new, self.chunk_size):
+            with transaction.atomic():
+                applied = apply_movements([line for _, line in chunk], self.store, self.worker, partial=True)
+            result.created += len(applied.movements)
+            for line, message in applied.shortages:
+                result.error(line.ref, message)
+            done += len(chunk)
+            if on_progress:
+                on_progress(done)
+
+
+IMPORTERS = {
+    importer.kind: importer
+    for importer in (
+        ProductImporter,
+        CustomerImporter,
+        SupplierImporter,
+        SubCategoryImporter,
+        StockMovementImporter,
+    )
+}
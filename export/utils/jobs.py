@@ -0,0 +1,351 @@
+"""
+============================================================
+EXPORT JOB HELPER — fon eksportini boshlash va bajarish
+============================================================
+Funksiyalar:
+  params_hash          — kind + format + parametrlar → sha256 (deduplikatsiya kaliti)
+  start_export_job     — job yaratish yoki mavjudini qayta ishlatish → (job, reused)
+  execute_export_job   — job ni bajarish (Celery task ichidan): spec → vaqtinchalik fayl → storage
+  cleanup_expired_jobs — muddati o'tgan fayllarni o'chirish, osilib qolgan joblarni yopish
+
+  start_import_job      — yuklangan faylni saqlab ImportJob yaratish (header darhol tekshiriladi)
+  commit_import_job     — tugagan dry-run job ni xuddi shu fayl bilan yozishga qayta navbatlash
+  execute_import_job    — job ni bajarish (Celery task ichidan): validate → commit, progress
+  cleanup_import_jobs   — eski dry-run fayllarini o'chirish, osilib qolgan joblarni yopish
+
+Sozlamalar (config/settings/base.py):
+  EXPORT_JOB_TTL_HOURS          — tayyor fayl saqlanish muddati
+  EXPORT_JOB_FRESHNESS_MINUTES  — shu oyna ichida bir xil so'rov tayyor faylni qayta oladi
+  EXPORT_JOB_STALE_MINUTES      — shundan uzoq pending/running job → failed
+  EXPORT_JOB_PROGRESS_EVERY     — progress har necha qatorda yoziladi
+  IMPORT_JOB_TTL_HOURS          — dry-run fayli (commit uchun) saqlanish muddati
+  IMPORT_JOB_STALE_MINUTES      — shundan uzoq pending/running import → failed
+  IMPORT_JOB_MAX_ERRORS         — job da saqlanadigan qator xatolari soni (jami — error_count)
+"""
+
+import hashlib
+import json
+import logging
+import tempfile
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from ..models import (
+    ACTIVE_EXPORT_STATUSES,
+    ACTIVE_IMPORT_STATUSES,
+    ExportJob,
+    ExportJobStatus,
+    ImportJob,
+    ImportJobStatus,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def params_hash(kind: str, file_format: str, params: dict) -> str:
+    payload = json.dumps(
+        {'kind': kind, 'format': file_format, 'params': params},
+        sort_keys=True, ensure_ascii=False, default=str,
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _reusable_job(store_id: int, digest: str):
+    """Faol yoki yangilik oynasi ichida tugagan (fayli hali bor) job."""
+    now         = timezone.now()
+    fresh_since = now - timedelta(minutes=settings.EXPORT_JOB_FRESHNESS_MINUTES)
+    return (
+        ExportJob.objects
+        .filter(store_id=store_id, params_hash=digest)
+        .filter(
+            Q(status__in=ACTIVE_EXPORT_STATUSES)
+            | Q(status=ExportJobStatus.DONE, finished_on__gte=fresh_since, expires_at__gt=now)
+        )
+        .order_by('-created_on')
+        .first()
+    )
+
+
+def start_export_job(kind: str, worker, file_format: str, params: dict) -> tuple[ExportJob, bool]:
+    """
+    Fon eksportini boshlash. Qaytaradi: (job, reused).
+    reused=True — bir xil parametrli faol yoki yangi tayyor job topildi, yangisi yaratilmadi.
+    Task tranzaksiya commit bo'lgach navbatga qo'yiladi ('exports' navbati, CELERY_TASK_ROUTES).
+    """
+    from ..tasks import run_export_job
+
+    digest   = params_hash(kind, file_format, params)
+    existing = _reusable_job(worker.store_id, digest)
+    if existing is not None:
+        return existing, True
+
+    try:
+        with transaction.atomic():
+            job = ExportJob.objects.create(
+                store_id    = worker.store_id,
+                worker      = worker,
+                kind        = kind,
+                file_format = file_format,
+                params      = params,
+                params_hash = digest,
+            )
+    except IntegrityError:
+        # Parallel so'rov xuddi shu job ni bir lahza oldin yaratdi
+        existing = _reusable_job(worker.store_id, digest)
+        if existing is None:
+            raise
+        return existing, True
+
+    transaction.on_commit(lambda: run_export_job.delay(job.id))
+    return job, False
+
+
+def execute_export_job(job_id: int) -> ExportJob | None:
+    """
+    Job ni bajarish. pending → running o'tishi atomar (UPDATE ... WHERE status='pending'):
+    takroriy yetkazilgan task ikkinchi marta bajarmaydi. Yakuniy holat ham faqat
+    running job ga yoziladi (... WHERE status='running').
+    Xato job ga yoziladi (failed) va qayta ko'tarilmaydi.
+    """
+    from ..views import EXPORT_VIEWS
+
+    claimed = ExportJob.objects.filter(pk=job_id, status=ExportJobStatus.PENDING).update(
+        status=ExportJobStatus.RUNNING, started_on=timezone.now(),
+    )
+    if not claimed:
+        return None
+
+    job = ExportJob.objects.select_related('store').get(pk=job_id)
+    try:
+        spec  = EXPORT_VIEWS[job.kind]().build_export(job.store, job.params)
+        total = spec.estimate_total()
+        ExportJob.objects.filter(pk=job.pk).update(rows_total=total)
+
+        processed = 0
+
+        def track(count: int):
+            nonlocal processed
+            processed = count
+            ExportJob.objects.filter(pk=job.pk).update(rows_processed=count)
+
+        with tempfile.TemporaryFile() as tmp:
+            spec.write(job.file_format, tmp, on_progress=track, every=settings.EXPORT_JOB_PROGRESS_EVERY)
+            size = tmp.tell()
+            tmp.seek(0)
+            file_name = spec.filename(spec.resolve_format(job.file_format))
+            job.file.save(file_name, File(tmp, name=file_name), save=False)
+
+        # Faqat hali running job yakunlanadi — cleanup uni failed qilgan bo'lsa, qayta tirilmaydi
+        now      = timezone.now()
+        finished = ExportJob.objects.filter(pk=job.pk, status=ExportJobStatus.RUNNING).update(
+            status         = ExportJobStatus.DONE,
+            rows_total     = total,
+            rows_processed = processed,
+            file           = job.file.name,
+            file_name      = file_name,
+            file_size      = size,
+            finished_on    = now,
+            expires_at     = now + timedelta(hours=settings.EXPORT_JOB_TTL_HOURS),
+        )
+        if not finished:
+            logger.warning("ExportJob #%s bajarilish paytida yopilgan, fayl o'chiriladi", job_id)
+            job.file.delete(save=False)
+        job.refresh_from_db()
+    except Exception as exc:
+        logger.exception("ExportJob #%s xato: %s", job_id, exc)
+        ExportJob.objects.filter(pk=job_id, status=ExportJobStatus.RUNNING).update(
+            status=ExportJobStatus.FAILED, error=str(exc)[:2000], finished_on=timezone.now(),
+        )
+        job.refresh_from_db()
+    return job
+
+
+def cleanup_expired_jobs() -> dict:
+    """
+    1. done + expires_at o'tgan → fayl o'chiriladi, status=expired
+    2. pending/running EXPORT_JOB_STALE_MINUTES dan uzoq → failed (dedup blokini bo'shatadi);
+       pending — created_on dan, running — started_on dan (uzoq navbat bajarilayotganini o'ldirmaydi)
+    """
+    now     = timezone.now()
+    expired = 0
+    for job in ExportJob.objects.filter(status=ExportJobStatus.DONE, expires_at__lte=now).iterator():
+        if job.file:
+            try:
+                job.file.delete(save=False)
+            except Exception as exc:
+                logger.warning("ExportJob #%s faylini o'chirib bo'lmadi: %s", job.pk, exc)
+        job.status = ExportJobStatus.EXPIRED
+        job.save(update_fields=['status', 'file'])
+        expired += 1
+
+    stale_before = now - timedelta(minutes=settings.EXPORT_JOB_STALE_MINUTES)
+    stale = ExportJob.objects.filter(
+        Q(status=ExportJobStatus.PENDING, created_on__lt=stale_before)
+        | Q(status=ExportJobStatus.RUNNING, started_on__lt=stale_before)
+    ).update(
+        status=ExportJobStatus.FAILED, error="Vaqt tugadi (worker javob bermadi).", finished_on=now,
+    )
+    return {'expired': expired, 'stale': stale}
+
+
+# ============================================================
+# IMPORT JOBLARI
+# ============================================================
+
+def start_import_job(kind: str, worker, upload, mode: str, dry_run: bool) -> ImportJob:
+    """
+    Fon importini boshlash: fayl hajmi/formati/header i shu so'rovda tekshiriladi
+    (UploadError → chaqiruvchi 400 qaytaradi), fayl storage ga saqlanadi, task
+    tranzaksiya commit bo'lgach navbatga qo'yiladi. Ma'lumot qatorlari o'qilmaydi.
+    """
+    from ..tasks import run_import_job
+    from .importer import IMPORTERS
+    from .upload import iter_upload
+
+    iter_upload(upload, IMPORTERS[kind].columns).close()
+    upload.seek(0)
+
+    job = ImportJob(
+        store_id  = worker.store_id,
+        worker    = worker,
+        kind      = kind,
+        mode      = mode,
+        dry_run   = dry_run,
+        file_name = upload.name[:100],
+    )
+    job.file.save(upload.name, upload, save=False)
+    job.save()
+    transaction.on_commit(lambda: run_import_job.delay(job.id))
+    return job
+
+
+def commit_import_job(job: ImportJob) -> bool:
+    """
+    Tugagan dry-run job → xuddi shu fayl bilan yozish (qayta yuklash shart emas).
+    Atomar: faqat done + dry_run + fayli bor job o'tadi. False — o'tkazib bo'lmaydi.
+    """
+    from ..tasks import run_import_job
+
+    moved = ImportJob.objects.filter(
+        pk=job.pk, status=ImportJobStatus.DONE, dry_run=True,
+    ).exclude(file='').update(
+        status=ImportJobStatus.PENDING, dry_run=False,
+        rows_processed=0, rows_planned=0, rows_written=0,
+        created=0, updated=0, skipped=0, error_count=0, errors=[], error='',
+        started_on=None, finished_on=None,
+    )
+    if moved:
+        transaction.on_commit(lambda: run_import_job.delay(job.pk))
+    return bool(moved)
+
+
+def execute_import_job(job_id: int) -> ImportJob | None:
+    """
+    Job ni bajarish. pending → running o'tishi atomar (takroriy task bajarmaydi).
+    Validatsiya va yozish — importer.run (bo'laklab, progress job ga yoziladi).
+    Fayl: commit qilingan (yoki xato bergan) job da o'chiriladi; dry-run da saqlanadi.
+    """
+    from .importer import IMPORTERS, ImportResult
+    from .upload import UploadError, iter_upload
+
+    claimed = ImportJob.objects.filter(pk=job_id, status=ImportJobStatus.PENDING).update(
+        status=ImportJobStatus.RUNNING, started_on=timezone.now(),
+    )
+    if not claimed:
+        return None
+
+    job   = ImportJob.objects.select_related('store', 'worker').get(pk=job_id)
+    every = settings.IMPORT_JOB_PROGRESS_EVERY
+
+    def validated(count: int):
+        ImportJob.objects.filter(pk=job.pk).update(rows_processed=count)
+
+    def written(count: int):
+        ImportJob.objects.filter(pk=job.pk).update(rows_written=count)
+
+    try:
+        importer = IMPORTERS[job.kind](job.store, mode=job.mode, worker=job.worker)
+        importer.progress_every = every
+        result   = ImportResult(dry_run=job.dry_run)
+        with job.file.open('rb') as fh:
+            rows = iter_upload(fh, importer.columns)
+            ImportJob.objects.filter(pk=job.pk).update(rows_total=rows.total)
+            plan = importer.validate(rows, result, on_progress=validated)
+
+        if job.dry_run:
+            result.created = len(plan.new)
+            result.updated = len(plan.updates)
+        else:
+            planned = len(plan.new) + len(plan.updates)
+            ImportJob.objects.filter(pk=job.pk).update(rows_planned=planned)
+            importer.commit(plan, result, on_progress=written)
+
+        data = result.as_dict()
+        job.refresh_from_db(fields=['rows_processed', 'rows_planned', 'rows_written'])
+        job.status      = ImportJobStatus.DONE
+        job.rows_total  = job.rows_processed
+        job.created     = data['created']
+        job.updated     = data['updated']
+        job.skipped     = data['skipped']
+        job.error_count = len(data['errors'])
+        job.errors      = data['errors'][:settings.IMPORT_JOB_MAX_ERRORS]
+        job.finished_on = timezone.now()
+        job.save(update_fields=[
+            'status', 'rows_total', 'created', 'updated', 'skipped',
+            'error_count', 'errors', 'finished_on',
+        ])
+    except Exception as exc:
+        if not isinstance(exc, UploadError):
+            logger.exception("ImportJob #%s xato: %s", job_id, exc)
+        ImportJob.objects.filter(pk=job_id).update(
+            status=ImportJobStatus.FAILED, error=str(exc)[:2000], finished_on=timezone.now(),
+        )
+        job.refresh_from_db()
+
+    if not (job.dry_run and job.status == ImportJobStatus.DONE):
+        _delete_import_file(job)
+    return job
+
+
+def _delete_import_file(job: ImportJob) -> None:
+    if not job.file:
+        return
+    try:
+        job.file.delete(save=False)
+    except Exception as exc:
+        logger.warning("ImportJob #%s faylini o'chirib bo'lmadi: %s", job.pk, exc)
+        return
+    ImportJob.objects.filter(pk=job.pk).update(file='')
+
+
+def cleanup_import_jobs() -> dict:
+    """
+    1. done dry-run + IMPORT_JOB_TTL_HOURS o'tgan → fayl o'chiriladi, status=expired
+    2. pending/running IMPORT_JOB_STALE_MINUTES dan uzoq → failed, fayl o'chiriladi
+    """
+    now     = timezone.now()
+    expired = 0
+    for job in ImportJob.objects.filter(
+        status=ImportJobStatus.DONE, dry_run=True,
+        finished_on__lte=now - timedelta(hours=settings.IMPORT_JOB_TTL_HOURS),
+    ).iterator():
+        _delete_import_file(job)
+        ImportJob.objects.filter(pk=job.pk).update(status=ImportJobStatus.EXPIRED)
+        expired += 1
+
+    stale = 0
+    for job in ImportJob.objects.filter(
+        status__in=ACTIVE_IMPORT_STATUSES,
+        created_on__lt=now - timedelta(minutes=settings.IMPORT_JOB_STALE_MINUTES),
+    ).iterator():
+        _delete_import_file(job)
+        ImportJob.objects.filter(pk=job.pk).update(
+            status=ImportJobStatus.FAILED, error="Vaqt tugadi (worker javob bermadi).", finished_on=now,
+        )
+        stale += 1
+    return {'expired': expired, 'stale': stale}
@@ -0,0 +1,59 @@
+"""
+============================================================
+JSON LINES HELPER — gzip siqilgan oqimli javob
+============================================================
+Funksiyalar:
+  iter_jsonl_gz                    — keys + rows (iterator) → gzip bayt bo'laklari
+  make_jsonl_gz_streaming_response — keys + rows (iterator) → StreamingHttpResponse (.jsonl.gz)
+
+Har bir qator — bitta JSON obyekt ({kalit: qiymat}), qatorlar '\n' bilan
+ajratilgan (JSON Lines). Qatorlar JSONL_BATCH_ROWS tadan kodlanadi va
+zlib.compressobj orqali oqimli siqiladi — fayl xotirada yig'ilmaydi.
+Kodlash — DjangoJSONEncoder (C kodlovchi; Decimal → "12.50" satr,
+datetime → ISO 8601, ya'ni aniqlik yo'qotilmaydi).
+"""
+
+import itertools
+import zlib
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+
+
+# Bitta siqish bo'lagidagi qatorlar soni
+JSONL_BATCH_ROWS = 1000
+# gzip konteyneri (wbits=31) — `gunzip`/`zcat` bilan ochiladi
+_GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+
+def iter_jsonl_gz(keys: list[str], rows, level: int = 6):
+    """keys + rows → gzip siqilgan JSON Lines bo'laklari (generator)."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, _GZIP_WBITS)
+    encode     = DjangoJSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+
+    rows = iter(rows)
+    while True:
+        batch = [encode(dict(zip(keys, row))) for row in itertools.islice(rows, JSONL_BATCH_ROWS)]
+        if not batch:
+            break
+        batch.append('')
+        data = compressor.compress('\n'.join(batch).encode('utf-8'))
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def make_jsonl_gz_streaming_response(filename: str, keys: list[str], rows) -> StreamingHttpResponse:
+    """
+    keys: ['id', 'created_on', ...]
+    rows: iterator — values_list() kortejlari
+
+    → StreamingHttpResponse (Content-Type: application/gzip)
+    Content-Encoding qo'yilmaydi — mijoz faylni .jsonl.gz holida saqlaydi.
+    """
+    response = StreamingHttpResponse(
+        iter_jsonl_gz(keys, rows),
+        content_type='application/gzip',
+    )
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
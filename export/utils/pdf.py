@@ -3,17 +3,32 @@
 PDF HELPER — reportlab asosida
 ============================================================
 Funksiyalar:
-  make_pdf_response  — title + headers + rows → HttpResponse (.pdf)
+  write_pdf          — title + headers + rows → fayl obyekti (.pdf), sahifama-sahifa
+  make_pdf_response  — title + headers + rows → FileResponse (.pdf, vaqtinchalik fayldan)
+
+⚠️ _ReportDocTemplate reportlab ichki API siga tayanadi (_startBuild/_endBuild,
+   frame._atTop, canv._doc.Pages) — versiya requirements/base.txt da qat'iy
+   belgilangan, export/tests.py dagi test ichki API o'zgarsa yiqiladi.
 """
 
 import io
+import math
+import tempfile
+from functools import lru_cache
+from xml.sax.saxutils import escape
 
-from django.http import HttpResponse
+from django.http import FileResponse, HttpResponse
+from reportlab import rl_config
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4, landscape
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import mm
+from reportlab.lib.utils import simpleSplit
 from reportlab.platypus import (
+    BaseDocTemplate,
+    Frame,
+    PageBreak,
+    PageTemplate,
     Paragraph,
     SimpleDocTemplate,
     Spacer,
@@ -21,6 +36,7 @@ from reportlab.platypus import (
     TableStyle,
 )
 from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.pdfdoc import PDFArray, PDFBase85Encode, PDFName, PDFStream, PDFZCompress
 from reportlab.pdfbase.ttfonts import TTFont
 import os
 
@@ -64,118 +80,284 @@ COLOR_WHITE   = colors.white
 COLOR_BLACK   = colors.black
 
 
+# ============================================================
+# HISOBOT JADVALI SOZLAMALARI
+# Jadval sahifa hajmidagi bo'laklarda quriladi: har bo'lak — bitta sahifa,
+# o'z sarlavha qatori bilan. Kataklar oddiy satr (kerak bo'lsa oldindan
+# qatorlarga bo'lingan); Paragraph faqat so'zni bo'lish kerak bo'lganda.
+# ============================================================
+
+PDF_CELL_FONT_SIZE   = 8
+PDF_CELL_LEADING     = 10
+PDF_CELL_PADDING_V   = 3
+PDF_CELL_PADDING_H   = 4
+PDF_HEADER_FONT_SIZE = 9
+PDF_HEADER_LEADING   = 12
+PDF_WRAP_CACHE_SIZE  = 8192   # takrorlanuvchi qiymatlar (filial, kassir, holat) qayta o'lchanmaydi
+PDF_STREAM_BLOCK     = 64 * 1024
+
+_ROW_HEIGHT = PDF_CELL_LEADING + 2 * PDF_CELL_PADDING_V
+
+
+@lru_cache(maxsize=4)
+def _report_styles(font_name: str) -> dict:
+    """Hujjatlar orasida umumiy stillar — bir marta quriladi."""
+    return {
+        'title': ParagraphStyle(
+            'ReportTitle',
+            fontName=font_name,
+            fontSize=14,
+            textColor=COLOR_HEADER,
+            spaceAfter=6,
+            leading=18,
+        ),
+        'header': ParagraphStyle(
+            'ReportHeader',
+            fontName=font_name,
+            fontSize=PDF_HEADER_FONT_SIZE,
+            textColor=COLOR_WHITE,
+            alignment=1,
+            leading=PDF_HEADER_LEADING,
+        ),
+        'cell': ParagraphStyle(
+            'ReportCell',
+            fontName=font_name,
+            fontSize=PDF_CELL_FONT_SIZE,
+            leading=PDF_CELL_LEADING,
+            wordWrap='LTR',
+        ),
+        'table': TableStyle([
+            # Header
+            ('BACKGROUND',    (0, 0), (-1, 0), COLOR_HEADER),
+            ('VALIGN',        (0, 0), (-1, -1), 'MIDDLE'),
+            # Ma'lumot qatorlari — zebra stripes (bitta buyruq, qatorlar soniga bog'liq emas)
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [COLOR_ROW_ODD, COLOR_WHITE]),
+            ('FONTNAME',      (0, 1), (-1, -1), font_name),
+            ('FONTSIZE',      (0, 1), (-1, -1), PDF_CELL_FONT_SIZE),
+            ('LEADING',       (0, 1), (-1, -1), PDF_CELL_LEADING),
+            ('GRID',          (0, 0), (-1, -1), 0.4, COLOR_BORDER),
+            ('TOPPADDING',    (0, 0), (-1, -1), PDF_CELL_PADDING_V),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), PDF_CELL_PADDING_V),
+            ('LEFTPADDING',   (0, 0), (-1, -1), PDF_CELL_PADDING_H),
+            ('RIGHTPADDING',  (0, 0), (-1, -1), PDF_CELL_PADDING_H),
+        ]),
+    }
+
+
+class _ReportDocTemplate(BaseDocTemplate):
+    """
+    Flowable larni bo'laklab qabul qiladigan hujjat.
+    build() butun ro'yxatni kutadi; bu yerda open() → add(...) → close():
+    har bo'lak joylashtirilgach sahifa canvas ga yoziladi va bo'lak xotiradan ketadi.
+    """
+
+    def __init__(self, target, **kwargs):
+        super().__init__(target, **kwargs)
+        frame = Frame(self.leftMargin, self.bottomMargin, self.width, self.height, id='body')
+        self.addPageTemplates([PageTemplate(id='report', frames=[frame], onPage=self._draw_page_number)])
+        self.setPageCallBack(self._compress_finished_page)
+
+    def _compress_finished_page(self, page_number: int):
+        """
+        reportlab sahifa oqimini save() gacha siqmasdan saqlaydi — minglab sahifada
+        bu xotiraning asosiy qismi. Tayyor sahifa shu yerda siqiladi (save() dagi
+        filtrlar bilan bir xil), xotirada faqat siqilgan baytlar qoladi.
+        """
+        pages = self.canv._doc.Pages.pages
+        if not pages:
+            return
+        page = pages[-1]
+        if not page.compression or not getattr(page, 'stream', None) or page.Contents:
+            return
+        filters = [PDFBase85Encode, PDFZCompress] if rl_config.useA85 else [PDFZCompress]
+        content = page.stream
+        for stream_filter in reversed(filters):
+            content = stream_filter.encode(content)
+        contents = PDFStream(content=content)
+        contents.dictionary['Filter'] = PDFArray([PDFName(f.pdfname) for f in filters])
+        contents.__Comment__ = 'page stream'
+        page.Contents = contents
+        page.stream    = None
+
+    @staticmethod
+    def _draw_page_number(canv, doc):
+        canv.saveState()
+        canv.setFont(_FONT_NAME, 7)
+        canv.setFillColor(colors.grey)
+        canv.drawRightString(doc.pagesize[0] - doc.rightMargin, doc.bottomMargin / 2, f"{doc.page}-sahifa")
+        canv.restoreState()
+
+    def open(self):
+        self._startBuild()
+        self.canv._doctemplate = self
+
+    def add(self, flowables: list):
+        while flowables:
+            self.clean_hanging()
+            self.handle_flowable(flowables)
+
+    def fresh_frame(self) -> tuple[bool, float]:
+        """(joriy frame bo'shmi, qolgan balandlik)."""
+        self.clean_hanging()
+        return bool(self.frame._atTop), self.frame._y - self.frame._y1p
+
+    def close(self):
+        del self.canv._doctemplate
+        self._endBuild()
+
+
+@lru_cache(maxsize=PDF_WRAP_CACHE_SIZE)
+def _wrap_text(text: str, font_name: str, avail_width: float) -> tuple[str, int, bool]:
+    """
+    Matnni ustun eniga so'z bo'yicha bo'ladi → (qatorlar '\\n' bilan, qatorlar soni, sig'madi).
+    sig'madi=True — bitta so'zning o'zi ustundan keng (shtrix-kod, havola).
+    """
+    lines = simpleSplit(text, font_name, PDF_CELL_FONT_SIZE, avail_width) or ['']
+    # Bir necha pt ortiqcha — katak ichki chetiga sig'adi (sanani bo'lgandan yaxshiroq)
+    too_wide = any(
+        pdfmetrics.stringWidth(line, font_name, PDF_CELL_FONT_SIZE) > avail_width + PDF_CELL_PADDING_H
+        for line in lines
+    )
+    return '\n'.join(lines), len(lines), too_wide
+
+
+def _cell(value, avail_width: float, safe_len: int, style: ParagraphStyle):
+    """
+    Katak qiymati → (katak, qatorlar soni).
+    Oddiy satr — Table uni o'zi chizadi (Paragraph parse qilinmaydi); sig'maydigan
+    matn oldindan qatorlarga bo'linadi. Paragraph faqat so'zni bo'lish kerak bo'lganda.
+    """
+    if value is None:
+        return '', 1
+    text = str(value)
+    if len(text) <= safe_len and '\n' not in text:
+        return text, 1
+    wrapped, lines, too_wide = _wrap_text(text, _FONT_NAME, avail_width)
+    if too_wide:
+        # Kam uchraydigan holat — balandlik Paragraph ning o'zidan aniq olinadi
+        para = Paragraph(escape(text).replace('\n', '<br/>'), style)
+        _, height = para.wrap(avail_width, PDF_CELL_LEADING * 1000)
+        return para, max(1, math.ceil(height / PDF_CELL_LEADING))
+    return wrapped, lines
+
+
 # ============================================================
 # ASOSIY FUNKSIYA
 # ============================================================
 
-def make_pdf_response(
-    filename: str,
+def write_pdf(
+    target,
     title: str,
     headers: list[str],
-    rows: list[list],
+    rows,
     landscape_mode: bool = False,
-) -> HttpResponse:
+) -> None:
     """
-    filename       — 'sales_report.pdf'
+    target         — yozish uchun ochilgan binary fayl obyekti (yoki BytesIO)
     title          — sarlavha matni
     headers        — ustun nomlari ro'yxati
-    rows           — ma'lumot qatorlari ro'yxati
+    rows           — ma'lumot qatorlari (ro'yxat yoki iterator — bir marta o'qiladi)
     landscape_mode — True bo'lsa sahifa gorizontal (keng jadvallar uchun)
+
+    Qatorlar iteratordan sahifaga sig'adigan miqdorda olinadi: har sahifa —
+    alohida Table (sarlavha qatori bilan). Xotirada faqat joriy sahifa va
+    tayyor sahifalarning siqilgan oqimlari turadi.
     """
     _try_register_font()
-    styles = getSampleStyleSheet()
+    styles = _report_styles(_FONT_NAME)
 
     page_size = landscape(A4) if landscape_mode else A4
-    buffer    = io.BytesIO()
 
-    doc = SimpleDocTemplate(
-        buffer,
+    doc = _ReportDocTemplate(
+        target,
         pagesize=page_size,
         leftMargin=15 * mm,
         rightMargin=15 * mm,
         topMargin=15 * mm,
         bottomMargin=15 * mm,
-    )
-
-    title_style = ParagraphStyle(
-        'Title',
-        fontName=_FONT_NAME,
-        fontSize=14,
-        textColor=COLOR_HEADER,
-        spaceAfter=6,
-        leading=18,
-    )
-    cell_style = ParagraphStyle(
-        'Cell',
-        fontName=_FONT_NAME,
-        fontSize=8,
-        leading=11,
-        wordWrap='LTR',
+        title=title,
     )
 
     # ---- Ustun kengligi ----
-    page_width = (landscape(A4)[0] if landscape_mode else A4[0]) - 30 * mm
-    col_count  = len(headers)
-    col_width  = page_width / col_count
-
-    # ---- Jadval ma'lumotlari ----
-    table_data = [[
-        Paragraph(f'<b>{h}</b>', ParagraphStyle(
-            'H', fontName=_FONT_NAME, fontSize=9,
-            textColor=COLOR_WHITE, leading=12,
-        ))
+    page_width  = page_size[0] - 30 * mm
+    col_count   = len(headers)
+    col_width   = page_width / col_count
+    col_widths  = [col_width] * col_count
+    text_width  = col_width - 2 * PDF_CELL_PADDING_H
+    # Shu uzunlikdagi matn har qanday belgilar bilan ham sig'adi (belgi eni ≤ shrift o'lchami)
+    safe_len    = int(text_width // PDF_CELL_FONT_SIZE)
+
+    header_row    = [Paragraph(escape(str(h)), styles['header']) for h in headers]
+    header_height = max(
+        Paragraph(escape(str(h)), styles['header']).wrap(text_width, page_size[1])[1]
         for h in headers
-    ]]
-
-    for row in rows:
-        table_data.append([
-            Paragraph(str(v) if v is not None else '', cell_style)
-            for v in row
-        ])
-
-    # ---- Jadval stili ----
-    row_count  = len(table_data)
-    table_style_cmds = [
-        # Header
-        ('BACKGROUND', (0, 0), (-1, 0), COLOR_HEADER),
-        ('TEXTCOLOR',  (0, 0), (-1, 0), COLOR_WHITE),
-        ('ALIGN',      (0, 0), (-1, 0), 'CENTER'),
-        ('VALIGN',     (0, 0), (-1, -1), 'MIDDLE'),
-        ('FONTNAME',   (0, 0), (-1, 0), _FONT_NAME),
-        ('FONTSIZE',   (0, 0), (-1, 0), 9),
-        ('ROWBACKGROUND', (0, 0), (-1, 0), COLOR_HEADER),
-        # Ma'lumot qatorlari — zebra stripes
-        ('ROWBACKGROUND', (0, 1), (-1, -1), COLOR_WHITE),
-        ('GRID',       (0, 0), (-1, -1), 0.4, COLOR_BORDER),
-        ('TOPPADDING', (0, 0), (-1, -1), 4),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
-        ('LEFTPADDING', (0, 0), (-1, -1), 5),
-        ('RIGHTPADDING', (0, 0), (-1, -1), 5),
-    ]
-    # Toq qatorlar — och ko'k
-    for i in range(1, row_count):
-        if i % 2 == 1:
-            table_style_cmds.append(
-                ('BACKGROUND', (0, i), (-1, i), COLOR_ROW_ODD)
-            )
-
-    table = Table(
-        table_data,
-        colWidths=[col_width] * col_count,
-        repeatRows=1,
-    )
-    table.setStyle(TableStyle(table_style_cmds))
+    ) + 2 * PDF_CELL_PADDING_V
+
+    rows = iter(rows)
+
+    def next_row():
+        """Keyingi qator → (kataklar, taxminiy balandlik) yoki None."""
+        row = next(rows, None)
+        if row is None:
+            return None
+        cells, lines = [], 1
+        for value in row:
+            cell, cell_lines = _cell(value, text_width, safe_len, styles['cell'])
+            cells.append(cell)
+            lines = max(lines, cell_lines)
+        return cells, lines * PDF_CELL_LEADING + 2 * PDF_CELL_PADDING_V
+
+    doc.open()
+    doc.add([Paragraph(escape(title), styles['title']), Spacer(1, 4 * mm)])
+
+    pending = next_row()
+    if pending is None:
+        # Bo'sh hisobot — faqat sarlavha qatori
+        doc.add([Table([header_row], colWidths=col_widths, style=styles['table'])])
+    while pending is not None:
+        at_top, available = doc.fresh_frame()
+        if not at_top and available < header_height + pending[1]:
+            doc.add([PageBreak()])
+            continue
+
+        # ---- Sahifa bo'lagi: joriy sahifaga sig'adigan qatorlar ----
+        data   = [header_row]
+        height = header_height
+        while pending is not None and (height + pending[1] <= available or len(data) == 1):
+            data.append(pending[0])
+            height += pending[1]
+            pending = next_row()
+
+        # Taxmin noto'g'ri chiqsa — Table qolganini keyingi sahifaga sarlavha bilan o'tkazadi
+        doc.add([Table(data, colWidths=col_widths, repeatRows=1, style=styles['table'])])
+
+    doc.close()
 
-    elements = [
-        Paragraph(title, title_style),
-        Spacer(1, 4 * mm),
-        table,
-    ]
 
-    doc.build(elements)
-    buffer.seek(0)
+def make_pdf_response(
+    filename: str,
+    title: str,
+    headers: list[str],
+    rows,
+    landscape_mode: bool = False,
+) -> FileResponse:
+    """
+    filename       — 'sales_report.pdf'
+    title, headers, rows, landscape_mode — write_pdf() ga qarang
 
-    response = HttpResponse(buffer.getvalue(), content_type='application/pdf')
+    Fayl vaqtinchalik faylga yoziladi va bo'laklab yuboriladi.
+    Javob yopilganda vaqtinchalik fayl avtomatik o'chadi.
+    """
+    tmp = tempfile.TemporaryFile(suffix='.pdf')
+    try:
+        write_pdf(tmp, title, headers, rows, landscape_mode)
+    except BaseException:
+        tmp.close()
+        raise
+    tmp.seek(0)
+
+    response = FileResponse(tmp, content_type='application/pdf')
+    response.block_size = PDF_STREAM_BLOCK
     response['Content-Disposition'] = f'attachment; filename="{filename}"'
     return response
 
@@ -0,0 +1,153 @@
+"""
+============================================================
+EXPORT SPEC — eksport tavsifi (so'rovdan mustaqil)
+============================================================
+Klasslar:
+  ExportSpec — bitta eksportning to'liq tavsifi: fayl nomi, sarlavhalar,
+               qator generatori, asosiy queryset, mashina ustunlari.
+
+Bitta ExportSpec ikki joyda ishlatiladi:
+  - sinxron: ExportSpec.response(fmt)      — view dan to'g'ridan-to'g'ri javob
+  - fon:     ExportSpec.write(fmt, fayl)   — ExportJob (Celery) artefakti
+
+Formatlar:
+  excel, pdf      — odam uchun: rows() generatori (ko'rinadigan nomlar, sana matni)
+  csv, jsonl.gz   — mashina uchun: columns → values_list() kortejlari (xom qiymatlar).
+                    columns berilmagan bo'lsa (masalan, dalolatnoma) — csv rows() dan.
+"""
+
+import itertools
+from dataclasses import dataclass, field
+from typing import Callable, Iterable
+
+from .csv_stream import iter_csv, make_csv_streaming_response
+from .excel import make_excel_response, write_excel
+from .jsonl_stream import iter_jsonl_gz, make_jsonl_gz_streaming_response
+from .pdf import make_pdf_response, write_pdf
+
+
+# Export so'rovlari DB kursoridan shu o'lchamdagi bo'laklarda o'qiladi
+EXPORT_CHUNK_SIZE = 2000
+
+# Stilsiz, oqimli formatlar
+MACHINE_FORMATS = ('csv', 'jsonl.gz')
+
+# Format → fayl kengaytmasi / Content-Type (artefakt yuklab olish uchun)
+EXPORT_EXTENSIONS = {
+    'excel':    'xlsx',
+    'pdf':      'pdf',
+    'csv':      'csv',
+    'jsonl.gz': 'jsonl.gz',
+}
+EXPORT_CONTENT_TYPES = {
+    'excel':    'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    'pdf':      'application/pdf',
+    'csv':      'text/csv; charset=utf-8',
+    'jsonl.gz': 'application/gzip',
+}
+
+
+def iter_values(qs):
+    """values_list() queryset → bo'laklab o'qiladigan iterator (queryset keshlanmaydi)."""
+    return qs.iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+
+def counted(rows: Iterable, on_progress: Callable[[int], None] | None, every: int):
+    """
+    rows dan o'tgan qatorlarni sanaydi: har `every` qatorda on_progress(n).
+    Oxirgi qiymat generator tugagach yana bir marta chaqiriladi.
+    """
+    if on_progress is None:
+        yield from rows
+        return
+    count = 0
+    rows  = iter(rows)
+    while True:
+        batch = list(itertools.islice(rows, every))
+        if not batch:
+            break
+        yield from batch
+        count += len(batch)
+        on_progress(count)
+
+
+@dataclass
+class ExportSpec:
+    basename:  str                           # 'sotuvlar' → sotuvlar.xlsx / .csv / ...
+    title:     str                           # PDF sarlavhasi
+    headers:   list[str]                     # odam uchun ustun nomlari
+    rows:      Callable[[], Iterable]        # odam uchun qatorlar generatori (har chaqiruvda yangi)
+    queryset:  object                        # asosiy queryset (filtrlangan) — count va mashina formatlari
+    columns:   list[tuple] | None = None     # [(kalit, lookup yoki ifoda)] — csv / jsonl.gz
+    landscape: bool = False
+    formats:   tuple = field(default=('excel', 'pdf', 'csv', 'jsonl.gz'))
+
+    # ----------------------------------------------------------
+    # Format
+    # ----------------------------------------------------------
+
+    def resolve_format(self, fmt: str) -> str:
+        """Qo'llab-quvvatlanmagan format → birinchi (asosiy) format."""
+        return fmt if fmt in self.formats else self.formats[0]
+
+    def filename(self, fmt: str) -> str:
+        return f"{self.basename}.{EXPORT_EXTENSIONS[fmt]}"
+
+    def estimate_total(self) -> int:
+        """Progress uchun taxminiy qatorlar soni."""
+        return self.queryset.count()
+
+    def _machine_rows(self) -> tuple[list[str], Iterable]:
+        if self.columns is None:
+            return self.headers, self.rows()
+        keys   = [key for key, _ in self.columns]
+        values = iter_values(self.queryset.values_list(*[expr for _, expr in self.columns]))
+        return keys, values
+
+    # ----------------------------------------------------------
+    # Sinxron javob
+    # ----------------------------------------------------------
+
+    def response(self, fmt: str):
+        fmt = self.resolve_format(fmt)
+        if fmt in MACHINE_FORMATS:
+            keys, values = self._machine_rows()
+            if fmt == 'csv':
+                return make_csv_streaming_response(self.filename(fmt), keys, values)
+            return make_jsonl_gz_streaming_response(self.filename(fmt), keys, values)
+        if fmt == 'pdf':
+            return make_pdf_response(
+                filename=self.filename(fmt),
+                title=self.title,
+                headers=self.headers,
+                rows=self.rows(),
+                landscape_mode=self.landscape,
+            )
+        return make_excel_response(self.filename(fmt), self.headers, self.rows())
+
+    # ----------------------------------------------------------
+    # Faylga yozish (fon vazifasi)
+    # ----------------------------------------------------------
+
+    def write(self, fmt: str, target, on_progress=None, every: int = EXPORT_CHUNK_SIZE) -> None:
+        """
+        Eksportni binary fayl obyektiga yozadi.
+        on_progress(n) — har `every` qatorda (qayta ishlangan qatorlar soni).
+        """
+        fmt = self.resolve_format(fmt)
+        if fmt in MACHINE_FORMATS:
+            keys, values = self._machine_rows()
+            values = counted(values, on_progress, every)
+            if fmt == 'csv':
+                for chunk in iter_csv(keys, values):
+                    target.write(chunk.encode('utf-8'))
+            else:
+                for chunk in iter_jsonl_gz(keys, values):
+                    target.write(chunk)
+            return
+
+        rows = counted(self.rows(), on_progress, every)
+        if fmt == 'pdf':
+            write_pdf(target, self.title, self.headers, rows, self.landscape)
+        else:
+            write_excel(target, self.headers, rows)
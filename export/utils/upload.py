@@ -0,0 +1,233 @@
+"""
+============================================================
+UPLOAD PARSER — import fayllarini oqim bilan o'qish (.xlsx / .csv)
+============================================================
+Klasslar / funksiyalar:
+  Column       — ustun sxemasi: nom, tur (text | decimal), majburiy, tanlovlar
+  UploadRow    — o'qilgan qator: num (varaqdagi raqam), values (turga keltirilgan), error
+  UploadError  — fayl darajasidagi xato (ValueError) → 400
+  UploadStream — UploadRow iteratori (+ total: taxminiy qatorlar soni, progress uchun)
+  iter_upload(file, columns) — UploadStream
+  column_names(columns)      — shablon uchun header ro'yxati
+
+Tartib (ma'lumot o'qilishidan oldin to'xtaydi):
+  1. Hajm     — file.size > IMPORT_MAX_FILE_MB → fayl ochilmaydi
+  2. Format   — .csv (utf-8 / utf-8-sig, ajratgich ',' yoki ';') yoki .xlsx
+                (openpyxl read_only — varaq xotiraga yuklanmaydi)
+  3. Header   — majburiy ustun yo'q yoki takrorlangan → ma'lumot o'qilmaydi
+  4. Qatorlar — .xlsx varaq o'lchami (dimension) IMPORT_MAX_ROWS dan katta bo'lsa
+                darhol xato; oqim davomida ham sanaladi (dimension yo'q bo'lishi mumkin)
+
+Qatorlar birma-bir yaratiladi — butun varaq ro'yxatga olinmaydi. Qator xatosi
+(noto'g'ri son, bo'sh majburiy ustun) oqimni to'xtatmaydi: UploadRow.error to'ldiriladi,
+iste'molchi uni javobdagi errors ga yozadi. Butunlay bo'sh qatorlar o'tkazib yuboriladi.
+"""
+
+import codecs
+import csv
+import itertools
+from dataclasses import dataclass, field
+from decimal import Decimal, InvalidOperation
+
+import openpyxl
+from django.conf import settings
+
+
+TEXT    = 'text'
+DECIMAL = 'decimal'
+
+
+class UploadError(ValueError):
+    """Fayl darajasidagi xato — import boshlanmaydi (yoki to'liq bekor qilinadi)."""
+
+
+@dataclass(frozen=True)
+class Column:
+    name:     str
+    type:     str   = TEXT
+    required: bool  = False
+    choices:  tuple = ()      # bo'sh bo'lmasa — qiymat kichik harfda shulardan biri bo'lishi shart
+
+
+@dataclass
+class UploadRow:
+    num:    int
+    values: dict = field(default_factory=dict)
+    error:  str | None = None
+
+
+class UploadStream:
+    """iter_upload natijasi: UploadRow iteratori. total — .xlsx dimension bo'yicha (csv → None)."""
+
+    def __init__(self, rows, total: int | None, close=None):
+        self._rows  = rows
+        self._close = close
+        self.total  = total
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> UploadRow:
+        return next(self._rows)
+
+    def close(self) -> None:
+        """Iteratsiya boshlanmagan bo'lsa ham faylni yopadi."""
+        self._rows.close()
+        if self._close:
+            self._close()
+
+
+def column_names(columns) -> list[str]:
+    return [column.name for column in columns]
+
+
+def to_decimal(val) -> Decimal | None:
+    """Stringdan Decimal olish, xato (yoki NaN/Infinity) bo'lsa None."""
+    try:
+        value = Decimal(str(val).replace(',', '.'))
+    except (InvalidOperation, ValueError):
+        return None
+    return value if value.is_finite() else None
+
+
+def _cell_text(value) -> str:
+    if value is None:
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)   # 4600000000000.0 → "4600000000000" (barcode, telefon)
+    return str(value).strip()
+
+
+def _convert(column: Column, raw) -> tuple:
+    """Katak → (qiymat, xato). decimal bo'sh bo'lsa None."""
+    text = _cell_text(raw)
+    if not text:
+        if column.required:
+            return None, f"{column.name} maydoni bo'sh."
+        return (None if column.type == DECIMAL else ''), None
+
+    if column.type == DECIMAL:
+        value = raw if isinstance(raw, (int, float)) and not isinstance(raw, bool) else text
+        number = to_decimal(value)
+        if number is None:
+            return None, f'{column.name} noto\'g\'ri: "{text}"'
+        return number, None
+
+    if column.choices:
+        text = text.lower()
+        if text not in column.choices:
+            allowed = ' yoki '.join(f'"{c}"' for c in column.choices)
+            return None, f'{column.name} {allowed} bo\'lishi kerak, "{text}" emas.'
+    return text, None
+
+
+# ============================================================
+# MANBALAR: .xlsx / .csv → (header, qatorlar iteratori, taxminiy qatorlar soni, close)
+# ============================================================
+
+def _open_xlsx(file):
+    try:
+        wb = openpyxl.load_workbook(file, read_only=True, data_only=True)
+    except Exception:
+        raise UploadError("Fayl noto'g'ri formatda. Faqat .xlsx yoki .csv qabul qilinadi.")
+    ws   = wb.active
+    rows = ws.iter_rows(values_only=True)
+    return next(rows, None), rows, ws.max_row, wb.close
+
+
+def _open_csv(file):
+    if hasattr(file, 'seek'):
+        file.seek(0)
+    lines = codecs.iterdecode(file, 'utf-8-sig')
+    try:
+        first = next(lines, None)
+    except UnicodeDecodeError:
+        raise UploadError("CSV fayl UTF-8 kodlashda bo'lishi kerak.")
+    if first is None:
+        return None, iter(()), None, lambda: None
+    delimiter = ';' if first.count(';') > first.count(',') else ','
+    rows      = csv.reader(itertools.chain([first], lines), delimiter=delimiter)
+    return next(rows, None), rows, None, lambda: None
+
+
+def _file_size(file) -> int | None:
+    size = getattr(file, 'size', None)
+    if size is None and hasattr(file, 'seek'):
+        position = file.tell()
+        size     = file.seek(0, 2)
+        file.seek(position)
+    return size
+
+
+# ============================================================
+# ASOSIY GENERATOR
+# ============================================================
+
+def iter_upload(file, columns, max_rows: int | None = None):
+    """
+    Yuklangan faylni sxema bo'yicha o'qiydi → UploadStream (UploadRow lar oqimi).
+
+    Fayl darajasidagi xatolar (hajm, format, bo'sh fayl, header) — darhol UploadError
+    (generator boshlanmasdan). Qatorlar limiti oqim davomida oshsa — UploadError
+    iteratsiya ichidan (iste'molchi yozishdan oldin butun oqimni o'qishi shart).
+    """
+    max_rows = max_rows or settings.IMPORT_MAX_ROWS
+    max_mb   = settings.IMPORT_MAX_FILE_MB
+
+    size = _file_size(file)
+    if size is not None and size > max_mb * 1024 * 1024:
+        raise UploadError(f"Fayl hajmi {max_mb} MB dan oshmasligi kerak.")
+
+    name   = (getattr(file, 'name', '') or '').lower()
+    opener = _open_csv if name.endswith('.csv') else _open_xlsx
+    header, rows, dimension, close = opener(file)
+
+    try:
+        if header is None:
+            raise UploadError("Fayl bo'sh.")
+
+        headers = [_cell_text(h).lower() for h in header]
+        named   = [h for h in headers if h]
+        if len(named) != len(set(named)):
+            raise UploadError("Sarlavha qatorida takrorlangan ustun bor.")
+        missing = [c.name for c in columns if c.required and c.name not in headers]
+        if missing:
+            raise UploadError(
+                f"Shablon mos emas — majburiy ustun(lar) yo'q: {', '.join(missing)}. "
+                f"Kutilgan ustunlar: {', '.join(column_names(columns))}."
+            )
+        if dimension and dimension - 1 > max_rows:
+            raise UploadError(f"Faylda qatorlar soni {max_rows} dan oshmasligi kerak.")
+    except BaseException:
+        close()
+        raise
+
+    positions = [(column, headers.index(column.name)) for column in columns if column.name in headers]
+
+    def generate():
+        count = 0
+        try:
+            for row_num, raw in enumerate(rows, start=2):
+                if all(_cell_text(v) == '' for v in raw):
+                    continue
+                count += 1
+                if count > max_rows:
+                    raise UploadError(f"Faylda qatorlar soni {max_rows} dan oshmasligi kerak.")
+
+                row = UploadRow(row_num)
+                for column, index in positions:
+                    value, error = _convert(column, raw[index] if index < len(raw) else None)
+                    if error and row.error is None:
+                        row.error = error
+                    row.values[column.name] = value
+                for column in columns:
+                    row.values.setdefault(column.name, None if column.type == DECIMAL else '')
+                yield row
+        except UnicodeDecodeError:
+            raise UploadError("CSV fayl UTF-8 kodlashda bo'lishi kerak.")
+        except csv.Error as exc:
+            raise UploadError(f"CSV fayl buzilgan: {exc}")
+        finally:
+            close()
+
+    return UploadStream(generate(), dimension - 1 if dimension else None, close)
@@ -8,6 +8,13 @@ Export (yuklab olish):
   StockExportView         GET /api/v1/export/stocks/
   StockMovementExportView GET /api/v1/export/stock-movements/
   SupplierExportView      GET /api/v1/export/suppliers/
+  SupplierStatementExportView GET /api/v1/export/suppliers/{id}/statement/  (CSV, oqimli)
+
+Fon rejimi (ExportJob, Celery 'exports' navbati):
+  istalgan export endpointi + ?async=1  → 202 {job} (bir xil so'rov — mavjud job, 200)
+  ExportJobViewSet        GET /api/v1/export/jobs/                 (?status, ?kind)
+                          GET /api/v1/export/jobs/{id}/            (progress)
+                          GET /api/v1/export/jobs/{id}/download/   (tayyor fayl)
 
 Import (shablon + yuklash):
   ProductImportView       GET  /api/v1/export/products/template/
@@ -21,6 +28,17 @@ Import (shablon + yuklash):
   SubCategoryImportView   GET  /api/v1/export/subcategories/template/
                           POST /api/v1/export/subcategories/import/
 
+Import pipeline (BulkImportView → export/utils/importer.py):
+  Fayl (.xlsx yoki .csv) export/utils/upload.iter_upload bilan oqimda o'qiladi:
+  hajm, header va qatorlar limiti ma'lumotdan oldin tekshiriladi, qatorlar
+  turga keltirilgan holda birma-bir keladi.
+  Mahsulot, mijoz, yetkazib beruvchi, subkategoriya —
+  barcha qatorlar xotirada (oldindan yuklangan nom/barcode to'plamlari bilan)
+  tekshiriladi, so'ng bo'laklab bulk_create. ?mode=upsert — mavjudlarini yangilash.
+  Javob: {created, updated, skipped, errors: [{row, error}]}
+  Harakatlar — qatorlar tekshirilgach warehouse.movements.apply_movements ga
+  bir paket bo'lib beriladi (partiya, FIFO, AVCO, supplier qarzi — bulk).
+
 Ruxsatlar:
   Export — IsAuthenticated (barcha xodimlar ko'ra oladi)
   Import — IsManagerOrAbove (faqat menejer va yuqori)
@@ -32,55 +50,85 @@ Filtrlar (export):
   warehouse           — Warehouse ID
   movement_type       — in | out
   status              — model holatiga qarab
-  format              — excel (default) | pdf
+  format              — excel (default) | pdf | csv | jsonl.gz
+
+Mashina formatlari (csv, jsonl.gz) — integratsiyalar va buxgalteriya uchun:
+  stilsiz, DB kursoridan to'g'ridan-to'g'ri oqim (StreamingHttpResponse).
+  Ustunlar — *_EXPORT_COLUMNS (API maydon nomlari), qiymatlar xom holda:
+  summalar — Decimal satr ("12.50"), vaqt — ISO 8601 (UTC), holatlar — kod.
+  Ism/joylashuv kabi birlashtirilgan maydonlar SQL da hisoblanadi.
 """
 
-from decimal import Decimal, InvalidOperation
+from datetime import timedelta
+from decimal import Decimal
 
-from django.db import transaction
+from django.db.models import Case, CharField, Value, When
+from django.db.models.functions import Coalesce, Concat, Trim
+from django.http import FileResponse
+from django.utils import timezone
 from django.utils.dateparse import parse_date
 
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework import status
 
 from accaunt.permissions import IsManagerOrAbove, SubscriptionRequired
 from accaunt.throttles import BulkOperationThrottle, ExportThrottle
 
 from expense.models import Expense, ExpenseCategory
-from store.models import Branch
-from trade.models import Customer, CustomerGroup, Sale
+from trade.models import Sale
 from warehouse.models import (
-    Category,
-    MovementType,
     Product,
-    ProductUnit,
     Stock,
     StockMovement,
-    SubCategory,
     Supplier,
-    Warehouse,
+    SupplierLedgerEntry,
+    SupplierLedgerEntryType,
 )
 
-from .utils.excel import make_excel_response, make_template, parse_excel_upload
-from .utils.pdf import make_pdf_response
+from config.query_utils import parse_day_start
+
+from .models import ExportJob, ExportJobStatus, ImportJob
+from .serializers import ExportJobSerializer, ImportJobSerializer
+from .utils.excel import make_template
+from .utils.importer import (
+    CustomerImporter,
+    ImportMode,
+    ProductImporter,
+    StockMovementImporter,
+    SubCategoryImporter,
+    SupplierImporter,
+)
+from .utils.jobs import commit_import_job, start_export_job, start_import_job
+from .utils.upload import UploadError, column_names, iter_upload
+from .utils.spec import EXPORT_CONTENT_TYPES, ExportSpec, iter_values
 
 
 # ============================================================
 # YORDAMCHI FUNKSIYALAR
 # ============================================================
 
+def _full_name_sql(prefix: str):
+    """'ism familiya' — SQL da (User.get_full_name() ekvivalenti)."""
+    return Trim(Concat(
+        f'{prefix}__first_name', Value(' '), f'{prefix}__last_name',
+        output_field=CharField(),
+    ))
+
+
 def _get_format(request) -> str:
-    """?format=excel|pdf  (default: excel)"""
+    """?format=excel|pdf|csv|jsonl.gz  (default: excel)"""
     return request.query_params.get('format', 'excel').lower()
 
 
-def _filter_date(qs, field: str, request, is_date_field=False):
+def _filter_date(qs, field: str, params, is_date_field=False):
     """date_from / date_to ni queryset ga qo'llash.
     is_date_field=True bo'lsa DateField (gte/lte), aks holda DateTimeField (date__gte/date__lte)."""
-    date_from = request.query_params.get('date_from')
-    date_to   = request.query_params.get('date_to')
+    date_from = params.get('date_from')
+    date_to   = params.get('date_to')
     suffix_gte = '__gte' if is_date_field else '__date__gte'
     suffix_lte = '__lte' if is_date_field else '__date__lte'
     if date_from:
@@ -94,12 +142,27 @@ def _filter_date(qs, field: str, request, is_date_field=False):
     return qs
 
 
-def _to_decimal(val: str) -> Decimal | None:
-    """Stringdan Decimal olish, xato bo'lsa None."""
-    try:
-        return Decimal(str(val).replace(',', '.'))
-    except (InvalidOperation, ValueError):
-        return None
+def _export_params(request, url_kwargs: dict) -> dict:
+    """
+    So'rov parametrlari (format/async siz) + URL kwargs → oddiy dict.
+    ExportJob.params sifatida saqlanadi va task da build_export() ga beriladi.
+    """
+    params = {
+        key: value for key, value in request.query_params.items()
+        if key not in ('format', 'async')
+    }
+    params.update(url_kwargs)
+    return params
+
+
+def _display_map(model, field: str) -> dict:
+    """Choices maydoni uchun {qiymat: ko'rinadigan nom} — get_FOO_display() o'rniga."""
+    return dict(model._meta.get_field(field).flatchoices)
+
+
+def _full_name(first_name, last_name) -> str:
+    """User.get_full_name() ning values() varianti."""
+    return f"{first_name or ''} {last_name or ''}".strip()
 
 
 def _fmt_dt(dt) -> str:
@@ -116,32 +179,151 @@ def _fmt_d(d) -> str:
     return d.strftime('%d.%m.%Y') if hasattr(d, 'strftime') else str(d)
 
 
+# ============================================================
+# MASHINA FORMATLARI USTUNLARI (csv, jsonl.gz)
+# ============================================================
+
+SALE_EXPORT_COLUMNS = [
+    ('id',              'id'),
+    ('created_on',      'created_on'),
+    ('branch',          'branch_id'),
+    ('branch_name',     'branch__name'),
+    ('worker_name',     _full_name_sql('worker__user')),
+    ('customer',        'customer_id'),
+    ('customer_name',   'customer__name'),
+    ('payment_type',    'payment_type'),
+    ('total_price',     'total_price'),
+    ('discount_amount', 'discount_amount'),
+    ('cash_amount',     'cash_amount'),
+    ('card_amount',     'card_amount'),
+    ('paid_amount',     'paid_amount'),
+    ('debt_amount',     'debt_amount'),
+    ('status',          'status'),
+    ('smena',           'smena_id'),
+]
+
+EXPENSE_EXPORT_COLUMNS = [
+    ('id',            'id'),
+    ('date',          'date'),
+    ('category',      'category_id'),
+    ('category_name', 'category__name'),
+    ('branch',        'branch_id'),
+    ('branch_name',   'branch__name'),
+    ('worker_name',   _full_name_sql('worker__user')),
+    ('amount',        'amount'),
+    ('description',   'description'),
+    ('smena',         'smena_id'),
+]
+
+STOCK_EXPORT_COLUMNS = [
+    ('id',               'id'),
+    ('product',          'product_id'),
+    ('product_name',     'product__name'),
+    ('barcode',          'product__barcode'),
+    ('category_name',    'product__category__name'),
+    ('subcategory_name', 'product__subcategory__name'),
+    ('unit',             'product__unit'),
+    ('quantity',         'quantity'),
+    ('location_type',    Case(When(branch__isnull=False, then=Value('branch')),
+                              default=Value('warehouse'), output_field=CharField())),
+    ('location_name',    Coalesce('branch__name', 'warehouse__name')),
+    ('sale_price',       'product__sale_price'),
+    ('purchase_price',   'product__purchase_price'),
+]
+
+STOCK_MOVEMENT_EXPORT_COLUMNS = [
+    ('id',            'id'),
+    ('created_on',    'created_on'),
+    ('movement_type', 'movement_type'),
+    ('product',       'product_id'),
+    ('product_name',  'product__name'),
+    ('quantity',      'quantity'),
+    ('unit',          'product__unit'),
+    ('unit_cost',     'unit_cost'),
+    ('location_type', Case(When(branch__isnull=False, then=Value('branch')),
+                           default=Value('warehouse'), output_field=CharField())),
+    ('location_name', Coalesce('branch__name', 'warehouse__name')),
+    ('worker_name',   _full_name_sql('worker__user')),
+    ('supplier',      'supplier_id'),
+    ('supplier_name', 'supplier__name'),
+    ('description',   'description'),
+]
+
+SUPPLIER_EXPORT_COLUMNS = [
+    ('id',           'id'),
+    ('name',         'name'),
+    ('company',      'company'),
+    ('phone',        'phone'),
+    ('address',      'address'),
+    ('debt_balance', 'debt_balance'),
+    ('status',       'status'),
+    ('description',  'description'),
+]
+
+
 # ============================================================
 # EXPORT VIEWS
 # ============================================================
 
-class SaleExportView(APIView):
+class ExportAPIView(APIView):
     """
-    GET /api/v1/export/sales/
-    Filtrlar: format, date_from, date_to, branch, smena, status
+    Export view'lari uchun asos.
+
+    Har bir eksport build_export(store, params) → ExportSpec ni qaytaradi:
+      - sinxron:  GET ...?format=...           → spec.response(format)
+      - fon:      GET ...?format=...&async=1   → ExportJob (202), task xuddi shu
+                  build_export() ni Celery worker da chaqiradi.
+
+    ?format= — fayl formati, DRF renderer tanlovi EMAS: DRF
+    URL_FORMAT_OVERRIDE='format' sababli noma'lum renderer → 404 qaytarardi.
+    Fayl javoblari renderer ishlatmaydi, xato javoblari — birinchi (JSON) renderer.
     """
     permission_classes  = [IsAuthenticated, SubscriptionRequired('has_export')]
     throttle_classes    = [ExportThrottle]
+    export_kind         = None   # EXPORT_VIEWS kaliti
 
-    def get(self, request):
+    def perform_content_negotiation(self, request, force=False):
+        return super().perform_content_negotiation(request, force=True)
+
+    def build_export(self, store, params) -> ExportSpec:
+        raise NotImplementedError
+
+    def get(self, request, **kwargs):
         worker = request.user.worker
-        qs = (
-            Sale.objects
-            .filter(store=worker.store)
-            .select_related('branch', 'worker__user', 'customer', 'smena')
-            .prefetch_related('items__product')
-        )
+        params = _export_params(request, kwargs)
+        spec   = self.build_export(worker.store, params)
+        fmt    = spec.resolve_format(_get_format(request))
+
+        if request.query_params.get('async', '').lower() in ('1', 'true'):
+            job, reused = start_export_job(self.export_kind, worker, fmt, params)
+            return Response(
+                {
+                    'message': (
+                        "Bir xil eksport allaqachon mavjud — o'sha qaytarildi."
+                        if reused else "Eksport navbatga qo'yildi."
+                    ),
+                    'data': ExportJobSerializer(job, context={'request': request}).data,
+                },
+                status=status.HTTP_200_OK if reused else status.HTTP_202_ACCEPTED,
+            )
+        return spec.response(fmt)
+
+
+class SaleExportView(ExportAPIView):
+    """
+    GET /api/v1/export/sales/
+    Filtrlar: format, date_from, date_to, branch, smena, status
+    """
+    export_kind = 'sales'
+
+    def build_export(self, store, params) -> ExportSpec:
+        qs = Sale.objects.filter(store=store).order_by('-created_on', '-id')
 
         # Filtrlar
-        qs = _filter_date(qs, 'created_on', request)
-        branch = request.query_params.get('branch')
-        smena  = request.query_params.get('smena')
-        st     = request.query_params.get('status')
+        qs = _filter_date(qs, 'created_on', params)
+        branch = params.get('branch')
+        smena  = params.get('smena')
+        st     = params.get('status')
         if branch: qs = qs.filter(branch_id=branch)
         if smena:  qs = qs.filter(smena_id=smena)
         if st:     qs = qs.filter(status=st)
@@ -151,58 +333,56 @@ class SaleExportView(APIView):
             'To\'lov turi', 'Jami summa', 'Chegirma', 'Naqd',
             'Karta', 'Nasiya', 'Holat', 'Smena',
         ]
-        rows = []
-        for i, sale in enumerate(qs, start=1):
-            is_cash = sale.payment_type == 'cash'
-            is_card = sale.payment_type == 'card'
-            rows.append([
-                i,
-                _fmt_dt(sale.created_on),
-                sale.branch.name if sale.branch else '',
-                sale.worker.user.get_full_name() if sale.worker else '',
-                sale.customer.name if sale.customer_id else '',
-                sale.get_payment_type_display(),
-                float(sale.total_price),
-                float(sale.discount_amount),
-                float(sale.paid_amount) if is_cash else 0.0,
-                float(sale.paid_amount) if is_card else 0.0,
-                float(sale.debt_amount),
-                sale.get_status_display(),
-                f'#{sale.smena_id}' if sale.smena_id else '',
-            ])
-
-        fmt = _get_format(request)
-        if fmt == 'pdf':
-            return make_pdf_response(
-                filename='sotuvlar.pdf',
-                title='Sotuvlar hisoboti',
-                headers=headers,
-                rows=rows,
-                landscape_mode=True,
+        payment_types = _display_map(Sale, 'payment_type')
+        statuses      = _display_map(Sale, 'status')
+
+        def rows():
+            values = qs.values_list(
+                'created_on', 'branch__name', 'worker__user__first_name', 'worker__user__last_name',
+                'customer__name', 'payment_type', 'total_price', 'discount_amount',
+                'paid_amount', 'debt_amount', 'status', 'smena_id',
             )
-        return make_excel_response('sotuvlar.xlsx', headers, rows)
+            for i, (created_on, branch_name, first_name, last_name, customer_name, payment_type,
+                    total_price, discount_amount, paid_amount, debt_amount, sale_status, smena_id) in enumerate(
+                iter_values(values), start=1,
+            ):
+                paid = float(paid_amount)
+                yield [
+                    i,
+                    _fmt_dt(created_on),
+                    branch_name or '',
+                    _full_name(first_name, last_name),
+                    customer_name or '',
+                    payment_types.get(payment_type, payment_type),
+                    float(total_price),
+                    float(discount_amount),
+                    paid if payment_type == 'cash' else 0.0,
+                    paid if payment_type == 'card' else 0.0,
+                    float(debt_amount),
+                    statuses.get(sale_status, sale_status),
+                    f'#{smena_id}' if smena_id else '',
+                ]
+
+        return ExportSpec(
+            basename='sotuvlar', title='Sotuvlar hisoboti', headers=headers, rows=rows,
+            queryset=qs, columns=SALE_EXPORT_COLUMNS, landscape=True,
+        )
 
 
-class ExpenseExportView(APIView):
+class ExpenseExportView(ExportAPIView):
     """
     GET /api/v1/export/expenses/
     Filtrlar: format, date_from, date_to, branch, smena, category
     """
-    permission_classes  = [IsAuthenticated, SubscriptionRequired('has_export')]
-    throttle_classes    = [ExportThrottle]
+    export_kind = 'expenses'
 
-    def get(self, request):
-        worker = request.user.worker
-        qs = (
-            Expense.objects
-            .filter(store=worker.store)
-            .select_related('branch', 'worker__user', 'category', 'smena')
-        )
+    def build_export(self, store, params) -> ExportSpec:
+        qs = Expense.objects.filter(store=store).order_by('-date', '-created_on')
 
-        qs = _filter_date(qs, 'date', request, is_date_field=True)
-        branch   = request.query_params.get('branch')
-        smena    = request.query_params.get('smena')
-        category = request.query_params.get('category')
+        qs = _filter_date(qs, 'date', params, is_date_field=True)
+        branch   = params.get('branch')
+        smena    = params.get('smena')
+        category = params.get('category')
         if branch:   qs = qs.filter(branch_id=branch)
         if smena:    qs = qs.filter(smena_id=smena)
         if category: qs = qs.filter(category_id=category)
@@ -211,49 +391,44 @@ class ExpenseExportView(APIView):
             '#', 'Sana', 'Kategoriya', 'Filial', 'Xodim',
             'Summa', 'Izoh', 'Smena',
         ]
-        rows = []
-        for i, exp in enumerate(qs, start=1):
-            rows.append([
-                i,
-                _fmt_d(exp.date),
-                exp.category.name if exp.category_id else '',
-                exp.branch.name if exp.branch_id else '',
-                exp.worker.user.get_full_name() if exp.worker_id else '',
-                float(exp.amount),
-                exp.description,
-                f'#{exp.smena_id}' if exp.smena_id else '',
-            ])
-
-        fmt = _get_format(request)
-        if fmt == 'pdf':
-            return make_pdf_response(
-                filename='xarajatlar.pdf',
-                title='Xarajatlar hisoboti',
-                headers=headers,
-                rows=rows,
+
+        def rows():
+            values = qs.values_list(
+                'date', 'category__name', 'branch__name', 'worker__user__first_name',
+                'worker__user__last_name', 'amount', 'description', 'smena_id',
             )
-        return make_excel_response('xarajatlar.xlsx', headers, rows)
+            for i, (date, category_name, branch_name, first_name, last_name,
+                    amount, description, smena_id) in enumerate(iter_values(values), start=1):
+                yield [
+                    i,
+                    _fmt_d(date),
+                    category_name or '',
+                    branch_name or '',
+                    _full_name(first_name, last_name),
+                    float(amount),
+                    description,
+                    f'#{smena_id}' if smena_id else '',
+                ]
+
+        return ExportSpec(
+            basename='xarajatlar', title='Xarajatlar hisoboti', headers=headers, rows=rows,
+            queryset=qs, columns=EXPENSE_EXPORT_COLUMNS,
+        )
 
 
-class StockExportView(APIView):
+class StockExportView(ExportAPIView):
     """
     GET /api/v1/export/stocks/
     Filtrlar: branch, warehouse
-    Format: faqat excel (qoldig' PDF uchun foydali emas)
+    Format: excel | csv | jsonl.gz (qoldiq PDF uchun foydali emas)
     """
-    permission_classes  = [IsAuthenticated, SubscriptionRequired('has_export')]
-    throttle_classes    = [ExportThrottle]
+    export_kind = 'stocks'
 
-    def get(self, request):
-        worker = request.user.worker
-        qs = (
-            Stock.objects
-            .filter(product__store=worker.store)
-            .select_related('product__category', 'product__subcategory', 'branch', 'warehouse')
-        )
+    def build_export(self, store, params) -> ExportSpec:
+        qs = Stock.objects.filter(product__store=store).order_by('product__name', 'id')
 
-        branch    = request.query_params.get('branch')
-        warehouse = request.query_params.get('warehouse')
+        branch    = params.get('branch')
+        warehouse = params.get('warehouse')
         if branch:    qs = qs.filter(branch_id=branch)
         if warehouse: qs = qs.filter(warehouse_id=warehouse)
 
@@ -262,47 +437,51 @@ class StockExportView(APIView):
             'Birlik', 'Qoldiq', 'Joylashuv', 'Tur',
             'Sotish narxi', 'Xarid narxi',
         ]
-        rows = []
-        for i, stock in enumerate(qs, start=1):
-            p   = stock.product
-            loc = stock.branch.name if stock.branch_id else stock.warehouse.name
-            typ = 'Filial' if stock.branch_id else 'Ombor'
-            rows.append([
-                i,
-                p.name,
-                p.category.name if p.category_id else '',
-                p.subcategory.name if p.subcategory_id else '',
-                p.get_unit_display(),
-                float(stock.quantity),
-                loc,
-                typ,
-                float(p.sale_price),
-                float(p.purchase_price),
-            ])
-
-        return make_excel_response('qoldiqlar.xlsx', headers, rows)
-
-
-class StockMovementExportView(APIView):
+        units = _display_map(Product, 'unit')
+
+        def rows():
+            values = qs.values_list(
+                'product__name', 'product__category__name', 'product__subcategory__name',
+                'product__unit', 'quantity', 'branch_id', 'branch__name', 'warehouse__name',
+                'product__sale_price', 'product__purchase_price',
+            )
+            for i, (name, category_name, subcategory_name, unit, quantity, branch_id,
+                    branch_name, warehouse_name, sale_price, purchase_price) in enumerate(
+                iter_values(values), start=1,
+            ):
+                yield [
+                    i,
+                    name,
+                    category_name or '',
+                    subcategory_name or '',
+                    units.get(unit, unit),
+                    float(quantity),
+                    branch_name if branch_id else warehouse_name,
+                    'Filial' if branch_id else 'Ombor',
+                    float(sale_price),
+                    float(purchase_price),
+                ]
+
+        return ExportSpec(
+            basename='qoldiqlar', title='Qoldiqlar', headers=headers, rows=rows,
+            queryset=qs, columns=STOCK_EXPORT_COLUMNS, formats=('excel', 'csv', 'jsonl.gz'),
+        )
+
+
+class StockMovementExportView(ExportAPIView):
     """
     GET /api/v1/export/stock-movements/
     Filtrlar: format, date_from, date_to, branch, warehouse, movement_type
     """
-    permission_classes  = [IsAuthenticated, SubscriptionRequired('has_export')]
-    throttle_classes    = [ExportThrottle]
+    export_kind = 'stock-movements'
 
-    def get(self, request):
-        worker = request.user.worker
-        qs = (
-            StockMovement.objects
-            .filter(product__store=worker.store)
-            .select_related('product', 'branch', 'warehouse', 'worker__user', 'supplier')
-        )
+    def build_export(self, store, params) -> ExportSpec:
+        qs = StockMovement.objects.filter(product__store=store).order_by('-created_on', '-id')
 
-        qs = _filter_date(qs, 'created_on', request)
-        branch    = request.query_params.get('branch')
-        warehouse = request.query_params.get('warehouse')
-        mv_type   = request.query_params.get('movement_type')
+        qs = _filter_date(qs, 'created_on', params)
+        branch    = params.get('branch')
+        warehouse = params.get('warehouse')
+        mv_type   = params.get('movement_type')
         if branch:    qs = qs.filter(branch_id=branch)
         if warehouse: qs = qs.filter(warehouse_id=warehouse)
         if mv_type:   qs = qs.filter(movement_type=mv_type)
@@ -312,83 +491,246 @@ class StockMovementExportView(APIView):
             'Miqdor', 'Birlik', 'Tannarx', 'Joylashuv',
             'Xodim', 'Yetkazib beruvchi', 'Izoh',
         ]
-        rows = []
-        for i, mv in enumerate(qs, start=1):
-            loc = mv.branch.name if mv.branch_id else mv.warehouse.name
-            rows.append([
-                i,
-                _fmt_dt(mv.created_on),
-                mv.get_movement_type_display(),
-                mv.product.name,
-                float(mv.quantity),
-                mv.product.get_unit_display(),
-                float(mv.unit_cost) if mv.unit_cost else '',
-                loc,
-                mv.worker.user.get_full_name() if mv.worker_id else '',
-                mv.supplier.name if mv.supplier_id else '',
-                mv.description,
-            ])
-
-        fmt = _get_format(request)
-        if fmt == 'pdf':
-            return make_pdf_response(
-                filename='harakatlar.pdf',
-                title='Ombor harakatlari hisoboti',
-                headers=headers,
-                rows=rows,
-                landscape_mode=True,
+        movement_types = _display_map(StockMovement, 'movement_type')
+        units          = _display_map(Product, 'unit')
+
+        def rows():
+            values = qs.values_list(
+                'created_on', 'movement_type', 'product__name', 'quantity', 'product__unit',
+                'unit_cost', 'branch_id', 'branch__name', 'warehouse__name',
+                'worker__user__first_name', 'worker__user__last_name', 'supplier__name', 'description',
             )
-        return make_excel_response('harakatlar.xlsx', headers, rows)
+            for i, (created_on, movement_type, product_name, quantity, unit, unit_cost, branch_id,
+                    branch_name, warehouse_name, first_name, last_name, supplier_name, description) in enumerate(
+                iter_values(values), start=1,
+            ):
+                yield [
+                    i,
+                    _fmt_dt(created_on),
+                    movement_types.get(movement_type, movement_type),
+                    product_name,
+                    float(quantity),
+                    units.get(unit, unit),
+                    float(unit_cost) if unit_cost else '',
+                    branch_name if branch_id else warehouse_name,
+                    _full_name(first_name, last_name),
+                    supplier_name or '',
+                    description,
+                ]
+
+        return ExportSpec(
+            basename='harakatlar', title='Ombor harakatlari hisoboti', headers=headers, rows=rows,
+            queryset=qs, columns=STOCK_MOVEMENT_EXPORT_COLUMNS, landscape=True,
+        )
 
 
-class SupplierExportView(APIView):
+class SupplierExportView(ExportAPIView):
     """
     GET /api/v1/export/suppliers/
     Filtrlar: format, status
     """
-    permission_classes  = [IsAuthenticated, SubscriptionRequired('has_export')]
-    throttle_classes    = [ExportThrottle]
+    export_kind = 'suppliers'
 
-    def get(self, request):
-        worker = request.user.worker
-        qs = Supplier.objects.filter(store=worker.store)
+    def build_export(self, store, params) -> ExportSpec:
+        qs = Supplier.objects.filter(store=store).order_by('name', 'id')
 
-        st = request.query_params.get('status')
+        st = params.get('status')
         if st: qs = qs.filter(status=st)
 
         headers = [
             '#', 'Nomi', 'Kompaniya', 'Telefon',
             'Manzil', 'Qarz balansi', 'Holat', 'Izoh',
         ]
-        rows = []
-        for i, sup in enumerate(qs, start=1):
-            rows.append([
-                i,
-                sup.name,
-                sup.company,
-                sup.phone,
-                sup.address,
-                float(sup.debt_balance),
-                sup.get_status_display(),
-                sup.description,
-            ])
-
-        fmt = _get_format(request)
-        if fmt == 'pdf':
-            return make_pdf_response(
-                filename='yetkazib_beruvchilar.pdf',
-                title='Yetkazib beruvchilar',
-                headers=headers,
-                rows=rows,
+        statuses = _display_map(Supplier, 'status')
+
+        def rows():
+            values = qs.values_list(
+                'name', 'company', 'phone', 'address', 'debt_balance', 'status', 'description',
+            )
+            for i, (name, company, phone, address, debt_balance, sup_status, description) in enumerate(
+                iter_values(values), start=1,
+            ):
+                yield [
+                    i,
+                    name,
+                    company,
+                    phone,
+                    address,
+                    float(debt_balance),
+                    statuses.get(sup_status, sup_status),
+                    description,
+                ]
+
+        return ExportSpec(
+            basename='yetkazib_beruvchilar', title='Yetkazib beruvchilar', headers=headers, rows=rows,
+            queryset=qs, columns=SUPPLIER_EXPORT_COLUMNS,
+        )
+
+
+class SupplierStatementExportView(ExportAPIView):
+    """
+    GET /api/v1/export/suppliers/{id}/statement/
+    Yetkazib beruvchi bilan hisob-kitob dalolatnomasi (akt sverka) — CSV, oqimli.
+    Filtrlar: date_from, date_to
+
+    Boshlang'ich qoldiq → davr yozuvlari (SupplierLedgerEntry, running balance) →
+    yakuniy qoldiq. Yozuvlar DB kursoridan (iterator) o'qiladi va darhol
+    yuboriladi — yetkazib beruvchi tarixi qancha katta bo'lmasin, xotira o'zgarmas.
+    """
+    export_kind = 'supplier-statement'
+
+    def build_export(self, store, params) -> ExportSpec:
+        supplier = Supplier.objects.filter(store=store, pk=params.get('pk')).first()
+        if supplier is None:
+            raise NotFound('Yetkazib beruvchi topilmadi.')
+
+        date_from = parse_day_start(params.get('date_from'), 'date_from')
+        date_to   = parse_day_start(params.get('date_to'), 'date_to')
+
+        entries = SupplierLedgerEntry.objects.filter(supplier=supplier).order_by('created_on', 'id')
+        if date_from:
+            entries = entries.filter(created_on__gte=date_from)
+            opening = SupplierLedgerEntry.balance_as_of(supplier.id, date_from - timedelta(microseconds=1))
+        else:
+            opening = Decimal('0')
+        if date_to:
+            entries = entries.filter(created_on__lt=date_to + timedelta(days=1))
+
+        headers = ['Sana', 'Turi', 'Izoh', 'Qarz (+)', "To'lov (−)", 'Qoldiq', "To'lanmagan"]
+        types   = dict(SupplierLedgerEntryType.choices)
+
+        def rows():
+            yield ['', f"{supplier.name} ({supplier.company})" if supplier.company else supplier.name, '', '', '', '', '']
+            yield ['', "Boshlang'ich qoldiq", '', '', '', opening, '']
+            closing = opening
+            for created_on, entry_type, description, amount, balance, open_amount in iter_values(
+                entries.values_list('created_on', 'entry_type', 'description', 'amount', 'balance', 'open_amount')
+            ):
+                closing = balance
+                yield [
+                    _fmt_dt(timezone.localtime(created_on)),
+                    types.get(entry_type, entry_type),
+                    description,
+                    amount if amount > 0 else '',
+                    -amount if amount < 0 else '',
+                    balance,
+                    open_amount or '',
+                ]
+            yield ['', 'Yakuniy qoldiq', '', '', '', closing, '']
+
+        return ExportSpec(
+            basename=f'dalolatnoma_{supplier.id}', title='Dalolatnoma', headers=headers, rows=rows,
+            queryset=entries, formats=('csv',),
+        )
+
+
+# Fon eksporti (ExportJob.kind) → view
+EXPORT_VIEWS = {
+    view.export_kind: view
+    for view in (
+        SaleExportView,
+        ExpenseExportView,
+        StockExportView,
+        StockMovementExportView,
+        SupplierExportView,
+        SupplierStatementExportView,
+    )
+}
+
+
+# ============================================================
+# EXPORT JOBLARI (fon rejimi)
+# ============================================================
+
+class ExportJobViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Fon rejimidagi eksportlar (do'kon bo'yicha).
+
+    Endpointlar:
+      GET /api/v1/export/jobs/                — ro'yxat (?status=, ?kind=)
+      GET /api/v1/export/jobs/{id}/           — holat va progress (polling)
+      GET /api/v1/export/jobs/{id}/download/  — tayyor fayl (status=done)
+
+    Boshlash: istalgan export endpointi + ?async=1 (→ 202, job).
+    """
+    serializer_class   = ExportJobSerializer
+    permission_classes = [IsAuthenticated, SubscriptionRequired('has_export')]
+
+    def get_queryset(self):
+        worker = getattr(self.request.user, 'worker', None)
+        if not worker or not worker.store:
+            return ExportJob.objects.none()
+        qs = ExportJob.objects.filter(store=worker.store)
+        job_status = self.request.query_params.get('status')
+        kind       = self.request.query_params.get('kind')
+        if job_status: qs = qs.filter(status=job_status)
+        if kind:       qs = qs.filter(kind=kind)
+        return qs
+
+    @action(methods=['get'], detail=True, url_path='download')
+    def download(self, request, pk=None):
+        job = self.get_object()
+        if job.status != ExportJobStatus.DONE or not job.file:
+            return Response(
+                {'detail': f"Fayl tayyor emas (holat: {job.get_status_display()})."},
+                status=status.HTTP_409_CONFLICT,
+            )
+        response = FileResponse(
+            job.file.open('rb'),
+            content_type=EXPORT_CONTENT_TYPES.get(job.file_format, 'application/octet-stream'),
+        )
+        response['Content-Disposition'] = f'attachment; filename="{job.file_name}"'
+        return response
+
+
+class ImportJobViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Fon rejimidagi importlar (do'kon bo'yicha).
+
+    Endpointlar:
+      GET  /api/v1/export/import-jobs/               — ro'yxat (?status=, ?kind=)
+      GET  /api/v1/export/import-jobs/{id}/          — holat, progress, qator xatolari (polling)
+      POST /api/v1/export/import-jobs/{id}/commit/   — tugagan dry-run ni xuddi shu fayl bilan yozish
+
+    Boshlash: istalgan import endpointi + ?async=1 (→ 202, job).
+    """
+    serializer_class   = ImportJobSerializer
+    permission_classes = [IsManagerOrAbove, SubscriptionRequired('has_export')]
+
+    def get_queryset(self):
+        worker = getattr(self.request.user, 'worker', None)
+        if not worker or not worker.store:
+            return ImportJob.objects.none()
+        qs = ImportJob.objects.filter(store=worker.store)
+        job_status = self.request.query_params.get('status')
+        kind       = self.request.query_params.get('kind')
+        if job_status: qs = qs.filter(status=job_status)
+        if kind:       qs = qs.filter(kind=kind)
+        return qs
+
+    @action(methods=['post'], detail=True, url_path='commit')
+    def commit(self, request, pk=None):
+        job = self.get_object()
+        if not commit_import_job(job):
+            return Response(
+                {'detail': "Faqat tugagan dry-run importni yozish mumkin (fayli saqlangan bo'lsa)."},
+                status=status.HTTP_409_CONFLICT,
             )
-        return make_excel_response('yetkazib_beruvchilar.xlsx', headers, rows)
+        job.refresh_from_db()
+        return Response(
+            {
+                'message': "Import yozish uchun navbatga qo'yildi.",
+                'data': ImportJobSerializer(job, context={'request': request}).data,
+            },
+            status=status.HTTP_202_ACCEPTED,
+        )
 
 
 # ============================================================
 # IMPORT VIEWS — Mahsulot
 # ============================================================
 
-PRODUCT_HEADERS = ['nom', 'kategoriya', 'subkategoriya', 'sale_price', 'purchase_price', 'birlik', 'barcode']
+PRODUCT_HEADERS = column_names(ProductImporter.columns)
 PRODUCT_NOTES = {
     'nom':           'Mahsulot nomi (majburiy)',
     'kategoriya':    'Mavjud kategoriya nomi (ixtiyoriy)',
@@ -398,96 +740,80 @@ PRODUCT_NOTES = {
     'birlik':        'dona / kg / g / litr / metr / m2 / yashik / qop / quti',
     'barcode':       'Shtrix-kod (ixtiyoriy)',
 }
-VALID_UNITS = [u.value for u in ProductUnit]
 
 
-class ProductImportView(APIView):
+def _flag(request, name: str) -> bool:
+    value = request.query_params.get(name) or request.data.get(name) or ''
+    return str(value).lower() in ('1', 'true')
+
+
+class BulkImportView(APIView):
+    """
+    Import endpointlari uchun asos (export/utils/importer.py pipeline).
+      GET  → bo'sh shablon .xlsx
+      POST → file=<.xlsx | .csv>, ?mode=create (standart) | upsert
+             &dry_run=true — faqat tekshirish (bazaga yozilmaydi)
+             &async=1      — ImportJob (202): fayl saqlanadi, Celery bo'laklab bajaradi,
+                             holat — GET /api/v1/export/import-jobs/{id}/ (polling)
+             Fayl iter_upload(file, importer_class.columns) bilan oqimda o'qiladi
+             Javob: {'created', 'updated', 'skipped', 'errors': [{'row', 'error'}], 'dry_run'}
+    """
     permission_classes  = [IsManagerOrAbove, SubscriptionRequired('has_export')]
     throttle_classes    = [BulkOperationThrottle]
+    importer_class      = None
+    template_name       = ''
+    template_headers    = []
+    template_notes      = {}
 
     def get(self, request):
         """GET → bo'sh shablon .xlsx"""
-        return make_template('mahsulotlar_shablon.xlsx', PRODUCT_HEADERS, PRODUCT_NOTES)
+        return make_template(self.template_name, self.template_headers, self.template_notes)
 
     def post(self, request):
-        """POST → faylni yuklash va import qilish"""
+        """POST → faylni yuklash va import qilish (sinxron yoki ImportJob)"""
         file = request.FILES.get('file')
         if not file:
             return Response({'detail': 'file maydoni kerak.'}, status=status.HTTP_400_BAD_REQUEST)
 
+        mode = request.query_params.get('mode') or request.data.get('mode') or ImportMode.CREATE
+        if mode not in ImportMode.ALL:
+            return Response(
+                {'detail': "mode 'create' yoki 'upsert' bo'lishi kerak."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        dry_run = _flag(request, 'dry_run')
+        worker  = request.user.worker
+
         try:
-            rows = parse_excel_upload(file)
-        except ValueError as e:
+            if _flag(request, 'async'):
+                job = start_import_job(self.importer_class.kind, worker, file, mode, dry_run)
+                return Response(
+                    {
+                        'message': "Import navbatga qo'yildi.",
+                        'data': ImportJobSerializer(job, context={'request': request}).data,
+                    },
+                    status=status.HTTP_202_ACCEPTED,
+                )
+            rows     = iter_upload(file, self.importer_class.columns)
+            importer = self.importer_class(worker.store, mode=mode, worker=worker)
+            result   = importer.run(rows, dry_run=dry_run)
+        except UploadError as e:
             return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(result.as_dict(), status=status.HTTP_200_OK)
 
-        worker = request.user.worker
-        store  = worker.store
-
-        # Kategoriya va subkategoriyalarni oldindan yuklash
-        cats    = {c.name.lower(): c for c in Category.objects.filter(store=store)}
-        subcats = {s.name.lower(): s for s in SubCategory.objects.filter(category__store=store)}
-
-        created = 0
-        skipped = 0
-        errors  = []
-
-        for row_num, row in enumerate(rows, start=2):
-            nom = row.get('nom', '').strip()
-            if not nom:
-                errors.append({'row': row_num, 'error': 'nom maydoni bo\'sh.'})
-                continue
-
-            sale_price = _to_decimal(row.get('sale_price', ''))
-            if sale_price is None:
-                errors.append({'row': row_num, 'error': f'sale_price noto\'g\'ri: "{row.get("sale_price")}"'})
-                continue
-
-            purchase_price = _to_decimal(row.get('purchase_price', '') or '0') or Decimal('0')
-            unit = row.get('birlik', 'dona').strip().lower()
-            if unit not in VALID_UNITS:
-                unit = 'dona'
-
-            cat_name    = row.get('kategoriya', '').strip().lower()
-            subcat_name = row.get('subkategoriya', '').strip().lower()
-            barcode     = row.get('barcode', '').strip() or None
-
-            category    = cats.get(cat_name)
-            subcategory = subcats.get(subcat_name)
-
-            # Bir do'konda bir xil nom bo'lmasligi kerak
-            if Product.objects.filter(store=store, name=nom).exists():
-                skipped += 1
-                errors.append({'row': row_num, 'error': f'"{nom}" allaqachon mavjud — o\'tkazib yuborildi.'})
-                continue
-
-            try:
-                with transaction.atomic():
-                    Product.objects.create(
-                        store=store,
-                        name=nom,
-                        category=category,
-                        subcategory=subcategory,
-                        sale_price=sale_price,
-                        purchase_price=purchase_price,
-                        unit=unit,
-                        barcode=barcode or None,
-                    )
-                created += 1
-            except Exception as e:
-                errors.append({'row': row_num, 'error': str(e)})
-
-        return Response({
-            'created': created,
-            'skipped': skipped,
-            'errors':  errors,
-        }, status=status.HTTP_200_OK)
+
+class ProductImportView(BulkImportView):
+    importer_class   = ProductImporter
+    template_name    = 'mahsulotlar_shablon.xlsx'
+    template_headers = PRODUCT_HEADERS
+    template_notes   = PRODUCT_NOTES
 
 
 # ============================================================
 # IMPORT VIEWS — Mijoz
 # ============================================================
 
-CUSTOMER_HEADERS = ['ism', 'telefon', 'manzil', 'guruh', 'izoh']
+CUSTOMER_HEADERS = column_names(CustomerImporter.columns)
 CUSTOMER_NOTES = {
     'ism':    'Mijoz ismi (majburiy)',
     'telefon':'Telefon raqami (ixtiyoriy)',
@@ -497,70 +823,18 @@ CUSTOMER_NOTES = {
 }
 
 
-class CustomerImportView(APIView):
-    permission_classes  = [IsManagerOrAbove, SubscriptionRequired('has_export')]
-    throttle_classes    = [BulkOperationThrottle]
-
-    def get(self, request):
-        return make_template('mijozlar_shablon.xlsx', CUSTOMER_HEADERS, CUSTOMER_NOTES)
-
-    def post(self, request):
-        file = request.FILES.get('file')
-        if not file:
-            return Response({'detail': 'file maydoni kerak.'}, status=status.HTTP_400_BAD_REQUEST)
-
-        try:
-            rows = parse_excel_upload(file)
-        except ValueError as e:
-            return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
-
-        worker = request.user.worker
-        store  = worker.store
-
-        groups = {g.name.lower(): g for g in CustomerGroup.objects.filter(store=store)}
-
-        created = 0
-        skipped = 0
-        errors  = []
-
-        for row_num, row in enumerate(rows, start=2):
-            ism = row.get('ism', '').strip()
-            if not ism:
-                errors.append({'row': row_num, 'error': 'ism maydoni bo\'sh.'})
-                continue
-
-            guruh_name = row.get('guruh', '').strip().lower()
-            group      = groups.get(guruh_name)
-
-            if Customer.objects.filter(store=store, name=ism).exists():
-                skipped += 1
-                errors.append({'row': row_num, 'error': f'"{ism}" allaqachon mavjud — o\'tkazib yuborildi.'})
-                continue
-
-            try:
-                Customer.objects.create(
-                    store=store,
-                    name=ism,
-                    phone=row.get('telefon', '').strip(),
-                    address=row.get('manzil', '').strip(),
-                    note=row.get('izoh', '').strip(),
-                    group=group,
-                )
-                created += 1
-            except Exception as e:
-                errors.append({'row': row_num, 'error': str(e)})
-
-        return Response({'created': created, 'skipped': skipped, 'errors': errors})
+class CustomerImportView(BulkImportView):
+    importer_class   = CustomerImporter
+    template_name    = 'mijozlar_shablon.xlsx'
+    template_headers = CUSTOMER_HEADERS
+    template_notes   = CUSTOMER_NOTES
 
 
 # ============================================================
 # IMPORT VIEWS — StockMovement (Kirim/Chiqim)
 # ============================================================
 
-MOVEMENT_HEADERS = [
-    'mahsulot', 'miqdor', 'harakat_turi',
-    'joy_nomi', 'joy_turi', 'tannarx', 'yetkazib_beruvchi', 'izoh',
-]
+MOVEMENT_HEADERS = column_names(StockMovementImporter.columns)
 MOVEMENT_NOTES = {
     'mahsulot':          'Mahsulot nomi (majburiy)',
     'miqdor':            'Miqdori — raqam (majburiy)',
@@ -573,120 +847,19 @@ MOVEMENT_NOTES = {
 }
 
 
-class StockMovementImportView(APIView):
-    permission_classes  = [IsManagerOrAbove, SubscriptionRequired('has_export')]
-    throttle_classes    = [BulkOperationThrottle]
-
-    def get(self, request):
-        return make_template('harakatlar_shablon.xlsx', MOVEMENT_HEADERS, MOVEMENT_NOTES)
-
-    def post(self, request):
-        file = request.FILES.get('file')
-        if not file:
-            return Response({'detail': 'file maydoni kerak.'}, status=status.HTTP_400_BAD_REQUEST)
-
-        try:
-            rows = parse_excel_upload(file)
-        except ValueError as e:
-            return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
-
-        worker = request.user.worker
-        store  = worker.store
-
-        products   = {p.name.lower(): p for p in Product.objects.filter(store=store, status='active')}
-        branches   = {b.name.lower(): b for b in Branch.objects.filter(store=store, status='active')}
-        warehouses = {w.name.lower(): w for w in Warehouse.objects.filter(store=store, status='active')}
-        suppliers  = {s.name.lower(): s for s in Supplier.objects.filter(store=store, status='active')}
-
-        created = 0
-        errors  = []
-
-        for row_num, row in enumerate(rows, start=2):
-            mahsulot_nom = row.get('mahsulot', '').strip().lower()
-            miqdor_str   = row.get('miqdor', '').strip()
-            harakat      = row.get('harakat_turi', '').strip().lower()
-            joy_nom      = row.get('joy_nomi', '').strip().lower()
-            joy_turi     = row.get('joy_turi', '').strip().lower()
-
-            # Validatsiya
-            product = products.get(mahsulot_nom)
-            if not product:
-                errors.append({'row': row_num, 'error': f'Mahsulot topilmadi: "{row.get("mahsulot")}"'})
-                continue
-
-            miqdor = _to_decimal(miqdor_str)
-            if miqdor is None or miqdor <= 0:
-                errors.append({'row': row_num, 'error': f'Noto\'g\'ri miqdor: "{miqdor_str}"'})
-                continue
-
-            if harakat not in ('in', 'out'):
-                errors.append({'row': row_num, 'error': f'harakat_turi "in" yoki "out" bo\'lishi kerak, "{harakat}" emas.'})
-                continue
-
-            branch    = None
-            warehouse = None
-            if joy_turi == 'branch':
-                branch = branches.get(joy_nom)
-                if not branch:
-                    errors.append({'row': row_num, 'error': f'Filial topilmadi: "{row.get("joy_nomi")}"'})
-                    continue
-            elif joy_turi == 'warehouse':
-                warehouse = warehouses.get(joy_nom)
-                if not warehouse:
-                    errors.append({'row': row_num, 'error': f'Ombor topilmadi: "{row.get("joy_nomi")}"'})
-                    continue
-            else:
-                errors.append({'row': row_num, 'error': 'joy_turi "branch" yoki "warehouse" bo\'lishi kerak.'})
-                continue
-
-            tannarx_str   = row.get('tannarx', '').strip()
-            unit_cost     = _to_decimal(tannarx_str) if tannarx_str else None
-            sup_nom       = row.get('yetkazib_beruvchi', '').strip().lower()
-            supplier      = suppliers.get(sup_nom) if sup_nom else None
-
-            try:
-                with transaction.atomic():
-                    mv = StockMovement.objects.create(
-                        product=product,
-                        branch=branch,
-                        warehouse=warehouse,
-                        movement_type=harakat,
-                        quantity=miqdor,
-                        unit_cost=unit_cost,
-                        worker=worker,
-                        supplier=supplier,
-                        description=row.get('izoh', '').strip(),
-                    )
-                    # Stock qoldig'ini yangilash
-                    stock, _ = Stock.objects.get_or_create(
-                        product=product,
-                        branch=branch,
-                        warehouse=warehouse,
-                        defaults={'quantity': 0},
-                    )
-                    if harakat == MovementType.IN:
-                        stock.quantity += miqdor
-                    else:
-                        stock.quantity -= miqdor
-                    stock.save(update_fields=['quantity'])
-
-                    # Supplier qarz balansini yangilash (faqat IN da)
-                    if harakat == MovementType.IN and supplier and unit_cost:
-                        supplier.debt_balance += miqdor * unit_cost
-                        supplier.save(update_fields=['debt_balance'])
-
-                created += 1
-            except Exception as e:
-                errors.append({'row': row_num, 'error': str(e)})
-
-        return Response({'created': created, 'errors': errors})
+class StockMovementImportView(BulkImportView):
+    """Kirim/chiqim importi — qatorlar warehouse.movements.apply_movements ga paket bo'lib beriladi."""
+    importer_class   = StockMovementImporter
+    template_name    = 'harakatlar_shablon.xlsx'
+    template_headers = MOVEMENT_HEADERS
+    template_notes   = MOVEMENT_NOTES
 
 
 # ============================================================
 # IMPORT VIEWS — Yetkazib beruvchi
 # ============================================================
 
-SUPPLIER_HEADERS = ['nom', 'kompaniya', 'telefon', 'manzil', 'izoh']
+SUPPLIER_HEADERS = column_names(SupplierImporter.columns)
 SUPPLIER_NOTES = {
     'nom':       'Yetkazib beruvchi nomi (majburiy)',
     'kompaniya': 'Kompaniya nomi (ixtiyoriy)',
@@ -696,116 +869,26 @@ SUPPLIER_NOTES = {
 }
 
 
-class SupplierImportView(APIView):
-    permission_classes  = [IsManagerOrAbove, SubscriptionRequired('has_export')]
-    throttle_classes    = [BulkOperationThrottle]
-
-    def get(self, request):
-        return make_template('yetkazibberuvchilar_shablon.xlsx', SUPPLIER_HEADERS, SUPPLIER_NOTES)
-
-    def post(self, request):
-        file = request.FILES.get('file')
-        if not file:
-            return Response({'detail': 'file maydoni kerak.'}, status=status.HTTP_400_BAD_REQUEST)
-
-        try:
-            rows = parse_excel_upload(file)
-        except ValueError as e:
-            return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
-
-        worker = request.user.worker
-        store  = worker.store
-
-        created = 0
-        skipped = 0
-        errors  = []
-
-        for row_num, row in enumerate(rows, start=2):
-            nom = row.get('nom', '').strip()
-            if not nom:
-                errors.append({'row': row_num, 'error': 'nom maydoni bo\'sh.'})
-                continue
-
-            if Supplier.objects.filter(store=store, name=nom).exists():
-                skipped += 1
-                errors.append({'row': row_num, 'error': f'"{nom}" allaqachon mavjud — o\'tkazib yuborildi.'})
-                continue
-
-            try:
-                Supplier.objects.create(
-                    store=store,
-                    name=nom,
-                    company=row.get('kompaniya', '').strip(),
-                    phone=row.get('telefon', '').strip(),
-                    address=row.get('manzil', '').strip(),
-                    description=row.get('izoh', '').strip(),
-                )
-                created += 1
-            except Exception as e:
-                errors.append({'row': row_num, 'error': str(e)})
-
-        return Response({'created': created, 'skipped': skipped, 'errors': errors})
+class SupplierImportView(BulkImportView):
+    importer_class   = SupplierImporter
+    template_name    = 'yetkazibberuvchilar_shablon.xlsx'
+    template_headers = SUPPLIER_HEADERS
+    template_notes   = SUPPLIER_NOTES
 
 
 # ============================================================
 # IMPORT VIEWS — SubKategoriya
 # ============================================================
 
-SUBCAT_HEADERS = ['nom', 'kategoriya']
+SUBCAT_HEADERS = column_names(SubCategoryImporter.columns)
 SUBCAT_NOTES = {
     'nom':        'Subkategoriya nomi (majburiy)',
     'kategoriya': 'Mavjud kategoriya nomi (majburiy)',
 }
 
 
-class SubCategoryImportView(APIView):
-    permission_classes  = [IsManagerOrAbove, SubscriptionRequired('has_export')]
-    throttle_classes    = [BulkOperationThrottle]
-
-    def get(self, request):
-        return make_template('subkategoriyalar_shablon.xlsx', SUBCAT_HEADERS, SUBCAT_NOTES)
-
-    def post(self, request):
-        file = request.FILES.get('file')
-        if not file:
-            return Response({'detail': 'file maydoni kerak.'}, status=status.HTTP_400_BAD_REQUEST)
-
-        try:
-            rows = parse_excel_upload(file)
-        except ValueError as e:
-            return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
-
-        worker = request.user.worker
-        store  = worker.store
-
-        cats = {c.name.lower(): c for c in Category.objects.filter(store=store)}
-
-        created = 0
-        skipped = 0
-        errors  = []
-
-        for row_num, row in enumerate(rows, start=2):
-            nom      = row.get('nom', '').strip()
-            cat_nom  = row.get('kategoriya', '').strip().lower()
-
-            if not nom:
-                errors.append({'row': row_num, 'error': 'nom maydoni bo\'sh.'})
-                continue
-
-            category = cats.get(cat_nom)
-            if not category:
-                errors.append({'row': row_num, 'error': f'Kategoriya topilmadi: "{row.get("kategoriya")}"'})
-                continue
-
-            if SubCategory.objects.filter(category=category, name=nom).exists():
-                skipped += 1
-                errors.append({'row': row_num, 'error': f'"{nom}" ({category.name}) allaqachon mavjud.'})
-                continue
-
-            try:
-                SubCategory.objects.create(category=category, name=nom)
-                created += 1
-            except Exception as e:
-                errors.append({'row': row_num, 'error': str(e)})
-
-        return Response({'created': created, 'skipped': skipped, 'errors': errors})
+class SubCategoryImportView(BulkImportView):
+    importer_class   = SubCategoryImporter
+    template_name    = 'subkategoriyalar_shablon.xlsx'
+    template_headers = SUBCAT_HEADERS
+    template_notes   = SUBCAT_NOTES
@@ -0,0 +1,87 @@
+"""
+============================================================
+STORE — StoreSettings / Subscription keshi benchmarki
+============================================================
+Vaqtinchalik do'konda bitta o'qish narxini o'lchaydi (p50 / p95 / maks, mikrosekund):
+
+  db            — StoreSettings.objects.select_related('store').get() (kesh yo'q)
+  pickled_model — eski usul: butun model obyekti (store bilan) Redis da, har o'qishda unpickle
+  remote_tier   — yangi: Redis dagi frozen dataclass (jarayon qavati tozalangan)
+  local_tier    — yangi: jarayon LRU (Redis ga bormaydi)
+
+Ishlatish:
+  python manage.py benchmark_settings_cache
+  python manage.py benchmark_settings_cache --repeat 5000
+
+⚠️ Natija joriy CACHES backendiga bog'liq: production (Redis) da ishga tushiring —
+   lokal sozlamalarda DummyCache bo'lsa, kesh qavatlari o'lchanmaydi.
+"""
+
+import statistics
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+
+
+def _percentiles(samples: list) -> str:
+    samples = sorted(samples)
+    p95     = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+    return (
+        f"p50={statistics.median(samples) * 1e6:9.1f}µs  "
+        f"p95={p95 * 1e6:9.1f}µs  "
+        f"max={samples[-1] * 1e6:9.1f}µs"
+    )
+
+
+class Command(BaseCommand):
+    help = "StoreSettings / Subscription o'qish narxi: DB vs pickle model vs Redis qavati vs jarayon LRU."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=2000, help="Har usul uchun o'qishlar soni")
+
+    def _measure(self, label: str, func, repeat: int) -> None:
+        func()   # isitish
+        samples = []
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            func()
+            samples.append(time.perf_counter() - t0)
+        self.stdout.write(f"  {label:14} {_percentiles(samples)}")
+
+    def handle(self, *args, **options):
+        from config import cache_utils
+        from store.models import Store, StoreSettings
+
+        repeat  = options['repeat']
+        backend = settings.CACHES['default']['BACKEND']
+        self.stdout.write(f"Kesh: {backend} | takror: {repeat}")
+        if backend.endswith('DummyCache'):
+            self.stdout.write(self.style.WARNING("DummyCache — kesh qavatlari DB ga tushadi."))
+
+        store = Store.objects.create(name='Benchmark: sozlamalar keshi')
+        try:
+            store_id  = store.id
+            model_key = f'benchmark_settings_model_{store_id}'
+            cache.set(model_key, StoreSettings.objects.select_related('store').get(store_id=store_id))
+            tiered    = cache_utils._settings_cache
+
+            def remote():
+                tiered.drop_local(store_id)
+                cache_utils.get_store_settings(store_id)
+
+            for label, func in (
+                ('db',            lambda: StoreSettings.objects.select_related('store').get(store_id=store_id)),
+                ('pickled_model', lambda: cache.get(model_key)),
+                ('remote_tier',   remote),
+                ('local_tier',    lambda: cache_utils.get_store_settings(store_id)),
+            ):
+                self._measure(label, func, repeat)
+
+            self.stdout.write(f"\nQatlam statistikasi: {tiered.hits}")
+        finally:
+            cache.delete(model_key)
+            cache_utils.invalidate_store_settings(store.id)
+            store.delete()
+            self.stdout.write("\nBenchmark do'koni o'chirildi.")
@@ -0,0 +1,92 @@
+"""
+============================================================
+STORE — Sintetik tenantlar generatori
+============================================================
+Berilgan shakldagi takrorlanuvchan do'konlar (config/synthetic.py):
+filiallar, omborlar, xodimlar, kategoriya/subkategoriya, o'n minglab mahsulot,
+FIFO partiyalar, sotuvlar (savat hajmi va to'lov turlari taqsimoti bilan),
+qaytarishlar, transferlar, xarajatlar, yetkazib beruvchi va mijoz qarzlari.
+
+Ishlatish:
+  python manage.py generate_tenants --preset tiny
+  python manage.py generate_tenants --preset large                 # ~10M qator
+  python manage.py generate_tenants --preset small --stores 5 --sales 100000 --seed 7
+  python manage.py generate_tenants --preset medium --estimate     # faqat hisob-kitob
+
+PostgreSQL da COPY FROM STDIN ishlatiladi (--no-copy — bulk_create), boshqa bazalarda
+bulk_create. Har do'kon — alohida tranzaksiya.
+
+⚠️ Faqat dev / staging bazada. Foydalanuvchilar paroli kirib bo'lmaydigan
+   (--password bilan berish mumkin), username: syn{store_id}_{n}.
+"""
+
+from dataclasses import fields, replace
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = "Takrorlanuvchan sintetik do'konlar (katalog, qoldiq, sotuvlar, qarzlar) — bulk_create / COPY."
+
+    def add_arguments(self, parser):
+        from config.synthetic import PRESETS, TenantShape
+
+        parser.add_argument('--preset', choices=sorted(PRESETS), default='small', help="Tayyor shakl")
+        for item in fields(TenantShape):
+            parser.add_argument(
+                f"--{item.name.replace('_', '-')}", type=item.type, default=None,
+                help=f"Shakl: {item.name} (preset qiymatini almashtiradi)",
+            )
+        parser.add_argument('--seed',       type=int, default=42,     help="Tasodifiy generator urug'i")
+        parser.add_argument('--batch-size', type=int, default=10_000, help="COPY / bulk_create bo'lagi")
+        parser.add_argument('--password',   default=None, help="Barcha sintetik foydalanuvchilar paroli")
+        parser.add_argument('--no-copy',  action='store_true', help="PostgreSQL da ham bulk_create")
+        parser.add_argument('--estimate', action='store_true', help="Faqat taxminiy qatorlar sonini ko'rsatish")
+
+    def handle(self, *args, **options):
+        from django.db import connection
+
+        from config.synthetic import PRESETS, TenantGenerator, TenantShape, estimate_rows
+        from warehouse.utils import BARCODE_MAX_SEQ
+
+        overrides = {
+            item.name: options[item.name]
+            for item in fields(TenantShape) if options.get(item.name) is not None
+        }
+        shape = replace(PRESETS[options['preset']], **overrides)
+        if shape.branches < 1 or shape.products < 1 or shape.stores < 1:
+            raise CommandError("stores, branches va products kamida 1 bo'lishi kerak.")
+        if shape.products > BARCODE_MAX_SEQ:
+            raise CommandError(f"Do'kon boshiga ko'pi bilan {BARCODE_MAX_SEQ:,} ta mahsulot (barcode bloki).")
+
+        estimate = estimate_rows(shape)
+        self.stdout.write(
+            f"Shakl: {options['preset']} | do'konlar: {shape.stores} | mahsulot: {shape.products:,} | "
+            f"sotuv: {shape.sales:,} × {shape.stores} | {shape.days} kun | ~{estimate:,} qator"
+        )
+        if options['estimate']:
+            return
+
+        use_copy  = connection.vendor == 'postgresql' and not options['no_copy']
+        generator = TenantGenerator(
+            shape,
+            seed       = options['seed'],
+            use_copy   = use_copy,
+            batch_size = options['batch_size'],
+            password   = options['password'],
+            log        = self.stdout.write,
+        )
+        self.stdout.write(f"DB: {connection.vendor} | yozish: {'COPY' if use_copy else 'bulk_create'}")
+
+        results = generator.generate()
+        total, seconds = 0, 0.0
+        for result in results:
+            total   += result.total
+            seconds += result.seconds
+            self.stdout.write(self.style.SUCCESS(
+                f"Do'kon #{result.store_id} '{result.name}': {result.total:,} qator, "
+                f"{result.seconds:.1f}s ({result.total / max(result.seconds, 1e-9):,.0f} qator/s)"
+            ))
+            for name, count in sorted(result.rows.items(), key=lambda item: -item[1]):
+                self.stdout.write(f"    {name:27} {count:>12,}")
+        self.stdout.write(self.style.SUCCESS(f"Jami: {total:,} qator, {seconds:.1f}s"))
@@ -0,0 +1,91 @@
+"""
+============================================================
+STORE — Regressiya benchmarklari (config/benchmark.py)
+============================================================
+Vaqtinchalik test bazasida sintetik do'kon (1 000 mahsulot, 100 000 sotuv) quradi va
+checkout, qoldiq, dashboard, eksport / import hot path larini o'lchaydi: latency
+persentillari, SQL soni, cho'qqi RSS. Natija — JSON; baseline bilan taqqoslanadi.
+
+Ishlatish:
+  python manage.py run_benchmarks --output bench.json
+  python manage.py run_benchmarks --baseline benchmarks/baseline.json --output bench.json
+  python manage.py run_benchmarks --save-baseline benchmarks/baseline.json
+  python manage.py run_benchmarks --quick --only 'sale.*' 'dashboard*'
+
+Chegaradan oshgan metrika bo'lsa — xato kodi bilan tugaydi (CI). Chegaralar baseline
+faylidagi "thresholds" da (--save-baseline standartlarini yozadi, qo'lda tahrirlanadi).
+
+⚠️ Lokal PostgreSQL + Redis da ishga tushiring (production ga o'xshash sozlamalar).
+   SQLite da parallel sotuv keysi o'tkaziladi; DummyCache da dashboard[warm] = [cold].
+   Test bazasini yaratish huquqi kerak (CREATEDB) — ish bazasiga tegilmaydi.
+"""
+
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+
+class Command(BaseCommand):
+    help = "Checkout / qoldiq / hisobot benchmarklari: JSON natija va baseline bilan taqqoslash."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output',        default=None, help="Natija JSON fayli")
+        parser.add_argument('--baseline',      default=None, help="Taqqoslanadigan baseline JSON")
+        parser.add_argument('--save-baseline', default=None, help="Natijani baseline sifatida yozish")
+        parser.add_argument('--only',    nargs='+', default=None, help="Keys nomi shablonlari (fnmatch)")
+        parser.add_argument('--quick',   action='store_true', help="Kichik tenant, kam takror (tutun tekshiruvi)")
+        parser.add_argument('--seed',    type=int, default=42, help="Sintetik ma'lumot urug'i")
+        parser.add_argument('--threads', type=int, default=8,  help="Parallel sotuv oqimlari")
+        parser.add_argument('--keepdb',  action='store_true', help="Test bazasini qayta ishlatish (sxema)")
+
+    def handle(self, *args, **options):
+        from config.benchmark import (
+            BENCHMARK_SHAPE,
+            QUICK_SHAPE,
+            BenchmarkSuite,
+            benchmark_database,
+            build_report,
+            compare,
+            load_report,
+            meta_differences,
+            write_report,
+        )
+
+        baseline = None
+        if options['baseline']:
+            if not os.path.exists(options['baseline']):
+                raise CommandError(f"Baseline topilmadi: {options['baseline']}")
+            baseline = load_report(options['baseline'])
+
+        shape = QUICK_SHAPE if options['quick'] else BENCHMARK_SHAPE
+        suite = BenchmarkSuite(shape, seed=options['seed'], quick=options['quick'],
+                               threads=options['threads'], log=self.stdout.write)
+
+        with benchmark_database(keepdb=options['keepdb']):
+            self.stdout.write(f"DB: {connection.vendor} | kesh: {settings.CACHES['default']['BACKEND']}")
+            prepared = suite.prepare()
+            results  = suite.run(options['only'])
+
+        thresholds = baseline.get('thresholds') if baseline else None
+        report     = build_report(results, shape, options['seed'], prepared, thresholds)
+        if options['output']:
+            write_report(report, options['output'])
+            self.stdout.write(f"Natija: {options['output']}")
+        if options['save_baseline']:
+            if os.path.exists(options['save_baseline']):
+                report['thresholds'] = load_report(options['save_baseline']).get('thresholds', report['thresholds'])
+            write_report(report, options['save_baseline'])
+            self.stdout.write(self.style.SUCCESS(f"Baseline yozildi: {options['save_baseline']}"))
+
+        if baseline is None:
+            return
+        for difference in meta_differences(report, baseline):
+            self.stdout.write(self.style.WARNING(f"Muhit farqi — {difference}"))
+        regressions = compare(report, baseline)
+        if regressions:
+            for regression in regressions:
+                self.stdout.write(self.style.ERROR(f"  {regression}"))
+            raise CommandError(f"{len(regressions)} ta metrika baseline chegarasidan oshdi.")
+        self.stdout.write(self.style.SUCCESS("Regressiya yo'q."))
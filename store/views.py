@@ -42,7 +42,8 @@ from accaunt.audit_mixin import AuditMixin
 from accaunt.models import AuditLog
 from accaunt.permissions import BranchLimitPermission, CanAccess, IsOwner
 
-from config.cache_utils import get_store_settings, invalidate_store_settings
+from config.cache_utils import invalidate_store_settings
+from config.tenant import get_request_tenant
 
 from .models import Branch, Smena, SmenaStatus, Store, StoreSettings
 from .serializers import (
@@ -437,7 +438,7 @@ class SmenaViewSet(AuditMixin, viewsets.ModelViewSet):
 
     def perform_create(self, serializer):
         worker   = self.request.user.worker
-        settings = get_store_settings(worker.store_id)    # QOIDA 3
+        settings = get_request_tenant(self.request).settings    # QOIDA 3
 
         # 1. Smena tizimi yoqilganmi?
         if not settings.shift_enabled:
@@ -511,7 +512,7 @@ class SmenaViewSet(AuditMixin, viewsets.ModelViewSet):
         """
         smena    = self.get_object()
         worker   = request.user.worker
-        settings = get_store_settings(worker.store_id)
+        settings = get_request_tenant(request).settings
 
         # 1. Allaqachon yopilganmi?
         if smena.status == SmenaStatus.CLOSED:
@@ -575,7 +576,8 @@ class SmenaViewSet(AuditMixin, viewsets.ModelViewSet):
                 # PDF ni response body ga emas, alohida field sifatida qaytaramiz
                 # (binary fayl bo'lgani uchun base64 encode qilamiz)
                 import base64
-                pdf_bytes = b''.join(pdf_response.streaming_content) if hasattr(pdf_response, 'streaming_content') else pdf_response.content
+                pdf_bytes = b''.join(pdf_response.streaming_content)
+                pdf_response.close()
                 pdf_url = 'data:application/pdf;base64,' + base64.b64encode(pdf_bytes).decode('utf-8')
             except Exception as exc:
                 logger.warning("auto_pdf_on_smena_close: PDF generatsiya xatosi smena_id=%s: %s", smena.pk, exc)
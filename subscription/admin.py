@@ -3,7 +3,7 @@ from django.contrib import admin
 from config.cache_utils import invalidate_subscription_cache
 
 from .models import (
-    Subscription, SubscriptionDowngradeLog, SubscriptionInvoice, SubscriptionPlan,
+    StoreUsage, Subscription, SubscriptionDowngradeLog, SubscriptionInvoice, SubscriptionPlan,
 )
 
 
@@ -23,7 +23,7 @@ class SubscriptionPlanAdmin(admin.ModelAdmin):
             'fields': ('name', 'plan_type', 'price_monthly')
         }),
         ("Cheklovlar", {
-            'fields': ('max_branches', 'max_workers', 'max_products')
+            'fields': ('max_branches', 'max_workers', 'max_products', 'api_requests_per_minute')
         }),
         ("Xususiyatlar", {
             'fields': ('has_dashboard', 'has_export')
@@ -79,3 +79,13 @@ class SubscriptionDowngradeLogAdmin(admin.ModelAdmin):
 
     def has_change_permission(self, request, obj=None) -> bool:
         return False
+
+
+@admin.register(StoreUsage)
+class StoreUsageAdmin(admin.ModelAdmin):
+    list_display    = ('store', 'branches', 'warehouses', 'workers', 'products', 'reconciled_on')
+    search_fields   = ('store__name',)
+    readonly_fields = ('store', 'branches', 'warehouses', 'workers', 'products', 'reconciled_on')
+
+    def has_add_permission(self, request) -> bool:
+        return False
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.11 on 2026-10-19 05:24
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('store', '0008_rename_note_to_description'),
+        ('subscription', '0003_rename_note_to_description'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StoreUsage',
+            fields=[
+                ('store', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='usage', serialize=False, to='store.store', verbose_name="Do'kon")),
+                ('branches', models.IntegerField(default=0, verbose_name='Faol filiallar')),
+                ('warehouses', models.IntegerField(default=0, verbose_name='Faol omborlar')),
+                ('workers', models.IntegerField(default=0, verbose_name='Faol xodimlar')),
+                ('products', models.IntegerField(default=0, verbose_name='Faol mahsulotlar')),
+                ('reconciled_on', models.DateTimeField(blank=True, null=True, verbose_name='Oxirgi qayta hisoblash')),
+            ],
+            options={
+                'verbose_name': 'Foydalanish',
+                'verbose_name_plural': 'Foydalanish hisoblagichlari',
+            },
+        ),
+    ]
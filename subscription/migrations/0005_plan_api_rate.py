@@ -0,0 +1,18 @@
+# Generated by Django 5.2.11 on 2026-10-19 05:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('subscription', '0004_store_usage'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='subscriptionplan',
+            name='api_requests_per_minute',
+            field=models.PositiveIntegerField(default=600, verbose_name="API so'rovlar / daqiqa"),
+        ),
+    ]
@@ -9,6 +9,7 @@ Modellar:
   Subscription          — Har bir do'konning joriy obunasi (OneToOne → Store)
   SubscriptionInvoice   — To'lov tarixi (immutable)
   SubscriptionDowngradeLog — LIFO: qaysi ob'ektlar inactive qilindi
+  StoreUsage            — Do'kon bo'yicha faol ob'ektlar hisoblagichlari (limit tekshiruvi)
 
 Qoidalar:
   1. Har bir Store ga bitta Subscription (OneToOne)
@@ -91,6 +92,12 @@ class SubscriptionPlan(models.Model):
     max_workers    = models.PositiveIntegerField(default=3,   verbose_name="Maks. xodimlar")
     max_products   = models.PositiveIntegerField(default=100, verbose_name="Maks. mahsulotlar")
 
+    # ---- API kvotasi (do'kon bo'yicha, barcha xodimlar birga; 0 = cheksiz) ----
+    api_requests_per_minute = models.PositiveIntegerField(
+        default=600,
+        verbose_name="API so'rovlar / daqiqa",
+    )
+
     # ---- Funksiya flaglari ----
     # StoreSettings dagi har bir modul uchun mos flag
 
@@ -340,3 +347,44 @@ class SubscriptionDowngradeLog(models.Model):
             f"{self.object_type} #{self.object_id} — "
             f"{self.subscription.store.name}"
         )
+
+
+# ============================================================
+# FOYDALANISH HISOBLAGICHLARI
+# ============================================================
+
+class StoreUsage(models.Model):
+    """
+    Do'konning faol filial / ombor / xodim / mahsulotlar soni.
+
+    Maqsad:
+      Limit tekshiruvi (max_*) har yaratishda COUNT(*) o'rniga bitta qatorni o'qiydi.
+      Hisoblagichlar subscription/usage.py orqali o'zgaradi (signal, LIFO, import) —
+      ob'ekt bilan bir tranzaksiyada (F() + n). Har kecha reconcile_store_usage
+      haqiqiy sonlar bilan solishtirib tuzatadi.
+    """
+    store          = models.OneToOneField(
+        'store.Store',
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='usage',
+        verbose_name="Do'kon",
+    )
+    branches       = models.IntegerField(default=0, verbose_name="Faol filiallar")
+    warehouses     = models.IntegerField(default=0, verbose_name="Faol omborlar")
+    workers        = models.IntegerField(default=0, verbose_name="Faol xodimlar")
+    products       = models.IntegerField(default=0, verbose_name="Faol mahsulotlar")
+    reconciled_on  = models.DateTimeField(
+        null=True, blank=True,
+        verbose_name="Oxirgi qayta hisoblash",
+    )
+
+    class Meta:
+        verbose_name        = 'Foydalanish'
+        verbose_name_plural = 'Foydalanish hisoblagichlari'
+
+    def __str__(self) -> str:
+        return (
+            f"#{self.store_id}: {self.branches} filial, {self.warehouses} ombor, "
+            f"{self.workers} xodim, {self.products} mahsulot"
+        )
@@ -7,13 +7,16 @@ Store yaratilganda → Trial subscription avtomatik yaratiladi.
 Trial rejasi SubscriptionPlan da mavjud bo'lishi shart.
 Agar Trial rejasi topilmasa → ogohlantirish logg'ga yoziladi,
 xatolik ko'tarilmaydi (Store yaratilishiga to'siq bo'lmasin).
+
+Branch / Warehouse / Worker / Product yaratilganda, status o'zgarganda va
+o'chirilganda → StoreUsage hisoblagichi (subscription/usage.py).
 """
 
 import logging
 from datetime import date, timedelta
 
 from django.conf import settings
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_init, post_save
 from django.dispatch import receiver
 
 logger = logging.getLogger(__name__)
@@ -57,3 +60,50 @@ def create_trial_subscription(sender, instance, created, **kwargs):
         "Trial obuna yaratildi: store='%s' (#%s), %d kun",
         instance.name, instance.id, trial_days,
     )
+
+
+# ============================================================
+# STOREUSAGE HISOBLAGICHLARI
+# ============================================================
+
+_TRACKED_SENDERS = ('store.Branch', 'warehouse.Warehouse', 'accaunt.Worker', 'warehouse.Product')
+
+
+def _usage_field(instance) -> str:
+    from subscription.usage import FIELD_BY_MODEL
+    return FIELD_BY_MODEL[type(instance).__name__]
+
+
+def _remember_status(sender, instance, **kwargs):
+    # Bazadan o'qilgan holat — post_save da faol ↔ nofaol o'tishini aniqlash uchun
+    # (status defer qilingan bo'lsa — None)
+    instance._usage_status = instance.__dict__.get('status')
+
+
+def _count_on_save(sender, instance, created, **kwargs):
+    from subscription.usage import ACTIVE, add_usage, recount
+
+    status   = instance.__dict__.get('status')
+    previous = None if created else getattr(instance, '_usage_status', None)
+    instance._usage_status = status
+
+    if created:
+        if status == ACTIVE:
+            add_usage(instance.store_id, _usage_field(instance), 1)
+    elif previous is None:
+        recount(instance.store_id)      # oldingi holat noma'lum
+    elif (previous == ACTIVE) != (status == ACTIVE):
+        add_usage(instance.store_id, _usage_field(instance), 1 if status == ACTIVE else -1)
+
+
+def _count_on_delete(sender, instance, **kwargs):
+    from subscription.usage import ACTIVE, add_usage
+
+    if getattr(instance, '_usage_status', None) == ACTIVE:
+        add_usage(instance.store_id, _usage_field(instance), -1)
+
+
+for _sender in _TRACKED_SENDERS:
+    post_init.connect(_remember_status, sender=_sender, dispatch_uid=f'usage_init_{_sender}')
+    post_save.connect(_count_on_save, sender=_sender, dispatch_uid=f'usage_save_{_sender}')
+    post_delete.connect(_count_on_delete, sender=_sender, dispatch_uid=f'usage_delete_{_sender}')
@@ -8,6 +8,9 @@ check_subscription_expiry()  — Har kuni 00:01 da ishlaydi:
   3. Expired subscriptionlarda LIFO inactive qiladi
   4. Ochiq smenalarni yopadi
 
+reconcile_store_usage()      — Har kuni 04:00: StoreUsage hisoblagichlarini haqiqiy
+                               sonlar bilan solishtirib tuzatadi (subscription/usage.py)
+
 Idempotentlik:
   notified_*d flaglari tufayli bir ogohlantirish bir marta yuboriladi.
   Expired tekshiruvi qayta ishlansa ham zarar yo'q (allaqachon expired).
@@ -103,6 +106,19 @@ def _run_expiry_check():
         )
 
 
+@shared_task
+def reconcile_store_usage():
+    """
+    Limit hisoblagichlari (StoreUsage) drift tuzatish — har kuni 04:00.
+    Signal chiqarmaydigan yo'llar (qo'lda SQL, .update()) qoldirgan farqlar shu yerda yo'qoladi.
+    """
+    from subscription.usage import reconcile_all
+
+    fixed = reconcile_all()
+    logger.info("reconcile_store_usage: %d ta do'kon hisoblagichi tuzatildi", fixed)
+    return fixed
+
+
 def _send_expiry_notification(subscription, days_left: int) -> None:
     """
     Obuna tugash ogohlantirishini yuborish.
@@ -0,0 +1,132 @@
+"""
+============================================================
+SUBSCRIPTION APP — Testlar
+============================================================
+Test guruhlari:
+  1. Tarif limitlari — StoreUsage hisoblagichlari (signal, LIFO, import), kechki tuzatish
+"""
+
+import io
+from datetime import timedelta
+from decimal import Decimal
+
+import openpyxl
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from rest_framework.test import APITestCase
+
+from accaunt.models import ALL_PERMISSIONS, CustomUser, Worker, WorkerRole
+from store.models import Store
+from warehouse.models import Product
+
+
+class UsageTestMixin:
+    """Do'kon + owner hodim + autentifikatsiya; mahsulot, obuna va import yordamchilari."""
+
+    def setUp(self):
+        self.store = Store.objects.create(name="Test do'kon")
+        self.user  = CustomUser.objects.create_user(
+            username='owner', email='owner@test.uz',
+            phone1='+998901234567', password='Test12345',
+        )
+        self.worker = Worker.objects.create(
+            user=self.user, store=self.store,
+            role=WorkerRole.OWNER, permissions=list(ALL_PERMISSIONS),
+        )
+        self.client.force_authenticate(self.user)
+
+    def _make_products(self, count: int):
+        start = Product.objects.filter(store=self.store).count()
+        return [
+            Product.objects.create(
+                store=self.store, name=f"Mahsulot {i:03d}",
+                sale_price=Decimal('10000'), barcode=f"20{i:011d}",
+            )
+            for i in range(start, start + count)
+        ]
+
+    def _subscribe(self, **features):
+        """Do'konga faol obuna (PRO reja, berilgan has_* / limit maydonlari bilan)."""
+        from .models import PlanType, Subscription, SubscriptionPlan, SubscriptionStatus
+        plan = SubscriptionPlan.objects.create(plan_type=PlanType.PRO, name='Pro', **features)
+        today = timezone.localdate()
+        Subscription.objects.update_or_create(
+            store=self.store,
+            defaults=dict(plan=plan, status=SubscriptionStatus.ACTIVE,
+                          start_date=today, end_date=today + timedelta(days=30)),
+        )
+
+    def _upload(self, url: str, headers: list, rows: list):
+        """Xotirada .xlsx yasab import endpointiga yuboradi → (data, so'rovlar soni)."""
+        wb = openpyxl.Workbook()
+        ws = wb.active
+        ws.append(headers)
+        for row in rows:
+            ws.append(row)
+        buffer = io.BytesIO()
+        wb.save(buffer)
+        buffer.seek(0)
+        buffer.name = 'import.xlsx'
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(url, {'file': buffer}, format='multipart')
+        self.assertEqual(response.status_code, 200, getattr(response, 'data', None))
+        return response.data, len(ctx.captured_queries)
+
+
+# ============================================================
+# 1. TARIF LIMITLARI — STOREUSAGE HISOBLAGICHLARI
+# ============================================================
+
+class StoreUsageTest(UsageTestMixin, APITestCase):
+    """Limit tekshiruvi COUNT(*) o'rniga hisoblagichni o'qiydi; hisoblagich tranzaksiya bilan o'zgaradi."""
+
+    def _usage(self):
+        from .usage import get_usage
+        return get_usage(self.store.id)
+
+    def test_counters_follow_lifecycle_and_reconcile(self):
+        from .usage import reconcile_all
+
+        products = self._make_products(3)
+        self.assertEqual((self._usage().products, self._usage().workers), (3, 1))
+
+        products[0].status = 'inactive'
+        products[0].save()
+        Product.objects.get(pk=products[1].pk).delete()
+        self.assertEqual(self._usage().products, 1)
+
+        Product.objects.filter(pk=products[2].pk).update(status='inactive')   # signalsiz — drift
+        self.assertEqual(self._usage().products, 1)
+        self.assertEqual(reconcile_all(), 1)
+        self.assertEqual(self._usage().products, 0)
+
+    def test_create_limit_without_count(self):
+        self._subscribe(max_products=2)
+        self._make_products(1)
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post('/api/v1/warehouse/products/', {'name': 'Ikkinchi', 'sale_price': '1000'})
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertFalse([q for q in ctx.captured_queries if 'COUNT(' in q['sql'] and 'warehouse_product' in q['sql']])
+
+        response = self.client.post('/api/v1/warehouse/products/', {'name': 'Uchinchi', 'sale_price': '1000'})
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(self._usage().products, 2)
+
+    def test_import_checks_limit_once_and_counts_bulk_rows(self):
+        from export.views import PRODUCT_HEADERS
+
+        self._subscribe(has_export=True, max_products=4)
+        self._make_products(1)
+        rows = [[f"Import {i}", '', '', '1500', '', 'dona', ''] for i in range(4)]
+
+        data, _ = self._upload('/api/v1/export/products/import/', PRODUCT_HEADERS, rows)
+        self.assertEqual(data['created'], 0)
+        self.assertIn("yana 3 ta", data['errors'][0]['error'])
+
+        data, _ = self._upload('/api/v1/export/products/import/', PRODUCT_HEADERS, rows[:3])
+        self.assertEqual(data['created'], 3)
+        self.assertEqual(self._usage().products, 4)
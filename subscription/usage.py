@@ -0,0 +1,156 @@
+"""
+============================================================
+SUBSCRIPTION — Tarif limitlari hisoblagichlari (StoreUsage)
+============================================================
+Funksiyalar:
+  get_usage(store_id)                   — StoreUsage qatori (yo'q bo'lsa — sanab yaratadi)
+  add_usage(store_id, field, delta)     — hisoblagichni o'zgartirish (chaqiruvchi tranzaksiyasida)
+  check_limit(store_id, field, n, plan) — "yana n ta qo'shsa bo'ladimi": (ok, limit, hozirgi)
+  remaining(store_id, field, plan)      — yana nechta qo'shish mumkin (None — cheksiz)
+  recount(store_id)                     — bitta do'kon: haqiqiy sonlar bilan qayta yozish
+  reconcile_all()                       — barcha do'konlar (kechki task): 4 ta guruhlangan COUNT
+
+Hisoblagich kim o'zgartiradi:
+  - signallar (subscription/signals.py): Branch / Warehouse / Worker / Product yaratilganda,
+    status o'zgarganda (faol ↔ nofaol), o'chirilganda
+  - .update(status=...) — signal chiqarmaydi: chaqiruvchi add_usage ni o'zi chaqiradi
+    (subscription/utils.py LIFO / qaytarish)
+  - bulk_create (import) — BulkImporter.usage_field bo'yicha
+Drift (qo'lda SQL, signalsiz yo'llar) — reconcile_store_usage (har kecha) tuzatadi.
+"""
+
+import logging
+
+from django.apps import apps
+from django.db.models import Count, F
+from django.utils import timezone
+
+from .models import StoreUsage
+
+logger = logging.getLogger(__name__)
+
+BRANCHES   = 'branches'
+WAREHOUSES = 'warehouses'
+WORKERS    = 'workers'
+PRODUCTS   = 'products'
+
+# hisoblagich → (model, reja limiti maydoni)
+TRACKED = {
+    BRANCHES:   ('store.Branch',        'max_branches'),
+    WAREHOUSES: ('warehouse.Warehouse', 'max_warehouses'),
+    WORKERS:    ('accaunt.Worker',      'max_workers'),
+    PRODUCTS:   ('warehouse.Product',   'max_products'),
+}
+
+# model nomi (LIFO log object_type, permission) → hisoblagich
+FIELD_BY_MODEL = {
+    'Branch':    BRANCHES,
+    'Warehouse': WAREHOUSES,
+    'Worker':    WORKERS,
+    'Product':   PRODUCTS,
+}
+
+ACTIVE = 'active'
+
+
+def _model(field: str):
+    return apps.get_model(TRACKED[field][0])
+
+
+def _count(field: str, store_id: int) -> int:
+    return _model(field).objects.filter(store_id=store_id, status=ACTIVE).count()
+
+
+def recount(store_id: int) -> StoreUsage:
+    """Haqiqiy sonlar (4 ta COUNT) → StoreUsage."""
+    counts = {field: _count(field, store_id) for field in TRACKED}
+    usage, _ = StoreUsage.objects.update_or_create(
+        store_id=store_id, defaults={**counts, 'reconciled_on': timezone.now()},
+    )
+    return usage
+
+
+def get_usage(store_id: int) -> StoreUsage:
+    usage = StoreUsage.objects.filter(store_id=store_id).first()
+    return usage if usage is not None else recount(store_id)
+
+
+def add_usage(store_id: int, field: str, delta: int) -> None:
+    """
+    Hisoblagichni delta ga o'zgartiradi (UPDATE ... SET f = f + delta).
+    Qator yo'q bo'lsa — sanab yaratiladi (o'zgarish allaqachon bazada — qo'shilmaydi).
+    Kamayish va qator yo'q (do'kon o'chirilmoqda, cascade) — hech narsa qilinmaydi.
+    """
+    if not store_id or not delta:
+        return
+    updated = StoreUsage.objects.filter(store_id=store_id).update(**{field: F(field) + delta})
+    if not updated and delta > 0:
+        recount(store_id)
+
+
+def _limit(store_id: int, field: str, plan=None) -> int:
+    if plan is None:
+        from config.cache_utils import get_subscription
+        sub  = get_subscription(store_id)
+        plan = sub.plan if sub else None
+    return getattr(plan, TRACKED[field][1], 0) if plan is not None else 0
+
+
+def check_limit(store_id: int, field: str, n: int = 1, plan=None) -> tuple:
+    """
+    Yana n ta faol ob'ekt qo'shish mumkinmi. Qaytaradi: (ok, limit, hozirgi).
+    limit = 0 — cheksiz (hozirgi soni o'qilmaydi). Obuna yo'q — tekshirilmaydi.
+    """
+    limit = _limit(store_id, field, plan)
+    if limit == 0:
+        return True, 0, None
+    current = getattr(get_usage(store_id), field)
+    return current + n <= limit, limit, current
+
+
+def remaining(store_id: int, field: str, plan=None) -> int | None:
+    """Yana nechta qo'shish mumkin; None — cheksiz."""
+    ok, limit, current = check_limit(store_id, field, 0, plan)
+    return None if limit == 0 else max(0, limit - current)
+
+
+def reconcile_all() -> int:
+    """
+    Barcha do'konlar: har model uchun bitta guruhlangan COUNT, farqlar tuzatiladi.
+    Qaytaradi: tuzatilgan do'konlar soni.
+    """
+    from store.models import Store
+
+    actual = {store_id: dict.fromkeys(TRACKED, 0) for store_id in Store.objects.values_list('id', flat=True)}
+    for field in TRACKED:
+        rows = (
+            _model(field).objects
+            .filter(status=ACTIVE)
+            .values('store_id')
+            .annotate(n=Count('id'))
+            .values_list('store_id', 'n')
+        )
+        for store_id, n in rows:
+            if store_id in actual:
+                actual[store_id][field] = n
+
+    now      = timezone.now()
+    existing = StoreUsage.objects.in_bulk(list(actual))
+    changed, missing = [], []
+    for store_id, counts in actual.items():
+        usage = existing.get(store_id)
+        if usage is None:
+            missing.append(StoreUsage(store_id=store_id, reconciled_on=now, **counts))
+            continue
+        drift = {f: (getattr(usage, f), n) for f, n in counts.items() if getattr(usage, f) != n}
+        if drift:
+            logger.warning("StoreUsage drift: store=%s %s", store_id, drift)
+            for f, n in counts.items():
+                setattr(usage, f, n)
+            changed.append(usage)
+
+    # Faqat farqi borlari qayta yoziladi — qolganlarida parallel o'zgarishlar saqlanadi
+    StoreUsage.objects.bulk_create(missing, ignore_conflicts=True)
+    StoreUsage.objects.bulk_update(changed, list(TRACKED), batch_size=500)
+    StoreUsage.objects.update(reconciled_on=now)
+    return len(changed)
@@ -13,7 +13,10 @@ import logging
 from django.db import transaction
 from django.utils import timezone
 
+from config.tenant import invalidate_store_tenants
+
 from .models import SubscriptionDowngradeLog
+from .usage import FIELD_BY_MODEL, add_usage, get_usage
 
 logger = logging.getLogger(__name__)
 
@@ -78,6 +81,9 @@ def apply_lifo_deactivation(subscription) -> dict:
             object_type='Worker',
         )
 
+    # .update() signal chiqarmaydi — hodimlar tenant konteksti (status, filial) eskirtiriladi
+    invalidate_store_tenants(store.id)
+
     logger.info(
         "LIFO deactivation: store=%s, plan=%s, result=%s",
         store.id, plan.plan_type, result
@@ -110,8 +116,9 @@ def _lifo_deactivate(subscription, model_class, queryset, max_count, object_type
             object_id       = obj.pk,
             previous_status = obj.status,
         )
-        # Inactive qilish
+        # Inactive qilish (.update() signal chiqarmaydi — hisoblagich shu yerda)
         model_class.objects.filter(pk=obj.pk).update(status='inactive')
+        add_usage(subscription.store_id, FIELD_BY_MODEL[object_type], -1)
 
         # Xodim bo'lsa — JWT tokenlarni bekor qilish
         if object_type == 'Worker':
@@ -178,16 +185,17 @@ def reactivate_downgraded_objects(subscription) -> dict:
 
         if max_count != 0:   # cheksiz emas
             if entry.object_type not in current_counts:
-                current_counts[entry.object_type] = model_class.objects.filter(
-                    store=store, status='active'
-                ).count()
+                current_counts[entry.object_type] = getattr(
+                    get_usage(store.id), FIELD_BY_MODEL[entry.object_type]
+                )
             if current_counts[entry.object_type] >= max_count:
                 result['skipped'] += 1
                 continue
 
         # Ob'ektni qaytarish
         try:
-            model_class.objects.filter(pk=entry.object_id).update(status='active')
+            if model_class.objects.filter(pk=entry.object_id).update(status='active'):
+                add_usage(store.id, FIELD_BY_MODEL[entry.object_type], 1)
             _mark_log_done(entry)
 
             current_counts[entry.object_type] = (
@@ -208,6 +216,8 @@ def reactivate_downgraded_objects(subscription) -> dict:
             )
             result['not_found'] += 1
 
+    invalidate_store_tenants(store.id)
+
     logger.info(
         "Reactivation: store=%s, result=%s",
         store.id, result
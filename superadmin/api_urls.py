@@ -4,6 +4,9 @@ from rest_framework.routers import DefaultRouter
 from .views import (
     AdminExpenseViewSet,
     ApplyCouponView,
+    ProfilingRuleViewSet,
+    ProfilingTokenView,
+    RequestProfileViewSet,
     StoreMyReferralsView,
     StoreReferralView,
     StoreTicketViewSet,
@@ -29,6 +32,8 @@ router.register('admin-expenses', AdminExpenseViewSet,           basename='super
 router.register('plans',          SuperAdminPlanViewSet,         basename='superadmin-plans')
 router.register('tickets',        SuperAdminTicketViewSet,       basename='superadmin-tickets')
 router.register('workers',        SuperAdminWorkerViewSet,       basename='superadmin-workers')
+router.register('profiling/rules',    ProfilingRuleViewSet,  basename='superadmin-profiling-rules')
+router.register('profiling/profiles', RequestProfileViewSet, basename='superadmin-profiling-profiles')
 
 urlpatterns = [
     # Dashboard va moliya
@@ -40,5 +45,8 @@ urlpatterns = [
     path('referrals/',        SuperAdminReferralView.as_view(),        name='superadmin-referrals'),
     path('referrals/stats/',  SuperAdminReferralStatsView.as_view(),   name='superadmin-referrals-stats'),
 
+    # Profillash: imzolangan X-Profile sarlavhasi
+    path('profiling/token/',  ProfilingTokenView.as_view(),            name='superadmin-profiling-token'),
+
     path('', include(router.urls)),
 ]
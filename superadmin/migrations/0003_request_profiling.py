@@ -0,0 +1,67 @@
+# Generated by Django 5.2.11 on 2026-10-19 05:43
+
+import django.db.models.deletion
+import superadmin.models
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('store', '0008_rename_note_to_description'),
+        ('superadmin', '0002_referral_storereferralcode_supportticket_ticketreply'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProfilingRule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('path_prefix', models.CharField(blank=True, max_length=200, verbose_name="Yo'l prefiksi")),
+                ('max_requests', models.PositiveIntegerField(default=20, verbose_name="Maks. so'rovlar")),
+                ('captured', models.PositiveIntegerField(default=0, verbose_name="Yozilgan so'rovlar")),
+                ('expires_at', models.DateTimeField(verbose_name='Tugash vaqti')),
+                ('is_active', models.BooleanField(default=True, verbose_name='Faolmi')),
+                ('note', models.CharField(blank=True, max_length=200, verbose_name='Izoh')),
+                ('created_on', models.DateTimeField(auto_now_add=True)),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='Yaratgan')),
+                ('store', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='profiling_rules', to='store.store', verbose_name="Do'kon")),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='profiling_rules', to=settings.AUTH_USER_MODEL, verbose_name='Foydalanuvchi')),
+            ],
+            options={
+                'verbose_name': 'Profillash qoidasi',
+                'verbose_name_plural': 'Profillash qoidalari',
+                'ordering': ['-created_on'],
+            },
+        ),
+        migrations.CreateModel(
+            name='RequestProfile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('trigger', models.CharField(choices=[('rule', 'Qoida'), ('header', 'Imzolangan sarlavha')], max_length=10, verbose_name='Sabab')),
+                ('method', models.CharField(max_length=10, verbose_name='Metod')),
+                ('path', models.CharField(max_length=500, verbose_name="Yo'l")),
+                ('view', models.CharField(blank=True, max_length=150, verbose_name='View')),
+                ('status_code', models.PositiveSmallIntegerField(verbose_name='Javob kodi')),
+                ('duration_ms', models.FloatField(verbose_name='Vaqt (ms)')),
+                ('query_count', models.PositiveIntegerField(default=0, verbose_name='SQL soni')),
+                ('db_time_ms', models.FloatField(default=0, verbose_name='SQL vaqti (ms)')),
+                ('sql_trace', models.JSONField(blank=True, default=list, verbose_name='SQL trace')),
+                ('summary', models.TextField(blank=True, verbose_name="Eng og'ir funksiyalar")),
+                ('file', models.FileField(blank=True, max_length=255, storage=superadmin.models.profile_storage, upload_to=superadmin.models.profile_upload_to, verbose_name='cProfile fayli')),
+                ('file_size', models.PositiveIntegerField(default=0, verbose_name='Fayl hajmi (bayt)')),
+                ('created_on', models.DateTimeField(verbose_name='Vaqti')),
+                ('rule', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='profiles', to='superadmin.profilingrule', verbose_name='Qoida')),
+                ('store', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='request_profiles', to='store.store', verbose_name="Do'kon")),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='request_profiles', to=settings.AUTH_USER_MODEL, verbose_name='Foydalanuvchi')),
+            ],
+            options={
+                'verbose_name': "So'rov profili",
+                'verbose_name_plural': "So'rov profillari",
+                'ordering': ['-created_on'],
+                'indexes': [models.Index(fields=['created_on'], name='request_profile_created_idx')],
+            },
+        ),
+    ]
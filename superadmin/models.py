@@ -1,6 +1,8 @@
 import uuid
 
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.files.storage import FileSystemStorage, storages
 from django.db import models
 
 from store.models import Store
@@ -290,3 +292,101 @@ class StoreReferralCode(models.Model):
         base = store.name[:4].upper().replace(' ', '')
         suffix = uuid.uuid4().hex[:4].upper()
         return f"{base}{suffix}"
+
+
+# ============================================================
+# PROFILLASH (superadmin/profiling.py)
+# ============================================================
+
+def profile_storage():
+    """Profil fayllari: STORAGES['profiles'] yoki lokal MEDIA_ROOT."""
+    if 'profiles' in settings.STORAGES:
+        return storages['profiles']
+    return FileSystemStorage()
+
+
+def profile_upload_to(instance, filename: str) -> str:
+    """profiles/{sana}/{tasodifiy_token}/{fayl_nomi}"""
+    return f"profiles/{instance.created_on:%Y%m%d}/{uuid.uuid4().hex}/{filename}"
+
+
+class ProfilingRule(models.Model):
+    """
+    Vaqtinchalik profillash qoidasi: mos so'rovlar (do'kon / foydalanuvchi / yo'l prefiksi —
+    berilganlari hammasi mos bo'lishi kerak) expires_at gacha, ko'pi bilan max_requests ta
+    cProfile + SQL trace bilan yoziladi (RequestProfile).
+    """
+    store        = models.ForeignKey(
+        Store, on_delete=models.CASCADE, null=True, blank=True,
+        related_name='profiling_rules', verbose_name="Do'kon"
+    )
+    user         = models.ForeignKey(
+        User, on_delete=models.CASCADE, null=True, blank=True,
+        related_name='profiling_rules', verbose_name="Foydalanuvchi"
+    )
+    path_prefix  = models.CharField(max_length=200, blank=True, verbose_name="Yo'l prefiksi")
+    max_requests = models.PositiveIntegerField(default=20, verbose_name="Maks. so'rovlar")
+    captured     = models.PositiveIntegerField(default=0, verbose_name="Yozilgan so'rovlar")
+    expires_at   = models.DateTimeField(verbose_name="Tugash vaqti")
+    is_active    = models.BooleanField(default=True, verbose_name="Faolmi")
+    note         = models.CharField(max_length=200, blank=True, verbose_name="Izoh")
+    created_by   = models.ForeignKey(
+        User, on_delete=models.SET_NULL, null=True, blank=True,
+        related_name='+', verbose_name="Yaratgan"
+    )
+    created_on   = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name        = 'Profillash qoidasi'
+        verbose_name_plural = 'Profillash qoidalari'
+        ordering            = ['-created_on']
+
+    def __str__(self):
+        target = self.store or self.user or self.path_prefix or 'hammasi'
+        return f"Profil: {target} ({self.captured}/{self.max_requests})"
+
+
+class ProfileTrigger(models.TextChoices):
+    RULE   = 'rule',   'Qoida'
+    HEADER = 'header', 'Imzolangan sarlavha'
+
+
+class RequestProfile(models.Model):
+    """Bitta profillangan so'rov: metama'lumot, SQL trace, cProfile (.prof — pstats formati)."""
+    rule        = models.ForeignKey(
+        ProfilingRule, on_delete=models.SET_NULL, null=True, blank=True,
+        related_name='profiles', verbose_name="Qoida"
+    )
+    trigger     = models.CharField(max_length=10, choices=ProfileTrigger.choices, verbose_name="Sabab")
+    store       = models.ForeignKey(
+        Store, on_delete=models.SET_NULL, null=True, blank=True,
+        related_name='request_profiles', verbose_name="Do'kon"
+    )
+    user        = models.ForeignKey(
+        User, on_delete=models.SET_NULL, null=True, blank=True,
+        related_name='request_profiles', verbose_name="Foydalanuvchi"
+    )
+    method      = models.CharField(max_length=10, verbose_name="Metod")
+    path        = models.CharField(max_length=500, verbose_name="Yo'l")
+    view        = models.CharField(max_length=150, blank=True, verbose_name="View")
+    status_code = models.PositiveSmallIntegerField(verbose_name="Javob kodi")
+    duration_ms = models.FloatField(verbose_name="Vaqt (ms)")
+    query_count = models.PositiveIntegerField(default=0, verbose_name="SQL soni")
+    db_time_ms  = models.FloatField(default=0, verbose_name="SQL vaqti (ms)")
+    sql_trace   = models.JSONField(default=list, blank=True, verbose_name="SQL trace")
+    summary     = models.TextField(blank=True, verbose_name="Eng og'ir funksiyalar")
+    file        = models.FileField(
+        upload_to=profile_upload_to, storage=profile_storage,
+        max_length=255, blank=True, verbose_name="cProfile fayli"
+    )
+    file_size   = models.PositiveIntegerField(default=0, verbose_name="Fayl hajmi (bayt)")
+    created_on  = models.DateTimeField(verbose_name="Vaqti")
+
+    class Meta:
+        verbose_name        = "So'rov profili"
+        verbose_name_plural = "So'rov profillari"
+        ordering            = ['-created_on']
+        indexes             = [models.Index(fields=['created_on'], name='request_profile_created_idx')]
+
+    def __str__(self):
+        return f"{self.method} {self.path} — {self.duration_ms:.0f} ms"
@@ -0,0 +1,309 @@
+"""
+============================================================
+SUPERADMIN — So'rovlarni talab bo'yicha profillash
+============================================================
+Yoqish (faqat superadmin):
+  1. Qoida — POST /api/v1/superadmin/profiling/rules/
+       {"store": 5, "user": null, "path_prefix": "/api/v1/sales/",
+        "duration_minutes": 30, "max_requests": 20}
+     Berilgan shartlarning hammasi mos so'rovlar muddat tugaguncha, ko'pi bilan
+     max_requests ta yoziladi.
+  2. Imzolangan sarlavha — POST /api/v1/superadmin/profiling/token/ → qiymat;
+     X-Profile: <qiymat> qo'shilgan istalgan so'rov profillanadi
+     (PROFILING_HEADER_MAX_AGE soniya amal qiladi, SECRET_KEY bilan imzolangan).
+
+Natija — RequestProfile: metama'lumot (do'kon, foydalanuvchi, view, status, vaqt),
+SQL trace (har so'rov: sql, params, ms), cProfile (.prof — pstats / snakeviz bilan
+ochiladi) va eng og'ir funksiyalar matni. Javobda X-Profile-Id sarlavhasi.
+  GET /api/v1/superadmin/profiling/profiles/{id}/download/   — .prof fayl
+
+Narxi (profillanmaydigan so'rovlar):
+  ProfilingMiddleware — bitta META o'qishi va jarayon ichidagi qoidalar tuple'i
+  (PROFILING_RULES_REFRESH soniyada bir marta keshdan yangilanadi — so'rov yo'lida DB ga
+  hech qachon bormaydi). Qoida yo'q — boshqa hech narsa. Qoida bor — faqat yo'l prefiksi
+  mos so'rovda JWT o'qiladi (imzo tekshiruvi, DB siz; claimsiz token — tenant keshi).
+
+Qoidalar ro'yxati:
+  reset_rules() — qoida yaratilganda / o'zgarganda / limiti tugaganda DB dan qayta quriladi
+  va keshga muddatsiz yoziladi (bo'sh tuple ham). Keshda yo'q (Redis tozalangan, DummyCache)
+  — jarayon nusxasi o'zgarmaydi; kunlik cleanup_request_profiles ham qayta yozadi.
+"""
+
+import cProfile
+import io
+import logging
+import marshal
+import pstats
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.db import connections
+from django.db.models import F
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+_RULES_KEY = 'profiling_rules'
+_SALT      = 'superadmin.profiling'
+
+# (id, store_id, user_id, path_prefix, expires_at)
+_snapshot = {'loaded': float('-inf'), 'rules': ()}
+
+
+def header_meta_key() -> str:
+    return 'HTTP_' + settings.PROFILING_HEADER.upper().replace('-', '_')
+
+
+# ============================================================
+# QOIDALAR
+# ============================================================
+
+def _unexpired(rules: tuple) -> tuple:
+    now = timezone.now()
+    return tuple(rule for rule in rules if rule[4] > now)
+
+
+def active_rules() -> tuple:
+    """
+    Jarayon ichidagi nusxa; PROFILING_RULES_REFRESH soniyada bir marta keshdan (DB siz)
+    yangilanadi. Keshda yo'q — oldingi nusxa qoladi.
+    """
+    now = time.monotonic()
+    if now - _snapshot['loaded'] < settings.PROFILING_RULES_REFRESH:
+        return _snapshot['rules']
+
+    rules = _snapshot['rules']
+    try:
+        cached = cache.get(_RULES_KEY)
+        if cached is not None:
+            rules = cached
+    except Exception as exc:
+        # Profillash hech qachon so'rovni buzmasligi kerak (masalan, Redis vaqtincha yo'q)
+        logger.warning("Profillash qoidalari o'qilmadi: %s", exc)
+    rules = _unexpired(rules)
+    _snapshot.update(loaded=now, rules=rules)
+    return rules
+
+
+def reset_rules() -> None:
+    """
+    Qoidalar DB dan qayta quriladi va keshga muddatsiz yoziladi: shu jarayon darhol,
+    boshqalar PROFILING_RULES_REFRESH ichida.
+    """
+    from .models import ProfilingRule
+
+    try:
+        rules = tuple(
+            ProfilingRule.objects
+            .filter(is_active=True, expires_at__gt=timezone.now(), captured__lt=F('max_requests'))
+            .values_list('id', 'store_id', 'user_id', 'path_prefix', 'expires_at')
+        )
+        cache.set(_RULES_KEY, rules, timeout=None)
+    except Exception as exc:
+        logger.warning("Profillash qoidalari yangilanmadi: %s", exc)
+        return
+    _snapshot.update(loaded=time.monotonic(), rules=rules)
+
+
+def _claim(rule_id: int) -> bool:
+    """Atomar: captured < max_requests bo'lsa +1. Limit tugagan — qoidalar qayta o'qiladi."""
+    from .models import ProfilingRule
+
+    claimed = ProfilingRule.objects.filter(
+        pk=rule_id, is_active=True, expires_at__gt=timezone.now(), captured__lt=F('max_requests'),
+    ).update(captured=F('captured') + 1)
+    if not claimed:
+        reset_rules()
+    return bool(claimed)
+
+
+# ============================================================
+# IMZOLANGAN SARLAVHA
+# ============================================================
+
+def sign_header(user_id: int) -> str:
+    return signing.dumps({'by': user_id}, salt=_SALT)
+
+
+def check_header(value: str) -> dict | None:
+    try:
+        return signing.loads(value, salt=_SALT, max_age=settings.PROFILING_HEADER_MAX_AGE)
+    except signing.BadSignature:
+        return None
+
+
+# ============================================================
+# MOSLASH
+# ============================================================
+
+def _identify(request) -> tuple:
+    """(user_id, store_id) — Authorization dagi access tokendan, DB siz."""
+    from rest_framework_simplejwt.exceptions import TokenError
+    from rest_framework_simplejwt.settings import api_settings
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    from accaunt.claims import CLAIM_STORE
+    from config.tenant import get_tenant_context
+
+    header = request.META.get('HTTP_AUTHORIZATION', '')
+    if not header.startswith('Bearer '):
+        return None, None
+    try:
+        token = AccessToken(header[7:])
+    except TokenError:
+        return None, None
+    user_id  = int(token[api_settings.USER_ID_CLAIM])
+    store_id = token.get(CLAIM_STORE)
+    if store_id is None:
+        tenant   = get_tenant_context(user_id)
+        store_id = tenant.store_id if tenant else None
+    return user_id, store_id
+
+
+def match(request, rules: tuple, header_value: str | None):
+    """
+    Profillash kerakmi. Qaytaradi: (rule_id, trigger) yoki None.
+    Sarlavha noto'g'ri yoki muddati o'tgan — e'tiborsiz (so'rov odatdagidek).
+    """
+    from .models import ProfileTrigger
+
+    if header_value and check_header(header_value) is not None:
+        return None, ProfileTrigger.HEADER
+
+    path       = request.path_info
+    candidates = [rule for rule in rules if path.startswith(rule[3])]
+    if not candidates:
+        return None
+
+    now        = timezone.now()
+    identified = None
+    for rule_id, store_id, user_id, _, expires_at in candidates:
+        if expires_at <= now:
+            continue
+        if store_id or user_id:
+            if identified is None:
+                identified = _identify(request)
+            if store_id and store_id != identified[1]:
+                continue
+            if user_id and user_id != identified[0]:
+                continue
+        if _claim(rule_id):
+            return rule_id, ProfileTrigger.RULE
+    return None
+
+
+# ============================================================
+# PROFILLASH
+# ============================================================
+
+class SqlTrace:
+    """connection.execute_wrapper: har SQL — matn, parametrlar, vaqt (limitgacha)."""
+
+    def __init__(self, limit: int):
+        self.limit   = limit
+        self.entries = []
+        self.count   = 0
+        self.total   = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.count += 1
+            self.total += elapsed
+            if len(self.entries) < self.limit:
+                self.entries.append({
+                    'sql':    sql,
+                    'params': repr(params)[:500],
+                    'many':   many,
+                    'ms':     round(elapsed * 1000, 3),
+                })
+
+
+def profile_request(request, get_response, rule_id, trigger):
+    """get_response ni cProfile + SQL trace bilan bajaradi va RequestProfile yozadi."""
+    trace    = SqlTrace(settings.PROFILING_SQL_TRACE_LIMIT)
+    profiler = cProfile.Profile()
+    started  = timezone.now()
+    start    = time.perf_counter()
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(trace))
+        try:
+            profiler.enable()
+        except ValueError:                 # boshqa profiler faol
+            profiler = None
+        try:
+            response = get_response(request)
+        finally:
+            if profiler is not None:
+                profiler.disable()
+    elapsed = time.perf_counter() - start
+
+    try:
+        profile = _save(request, response, rule_id, trigger, trace, profiler, started, elapsed)
+        response['X-Profile-Id'] = str(profile.pk)
+    except Exception:
+        logger.exception("So'rov profili saqlanmadi: %s %s", request.method, request.path)
+    return response
+
+
+def _save(request, response, rule_id, trigger, trace, profiler, started, elapsed):
+    from config.metrics import view_label
+
+    from .models import RequestProfile
+
+    raw, summary = b'', ''
+    if profiler is not None:
+        profiler.create_stats()
+        raw    = marshal.dumps(profiler.stats)     # pstats fayl formati (Profile.dump_stats)
+        buffer = io.StringIO()
+        pstats.Stats(profiler, stream=buffer).sort_stats('cumulative').print_stats(settings.PROFILING_SUMMARY_LINES)
+        summary = buffer.getvalue()
+
+    tenant  = getattr(request, 'tenant', None)
+    profile = RequestProfile(
+        rule_id     = rule_id,
+        trigger     = trigger,
+        store_id    = tenant.store_id if tenant else None,
+        user_id     = tenant.user_id if tenant else None,
+        method      = request.method,
+        path        = request.get_full_path()[:500],
+        view        = view_label(request)[:150],
+        status_code = response.status_code,
+        duration_ms = round(elapsed * 1000, 3),
+        query_count = trace.count,
+        db_time_ms  = round(trace.total * 1000, 3),
+        sql_trace   = trace.entries,
+        summary     = summary,
+        created_on  = started,
+    )
+    if raw:
+        profile.file.save('request.prof', ContentFile(raw), save=False)
+        profile.file_size = len(raw)
+    profile.save()
+    return profile
+
+
+def cleanup_profiles() -> dict:
+    """PROFILING_ARTIFACT_TTL_DAYS dan eski profillar (fayllari bilan) va tugagan qoidalar."""
+    from datetime import timedelta
+
+    from .models import ProfilingRule, RequestProfile
+
+    cutoff  = timezone.now() - timedelta(days=settings.PROFILING_ARTIFACT_TTL_DAYS)
+    deleted = 0
+    for profile in RequestProfile.objects.filter(created_on__lt=cutoff).only('id', 'file').iterator():
+        if profile.file:
+            profile.file.delete(save=False)
+        profile.delete()
+        deleted += 1
+    expired = ProfilingRule.objects.filter(is_active=True, expires_at__lte=timezone.now()).update(is_active=False)
+    reset_rules()                  # kesh tozalangan bo'lsa ham qayta yoziladi
+    return {'deleted': deleted, 'expired_rules': expired}
@@ -1,6 +1,7 @@
-from datetime import date
+from datetime import date, timedelta
 from decimal import Decimal
 
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 from rest_framework import serializers
@@ -9,7 +10,7 @@ from store.models import Store
 from subscription.models import Subscription, SubscriptionInvoice, SubscriptionPlan
 from .models import (
     AdminExpense, Coupon, CouponUsage,
-    Referral, StoreReferralCode,
+    ProfilingRule, Referral, RequestProfile, StoreReferralCode,
     SupportTicket, TicketReply,
 )
 
@@ -500,3 +501,49 @@ class AdminWorkerListSerializer(serializers.Serializer):
 
     def get_last_login(self, obj):
         return obj.user.last_login
+
+
+# ============================================================
+# PROFILLASH (superadmin/profiling.py)
+# ============================================================
+
+class ProfilingRuleSerializer(serializers.ModelSerializer):
+    duration_minutes = serializers.IntegerField(write_only=True, min_value=1, required=False)
+
+    class Meta:
+        model            = ProfilingRule
+        fields           = [
+            'id', 'store', 'user', 'path_prefix', 'max_requests', 'captured',
+            'expires_at', 'is_active', 'note', 'created_by', 'created_on', 'duration_minutes',
+        ]
+        read_only_fields = ['captured', 'expires_at', 'created_by', 'created_on']
+
+    def validate_duration_minutes(self, value):
+        limit = settings.PROFILING_MAX_DURATION_MINUTES
+        if value > limit:
+            raise serializers.ValidationError(f"Ko'pi bilan {limit} daqiqa.")
+        return value
+
+    def validate(self, attrs):
+        if self.instance is None and 'duration_minutes' not in attrs:
+            raise serializers.ValidationError({'duration_minutes': "Davomiylik kiritilishi shart."})
+        minutes = attrs.pop('duration_minutes', None)
+        if minutes:
+            attrs['expires_at'] = timezone.now() + timedelta(minutes=minutes)
+        return attrs
+
+
+class RequestProfileListSerializer(serializers.ModelSerializer):
+    store_name = serializers.CharField(source='store.name', default=None, read_only=True)
+
+    class Meta:
+        model  = RequestProfile
+        fields = [
+            'id', 'rule', 'trigger', 'store', 'store_name', 'user', 'method', 'path', 'view',
+            'status_code', 'duration_ms', 'query_count', 'db_time_ms', 'file_size', 'created_on',
+        ]
+
+
+class RequestProfileDetailSerializer(RequestProfileListSerializer):
+    class Meta(RequestProfileListSerializer.Meta):
+        fields = RequestProfileListSerializer.Meta.fields + ['sql_trace', 'summary']
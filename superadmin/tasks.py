@@ -0,0 +1,28 @@
+"""
+============================================================
+SUPERADMIN — Celery Tasklari
+============================================================
+cleanup_request_profiles() — Har kuni 03:30: PROFILING_ARTIFACT_TTL_DAYS dan eski
+                             so'rov profillari (.prof fayllari bilan) o'chiriladi,
+                             muddati o'tgan profillash qoidalari o'chiriladi (is_active=False)
+                             va faol qoidalar ro'yxati keshga qayta yoziladi
+"""
+
+import logging
+
+from celery import shared_task
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def cleanup_request_profiles():
+    from superadmin.profiling import cleanup_profiles
+
+    result = cleanup_profiles()
+    if result['deleted'] or result['expired_rules']:
+        logger.info(
+            "cleanup_request_profiles: %d ta profil o'chirildi, %d ta qoida tugadi",
+            result['deleted'], result['expired_rules'],
+        )
+    return result
@@ -1,3 +1,119 @@
-from django.test import TestCase
+"""
+============================================================
+SUPERADMIN APP — Testlar
+============================================================
+Test guruhlari:
+  1. Profillash — superadmin qoidasi (do'kon, limit), imzolangan sarlavha, .prof yuklab olish,
+     qoidalar ro'yxati so'rov yo'lida DB siz
+"""
 
-# Create your tests here.
+import shutil
+import tempfile
+from decimal import Decimal
+
+from django.test import override_settings
+
+from rest_framework.test import APITestCase
+
+from accaunt.models import ALL_PERMISSIONS, CustomUser, Worker, WorkerRole
+from store.models import Store
+
+from .models import ProfilingRule, RequestProfile
+from .profiling import reset_rules
+
+
+# ============================================================
+# 1. PROFILLASH — SUPERADMIN QOIDASI VA IMZOLANGAN SARLAVHA
+# ============================================================
+
+class RequestProfilingTest(APITestCase):
+    """Mos so'rov cProfile + SQL trace bilan yoziladi; qolganlari tegilmaydi."""
+
+    url = '/api/v1/warehouse/products/'
+
+    def setUp(self):
+        self.store = Store.objects.create(name="Test do'kon")
+        self.user  = CustomUser.objects.create_user(
+            username='owner', email='owner@test.uz',
+            phone1='+998901234567', password='Test12345',
+        )
+        Worker.objects.create(user=self.user, store=self.store, role=WorkerRole.OWNER, permissions=list(ALL_PERMISSIONS))
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        override = override_settings(MEDIA_ROOT=self.media_root)
+        override.enable()
+        self.addCleanup(override.disable)
+        reset_rules()
+        self.addCleanup(reset_rules)                                   # LIFO: avval qoidalar o'chadi,
+        self.addCleanup(ProfilingRule.objects.all().delete)            # keyin bo'sh ro'yxat keshga
+        self.admin = CustomUser.objects.create_superuser(email='admin@test.uz', username='admin', password='Admin12345')
+
+    def _as_admin(self, method: str, url: str, data=None):
+        self.client.force_authenticate(self.admin)
+        response = getattr(self.client, method)(url, data or {}, format='json')
+        self.client.force_authenticate(None)
+        return response
+
+    def _owner_token(self) -> str:
+        response = self.client.post('/api/v1/auth/login/', {'username': 'owner', 'password': 'Test12345'})
+        return response.data['access']
+
+    def test_store_rule_profiles_limited_requests(self):
+        import marshal
+        from warehouse.models import Product
+
+        for i in range(2):
+            Product.objects.create(store=self.store, name=f"Mahsulot {i}", sale_price=Decimal('10000'))
+        response = self._as_admin('post', '/api/v1/superadmin/profiling/rules/', {
+            'store': self.store.id, 'path_prefix': '/api/v1/warehouse/', 'duration_minutes': 10, 'max_requests': 1,
+        })
+        self.assertEqual(response.status_code, 201, response.data)
+
+        auth = {'HTTP_AUTHORIZATION': f'Bearer {self._owner_token()}'}
+        first = self.client.get(self.url, **auth)
+        self.assertEqual(first.status_code, 200)
+        self.assertIn('X-Profile-Id', first)
+        self.assertNotIn('X-Profile-Id', self.client.get(self.url, **auth))           # max_requests tugadi
+        self.assertNotIn('X-Profile-Id', self.client.get('/api/v1/customers/', **auth))
+
+        profile = RequestProfile.objects.get()
+        self.assertEqual((profile.store_id, profile.view, profile.trigger), (self.store.id, 'ProductViewSet.list', 'rule'))
+        self.assertEqual(profile.query_count, len(profile.sql_trace))
+        self.assertTrue(any('warehouse_product' in q['sql'] for q in profile.sql_trace))
+        self.assertIn('cumulative', profile.summary)
+
+        detail = self._as_admin('get', f'/api/v1/superadmin/profiling/profiles/{profile.pk}/')
+        self.assertEqual(detail.data['query_count'], profile.query_count)
+        self.client.force_authenticate(self.admin)
+        download = self.client.get(f'/api/v1/superadmin/profiling/profiles/{profile.pk}/download/')
+        self.assertEqual(download.status_code, 200)
+        stats = marshal.loads(b''.join(download.streaming_content))                 # pstats formati
+        self.assertTrue(any(func[2] == 'list' for func in stats))
+
+    def test_signed_header_profiles_single_request(self):
+        token = self._as_admin('post', '/api/v1/superadmin/profiling/token/').data
+        self.client.force_authenticate(self.user)
+        header = 'HTTP_' + token['header'].upper().replace('-', '_')
+
+        self.assertNotIn('X-Profile-Id', self.client.get(self.url, **{header: token['value'] + 'x'}))
+        self.assertIn('X-Profile-Id', self.client.get(self.url, **{header: token['value']}))
+        self.assertEqual(RequestProfile.objects.get().trigger, 'header')
+        self.assertEqual(self._as_admin('get', '/api/v1/superadmin/profiling/profiles/').data['count'], 1)
+
+    def test_rules_refresh_never_queries_database(self):
+        """Qoida yo'q / bor — har PROFILING_RULES_REFRESH da faqat kesh o'qiladi."""
+        from superadmin import profiling
+
+        profiling._snapshot['loaded'] = float('-inf')                 # yangilash vaqti keldi
+        with self.assertNumQueries(0):
+            self.assertEqual(profiling.active_rules(), ())
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get('/api/v1/auth/profil/').status_code, 401)
+
+        response = self._as_admin('post', '/api/v1/superadmin/profiling/rules/', {
+            'path_prefix': '/api/v1/customers/', 'duration_minutes': 10, 'max_requests': 5,
+        })
+        self.assertEqual(response.status_code, 201, response.data)
+        profiling._snapshot['loaded'] = float('-inf')
+        with self.assertNumQueries(0):
+            self.assertEqual([rule[0] for rule in profiling.active_rules()], [response.data['id']])
@@ -1,19 +1,25 @@
 from datetime import date, timedelta
 from decimal import Decimal
 
+from django.conf import settings
 from django.db.models import Count, Q, Sum
+from django.http import FileResponse
 from django.utils import timezone
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework_simplejwt.tokens import RefreshToken
 
+from accaunt.claims import TenantRefreshToken
 from store.models import Store
 from subscription.models import Subscription, SubscriptionPlan
 from trade.models import Sale
 
-from .models import AdminExpense, Coupon, CouponUsage, Referral, StoreReferralCode, SupportTicket, TicketReply
+from .models import (
+    AdminExpense, Coupon, CouponUsage, ProfilingRule, Referral, RequestProfile,
+    StoreReferralCode, SupportTicket, TicketReply,
+)
+from .profiling import reset_rules, sign_header
 from .permissions import IsSuperAdmin
 from .serializers import (
     AdminExpenseSerializer,
@@ -29,8 +35,11 @@ from .serializers import (
     CouponUsageSerializer,
     ExtendSubscriptionSerializer,
     GiveTrialSerializer,
+    ProfilingRuleSerializer,
     ReferralListSerializer,
     ReferralStatsSerializer,
+    RequestProfileDetailSerializer,
+    RequestProfileListSerializer,
     StoreDetailSerializer,
     StoreListSerializer,
     StoreReferralCodeSerializer,
@@ -176,7 +185,7 @@ class SuperAdminStoreViewSet(viewsets.ReadOnlyModelViewSet):
             )
 
         user = owner_worker.user
-        refresh = RefreshToken.for_user(user)
+        refresh = TenantRefreshToken.for_user(user)
 
         return Response({
             'store_id':    store.id,
@@ -784,3 +793,81 @@ class SuperAdminWorkerViewSet(viewsets.ReadOnlyModelViewSet):
             'new_password': new_pass,
             'warning':      "Bu parolni foydalanuvchiga xavfsiz yo'l bilan yetkazing.",
         })
+
+
+# ============================================================
+# PROFILLASH — SUPERADMIN (superadmin/profiling.py)
+# ============================================================
+
+class ProfilingRuleViewSet(viewsets.ModelViewSet):
+    """
+    Vaqtinchalik profillash qoidalari.
+      POST   /api/v1/superadmin/profiling/rules/       {store, user, path_prefix, duration_minutes, max_requests}
+      PATCH  /api/v1/superadmin/profiling/rules/{id}/  {"is_active": false} — to'xtatish
+      DELETE /api/v1/superadmin/profiling/rules/{id}/
+    """
+    permission_classes = [IsSuperAdmin]
+    serializer_class   = ProfilingRuleSerializer
+    queryset           = ProfilingRule.objects.select_related('store', 'user')
+
+    def perform_create(self, serializer):
+        serializer.save(created_by=self.request.user)
+        reset_rules()
+
+    def perform_update(self, serializer):
+        serializer.save()
+        reset_rules()
+
+    def perform_destroy(self, instance):
+        instance.delete()
+        reset_rules()
+
+
+class RequestProfileViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Yozilgan profillar.
+      GET /api/v1/superadmin/profiling/profiles/                 — ro'yxat (?store=, ?rule=, ?view=)
+      GET /api/v1/superadmin/profiling/profiles/{id}/            — SQL trace + eng og'ir funksiyalar
+      GET /api/v1/superadmin/profiling/profiles/{id}/download/   — .prof (pstats / snakeviz)
+    """
+    permission_classes = [IsSuperAdmin]
+
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return RequestProfileListSerializer
+        return RequestProfileDetailSerializer
+
+    def get_queryset(self):
+        qs = RequestProfile.objects.select_related('store')
+        if self.action == 'list':
+            qs = qs.defer('sql_trace', 'summary')
+        for param in ('store', 'rule', 'view'):
+            value = self.request.query_params.get(param)
+            if value:
+                qs = qs.filter(**{param: value})
+        return qs
+
+    @action(detail=True, methods=['get'])
+    def download(self, request, pk=None):
+        profile = self.get_object()
+        if not profile.file:
+            return Response({'detail': "Bu profilda cProfile fayli yo'q."}, status=status.HTTP_404_NOT_FOUND)
+        response = FileResponse(profile.file.open('rb'), content_type='application/octet-stream')
+        response['Content-Disposition'] = f'attachment; filename="profile-{profile.pk}.prof"'
+        return response
+
+
+class ProfilingTokenView(APIView):
+    """
+    POST /api/v1/superadmin/profiling/token/
+    Imzolangan sarlavha qiymati: shu sarlavhali so'rovlar PROFILING_HEADER_MAX_AGE
+    soniya davomida profillanadi (frontend / curl da qo'lda qo'shiladi).
+    """
+    permission_classes = [IsSuperAdmin]
+
+    def post(self, request):
+        return Response({
+            'header':     settings.PROFILING_HEADER,
+            'value':      sign_header(request.user.pk),
+            'expires_in': settings.PROFILING_HEADER_MAX_AGE,
+        })
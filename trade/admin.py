@@ -1,6 +1,17 @@
 from django.contrib import admin
 
-from .models import Customer, CustomerGroup, Sale, SaleItem, SaleReturn, SaleReturnItem
+from .models import (
+    Customer,
+    CustomerGroup,
+    CustomerLedgerEntry,
+    CustomerPayment,
+    CustomerPaymentAllocation,
+    CustomerStats,
+    Sale,
+    SaleItem,
+    SaleReturn,
+    SaleReturnItem,
+)
 
 
 class SaleItemInline(admin.TabularInline):
@@ -19,6 +30,14 @@ class SaleReturnItemInline(admin.TabularInline):
     can_delete      = False
 
 
+class CustomerPaymentAllocationInline(admin.TabularInline):
+    model           = CustomerPaymentAllocation
+    extra           = 0
+    fields          = ('sale', 'amount')
+    readonly_fields = ('sale', 'amount')
+    can_delete      = False
+
+
 @admin.register(CustomerGroup)
 class CustomerGroupAdmin(admin.ModelAdmin):
     list_display    = ('name', 'store', 'discount', 'created_on')
@@ -39,6 +58,13 @@ class CustomerAdmin(admin.ModelAdmin):
     autocomplete_fields = ('store', 'group')
 
 
+@admin.register(CustomerStats)
+class CustomerStatsAdmin(admin.ModelAdmin):
+    list_display    = ('customer', 'purchase_count', 'total_spent', 'returned_amount', 'last_purchase_on')
+    search_fields   = ('customer__name', 'customer__phone')
+    readonly_fields = ('customer', 'purchase_count', 'total_spent', 'returned_amount', 'last_purchase_on', 'updated_on')
+
+
 @admin.register(Sale)
 class SaleAdmin(admin.ModelAdmin):
     list_display    = ('id', 'branch', 'worker', 'customer', 'payment_type', 'total_price', 'status', 'created_on')
@@ -83,3 +109,27 @@ class SaleReturnAdmin(admin.ModelAdmin):
             'fields': ('created_on',)
         }),
     )
+
+
+@admin.register(CustomerPayment)
+class CustomerPaymentAdmin(admin.ModelAdmin):
+    list_display    = ('id', 'customer', 'amount', 'payment_type', 'worker', 'store', 'created_on')
+    list_filter     = ('store', 'payment_type')
+    search_fields   = ('customer__name', 'customer__phone')
+    ordering        = ('-created_on',)
+    readonly_fields = ('store', 'customer', 'amount', 'payment_type', 'smena', 'worker', 'created_on')
+    date_hierarchy  = 'created_on'
+    inlines         = [CustomerPaymentAllocationInline]
+
+
+@admin.register(CustomerLedgerEntry)
+class CustomerLedgerEntryAdmin(admin.ModelAdmin):
+    list_display    = ('id', 'customer', 'entry_type', 'amount', 'balance', 'created_on')
+    list_filter     = ('store', 'entry_type')
+    search_fields   = ('customer__name', 'customer__phone')
+    ordering        = ('-created_on', '-id')
+    readonly_fields = (
+        'store', 'customer', 'entry_type', 'amount', 'balance',
+        'sale', 'sale_return', 'payment', 'worker', 'description', 'created_on',
+    )
+    date_hierarchy  = 'created_on'
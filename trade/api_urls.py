@@ -13,10 +13,15 @@ Router avtomatik quyidagi URL'larni yaratadi:
   DELETE /api/v1/customer-groups/{id}/         — guruh o'chirish (IsManagerOrAbove)
 
   GET    /api/v1/customers/                    — mijozlar ro'yxati (?status=active|inactive, ?group=id, ?search=)
+  GET    /api/v1/customers/?q=alisher          — reytingli qidiruv (ism/telefon prefiksi, ?limit=)
   POST   /api/v1/customers/                    — yangi mijoz yaratish (CanAccess('sotuv'))
   GET    /api/v1/customers/{id}/               — mijoz tafsilotlari
   PATCH  /api/v1/customers/{id}/               — mijoz yangilash
   DELETE /api/v1/customers/{id}/               — mijozni nofaol qilish (soft delete)
+  GET    /api/v1/customers/{id}/sales/         — mijoz sotuvlari tarixi (sahifalangan, ?status=)
+  GET    /api/v1/customers/{id}/ledger/        — nasiya daftari, running balance (?date_from=, ?date_to=)
+  GET    /api/v1/customers/{id}/balance/       — sana oxiridagi qarz qoldig'i (?as_of=YYYY-MM-DD)
+  GET    /api/v1/customers/debt-aging/         — qarz yoshi 0-30 / 31-60 / 60+ kun (?customer=id)
 
   GET    /api/v1/sales/                        — sotuvlar ro'yxati (?status=completed|cancelled, ?branch=id, ?smena=id)
   POST   /api/v1/sales/                        — yangi sotuv yaratish (@transaction.atomic, CanAccess('sotuv'))
@@ -30,16 +35,28 @@ Router avtomatik quyidagi URL'larni yaratadi:
   PATCH  /api/v1/sale-returns/{id}/confirm/    — tasdiqlash (IsManagerOrAbove, StockMovement(IN) avtomatik)
   PATCH  /api/v1/sale-returns/{id}/cancel/     — bekor qilish (IsManagerOrAbove)
   [PUT, DELETE YO'Q — qaytarishlar o'chirilmaydi]
+
+  GET    /api/v1/customer-payments/            — qarz to'lovlari (?customer=id, ?smena=id)
+  POST   /api/v1/customer-payments/            — qarz to'lovi (FIFO: eng eski nasiya sotuvi birinchi yopiladi)
+  GET    /api/v1/customer-payments/{id}/       — to'lov tafsilotlari (taqsimot bilan)
+  [PUT, DELETE YO'Q — to'lovlar o'zgartirilmaydi]
 """
 
 from rest_framework.routers import DefaultRouter
 
-from .views import CustomerGroupViewSet, CustomerViewSet, SaleReturnViewSet, SaleViewSet
+from .views import (
+    CustomerGroupViewSet,
+    CustomerPaymentViewSet,
+    CustomerViewSet,
+    SaleReturnViewSet,
+    SaleViewSet,
+)
 
 router = DefaultRouter()
 router.register(r'customer-groups', CustomerGroupViewSet, basename='customer-group')
 router.register(r'customers',       CustomerViewSet,      basename='customer')
 router.register(r'sales',           SaleViewSet,          basename='sale')
 router.register(r'sale-returns',    SaleReturnViewSet,    basename='sale-return')
+router.register(r'customer-payments', CustomerPaymentViewSet, basename='customer-payment')
 
 urlpatterns = router.urls
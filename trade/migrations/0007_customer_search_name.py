@@ -0,0 +1,89 @@
+# Generated by Django 5.2.11 on 2026-10-19 02:44
+#
+# Mijoz qidiruvi: normallashtirilgan ism + trigram/telefon prefiks indekslari.
+#
+# 1. search_name ustuni (normallashtirilgan nom) qo'shiladi va mavjud
+#    qatorlar uchun to'ldiriladi.
+# 2. Faqat PostgreSQL: pg_trgm kengaytmasi, search_name ustida GIN
+#    (gin_trgm_ops) va phone ustida prefiks (varchar_pattern_ops) indekslari.
+#    SQLite (local dev) da o'tkazib yuboriladi.
+
+import re
+
+from django.db import migrations, models
+
+# Migratsiya vaqtidagi normallashtirish (config.search_utils.normalize_search_text
+# nusxasi) — keyingi o'zgarishlar tarixiy migratsiya natijasiga ta'sir qilmasin.
+_CYRILLIC_TO_LATIN = {
+    'а': 'a',  'б': 'b',  'в': 'v',  'г': 'g',  'д': 'd',  'е': 'e',
+    'ё': 'yo', 'ж': 'j',  'з': 'z',  'и': 'i',  'й': 'y',  'к': 'k',
+    'л': 'l',  'м': 'm',  'н': 'n',  'о': 'o',  'п': 'p',  'р': 'r',
+    'с': 's',  'т': 't',  'у': 'u',  'ф': 'f',  'х': 'x',  'ц': 'ts',
+    'ч': 'ch', 'ш': 'sh', 'щ': 'sh', 'ъ': '',   'ы': 'i',  'ь': '',
+    'э': 'e',  'ю': 'yu', 'я': 'ya', 'ў': 'o',  'қ': 'q',  'ғ': 'g',
+    'ҳ': 'h',
+}
+_TRANSLIT_TABLE = str.maketrans(_CYRILLIC_TO_LATIN)
+_APOSTROPHES    = re.compile(r"['`ʻʼ‘’´]")
+_NON_ALNUM      = re.compile(r'[^0-9a-z]+')
+
+
+def normalize_search_text(text: str) -> str:
+    if not text:
+        return ''
+    text = text.casefold().translate(_TRANSLIT_TABLE)
+    text = _APOSTROPHES.sub('', text)
+    return _NON_ALNUM.sub(' ', text).strip()
+
+
+def fill_search_name(apps, schema_editor):
+    """Mavjud qatorlar uchun search_name ni to'ldirish (1000 talik bo'laklarda)."""
+    Model = apps.get_model('trade', 'Customer')
+    batch = []
+    for obj in Model.objects.only('id', 'name').iterator(chunk_size=1000):
+        obj.search_name = normalize_search_text(obj.name)
+        batch.append(obj)
+        if len(batch) >= 1000:
+            Model.objects.bulk_update(batch, ['search_name'])
+            batch = []
+    if batch:
+        Model.objects.bulk_update(batch, ['search_name'])
+
+
+def create_search_indexes(apps, schema_editor):
+    """Faqat PostgreSQL da ishlaydi — SQLite da o'tkazib yuboriladi."""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm;")
+    schema_editor.execute("""
+        CREATE INDEX IF NOT EXISTS trade_customer_search_name_trgm
+            ON trade_customer USING gin (search_name gin_trgm_ops);
+    """)
+    schema_editor.execute("""
+        CREATE INDEX IF NOT EXISTS trade_customer_phone_prefix
+            ON trade_customer (store_id, phone varchar_pattern_ops);
+    """)
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS trade_customer_search_name_trgm;")
+    schema_editor.execute("DROP INDEX IF EXISTS trade_customer_phone_prefix;")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trade', '0006_sale_cash_card_amount'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customer',
+            name='search_name',
+            field=models.CharField(blank=True, default='', editable=False, max_length=200, verbose_name='Qidiruv nomi'),
+        ),
+        migrations.RunPython(fill_search_name, migrations.RunPython.noop),
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
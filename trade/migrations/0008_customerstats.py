@@ -0,0 +1,87 @@
+# Generated by Django 5.2.11 on 2026-10-19 03:10
+#
+# CustomerStats: mijoz xarid ko'rsatkichlari (ro'yxatda sotuvlarni yuklamaslik uchun).
+# Mavjud mijozlar uchun sotuv/qaytarish jadvallaridan bir marta to'ldiriladi
+# (2 ta guruhlangan so'rov) — keyin trade/views.py inkremental yangilaydi.
+
+import django.db.models.deletion
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import Count, F, Max, Sum
+from django.db.models.functions import Coalesce
+
+
+def fill_customer_stats(apps, schema_editor):
+    Sale          = apps.get_model('trade', 'Sale')
+    SaleReturn    = apps.get_model('trade', 'SaleReturn')
+    CustomerStats = apps.get_model('trade', 'CustomerStats')
+
+    returned = {
+        row['cid']: row['total'] or Decimal('0')
+        for row in (
+            SaleReturn.objects
+            .filter(status='confirmed')
+            .annotate(cid=Coalesce('customer_id', 'sale__customer_id'))
+            .exclude(cid__isnull=True)
+            .values('cid')
+            .annotate(total=Sum('total_amount'))
+        )
+    }
+
+    rows = {}
+    for row in (
+        Sale.objects
+        .filter(status='completed', customer__isnull=False)
+        .values('customer_id')
+        .annotate(
+            count=Count('id'),
+            spent=Sum(F('total_price') - F('discount_amount')),
+            last=Max('created_on'),
+        )
+    ):
+        back = returned.get(row['customer_id'], Decimal('0'))
+        rows[row['customer_id']] = CustomerStats(
+            customer_id      = row['customer_id'],
+            purchase_count   = row['count'],
+            total_spent      = (row['spent'] or Decimal('0')) - back,
+            returned_amount  = back,
+            last_purchase_on = row['last'],
+        )
+    for cid, back in returned.items():
+        if cid not in rows:
+            rows[cid] = CustomerStats(customer_id=cid, total_spent=-back, returned_amount=back)
+
+    CustomerStats.objects.bulk_create(rows.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accaunt', '0006_workerkpi'),
+        ('store', '0008_rename_note_to_description'),
+        ('trade', '0007_customer_search_name'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CustomerStats',
+            fields=[
+                ('customer', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='trade.customer', verbose_name='Mijoz')),
+                ('purchase_count', models.PositiveIntegerField(default=0, verbose_name='Xaridlar soni')),
+                ('total_spent', models.DecimalField(decimal_places=2, default=0, max_digits=17, verbose_name='Jami xarid summasi (qaytarishlar ayirilgan)')),
+                ('returned_amount', models.DecimalField(decimal_places=2, default=0, max_digits=17, verbose_name='Qaytarilgan summa')),
+                ('last_purchase_on', models.DateTimeField(blank=True, null=True, verbose_name='Oxirgi xarid vaqti')),
+                ('updated_on', models.DateTimeField(auto_now=True, verbose_name='Yangilangan vaqti')),
+            ],
+            options={
+                'verbose_name': 'Mijoz statistikasi',
+                'verbose_name_plural': 'Mijozlar statistikasi',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='sale',
+            index=models.Index(fields=['customer', '-created_on'], name='sale_customer_created_idx'),
+        ),
+        migrations.RunPython(fill_customer_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,149 @@
+# Generated by Django 5.2.11 on 2026-10-19 02:54
+
+import django.db.models.deletion
+import django.utils.timezone
+from decimal import Decimal
+
+from django.db import migrations, models
+
+
+def fill_customer_ledger(apps, schema_editor):
+    """
+    Mavjud nasiya sotuvlaridan daftar yozuvlari (sotuv vaqti bilan, running balance).
+    Customer.debt_balance bilan farq bo'lsa — bitta 'adjustment' yozuvi.
+
+    Sale.debt_open = debt_amount; debt_balance sotuvlar yig'indisidan kam bo'lsa,
+    farq eng eski sotuvlardan boshlab (FIFO) yopilgan deb olinadi.
+    """
+    Customer            = apps.get_model('trade', 'Customer')
+    Sale                = apps.get_model('trade', 'Sale')
+    CustomerLedgerEntry = apps.get_model('trade', 'CustomerLedgerEntry')
+
+    balances = {}
+    open_by  = {}
+    entries  = []
+    sales = (
+        Sale.objects
+        .filter(status='completed', debt_amount__gt=0)
+        .order_by('customer_id', 'created_on', 'id')
+        .values('id', 'customer_id', 'store_id', 'debt_amount', 'created_on')
+    )
+    for sale in sales.iterator(chunk_size=2000):
+        open_by.setdefault(sale['customer_id'], []).append(
+            Sale(id=sale['id'], debt_open=sale['debt_amount'])
+        )
+        if sale['customer_id'] is None:
+            continue
+        balance = balances.get(sale['customer_id'], Decimal('0')) + sale['debt_amount']
+        balances[sale['customer_id']] = balance
+        entries.append(CustomerLedgerEntry(
+            store_id    = sale['store_id'],
+            customer_id = sale['customer_id'],
+            entry_type  = 'sale',
+            amount      = sale['debt_amount'],
+            balance     = balance,
+            sale_id     = sale['id'],
+            description = f"Nasiya sotuv #{sale['id']}",
+            created_on  = sale['created_on'],
+        ))
+
+    customers = Customer.objects.values('id', 'store_id', 'debt_balance')
+    for customer in customers.iterator(chunk_size=2000):
+        current = balances.get(customer['id'], Decimal('0'))
+        if customer['debt_balance'] == current:
+            continue
+        entries.append(CustomerLedgerEntry(
+            store_id    = customer['store_id'],
+            customer_id = customer['id'],
+            entry_type  = 'adjustment',
+            amount      = customer['debt_balance'] - current,
+            balance     = customer['debt_balance'],
+            description = "Daftar ochilishidagi qoldiq tuzatishi",
+        ))
+        # Ortiqcha nasiya — eng eski sotuvlardan yopiladi
+        closed = current - max(customer['debt_balance'], Decimal('0'))
+        for sale in open_by.get(customer['id'], []):
+            if closed <= 0:
+                break
+            part            = min(sale.debt_open, closed)
+            sale.debt_open -= part
+            closed         -= part
+
+    CustomerLedgerEntry.objects.bulk_create(entries, batch_size=1000)
+    Sale.objects.bulk_update(
+        [sale for group in open_by.values() for sale in group], ['debt_open'], batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accaunt', '0006_workerkpi'),
+        ('store', '0008_rename_note_to_description'),
+        ('trade', '0008_customerstats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CustomerPayment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=15, verbose_name="To'lov summasi")),
+                ('payment_type', models.CharField(choices=[('cash', 'Naqd'), ('card', 'Karta')], default='cash', max_length=10, verbose_name="To'lov turi")),
+                ('description', models.TextField(blank=True, verbose_name='Izoh')),
+                ('created_on', models.DateTimeField(auto_now_add=True, verbose_name='Yaratilgan vaqti')),
+                ('customer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='payments', to='trade.customer', verbose_name='Mijoz')),
+                ('smena', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='customer_payments', to='store.smena', verbose_name='Smena')),
+                ('store', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='customer_payments', to='store.store', verbose_name="Do'kon")),
+                ('worker', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='customer_payments', to='accaunt.worker', verbose_name='Xodim')),
+            ],
+            options={
+                'verbose_name': "Mijoz to'lovi",
+                'verbose_name_plural': "Mijoz to'lovlari",
+                'ordering': ['-created_on'],
+            },
+        ),
+        migrations.CreateModel(
+            name='CustomerPaymentAllocation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=15, verbose_name='Yopilgan summa')),
+                ('payment', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='allocations', to='trade.customerpayment', verbose_name="To'lov")),
+                ('sale', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='debt_allocations', to='trade.sale', verbose_name='Nasiya sotuv')),
+            ],
+            options={
+                'verbose_name': "To'lov taqsimoti",
+                'verbose_name_plural': "To'lov taqsimotlari",
+                'ordering': ['id'],
+            },
+        ),
+        migrations.CreateModel(
+            name='CustomerLedgerEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('entry_type', models.CharField(choices=[('sale', 'Nasiya sotuv'), ('payment', "Qarz to'lovi"), ('cancel', 'Sotuv bekor qilindi'), ('return', 'Qaytarish'), ('adjustment', 'Tuzatish')], max_length=12, verbose_name='Yozuv turi')),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=15, verbose_name="Summa (+ qarz, − to'lov)")),
+                ('balance', models.DecimalField(decimal_places=2, max_digits=15, verbose_name='Yozuvdan keyingi qoldiq')),
+                ('description', models.CharField(blank=True, max_length=255, verbose_name='Izoh')),
+                ('created_on', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Yaratilgan vaqti')),
+                ('customer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ledger_entries', to='trade.customer', verbose_name='Mijoz')),
+                ('sale', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='ledger_entries', to='trade.sale', verbose_name='Sotuv')),
+                ('sale_return', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='ledger_entries', to='trade.salereturn', verbose_name='Qaytarish')),
+                ('store', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='customer_ledger', to='store.store', verbose_name="Do'kon")),
+                ('worker', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='customer_ledger_entries', to='accaunt.worker', verbose_name='Xodim')),
+                ('payment', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='ledger_entries', to='trade.customerpayment', verbose_name="To'lov")),
+            ],
+            options={
+                'verbose_name': 'Nasiya daftari yozuvi',
+                'verbose_name_plural': 'Nasiya daftari',
+                'ordering': ['created_on', 'id'],
+                'indexes': [models.Index(fields=['customer', 'created_on'], name='ledger_customer_created_idx'), models.Index(fields=['store', 'entry_type', 'created_on'], name='ledger_store_type_idx')],
+            },
+        ),
+        migrations.AddField(
+            model_name='sale',
+            name='debt_open',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=15, verbose_name='Yopilmagan qarz'),
+        ),
+        migrations.RunPython(fill_customer_ledger, migrations.RunPython.noop),
+    ]
@@ -9,10 +9,14 @@ Modellar:
   SaleReturnStatus  — Qaytarish holati (TextChoices): pending | confirmed | cancelled
   CustomerGroup     — Mijoz guruhi (chegirma % bilan)
   Customer          — Mijoz (nasiya qoldig'i, guruh, do'kon)
+  CustomerStats     — Mijoz xaridlari statistikasi (inkremental yangilanadi)
   Sale              — Sotuv (savdo yozuvi, atomic transaction bilan yaratiladi)
   SaleItem          — Sotuv elementi (mahsulot, miqdor, narx)
   SaleReturn        — Qaytarish (BOSQICH 5, confirmed → StockMovement(IN) avtomatik)
   SaleReturnItem    — Qaytarish elementi (mahsulot, miqdor, narx)
+  CustomerPayment   — Mijozning nasiya to'lovi (FIFO taqsimlanadi)
+  CustomerPaymentAllocation — To'lovning nasiya sotuvlariga taqsimoti
+  CustomerLedgerEntry — Nasiya daftari (running balance, aging)
 
 Multi-tenant: barcha modellar store(FK) orqali ajratilgan.
 
@@ -24,6 +28,7 @@ Bog'liqliklar:
 """
 
 from django.db import models
+from django.utils import timezone
 
 
 # ============================================================
@@ -95,13 +100,22 @@ class Customer(models.Model):
     """
     Mijoz.
     Har bir mijoz bitta do'konga tegishli (multi-tenant).
-    debt_balance — joriy nasiya qoldig'i. Sale.debt_amount qayta yangilanadi.
+    debt_balance — joriy nasiya qoldig'i = oxirgi CustomerLedgerEntry.balance
+                   (faqat CustomerLedgerEntry.post() orqali o'zgaradi).
     Soft delete: status='inactive' ga o'tkaziladi.
     """
     name         = models.CharField(
         max_length=200,
         verbose_name='Ism-familiya',
     )
+    # Qidiruv uchun normallashtirilgan ism (kirill→lotin, kichik harf) — save() to'ldiradi
+    search_name  = models.CharField(
+        max_length=200,
+        blank=True,
+        default='',
+        editable=False,
+        verbose_name='Qidiruv nomi',
+    )
     phone        = models.CharField(
         max_length=20,
         blank=True,
@@ -152,6 +166,190 @@ class Customer(models.Model):
         phone = self.phone or "tel yo'q"
         return f"{self.name} ({phone})"
 
+    def save(self, *args, **kwargs):
+        """search_name har doim name dan hosil qilinadi (config/search_utils.py)."""
+        from config.search_utils import normalize_search_text
+        self.search_name = normalize_search_text(self.name)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'name' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'search_name'}
+        super().save(*args, **kwargs)
+
+
+# ============================================================
+# MIJOZ STATISTIKASI
+# ============================================================
+
+class CustomerStats(models.Model):
+    """
+    Mijozning xarid ko'rsatkichlari — ro'yxatda har bir mijoz sotuvlarini
+    yuklamaslik uchun oldindan hisoblangan qator (Customer bilan 1:1).
+
+    Inkremental yangilanadi (trade/views.py):
+      Sale yaratildi (mijoz bilan)  → record_sale():   purchase_count += 1, total_spent += net
+      Sale bekor qilindi            → record_cancel(): purchase_count -= 1, total_spent -= net
+      SaleReturn tasdiqlandi        → record_return(): total_spent -= summa, returned_amount += summa
+
+    Qator bo'lmasa (yangi mijoz) — birinchi sotuvda yaratiladi.
+    Nasiya qoldig'i Customer.debt_balance / CustomerLedgerEntry da (bu yerda takrorlanmaydi).
+
+    total_spent = SUM(completed sale: total_price - discount_amount) - returned_amount
+    """
+    customer         = models.OneToOneField(
+        Customer,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='stats',
+        verbose_name='Mijoz',
+    )
+    purchase_count   = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Xaridlar soni',
+    )
+    total_spent      = models.DecimalField(
+        max_digits=17,
+        decimal_places=2,
+        default=0,
+        verbose_name="Jami xarid summasi (qaytarishlar ayirilgan)",
+    )
+    returned_amount  = models.DecimalField(
+        max_digits=17,
+        decimal_places=2,
+        default=0,
+        verbose_name='Qaytarilgan summa',
+    )
+    last_purchase_on = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Oxirgi xarid vaqti',
+    )
+    updated_on       = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Yangilangan vaqti',
+    )
+
+    class Meta:
+        verbose_name        = 'Mijoz statistikasi'
+        verbose_name_plural = 'Mijozlar statistikasi'
+
+    def __str__(self) -> str:
+        return f"{self.customer_id}: {self.purchase_count} ta xarid, {self.total_spent} so'm"
+
+    @classmethod
+    def _apply(cls, customer_id: int, **updates) -> None:
+        """Qator mavjudligini ta'minlab, F() bilan atomik yangilash."""
+        cls.objects.get_or_create(customer_id=customer_id)
+        cls.objects.filter(customer_id=customer_id).update(**updates)
+
+    @classmethod
+    def record_sale(cls, sale) -> None:
+        """Yakunlangan sotuv qo'shildi."""
+        if not sale.customer_id:
+            return
+        from django.db.models import F
+        cls._apply(
+            sale.customer_id,
+            purchase_count   = F('purchase_count') + 1,
+            total_spent      = F('total_spent') + (sale.total_price - sale.discount_amount),
+            last_purchase_on = sale.created_on,
+        )
+
+    @classmethod
+    def record_cancel(cls, sale) -> None:
+        """
+        Sotuv bekor qilindi (sale.status allaqachon 'cancelled').
+        last_purchase_on qolgan yakunlangan sotuvlardan qayta olinadi (1 ta indeksli MAX).
+        """
+        if not sale.customer_id:
+            return
+        from django.db.models import F, Max
+        last = (
+            Sale.objects
+            .filter(customer_id=sale.customer_id, status=SaleStatus.COMPLETED)
+            .aggregate(last=Max('created_on'))['last']
+        )
+        cls._apply(
+            sale.customer_id,
+            purchase_count   = F('purchase_count') - 1,
+            total_spent      = F('total_spent') - (sale.total_price - sale.discount_amount),
+            last_purchase_on = last,
+        )
+
+    @classmethod
+    def record_return(cls, customer_id, amount) -> None:
+        """Qaytarish tasdiqlandi — summa xarajatdan ayiriladi."""
+        if not customer_id or not amount:
+            return
+        from django.db.models import F
+        cls._apply(
+            customer_id,
+            total_spent     = F('total_spent') - amount,
+            returned_amount = F('returned_amount') + amount,
+        )
+
+    @classmethod
+    def rebuild(cls, customer_ids=None) -> int:
+        """
+        Statistikani sotuv/qaytarish jadvallaridan to'liq qayta hisoblash
+        (2 ta guruhlangan so'rov). Tekshiruv/tuzatish uchun.
+        customer_ids=None → barcha mijozlar. Qaytaradi: yozilgan qatorlar soni.
+        """
+        from decimal import Decimal
+        from django.db.models import Count, F, Max, Q, Sum
+        from django.db.models.functions import Coalesce
+
+        sales   = Sale.objects.filter(status=SaleStatus.COMPLETED, customer__isnull=False)
+        returns = SaleReturn.objects.filter(status=SaleReturnStatus.CONFIRMED)
+        if customer_ids is not None:
+            sales   = sales.filter(customer_id__in=customer_ids)
+            returns = returns.filter(
+                Q(customer_id__in=customer_ids)
+                | Q(customer__isnull=True, sale__customer_id__in=customer_ids)
+            )
+
+        returned = {}
+        for row in (
+            returns
+            .annotate(cid=Coalesce('customer_id', 'sale__customer_id'))
+            .exclude(cid__isnull=True)
+            .values('cid')
+            .annotate(total=Sum('total_amount'))
+        ):
+            returned[row['cid']] = row['total'] or Decimal('0')
+
+        rows = {}
+        for row in (
+            sales.values('customer_id')
+            .annotate(
+                count=Count('id'),
+                spent=Sum(F('total_price') - F('discount_amount')),
+                last=Max('created_on'),
+            )
+        ):
+            back = returned.get(row['customer_id'], Decimal('0'))
+            rows[row['customer_id']] = cls(
+                customer_id      = row['customer_id'],
+                purchase_count   = row['count'],
+                total_spent      = (row['spent'] or Decimal('0')) - back,
+                returned_amount  = back,
+                last_purchase_on = row['last'],
+            )
+        for cid, back in returned.items():
+            if cid not in rows:
+                rows[cid] = cls(customer_id=cid, total_spent=-back, returned_amount=back)
+
+        if customer_ids is not None:
+            cls.objects.filter(customer_id__in=customer_ids).exclude(customer_id__in=rows).delete()
+        else:
+            cls.objects.exclude(customer_id__in=rows).delete()
+        cls.objects.bulk_create(
+            rows.values(),
+            update_conflicts=True,
+            unique_fields=['customer'],
+            update_fields=['purchase_count', 'total_spent', 'returned_amount', 'last_purchase_on'],
+        )
+        return len(rows)
+
 
 # ============================================================
 # SOTUV (SAVDO)
@@ -164,9 +362,14 @@ class Sale(models.Model):
     ⚠️ Yaratish faqat @transaction.atomic bilan (trade/views.py).
     ⚠️ Yaratilganda har bir SaleItem uchun StockMovement(OUT) avtomatik.
     ⚠️ Bekor qilganda (PATCH .../cancel/) StockMovement(IN) avtomatik.
-    ⚠️ Customer.debt_balance nasiya bo'lsa yangilanadi.
+    ⚠️ Customer.debt_balance nasiya bo'lsa yangilanadi (CustomerLedgerEntry orqali).
+
+    debt_amount — sotuvda berilgan nasiya (yaratilgandan keyin o'zgarmaydi:
+                  hisobotlar, eksport, chek).
+    debt_open   — hali yopilmagan qismi: mijoz to'lovlari (FIFO), qaytarishlar
+                  va bekor qilish uni kamaytiradi.
 
-    paid_amount + debt_amount == total_price - discount_amount (validatsiya views.py da)
+    paid_amount + debt_amount == total_price - discount_amount (yaratilganda, validatsiya views.py da)
 
     MIXED to'lov:
       cash_amount + card_amount == net_price (ya'ni paid_amount)
@@ -246,6 +449,12 @@ class Sale(models.Model):
         default=0,
         verbose_name='Qarz summasi',
     )
+    debt_open       = models.DecimalField(
+        max_digits=15,
+        decimal_places=2,
+        default=0,
+        verbose_name='Yopilmagan qarz',
+    )
     status          = models.CharField(
         max_length=15,
         choices=SaleStatus.choices,
@@ -265,6 +474,10 @@ class Sale(models.Model):
         verbose_name        = 'Sotuv'
         verbose_name_plural = 'Sotuvlar'
         ordering            = ['-created_on']
+        indexes             = [
+            # /customers/{id}/sales/ va CustomerStats.record_cancel() uchun
+            models.Index(fields=['customer', '-created_on'], name='sale_customer_created_idx'),
+        ]
 
     def __str__(self) -> str:
         return f"Sotuv #{self.pk} — {self.branch.name} | {self.total_price} so'm"
@@ -382,7 +595,8 @@ class SaleReturn(models.Model):
     ⚠️ Tasdiqlash (PATCH .../confirm/) faqat @transaction.atomic bilan:
        Har bir SaleReturnItem uchun StockMovement(IN) + Stock yangilanadi.
     ⚠️ sale(FK) ixtiyoriy — kassada chek yo'q bo'lsa ham qaytariladi.
-    ⚠️ Customer.debt_balance qayta hisoblanadi (nasiya bo'lsa kamaytiriladi).
+    ⚠️ Asl sotuv nasiya bo'lsa — qaytarilgan summa uning qarzidan yopiladi
+       (CustomerLedgerEntry 'return', trade/utils.py credit_return_to_debt).
     """
     sale       = models.ForeignKey(
         Sale,
@@ -495,3 +709,323 @@ class SaleReturnItem(models.Model):
 
     def __str__(self) -> str:
         return f"{self.product.name} × {self.quantity} = {self.total_price}"
+
+
+# ============================================================
+# MIJOZ NASIYA DAFTARI (LEDGER)
+# ============================================================
+
+class CustomerPaymentType(models.TextChoices):
+    CASH = 'cash', 'Naqd'
+    CARD = 'card', 'Karta'
+
+
+class LedgerEntryType(models.TextChoices):
+    SALE       = 'sale',       'Nasiya sotuv'
+    PAYMENT    = 'payment',    "Qarz to'lovi"
+    CANCEL     = 'cancel',     'Sotuv bekor qilindi'
+    RETURN     = 'return',     'Qaytarish'
+    ADJUSTMENT = 'adjustment', 'Tuzatish'
+
+
+class CustomerPayment(models.Model):
+    """
+    Mijozning nasiya qarzini to'lashi.
+
+    ⚠️ Immutable — yaratilgandan keyin o'zgartirib yoki o'chirib bo'lmaydi.
+    ⚠️ Yaratilganda summa ochiq nasiya sotuvlariga FIFO bo'yicha taqsimlanadi
+       (eng eski sotuv birinchi) — CustomerPaymentAllocation,
+       Sale.debt_open kamayadi, CustomerLedgerEntry(payment) yoziladi.
+    """
+    store        = models.ForeignKey(
+        'store.Store',
+        on_delete=models.CASCADE,
+        related_name='customer_payments',
+        verbose_name="Do'kon",
+    )
+    customer     = models.ForeignKey(
+        Customer,
+        on_delete=models.CASCADE,
+        related_name='payments',
+        verbose_name='Mijoz',
+    )
+    amount       = models.DecimalField(
+        max_digits=15,
+        decimal_places=2,
+        verbose_name="To'lov summasi",
+    )
+    payment_type = models.CharField(
+        max_length=10,
+        choices=CustomerPaymentType.choices,
+        default=CustomerPaymentType.CASH,
+        verbose_name="To'lov turi",
+    )
+    description  = models.TextField(
+        blank=True,
+        verbose_name='Izoh',
+    )
+    smena        = models.ForeignKey(
+        'store.Smena',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='customer_payments',
+        verbose_name='Smena',
+    )
+    worker       = models.ForeignKey(
+        'accaunt.Worker',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='customer_payments',
+        verbose_name='Xodim',
+    )
+    created_on   = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Yaratilgan vaqti',
+    )
+
+    class Meta:
+        verbose_name        = "Mijoz to'lovi"
+        verbose_name_plural = "Mijoz to'lovlari"
+        ordering            = ['-created_on']
+
+    def __str__(self) -> str:
+        return f"To'lov #{self.pk}: {self.customer.name} — {self.amount} ({self.get_payment_type_display()})"
+
+
+class CustomerPaymentAllocation(models.Model):
+    """To'lovning qaysi nasiya sotuviga qancha yopilgani (FIFO taqsimot natijasi)."""
+    payment = models.ForeignKey(
+        CustomerPayment,
+        on_delete=models.CASCADE,
+        related_name='allocations',
+        verbose_name="To'lov",
+    )
+    sale    = models.ForeignKey(
+        Sale,
+        on_delete=models.CASCADE,
+        related_name='debt_allocations',
+        verbose_name='Nasiya sotuv',
+    )
+    amount  = models.DecimalField(
+        max_digits=15,
+        decimal_places=2,
+        verbose_name='Yopilgan summa',
+    )
+
+    class Meta:
+        verbose_name        = "To'lov taqsimoti"
+        verbose_name_plural = "To'lov taqsimotlari"
+        ordering            = ['id']
+
+    def __str__(self) -> str:
+        return f"To'lov #{self.payment_id} → Sotuv #{self.sale_id}: {self.amount}"
+
+
+class CustomerLedgerEntry(models.Model):
+    """
+    Mijoz nasiya daftari — qarzning har bir o'zgarishi alohida yozuv.
+
+    amount  — ishorali: + qarz oshdi (nasiya sotuv), − qarz kamaydi (to'lov,
+              bekor qilish, qaytarish).
+    balance — shu yozuvdan KEYINGI qoldiq (running balance). Customer qatori
+              select_for_update bilan qulflanib yoziladi — ketma-ketlik buzilmaydi,
+              Customer.debt_balance == oxirgi yozuv balance.
+
+    Yozuv manbalari (trade/views.py):
+      Sale (debt_amount > 0) yaratildi  → sale    (+debt_amount)
+      CustomerPayment yaratildi         → payment (−amount)
+      Sale bekor qilindi                → cancel  (−debt_open)
+      SaleReturn tasdiqlandi            → return  (−nasiyadan yopilgan qism)
+
+    "Sana bo'yicha qoldiq" — balance_as_of(): (customer, created_on) indeksi
+    bo'yicha bitta qator. Qarz yoshi — aging(): bitta agregat so'rov
+    (sotuvga bog'lanmagan ochilish qoldig'i ham).
+    ⚠️ Immutable — xatolik yangi 'adjustment' yozuvi bilan tuzatiladi.
+    """
+    store       = models.ForeignKey(
+        'store.Store',
+        on_delete=models.CASCADE,
+        related_name='customer_ledger',
+        verbose_name="Do'kon",
+    )
+    customer    = models.ForeignKey(
+        Customer,
+        on_delete=models.CASCADE,
+        related_name='ledger_entries',
+        verbose_name='Mijoz',
+    )
+    entry_type  = models.CharField(
+        max_length=12,
+        choices=LedgerEntryType.choices,
+        verbose_name='Yozuv turi',
+    )
+    amount      = models.DecimalField(
+        max_digits=15,
+        decimal_places=2,
+        verbose_name="Summa (+ qarz, − to'lov)",
+    )
+    balance     = models.DecimalField(
+        max_digits=15,
+        decimal_places=2,
+        verbose_name="Yozuvdan keyingi qoldiq",
+    )
+    sale        = models.ForeignKey(
+        Sale,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='ledger_entries',
+        verbose_name='Sotuv',
+    )
+    sale_return = models.ForeignKey(
+        SaleReturn,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='ledger_entries',
+        verbose_name='Qaytarish',
+    )
+    payment     = models.ForeignKey(
+        CustomerPayment,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='ledger_entries',
+        verbose_name="To'lov",
+    )
+    worker      = models.ForeignKey(
+        'accaunt.Worker',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='customer_ledger_entries',
+        verbose_name='Xodim',
+    )
+    description = models.CharField(
+        max_length=255,
+        blank=True,
+        verbose_name='Izoh',
+    )
+    created_on  = models.DateTimeField(
+        default=timezone.now,
+        verbose_name='Yaratilgan vaqti',
+    )
+
+    class Meta:
+        verbose_name        = 'Nasiya daftari yozuvi'
+        verbose_name_plural = 'Nasiya daftari'
+        ordering            = ['created_on', 'id']
+        indexes             = [
+            models.Index(fields=['customer', 'created_on'], name='ledger_customer_created_idx'),
+            models.Index(fields=['store', 'entry_type', 'created_on'], name='ledger_store_type_idx'),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.get_entry_type_display()}: {self.amount:+} → {self.balance}"
+
+    @classmethod
+    def post(cls, customer_id: int, entry_type: str, amount, **refs) -> 'CustomerLedgerEntry':
+        """
+        Yangi yozuv qo'shish va Customer.debt_balance ni yangilash.
+        ⚠️ Faqat transaction.atomic ichida — Customer qatori qulflanadi.
+        refs: sale, sale_return, payment, worker, description.
+        """
+        customer = (
+            Customer.objects
+            .select_for_update()
+            .only('id', 'store_id', 'debt_balance')
+            .get(pk=customer_id)
+        )
+        balance = customer.debt_balance + amount
+        Customer.objects.filter(pk=customer_id).update(debt_balance=balance)
+        return cls.objects.create(
+            store_id    = customer.store_id,
+            customer_id = customer_id,
+            entry_type  = entry_type,
+            amount      = amount,
+            balance     = balance,
+            **refs,
+        )
+
+    @classmethod
+    def balance_as_of(cls, customer_id: int, moment):
+        """moment vaqtidagi qoldiq — oxirgi yozuvning balance (indeksli bitta qator)."""
+        from decimal import Decimal
+        last = (
+            cls.objects
+            .filter(customer_id=customer_id, created_on__lte=moment)
+            .order_by('-created_on', '-id')
+            .values_list('balance', flat=True)
+            .first()
+        )
+        return last if last is not None else Decimal('0')
+
+    @classmethod
+    def aging(cls, store_id: int, customer_id=None, now=None) -> dict:
+        """
+        Ochiq nasiya qoldig'ining yoshi — bitta agregat so'rov.
+
+        Nasiya sotuv yozuvlari (entry_type='sale') sanasi bo'yicha guruhlanadi,
+        summa — sotuvning hali yopilmagan qismi (Sale.debt_open, FIFO
+        to'lovlardan keyin). Sotuvga bog'lanmagan qoldiq (Customer.debt_balance −
+        Σ debt_open, masalan daftar ochilishidagi 'adjustment') mijozning birinchi
+        'adjustment' yozuvi sanasiga tushadi. Buckets: 0-30, 31-60, 60+ kun.
+        """
+        from datetime import timedelta
+        from decimal import Decimal
+        from django.db.models import (
+            Case, Count, DecimalField, F, OuterRef, Q, Subquery, Sum, Value, When,
+        )
+        from django.db.models.functions import Coalesce, Greatest
+
+        now  = now or timezone.now()
+        d30  = now - timedelta(days=30)
+        d60  = now - timedelta(days=60)
+        zero = Value(Decimal('0'))
+        money = DecimalField(max_digits=15, decimal_places=2)
+
+        sales_open = (
+            Sale.objects
+            .filter(customer_id=OuterRef('customer_id'), status=SaleStatus.COMPLETED)
+            .values('customer_id')
+            .annotate(total=Sum('debt_open'))
+            .values('total')
+        )
+        first_adjustment = (
+            cls.objects
+            .filter(customer_id=OuterRef('customer_id'), entry_type=LedgerEntryType.ADJUSTMENT)
+            .order_by('created_on', 'id')
+            .values('id')[:1]
+        )
+        unattributed = Greatest(
+            F('customer__debt_balance') - Coalesce(Subquery(sales_open, output_field=money), zero),
+            zero,
+            output_field=money,
+        )
+
+        qs = cls.objects.filter(store_id=store_id).filter(
+            Q(entry_type=LedgerEntryType.SALE, sale__status=SaleStatus.COMPLETED)
+            | Q(entry_type=LedgerEntryType.ADJUSTMENT, pk=Subquery(first_adjustment))
+        )
+        if customer_id is not None:
+            qs = qs.filter(customer_id=customer_id)
+        qs = qs.annotate(open_debt=Case(
+            When(entry_type=LedgerEntryType.SALE, then=F('sale__debt_open')),
+            default=unattributed,
+            output_field=money,
+        )).filter(open_debt__gt=0)
+
+        agg = qs.aggregate(
+            days_0_30    = Sum('open_debt', filter=Q(created_on__gte=d30)),
+            days_31_60   = Sum('open_debt', filter=Q(created_on__lt=d30, created_on__gte=d60)),
+            days_60_plus = Sum('open_debt', filter=Q(created_on__lt=d60)),
+            customers    = Count('customer', distinct=True),
+        )
+        buckets = {key: agg[key] or Decimal('0') for key in ('days_0_30', 'days_31_60', 'days_60_plus')}
+        return {
+            **buckets,
+            'total':     sum(buckets.values(), Decimal('0')),
+            'customers': agg['customers'],
+        }
@@ -19,6 +19,8 @@ Serializerlar:
   SaleReturnListSerializer        — GET /sale-returns/
   SaleReturnDetailSerializer      — GET /sale-returns/{id}/
   SaleReturnCreateSerializer      — POST /sale-returns/ uchun input validatsiya
+  CustomerPaymentSerializer       — GET/POST /customer-payments/ (FIFO taqsimot bilan)
+  CustomerLedgerEntrySerializer   — GET /customers/{id}/ledger/
 """
 
 from decimal import Decimal
@@ -32,6 +34,10 @@ from warehouse.models import Product
 from .models import (
     Customer,
     CustomerGroup,
+    CustomerLedgerEntry,
+    CustomerPayment,
+    CustomerPaymentAllocation,
+    CustomerStats,
     CustomerStatus,
     PaymentType,
     Sale,
@@ -110,7 +116,39 @@ class CustomerGroupCreateSerializer(serializers.ModelSerializer):
 # MIJOZ SERIALIZERLARI
 # ============================================================
 
-class CustomerListSerializer(serializers.ModelSerializer):
+class CustomerStatsFieldsMixin(serializers.Serializer):
+    """
+    CustomerStats dan xarid ko'rsatkichlari (view select_related('stats') beradi).
+    Statistika qatori yo'q (hali xarid qilmagan) mijoz uchun — nol qiymatlar.
+    """
+    purchase_count   = serializers.SerializerMethodField()
+    total_spent      = serializers.SerializerMethodField()
+    last_purchase_on = serializers.SerializerMethodField()
+
+    @staticmethod
+    def _stats(obj: Customer):
+        try:
+            return obj.stats
+        except CustomerStats.DoesNotExist:
+            return None
+
+    def get_purchase_count(self, obj: Customer) -> int:
+        stats = self._stats(obj)
+        return stats.purchase_count if stats else 0
+
+    def get_total_spent(self, obj: Customer) -> str:
+        stats = self._stats(obj)
+        value = stats.total_spent if stats else Decimal('0')
+        return serializers.DecimalField(max_digits=17, decimal_places=2).to_representation(value)
+
+    def get_last_purchase_on(self, obj: Customer):
+        stats = self._stats(obj)
+        if not stats or not stats.last_purchase_on:
+            return None
+        return serializers.DateTimeField().to_representation(stats.last_purchase_on)
+
+
+class CustomerListSerializer(CustomerStatsFieldsMixin, serializers.ModelSerializer):
     """Mijozlar ro'yxati. GET /api/v1/customers/"""
     group_name     = serializers.CharField(
         source='group.name', read_only=True, allow_null=True, default=None,
@@ -121,6 +159,7 @@ class CustomerListSerializer(serializers.ModelSerializer):
         model  = Customer
         fields = (
             'id', 'name', 'phone', 'debt_balance',
+            'purchase_count', 'total_spent', 'last_purchase_on',
             'group', 'group_name',
             'status', 'status_display',
             'created_on',
@@ -132,13 +171,16 @@ class CustomerDebtSaleSerializer(serializers.ModelSerializer):
     class Meta:
         model  = Sale
         fields = (
-            'id', 'total_price', 'paid_amount', 'debt_amount',
+            'id', 'total_price', 'paid_amount', 'debt_amount', 'debt_open',
             'status', 'created_on',
         )
 
 
-class CustomerDetailSerializer(serializers.ModelSerializer):
-    """Mijoz to'liq ma'lumoti. GET /api/v1/customers/{id}/"""
+class CustomerDetailSerializer(CustomerStatsFieldsMixin, serializers.ModelSerializer):
+    """
+    Mijoz to'liq ma'lumoti. GET /api/v1/customers/{id}/
+    To'liq sotuvlar tarixi — GET /api/v1/customers/{id}/sales/ (sahifalangan).
+    """
     group_name     = serializers.CharField(
         source='group.name', read_only=True, allow_null=True, default=None,
     )
@@ -149,6 +191,7 @@ class CustomerDetailSerializer(serializers.ModelSerializer):
         model  = Customer
         fields = (
             'id', 'name', 'phone', 'address', 'debt_balance',
+            'purchase_count', 'total_spent', 'last_purchase_on',
             'group', 'group_name',
             'status', 'status_display',
             'created_on',
@@ -159,7 +202,7 @@ class CustomerDetailSerializer(serializers.ModelSerializer):
         """Mijozning barcha nasiya sotuvlari (yakunlangan, qarzi bor)."""
         sales = obj.sales.filter(
             payment_type=PaymentType.DEBT,
-            debt_amount__gt=0,
+            debt_open__gt=0,
             status=SaleStatus.COMPLETED,
         ).order_by('-created_on')
         return CustomerDebtSaleSerializer(sales, many=True).data
@@ -369,7 +412,7 @@ class SaleListSerializer(serializers.ModelSerializer):
             'payment_type', 'payment_type_display',
             'total_price', 'discount_amount',
             'cash_amount', 'card_amount',
-            'paid_amount', 'debt_amount',
+            'paid_amount', 'debt_amount', 'debt_open',
             'status', 'status_display',
             'created_on',
         )
@@ -411,7 +454,7 @@ class SaleDetailSerializer(serializers.ModelSerializer):
             'payment_type', 'payment_type_display',
             'total_price', 'discount_amount',
             'cash_amount', 'card_amount',
-            'paid_amount', 'debt_amount',
+            'paid_amount', 'debt_amount', 'debt_open',
             'status', 'status_display',
             'description', 'created_on',
             'items',
@@ -716,3 +759,99 @@ class SaleReturnCreateSerializer(serializers.Serializer):
                 )
 
         return data
+
+
+# ============================================================
+# NASIYA DAFTARI VA QARZ TO'LOVLARI
+# ============================================================
+
+class CustomerPaymentAllocationSerializer(serializers.ModelSerializer):
+    """To'lovning nasiya sotuviga taqsimoti — CustomerPaymentSerializer ichida nested."""
+    sale_created_on = serializers.DateTimeField(source='sale.created_on', read_only=True)
+
+    class Meta:
+        model  = CustomerPaymentAllocation
+        fields = ('sale', 'sale_created_on', 'amount')
+
+
+class CustomerPaymentSerializer(serializers.ModelSerializer):
+    """
+    Mijoz qarz to'lovi — yaratish va ro'yxat uchun.
+    POST /api/v1/customer-payments/
+    Immutable: o'chirish va yangilash yo'q. allocations — FIFO taqsimot (read-only).
+    """
+    customer_name        = serializers.CharField(source='customer.name', read_only=True)
+    payment_type_display = serializers.CharField(source='get_payment_type_display', read_only=True)
+    worker_name          = serializers.SerializerMethodField()
+    allocations          = CustomerPaymentAllocationSerializer(many=True, read_only=True)
+
+    class Meta:
+        model  = CustomerPayment
+        fields = (
+            'id', 'customer', 'customer_name',
+            'amount', 'payment_type', 'payment_type_display',
+            'description', 'smena',
+            'allocations',
+            'worker_name', 'created_on',
+        )
+        extra_kwargs = {
+            'customer': {
+                'error_messages': {
+                    'required'      : "Mijoz tanlanishi shart.",
+                    'does_not_exist': "Bunday mijoz topilmadi.",
+                }
+            },
+            'amount': {
+                'error_messages': {
+                    'required': "To'lov summasi kiritilishi shart.",
+                    'invalid' : "To'g'ri raqam kiritilishi shart.",
+                }
+            },
+            'payment_type': {
+                'error_messages': {
+                    'invalid_choice': "To'lov turi noto'g'ri. 'cash' yoki 'card' bo'lishi kerak.",
+                }
+            },
+        }
+
+    def get_worker_name(self, obj):
+        if obj.worker_id:
+            return obj.worker.user.get_full_name() or obj.worker.user.username
+        return None
+
+    def validate_customer(self, value):
+        store = self.context.get('store')
+        if store and value.store_id != store.id:
+            raise serializers.ValidationError(
+                "Bu mijoz sizning do'koningizga tegishli emas."
+            )
+        return value
+
+    def validate_smena(self, value):
+        store = self.context.get('store')
+        if value and store and value.store_id != store.id:
+            raise serializers.ValidationError(
+                "Bu smena sizning do'koningizga tegishli emas."
+            )
+        return value
+
+    def validate_amount(self, value):
+        if value <= 0:
+            raise serializers.ValidationError(
+                "To'lov summasi 0 dan katta bo'lishi shart."
+            )
+        return value
+
+
+class CustomerLedgerEntrySerializer(serializers.ModelSerializer):
+    """Nasiya daftari yozuvi. GET /api/v1/customers/{id}/ledger/"""
+    entry_type_display = serializers.CharField(source='get_entry_type_display', read_only=True)
+
+    class Meta:
+        model  = CustomerLedgerEntry
+        fields = (
+            'id', 'entry_type', 'entry_type_display',
+            'amount', 'balance',
+            'sale', 'sale_return', 'payment',
+            'description', 'created_on',
+        )
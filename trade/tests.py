@@ -1,3 +1,321 @@
-from django.test import TestCase
+"""
+============================================================
+TRADE APP — Testlar
+============================================================
+Test guruhlari:
+  1. Mijoz qidiruvi — ism (kirill/lotin), telefon prefiksi, ?q= reytingi
+  2. Mijoz statistikasi — CustomerStats (sotuv/bekor/qaytarish), /customers/{id}/sales/
+  3. Nasiya daftari — running balance, FIFO to'lov, bekor/qaytarish, aging, as_of
+"""
 
-# Create your tests here.
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from rest_framework.test import APITestCase
+
+from accaunt.models import ALL_PERMISSIONS, CustomUser, Worker, WorkerRole
+from store.models import Branch, Store, StoreSettings
+from warehouse.models import Product, Stock
+
+from .models import (
+    Customer,
+    CustomerLedgerEntry,
+    CustomerStats,
+    LedgerEntryType,
+    Sale,
+)
+
+
+class TradeTestMixin:
+    """Do'kon + owner hodim + autentifikatsiya — barcha testlar uchun umumiy."""
+
+    def setUp(self):
+        self.store = Store.objects.create(name="Test do'kon")
+        self.user  = CustomUser.objects.create_user(
+            username='owner', email='owner@test.uz',
+            phone1='+998901234567', password='Test12345',
+        )
+        self.worker = Worker.objects.create(
+            user=self.user, store=self.store,
+            role=WorkerRole.OWNER, permissions=list(ALL_PERMISSIONS),
+        )
+        self.client.force_authenticate(self.user)
+
+    def _make_sale_context(self):
+        """Filial + mahsulot + filialdagi qoldiq (sotuv yaratish uchun)."""
+        self.branch  = Branch.objects.create(store=self.store, name='Markaziy filial')
+        self.product = Product.objects.create(
+            store=self.store, name='Non', sale_price=Decimal('5000'), barcode='2000000000017',
+        )
+        Stock.objects.create(product=self.product, branch=self.branch, quantity=Decimal('1000'))
+
+    def _sell(self, customer, quantity=2, payment_type='cash', paid=None) -> dict:
+        """POST /sales/ — bitta mahsulotli sotuv."""
+        total    = Decimal('5000') * quantity
+        response = self.client.post('/api/v1/sales/', {
+            'branch':       self.branch.id,
+            'customer':     customer.id if customer else None,
+            'payment_type': payment_type,
+            'paid_amount':  str(total if paid is None else paid),
+            'items':        [{'product': self.product.id, 'quantity': str(quantity), 'unit_price': '5000'}],
+        }, format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+        return response.data['data']
+
+
+# ============================================================
+# 1. MIJOZ QIDIRUVI
+# ============================================================
+
+class CustomerSearchTest(TradeTestMixin, APITestCase):
+    """?q= / ?search= — indeksli prefiks qidiruv (icontains emas)."""
+
+    def setUp(self):
+        super().setUp()
+        for name, phone in (
+            ('Alisher Karimov', '+998901112233'),
+            ('Алишер Юсупов',   '+998935554433'),
+            ('Karim Aliyev',    '+998901119999'),
+        ):
+            Customer.objects.create(store=self.store, name=name, phone=phone)
+
+    def _names(self, url: str) -> list:
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, response.data)
+        return [row['name'] for row in response.data['results']]
+
+    def test_name_prefix_any_script(self):
+        """Lotincha so'rov kirillcha yozilgan ismni ham topadi; nom boshi yuqorida."""
+        names = self._names('/api/v1/customers/?q=alisher')
+        self.assertEqual(names, ['Alisher Karimov', 'Алишер Юсупов'])
+
+    def test_word_prefix_ranking(self):
+        """Ism boshidagi moslik familiyadagidan yuqorida."""
+        names = self._names('/api/v1/customers/?q=karim')
+        self.assertEqual(names, ['Karim Aliyev', 'Alisher Karimov'])
+
+    def test_phone_prefix(self):
+        """Telefon bo'lagi '+998' prefiksi bilan qidiriladi."""
+        names = self._names('/api/v1/customers/?q=90 111')
+        self.assertEqual(set(names), {'Alisher Karimov', 'Karim Aliyev'})
+        self.assertEqual(self._names('/api/v1/customers/?q=+998935554433'), ['Алишер Юсупов'])
+
+    def test_search_param_paginated(self):
+        """?search= sahifalangan javob qaytaradi (eski shakl saqlanadi)."""
+        response = self.client.get('/api/v1/customers/?search=aliyev')
+        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(response.data['results'][0]['name'], 'Karim Aliyev')
+
+
+# ============================================================
+# 2. MIJOZ STATISTIKASI (CustomerStats)
+# ============================================================
+
+class CustomerStatsTest(TradeTestMixin, APITestCase):
+    """Xarid ko'rsatkichlari inkremental yangilanadi; ro'yxat sotuvlarni yuklamaydi."""
+
+    def setUp(self):
+        super().setUp()
+        self._make_sale_context()
+        self.customer = Customer.objects.create(store=self.store, name='Doimiy mijoz', phone='+998901234500')
+
+    def _stats(self) -> dict:
+        response = self.client.get(f'/api/v1/customers/{self.customer.id}/')
+        self.assertEqual(response.status_code, 200, response.data)
+        return response.data
+
+    def test_new_customer_has_zero_stats(self):
+        """Hali xarid qilmagan mijoz — nol qiymatlar (statistika qatori yo'q)."""
+        data = self._stats()
+        self.assertEqual((data['purchase_count'], data['total_spent'], data['last_purchase_on']), (0, '0.00', None))
+
+    def test_sale_cancel_and_return_update_stats(self):
+        """Sotuv → +1/+summa, bekor → qaytadi, qaytarish → summa kamayadi."""
+        first = self._sell(self.customer, quantity=2)
+        self._sell(self.customer, quantity=1)
+        data = self._stats()
+        self.assertEqual((data['purchase_count'], data['total_spent']), (2, '15000.00'))
+        self.assertIsNotNone(data['last_purchase_on'])
+
+        response = self.client.patch(f"/api/v1/sales/{first['id']}/cancel/")
+        self.assertEqual(response.status_code, 200, response.data)
+        data = self._stats()
+        self.assertEqual((data['purchase_count'], data['total_spent']), (1, '5000.00'))
+
+        CustomerStats.record_return(self.customer.id, Decimal('2000'))
+        data = self._stats()
+        self.assertEqual(data['total_spent'], '3000.00')
+
+        # Inkremental qiymatlar to'liq qayta hisoblash bilan mos
+        before = CustomerStats.objects.get(customer=self.customer)
+        CustomerStats.rebuild([self.customer.id])
+        after  = CustomerStats.objects.get(customer=self.customer)
+        self.assertEqual(after.purchase_count, before.purchase_count)
+        self.assertEqual(after.last_purchase_on, before.last_purchase_on)
+
+    def test_list_queries_do_not_grow_with_sales(self):
+        """Ro'yxat so'rovlari soni mijozning sotuvlar soniga bog'liq emas."""
+        self._sell(self.customer)
+        with CaptureQueriesContext(connection) as small:
+            self.client.get('/api/v1/customers/')
+        for _ in range(5):
+            self._sell(self.customer)
+        with CaptureQueriesContext(connection) as large:
+            response = self.client.get('/api/v1/customers/')
+        self.assertEqual(len(small.captured_queries), len(large.captured_queries))
+        self.assertEqual(response.data['results'][0]['purchase_count'], 6)
+
+    def test_customer_sales_endpoint_paginated(self):
+        """GET /customers/{id}/sales/ — sahifalangan, yangi sotuv birinchi."""
+        for _ in range(12):
+            self._sell(self.customer, quantity=1)
+        other = Customer.objects.create(store=self.store, name='Boshqa mijoz')
+        self._sell(other, quantity=1)
+
+        response = self.client.get(f'/api/v1/customers/{self.customer.id}/sales/')
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(response.data['count'], 12)
+        self.assertEqual(len(response.data['results']), 10)
+        latest = Sale.objects.filter(customer=self.customer).order_by('-created_on', '-id').first()
+        self.assertEqual(response.data['results'][0]['customer'], self.customer.id)
+        self.assertIn(latest.id, [row['id'] for row in response.data['results']])
+
+
+# ============================================================
+# 3. NASIYA DAFTARI (CustomerLedgerEntry, CustomerPayment)
+# ============================================================
+
+class CustomerLedgerTest(TradeTestMixin, APITestCase):
+    """Qarzning har bir o'zgarishi daftarda; debt_balance == oxirgi balance."""
+
+    def setUp(self):
+        super().setUp()
+        self._make_sale_context()
+        StoreSettings.objects.filter(store=self.store).update(allow_debt=True)
+        self.customer = Customer.objects.create(store=self.store, name='Nasiyachi', phone='+998901234501')
+
+    def _debt_sale(self, quantity) -> dict:
+        return self._sell(self.customer, quantity=quantity, payment_type='debt', paid=0)
+
+    def _pay(self, amount, expected_status=201):
+        response = self.client.post('/api/v1/customer-payments/', {
+            'customer': self.customer.id, 'amount': str(amount), 'payment_type': 'cash',
+        }, format='json')
+        self.assertEqual(response.status_code, expected_status, response.data)
+        return response.data
+
+    def _assert_balance(self, expected):
+        self.customer.refresh_from_db()
+        last = CustomerLedgerEntry.objects.filter(customer=self.customer).last()
+        self.assertEqual(self.customer.debt_balance, Decimal(expected))
+        self.assertEqual(last.balance, Decimal(expected))
+
+    def test_payment_allocated_fifo(self):
+        """To'lov eng eski nasiya sotuvini birinchi yopadi; running balance to'g'ri."""
+        first  = self._debt_sale(2)   # 10 000
+        second = self._debt_sale(1)   #  5 000
+        self._assert_balance('15000')
+
+        data = self._pay(12000)['data']
+        self.assertEqual(
+            [(row['sale'], row['amount']) for row in data['allocations']],
+            [(first['id'], '10000.00'), (second['id'], '2000.00')],
+        )
+        self.assertEqual(Sale.objects.get(pk=first['id']).debt_open, Decimal('0'))
+        self.assertEqual(Sale.objects.get(pk=second['id']).debt_open, Decimal('3000'))
+        # Berilgan nasiya o'zgarmaydi (hisobot, eksport, chek)
+        self.assertEqual(Sale.objects.get(pk=first['id']).debt_amount, Decimal('10000'))
+        self.assertEqual(Sale.objects.get(pk=second['id']).debt_amount, Decimal('5000'))
+        self._assert_balance('3000')
+
+        types = list(CustomerLedgerEntry.objects.filter(customer=self.customer).values_list('entry_type', flat=True))
+        self.assertEqual(types, [LedgerEntryType.SALE, LedgerEntryType.SALE, LedgerEntryType.PAYMENT])
+
+    def test_overpayment_rejected(self):
+        """Qarzdan ortiq to'lov qabul qilinmaydi."""
+        self._debt_sale(1)
+        self._pay(6000, expected_status=400)
+        self._assert_balance('5000')
+
+    def test_cancel_reverses_only_open_debt(self):
+        """Qisman to'langan sotuv bekor qilinsa — faqat qolgan qarz ayiriladi."""
+        sale = self._debt_sale(2)
+        self._pay(4000)
+        response = self.client.patch(f"/api/v1/sales/{sale['id']}/cancel/")
+        self.assertEqual(response.status_code, 200, response.data)
+        self._assert_balance('0')
+        last = CustomerLedgerEntry.objects.filter(customer=self.customer).last()
+        self.assertEqual((last.entry_type, last.amount), (LedgerEntryType.CANCEL, Decimal('-6000')))
+        sale = Sale.objects.get(pk=sale['id'])
+        self.assertEqual((sale.debt_amount, sale.debt_open), (Decimal('10000'), Decimal('0')))
+
+    def test_return_credited_to_debt(self):
+        """Nasiya sotuvdan qaytarish — summa shu sotuv qarzidan yopiladi."""
+        sale     = self._debt_sale(2)
+        response = self.client.post('/api/v1/sale-returns/', {
+            'sale': sale['id'], 'customer': self.customer.id, 'branch': self.branch.id,
+            'items': [{'product': self.product.id, 'quantity': '1', 'unit_price': '5000'}],
+        }, format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+        return_id = response.data['data']['id']
+        response  = self.client.patch(f'/api/v1/sale-returns/{return_id}/confirm/')
+        self.assertEqual(response.status_code, 200, response.data)
+
+        self._assert_balance('5000')
+        sale = Sale.objects.get(pk=sale['id'])
+        self.assertEqual((sale.debt_amount, sale.debt_open), (Decimal('10000'), Decimal('5000')))
+
+    def test_aging_and_balance_as_of(self):
+        """Aging — bitta so'rov, sotuv sanasi bo'yicha; as_of — shu kundagi qoldiq."""
+        old, mid, new = self._debt_sale(1), self._debt_sale(2), self._debt_sale(3)
+        now = timezone.now()
+        for sale_id, days in ((old['id'], 90), (mid['id'], 45)):
+            moment = now - timedelta(days=days)
+            Sale.objects.filter(pk=sale_id).update(created_on=moment)
+            CustomerLedgerEntry.objects.filter(sale_id=sale_id).update(created_on=moment)
+        self._pay(7000)   # FIFO: eski (5000) to'liq, o'rtadagidan 2000
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/api/v1/customers/debt-aging/')
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(
+            (response.data['days_0_30'], response.data['days_31_60'], response.data['days_60_plus']),
+            (Decimal('15000'), Decimal('8000'), Decimal('0')),
+        )
+        self.assertEqual(response.data['total'], Decimal('23000'))
+        aging_queries = [q for q in ctx.captured_queries if 'trade_customerledgerentry' in q['sql']]
+        self.assertEqual(len(aging_queries), 1)
+
+        as_of = (now - timedelta(days=40)).date().isoformat()
+        response = self.client.get(f'/api/v1/customers/{self.customer.id}/balance/?as_of={as_of}')
+        self.assertEqual(response.data['balance'], Decimal('15000'))
+
+        response = self.client.get(f'/api/v1/customers/{self.customer.id}/ledger/')
+        balances = [row['balance'] for row in response.data['results']]
+        self.assertEqual(balances, ['5000.00', '15000.00', '30000.00', '23000.00'])
+
+    def test_aging_includes_opening_balance(self):
+        """Daftar ochilishidagi qoldiq ('adjustment') aging'da — jami Σ debt_balance ga teng."""
+        self._debt_sale(1)                                    # 5 000, bugun
+        legacy = Customer.objects.create(
+            store=self.store, name='Eski qarzdor', phone='+998901234502', debt_balance=Decimal('4000'),
+        )
+        CustomerLedgerEntry.objects.create(
+            store=self.store, customer=legacy, entry_type=LedgerEntryType.ADJUSTMENT,
+            amount=Decimal('4000'), balance=Decimal('4000'),
+            description="Daftar ochilishidagi qoldiq tuzatishi",
+        )
+        CustomerLedgerEntry.objects.filter(customer=legacy).update(created_on=timezone.now() - timedelta(days=40))
+
+        response = self.client.get('/api/v1/customers/debt-aging/')
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(
+            (response.data['days_0_30'], response.data['days_31_60'], response.data['days_60_plus']),
+            (Decimal('5000'), Decimal('4000'), Decimal('0')),
+        )
+        self.assertEqual(response.data['total'], Decimal('9000'))
+        self.assertEqual(response.data['customers'], 2)
@@ -0,0 +1,92 @@
+"""
+============================================================
+TRADE APP — Yordamchi funksiyalar
+============================================================
+Funksiyalar:
+  allocate_debt_fifo()      — to'lov summasini ochiq nasiya sotuvlariga FIFO taqsimlash
+  credit_return_to_debt()   — tasdiqlangan qaytarishni asl sotuv qarzidan yopish
+
+⚠️ Barcha funksiyalar transaction.atomic ichida chaqirilishi SHART
+   (select_for_update ishlatiladi).
+"""
+
+from decimal import Decimal
+
+from .models import (
+    CustomerLedgerEntry,
+    LedgerEntryType,
+    PaymentType,
+    Sale,
+    SaleStatus,
+)
+
+
+def allocate_debt_fifo(customer_id: int, amount: Decimal) -> list:
+    """
+    To'lov summasini mijozning ochiq nasiya sotuvlariga FIFO bo'yicha taqsimlash
+    (eng eski sotuv birinchi yopiladi). Sale.debt_open kamaytiriladi —
+    debt_amount (berilgan nasiya) o'zgarmaydi.
+
+    Sotuvlar qulflanadi (select_for_update), yangilanish — bitta bulk_update.
+    Qaytaradi: [(sale, yopilgan_summa), ...]. Summa ochiq qarzdan oshsa —
+    ortig'i taqsimlanmaydi (chaqiruvchi tekshiradi).
+    """
+    open_sales = (
+        Sale.objects
+        .select_for_update()
+        .filter(
+            customer_id=customer_id,
+            payment_type=PaymentType.DEBT,
+            status=SaleStatus.COMPLETED,
+            debt_open__gt=0,
+        )
+        .order_by('created_on', 'id')
+        .only('id', 'debt_open', 'created_on')
+    )
+
+    remaining   = amount
+    allocations = []
+    for sale in open_sales:
+        if remaining <= 0:
+            break
+        take            = min(sale.debt_open, remaining)
+        sale.debt_open -= take
+        remaining      -= take
+        allocations.append((sale, take))
+
+    if allocations:
+        Sale.objects.bulk_update([sale for sale, _ in allocations], ['debt_open'])
+    return allocations
+
+
+def credit_return_to_debt(sale_return, worker=None):
+    """
+    Qaytarilgan summa asl sotuvning yopilmagan qarzidan (Sale.debt_open) ayiriladi
+    (nasiya sotuv bo'lsa). Qarzdan oshgan qism — naqd qaytariladi (daftarga kirmaydi).
+    Qaytaradi: daftar yozuvi yoki None.
+    """
+    if not sale_return.sale_id or not sale_return.total_amount:
+        return None
+
+    sale = (
+        Sale.objects
+        .select_for_update()
+        .only('id', 'customer_id', 'status', 'debt_open')
+        .get(pk=sale_return.sale_id)
+    )
+    if not sale.customer_id or sale.status != SaleStatus.COMPLETED or sale.debt_open <= 0:
+        return None
+
+    credit = min(sale_return.total_amount, sale.debt_open)
+    sale.debt_open -= credit
+    sale.save(update_fields=['debt_open'])
+
+    return CustomerLedgerEntry.post(
+        sale.customer_id,
+        LedgerEntryType.RETURN,
+        -credit,
+        sale        = sale,
+        sale_return = sale_return,
+        worker      = worker,
+        description = f"Qaytarish #{sale_return.id} (sotuv #{sale.id})",
+    )
@@ -7,13 +7,14 @@ ViewSet'lar:
   CustomerViewSet      — Mijozlar CRUD (soft delete)
   SaleViewSet          — Sotuvlar (create + cancel, list, retrieve)
   SaleReturnViewSet    — Qaytarishlar (create, confirm, cancel, list, retrieve)
+  CustomerPaymentViewSet — Mijoz qarz to'lovlari (create, list, retrieve)
 
 Sale yaratish (POST /sales/) — @transaction.atomic:
   1. StoreSettings validatsiya (allow_cash/card/debt, allow_discount, shift_enabled)
   2. Branch + customer store validatsiya
   3. StockMovement(OUT) yaratish + Stock yangilash (select_for_update + F())
   4. Sale + SaleItem saqlash
-  5. Customer.debt_balance yangilash (nasiya bo'lsa)
+  5. Customer.debt_balance yangilash (nasiya bo'lsa) + CustomerStats
   6. AuditLog yozish
 
 Sale bekor qilish (PATCH /sales/{id}/cancel/) — @transaction.atomic:
@@ -36,10 +37,11 @@ SaleReturn tasdiqlash (PATCH /sale-returns/{id}/confirm/) — @transaction.atomi
   4. AuditLog yozish
 """
 
+from datetime import timedelta
 from decimal import Decimal
 
 from django.db import transaction
-from django.db.models import F, Q, Sum, Count
+from django.db.models import F, Sum, Count
 from django.utils import timezone
 
 from rest_framework import status, viewsets
@@ -53,6 +55,8 @@ from accaunt.models import AuditLog
 from accaunt.permissions import CanAccess, IsManagerOrAbove
 
 from config.cache_utils import get_store_settings
+from config.query_utils import parse_day_start
+from config.tenant import get_request_tenant
 
 from store.models import Smena, SmenaStatus
 
@@ -62,7 +66,12 @@ from warehouse.utils import fifo_deduct
 from .models import (
     Customer,
     CustomerGroup,
+    CustomerLedgerEntry,
+    CustomerPayment,
+    CustomerPaymentAllocation,
+    CustomerStats,
     CustomerStatus,
+    LedgerEntryType,
     PaymentType,
     Sale,
     SaleItem,
@@ -76,7 +85,9 @@ from .serializers import (
     CustomerDetailSerializer,
     CustomerGroupCreateSerializer,
     CustomerGroupListSerializer,
+    CustomerLedgerEntrySerializer,
     CustomerListSerializer,
+    CustomerPaymentSerializer,
     CustomerUpdateSerializer,
     SaleCreateSerializer,
     SaleDetailSerializer,
@@ -85,6 +96,26 @@ from .serializers import (
     SaleReturnDetailSerializer,
     SaleReturnListSerializer,
 )
+from .utils import allocate_debt_fifo, credit_return_to_debt
+
+
+# ============================================================
+# MIJOZ QIDIRUVI
+# ============================================================
+
+def _search_customers(queryset, q: str):
+    """
+    Mijozlarni ism (search_name) va telefon prefiksi bo'yicha reytingli qidirish.
+    "90 123" → phone LIKE '+99890123%' (prefiks indeksi), ism kirill/lotin farqisiz.
+    """
+    from config.search_utils import phone_search_prefix, ranked_search
+    phone = phone_search_prefix(q)
+    return ranked_search(
+        queryset, q,
+        name_field='search_name',
+        code_field='phone' if phone else None,
+        code_prefix=phone,
+    )
 
 
 # ============================================================
@@ -235,16 +266,28 @@ class CustomerViewSet(AuditMixin, viewsets.ModelViewSet):
     Mijozlar.
 
     Endpointlar:
-      GET    /api/v1/customers/       — ro'yxat (?status, ?group, ?search)
+      GET    /api/v1/customers/       — ro'yxat (?status, ?group, ?search, ?q)
       POST   /api/v1/customers/       — yaratish
       GET    /api/v1/customers/{id}/  — detail
       PATCH  /api/v1/customers/{id}/  — yangilash
       DELETE /api/v1/customers/{id}/  — soft delete (status='inactive')
+      GET    /api/v1/customers/{id}/sales/ — mijozning sotuvlari (sahifalangan)
+      GET    /api/v1/customers/{id}/ledger/  — nasiya daftari (?date_from, ?date_to)
+      GET    /api/v1/customers/{id}/balance/ — sana bo'yicha qoldiq (?as_of=YYYY-MM-DD)
+      GET    /api/v1/customers/debt-aging/   — qarz yoshi: 0-30 / 31-60 / 60+ kun
+
+    Xarid ko'rsatkichlari (purchase_count, total_spent, last_purchase_on):
+      CustomerStats qatoridan (select_related) — sotuvlar yuklanmaydi.
 
     URL filterlar:
       ?status=active|inactive
       ?group=<id>
-      ?search=<ism|telefon>
+      ?search=<ism|telefon>  — sahifalangan ro'yxat, reyting tartibida
+      ?q=<ism|telefon>       — reytingli qidiruv, ?limit= ta (sahifalanmaydi)
+
+    Qidiruv (config/search_utils.py):
+      ism — so'z boshi bo'yicha, kirill/lotin farqisiz ("алишер" == "alisher")
+      telefon — prefiks: "90 123" → '+99890123...'
 
     Multi-tenant: faqat o'z do'konining mijozlari.
     """
@@ -272,8 +315,7 @@ class CustomerViewSet(AuditMixin, viewsets.ModelViewSet):
         qs = (
             Customer.objects
             .filter(store=worker.store)
-            .select_related('group')
-            .prefetch_related('sales')
+            .select_related('group', 'stats')
         )
 
         # ?status=active|inactive
@@ -286,16 +328,125 @@ class CustomerViewSet(AuditMixin, viewsets.ModelViewSet):
         if group_param:
             qs = qs.filter(group_id=group_param)
 
-        # ?search=<text>
-        search_param = self.request.query_params.get('search')
+        # ?search=<text> — indeksli prefiks qidiruv (icontains emas)
+        search_param = (self.request.query_params.get('search') or '').strip()
         if search_param:
-            qs = qs.filter(
-                Q(name__icontains=search_param) |
-                Q(phone__icontains=search_param)
-            )
+            return _search_customers(qs, search_param)
 
         return qs.order_by('status', 'name')
 
+    def list(self, request, *args, **kwargs):
+        """
+        ?q= berilsa — reytingli qidiruv natijalari (?limit= ta, sahifalanmaydi).
+        Javob shakli sahifalangan ro'yxat bilan bir xil (count/next/previous/results).
+        """
+        q = (request.query_params.get('q') or '').strip()
+        if not q:
+            return super().list(request, *args, **kwargs)
+
+        from config.search_utils import get_search_limit
+
+        customers  = _search_customers(self.get_queryset(), q)[:get_search_limit(request)]
+        serializer = self.get_serializer(customers, many=True)
+        return Response({
+            'count':    len(serializer.data),
+            'next':     None,
+            'previous': None,
+            'results':  serializer.data,
+        })
+
+    @action(methods=['get'], detail=True, url_path='sales')
+    def sales(self, request, pk=None):
+        """
+        Mijozning sotuvlar tarixi — sahifalangan (?page=).
+
+        GET /api/v1/customers/{id}/sales/
+        GET /api/v1/customers/{id}/sales/?status=completed|cancelled
+
+        Indeks: (customer, -created_on) — sahifa o'lchamidagi so'rov.
+        """
+        customer = self.get_object()
+        qs = (
+            Sale.objects
+            .filter(customer=customer, store_id=customer.store_id)
+            .select_related('branch', 'worker__user', 'customer')
+            .order_by('-created_on')
+        )
+        status_param = request.query_params.get('status')
+        if status_param in (SaleStatus.COMPLETED, SaleStatus.CANCELLED):
+            qs = qs.filter(status=status_param)
+
+        page = self.paginate_queryset(qs)
+        serializer = SaleListSerializer(page, many=True, context=self.get_serializer_context())
+        return self.get_paginated_response(serializer.data)
+
+    @action(methods=['get'], detail=True, url_path='ledger')
+    def ledger(self, request, pk=None):
+        """
+        Mijozning nasiya daftari — sahifalangan, vaqt bo'yicha (running balance).
+
+        GET /api/v1/customers/{id}/ledger/
+        GET /api/v1/customers/{id}/ledger/?date_from=2026-01-01&date_to=2026-01-31
+
+        Indeks: (customer, created_on).
+        """
+        customer = self.get_object()
+        qs = CustomerLedgerEntry.objects.filter(customer=customer).order_by('created_on', 'id')
+
+        date_from = parse_day_start(request.query_params.get('date_from'), 'date_from')
+        date_to   = parse_day_start(request.query_params.get('date_to'), 'date_to')
+        if date_from:
+            qs = qs.filter(created_on__gte=date_from)
+        if date_to:
+            qs = qs.filter(created_on__lt=date_to + timedelta(days=1))
+
+        page = self.paginate_queryset(qs)
+        serializer = CustomerLedgerEntrySerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @action(methods=['get'], detail=True, url_path='balance')
+    def balance(self, request, pk=None):
+        """
+        Berilgan sana oxiridagi nasiya qoldig'i (daftardagi oxirgi yozuv).
+
+        GET /api/v1/customers/{id}/balance/?as_of=2026-01-31
+        as_of berilmasa — joriy qoldiq (Customer.debt_balance).
+        """
+        customer = self.get_object()
+        as_of    = parse_day_start(request.query_params.get('as_of'), 'as_of')
+        if as_of is None:
+            return Response({'customer': customer.id, 'as_of': None, 'balance': customer.debt_balance})
+
+        moment = as_of + timedelta(days=1) - timedelta(microseconds=1)
+        return Response({
+            'customer': customer.id,
+            'as_of':    as_of.date(),
+            'balance':  CustomerLedgerEntry.balance_as_of(customer.id, moment),
+        })
+
+    @action(methods=['get'], detail=False, url_path='debt-aging')
+    def debt_aging(self, request):
+        """
+        Ochiq nasiya qarzlari yoshi bo'yicha: 0-30, 31-60, 60+ kun.
+
+        GET /api/v1/customers/debt-aging/
+        GET /api/v1/customers/debt-aging/?customer=<id>
+
+        Bitta agregat so'rov (CustomerLedgerEntry.aging).
+        """
+        worker = getattr(request.user, 'worker', None)
+        if not worker or not worker.store:
+            raise PermissionDenied("Do'kon topilmadi.")
+
+        customer_id = request.query_params.get('customer')
+        if customer_id is not None and not customer_id.isdigit():
+            raise ValidationError({'customer': "Mijoz ID butun son bo'lishi kerak."})
+
+        return Response(CustomerLedgerEntry.aging(
+            worker.store_id,
+            customer_id=int(customer_id) if customer_id else None,
+        ))
+
     def perform_create(self, serializer):
         worker = self.request.user.worker
 
@@ -464,7 +615,7 @@ class SaleViewSet(AuditMixin, viewsets.ModelViewSet):
         serializer.is_valid(raise_exception=True)
         data     = serializer.validated_data
         worker   = request.user.worker
-        settings = get_store_settings(worker.store_id)   # QOIDA 3
+        settings = get_request_tenant(request).settings   # QOIDA 3
 
         branch          = data['branch']
         customer        = data.get('customer')
@@ -727,6 +878,7 @@ class SaleViewSet(AuditMixin, viewsets.ModelViewSet):
             cash_amount     = cash_amount,
             card_amount     = card_amount,
             debt_amount     = debt_amount,
+            debt_open       = debt_amount,
             status          = SaleStatus.COMPLETED,
             description     = description,
         )
@@ -783,10 +935,19 @@ class SaleViewSet(AuditMixin, viewsets.ModelViewSet):
         # 12. Customer.debt_balance yangilash
         # --------------------------------------------------
         if customer and debt_amount > 0:
-            Customer.objects.filter(pk=customer.pk).update(
-                debt_balance=F('debt_balance') + debt_amount,
+            CustomerLedgerEntry.post(
+                customer.pk,
+                LedgerEntryType.SALE,
+                debt_amount,
+                sale        = sale,
+                worker      = worker,
+                description = f"Nasiya sotuv #{sale.id}",
+                created_on  = sale.created_on,
             )
 
+        # 12b. CustomerStats — xaridlar soni / summasi / oxirgi xarid
+        CustomerStats.record_sale(sale)
+
         # --------------------------------------------------
         # 13. AuditLog
         # --------------------------------------------------
@@ -905,16 +1066,26 @@ class SaleViewSet(AuditMixin, viewsets.ModelViewSet):
         # --------------------------------------------------
         # Customer.debt_balance qaytarish (agar nasiya bo'lsa)
         # --------------------------------------------------
-        if sale.customer and sale.debt_amount > 0:
-            Customer.objects.filter(pk=sale.customer_id).update(
-                debt_balance=F('debt_balance') - sale.debt_amount,
+        # debt_open — to'lovlardan keyin qolgan (yopilmagan) qarz
+        if sale.customer and sale.debt_open > 0:
+            CustomerLedgerEntry.post(
+                sale.customer_id,
+                LedgerEntryType.CANCEL,
+                -sale.debt_open,
+                sale        = sale,
+                worker      = worker,
+                description = f"Sotuv #{sale.id} bekor qilindi",
             )
 
         # --------------------------------------------------
         # Bekor qilish
         # --------------------------------------------------
-        sale.status = SaleStatus.CANCELLED
-        sale.save(update_fields=['status'])
+        sale.status    = SaleStatus.CANCELLED
+        sale.debt_open = Decimal('0')
+        sale.save(update_fields=['status', 'debt_open'])
+
+        # CustomerStats — bekor qilingan sotuv ko'rsatkichlardan ayiriladi
+        CustomerStats.record_cancel(sale)
 
         self._audit_log(
             AuditLog.Action.UPDATE,
@@ -1001,7 +1172,7 @@ class SaleReturnViewSet(AuditMixin, viewsets.ModelViewSet):
         Holat: pending. Tasdiqlash uchun /confirm/ kerak.
         """
         worker   = request.user.worker
-        settings = get_store_settings(worker.store_id)
+        settings = get_request_tenant(request).settings
 
         # StoreSettings: qaytarish yoqilganligini tekshirish
         if not settings.sale_return_enabled:
@@ -1097,7 +1268,8 @@ class SaleReturnViewSet(AuditMixin, viewsets.ModelViewSet):
           1. Faqat 'pending' qaytarish tasdiqlanadi
           2. Har bir element uchun StockMovement(IN) + Stock yangilash
           3. SaleReturn.status = 'confirmed'
-          4. AuditLog
+          4. Nasiya sotuv bo'lsa — qarzdan yopish (CustomerLedgerEntry 'return')
+          5. AuditLog
         """
         sale_return = self.get_object()
         worker      = request.user.worker
@@ -1144,6 +1316,15 @@ class SaleReturnViewSet(AuditMixin, viewsets.ModelViewSet):
         sale_return.status = SaleReturnStatus.CONFIRMED
         sale_return.save(update_fields=['status'])
 
+        # Asl sotuv nasiya bo'lsa — qaytarilgan summa qarzdan yopiladi
+        credit_return_to_debt(sale_return, worker=worker)
+
+        # CustomerStats — qaytarilgan summa (mijoz qaytarishda yoki asl sotuvda)
+        CustomerStats.record_return(
+            sale_return.customer_id or (sale_return.sale.customer_id if sale_return.sale else None),
+            sale_return.total_amount,
+        )
+
         self._audit_log(
             AuditLog.Action.UPDATE,
             sale_return,
@@ -1214,3 +1395,111 @@ class SaleReturnViewSet(AuditMixin, viewsets.ModelViewSet):
             },
             status=status.HTTP_200_OK,
         )
+
+
+# ============================================================
+# MIJOZ QARZ TO'LOVLARI VIEWSET
+# ============================================================
+
+class CustomerPaymentViewSet(AuditMixin, viewsets.ModelViewSet):
+    """
+    Mijozning nasiya qarzi bo'yicha to'lovlari.
+
+    Endpointlar:
+      GET  /api/v1/customer-payments/       — ro'yxat (?customer=, ?smena=)
+      POST /api/v1/customer-payments/       — to'lov qabul qilish
+      GET  /api/v1/customer-payments/{id}/  — detail (FIFO taqsimot bilan)
+
+    Immutable: UPDATE va DELETE yo'q.
+    To'lov ochiq nasiya sotuvlariga FIFO bo'yicha taqsimlanadi (eng eski birinchi),
+    Customer.debt_balance daftar orqali (CustomerLedgerEntry 'payment') kamayadi.
+    """
+    http_method_names = ['get', 'post']
+
+    def get_permissions(self):
+        return [IsAuthenticated(), CanAccess('sotuv')]
+
+    def get_serializer_class(self):
+        return CustomerPaymentSerializer
+
+    def get_queryset(self):
+        worker = getattr(self.request.user, 'worker', None)
+        if not worker or not worker.store:
+            return CustomerPayment.objects.none()
+        qs = (
+            CustomerPayment.objects
+            .filter(store=worker.store)
+            .select_related('customer', 'worker__user', 'smena')
+            .prefetch_related('allocations__sale')
+        )
+        customer_id = self.request.query_params.get('customer')
+        if customer_id:
+            qs = qs.filter(customer_id=customer_id)
+        smena_id = self.request.query_params.get('smena')
+        if smena_id:
+            qs = qs.filter(smena_id=smena_id)
+        return qs
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        worker  = getattr(self.request.user, 'worker', None)
+        if worker:
+            context['store'] = worker.store
+        return context
+
+    @transaction.atomic
+    def perform_create(self, serializer):
+        worker   = self.request.user.worker
+        customer = (
+            Customer.objects
+            .select_for_update()
+            .get(pk=serializer.validated_data['customer'].pk)
+        )
+        amount = serializer.validated_data['amount']
+        if customer.debt_balance <= 0:
+            raise ValidationError({'customer': "Mijozning nasiya qarzi yo'q."})
+        if amount > customer.debt_balance:
+            raise ValidationError({
+                'amount': (
+                    f"To'lov summasi qarzdan oshib ketdi. "
+                    f"Joriy qarz: {customer.debt_balance:.2f}"
+                )
+            })
+
+        instance = serializer.save(store=worker.store, worker=worker)
+
+        # FIFO taqsimot: eng eski ochiq nasiya sotuvidan boshlab yopiladi
+        allocations = allocate_debt_fifo(customer.pk, amount)
+        CustomerPaymentAllocation.objects.bulk_create([
+            CustomerPaymentAllocation(payment=instance, sale=sale, amount=part)
+            for sale, part in allocations
+        ])
+
+        CustomerLedgerEntry.post(
+            customer.pk,
+            LedgerEntryType.PAYMENT,
+            -amount,
+            payment     = instance,
+            worker      = worker,
+            description = f"Qarz to'lovi #{instance.id} ({instance.get_payment_type_display()})",
+        )
+        self._audit_log(
+            AuditLog.Action.CREATE, instance,
+            f"Qarz to'lovi: '{customer.name}' — {amount} ({instance.get_payment_type_display()}), "
+            f"{len(allocations)} ta sotuv yopildi",
+        )
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        self.perform_create(serializer)
+        return Response(
+            {
+                'message': "To'lov muvaffaqiyatli qabul qilindi.",
+                'data': CustomerPaymentSerializer(
+                    serializer.instance,
+                    context=self.get_serializer_context(),
+                ).data,
+            },
+            status=status.HTTP_201_CREATED,
+        )
@@ -12,6 +12,7 @@ from .models import (
     StockMovement,
     SubCategory,
     Supplier,
+    SupplierLedgerEntry,
     SupplierPayment,
     Transfer,
     TransferItem,
@@ -202,3 +203,17 @@ class SupplierPaymentAdmin(admin.ModelAdmin):
         'supplier', 'amount', 'payment_type',
         'description', 'smena', 'worker', 'created_on',
     )
+
+
+@admin.register(SupplierLedgerEntry)
+class SupplierLedgerEntryAdmin(admin.ModelAdmin):
+    """
+    Yetkazib beruvchi daftari — faqat ko'rish (running balance, ochiq qism).
+    """
+    list_display    = ('id', 'supplier', 'entry_type', 'amount', 'balance', 'open_amount', 'created_on')
+    list_filter     = ('entry_type', 'store')
+    search_fields   = ('supplier__name',)
+    readonly_fields = (
+        'store', 'supplier', 'entry_type', 'amount', 'balance', 'open_amount',
+        'movement', 'payment', 'description', 'created_on',
+    )
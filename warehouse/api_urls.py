@@ -27,6 +27,8 @@ Router avtomatik quyidagi URL'larni yaratadi:
   GET    /api/v1/warehouse/exchange-rates/{id}/  — kurs tafsilotlari
 
   GET    /api/v1/warehouse/products/             — mahsulotlar ro'yxati (?category=&subcategory=&status=)
+  GET    /api/v1/warehouse/products/?q=cola      — reytingli qidiruv (nom/barcode, ?limit=)
+  GET    /api/v1/warehouse/products/autocomplete/?q= — kassa autocomplete (xotiradagi prefiks indeksi)
   POST   /api/v1/warehouse/products/             — mahsulot yaratish (barcode auto-generate)
   GET    /api/v1/warehouse/products/{id}/        — mahsulot tafsilotlari
   PATCH  /api/v1/warehouse/products/{id}/        — mahsulot yangilash
@@ -78,9 +80,12 @@ Router avtomatik quyidagi URL'larni yaratadi:
   GET    /api/v1/warehouse/suppliers/{id}/       — tafsilotlar
   PATCH  /api/v1/warehouse/suppliers/{id}/       — yangilash (manager+)
   DELETE /api/v1/warehouse/suppliers/{id}/       — nofaol qilish (manager+, soft delete)
+  GET    /api/v1/warehouse/suppliers/{id}/ledger/  — daftar: kirim/to'lov, running balance (?date_from, ?date_to, ?open=1)
+  GET    /api/v1/warehouse/suppliers/{id}/balance/ — sana oxiridagi qarz (?as_of=YYYY-MM-DD)
+  GET    /api/v1/warehouse/suppliers/aging/      — kreditorlik qarzi yoshi 0-30/31-60/61-90/90+ (bitta so'rov)
 
   GET    /api/v1/warehouse/supplier-payments/    — to'lovlar ro'yxati (?supplier=, ?smena=)
-  POST   /api/v1/warehouse/supplier-payments/    — to'lov yaratish (manager+, debt_balance avtomatik)
+  POST   /api/v1/warehouse/supplier-payments/    — to'lov yaratish (manager+, daftar + debt_balance avtomatik, FIFO)
 
   GET    /api/v1/warehouse/promotions/              — aksiyalar ro'yxati (?is_active=true/false)
   POST   /api/v1/warehouse/promotions/              — aksiya yaratish (manager+)
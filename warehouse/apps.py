@@ -2,7 +2,15 @@ from django.apps import AppConfig
 
 
 class WarehouseConfig(AppConfig):
-    """Mahsulot, kategoriya va yetkazib beruvchi ilovasi konfiguratsiyasi"""
+    """
+    Mahsulot, kategoriya va yetkazib beruvchi ilovasi konfiguratsiyasi.
+
+    ready() — signals.py ni import qilib signallarni ulaydi.
+    """
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'warehouse'
     verbose_name = 'Ombor'
+
+    def ready(self) -> None:
+        """Signal'larni ulash — Django ilovasi tayyor bo'lgandan keyin."""
+        import warehouse.signals  # noqa: F401
@@ -0,0 +1,321 @@
+"""
+============================================================
+WAREHOUSE APP — Yorliq (QR / EAN-13) render servisi
+============================================================
+Klasslar / funksiyalar:
+  LabelSpec                 — (kod, tur, format, o'lcham): render kaliti va ETag manbai
+  label_spec(code, ...)     — so'rov parametrlaridan tekshirilgan LabelSpec (ValueError)
+  get_label(spec)           — bitta rasm: kesh → render → kesh
+  render_many(specs)        — ko'p rasm: kesh (get_many) + qolganlari process pool da,
+                              (spec, bytes) tayyor bo'lish tartibida qaytadi
+  stream_zip(entries)       — (fayl nomi, bytes) oqimi → ZIP baytlari bo'laklab
+                              (butun arxiv xotirada yig'ilmaydi)
+  render_sticker_sheet(...) — narx yorlig'i varag'i (A4, N ta / sahifa, copies) → PDF bytes
+
+Kesh:
+  Django cache (production — Redis). Kalit = ETag = sha1(versiya, tur, format,
+  o'lcham, kod) — bir xil yorliq hech qachon qayta chizilmaydi, render o'zgarsa
+  _RENDER_VERSION oshiriladi. Viewlar ETag / If-None-Match → 304 qaytaradi.
+
+Process pool:
+  Rasm chizish (qrcode / python-barcode + Pillow) — sof CPU ish, GIL tufayli
+  threadlar tezlatmaydi. Keshda yo'q rasmlar soni LABEL_POOL_MIN_BATCH dan
+  ko'p bo'lsa — LABEL_RENDER_WORKERS ta jarayonda chiziladi (spawn: worker
+  jarayon DB ulanishlarini meros qilmaydi). Pool birinchi ishlatilganda yaratiladi.
+  _render funksiyasi Django ga tegmaydi — spawn qilingan jarayonda ham ishlaydi.
+"""
+
+import atexit
+import hashlib
+import io
+import multiprocessing
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.cache import cache
+
+from config.metrics import record_cache
+
+QR    = 'qr'
+EAN13 = 'ean13'
+PNG   = 'png'
+SVG   = 'svg'
+
+# Render natijasi o'zgarsa oshiriladi — eski kesh/ETag lar o'z-o'zidan eskiradi
+_RENDER_VERSION = 1
+
+# tur → (min, max, standart) o'lcham: QR — modul piksellari (box_size), EAN-13 — dpi
+_SIZE_LIMITS = {
+    QR:    (2, 20, 10),
+    EAN13: (72, 600, 300),
+}
+
+# A4 stiker varaqlari: N ta / sahifa → (ustunlar, qatorlar)
+SHEET_LAYOUTS = {
+    12: (3, 4),
+    24: (3, 8),
+    40: (4, 10),
+    65: (5, 13),
+}
+
+
+@dataclass(frozen=True)
+class LabelSpec:
+    code: str
+    kind: str = QR
+    fmt:  str = PNG
+    size: int = 10
+
+    @property
+    def etag(self) -> str:
+        raw = f"{_RENDER_VERSION}|{self.kind}|{self.fmt}|{self.size}|{self.code}"
+        return hashlib.sha1(raw.encode()).hexdigest()
+
+    @property
+    def cache_key(self) -> str:
+        return f'label_{self.etag}'
+
+    @property
+    def content_type(self) -> str:
+        return 'image/svg+xml' if self.fmt == SVG else 'image/png'
+
+
+def label_spec(code: str, kind: str = QR, fmt: str = PNG, size=None) -> LabelSpec:
+    """So'rov parametrlari → LabelSpec. Noto'g'ri format/o'lcham — ValueError."""
+    fmt = (fmt or PNG).lower()
+    if fmt not in (PNG, SVG):
+        raise ValueError("format 'png' yoki 'svg' bo'lishi kerak.")
+    if kind == QR and fmt == SVG:
+        raise ValueError("QR kod faqat PNG formatida.")
+
+    low, high, default = _SIZE_LIMITS[kind]
+    try:
+        size = int(size) if size not in (None, '') else default
+    except (TypeError, ValueError):
+        raise ValueError("size butun son bo'lishi kerak.")
+    if not low <= size <= high:
+        raise ValueError(f"size {low}..{high} oralig'ida bo'lishi kerak.")
+    return LabelSpec(code=code, kind=kind, fmt=fmt, size=size)
+
+
+# ============================================================
+# RENDER (sof funksiya — process pool da ishlaydi)
+# ============================================================
+
+def _render(spec: LabelSpec) -> bytes:
+    output = io.BytesIO()
+    if spec.kind == QR:
+        import qrcode
+
+        qr = qrcode.QRCode(box_size=spec.size, border=4)
+        qr.add_data(spec.code)
+        qr.make(fit=True)
+        qr.make_image().save(output, format='PNG')
+        return output.getvalue()
+
+    import barcode as barcode_lib
+    from barcode.writer import ImageWriter, SVGWriter
+
+    # EAN-13: 12 ta raqam berish kerak (check digit auto qo'shiladi)
+    code_12 = spec.code[:12] if len(spec.code) == 13 else spec.code
+    try:
+        if spec.fmt == SVG:
+            barcode_lib.get('ean13', code_12, writer=SVGWriter()).write(output)
+        else:
+            barcode_lib.get('ean13', code_12, writer=ImageWriter()).write(output, options={
+                'write_text':    True,
+                'font_size':     10,
+                'text_distance': 5,
+                'quiet_zone':    6,
+                'dpi':           spec.size,
+            })
+    except Exception as e:
+        raise ValueError(f"Barcode {spec.fmt.upper()} generatsiya xatosi: {e}")
+    return output.getvalue()
+
+
+_POOL = None
+
+
+def _pool() -> ProcessPoolExecutor:
+    global _POOL
+    if _POOL is None:
+        _POOL = ProcessPoolExecutor(
+            max_workers=settings.LABEL_RENDER_WORKERS,
+            mp_context=multiprocessing.get_context('spawn'),
+        )
+        atexit.register(_POOL.shutdown, cancel_futures=True)
+    return _POOL
+
+
+# ============================================================
+# KESHLI API
+# ============================================================
+
+def get_label(spec: LabelSpec) -> bytes:
+    """Bitta yorliq: keshda bo'lsa — o'sha, aks holda chizib keshga yozadi."""
+    content = cache.get(spec.cache_key)
+    record_cache('labels', content is not None)
+    if content is None:
+        content = _render(spec)
+        cache.set(spec.cache_key, content, timeout=settings.LABEL_CACHE_TTL)
+    return content
+
+
+def render_many(specs):
+    """
+    Ko'p yorliq → (spec, bytes) generatori, tayyor bo'lish tartibida.
+    Keshdagilar darhol (bitta get_many), qolganlari — pool da (yoki kam bo'lsa joyida).
+    Takrorlangan spec bir marta chiziladi va bir marta qaytadi.
+    """
+    specs  = list(dict.fromkeys(specs))
+    cached = cache.get_many([spec.cache_key for spec in specs])
+    record_cache('labels', True, len(cached))
+    record_cache('labels', False, len(specs) - len(cached))
+    for spec in specs:
+        if spec.cache_key in cached:
+            yield spec, cached[spec.cache_key]
+
+    missing = [spec for spec in specs if spec.cache_key not in cached]
+    if not missing:
+        return
+
+    ttl = settings.LABEL_CACHE_TTL
+    if settings.LABEL_RENDER_WORKERS < 2 or len(missing) < settings.LABEL_POOL_MIN_BATCH:
+        for spec in missing:
+            content = _render(spec)
+            cache.set(spec.cache_key, content, timeout=ttl)
+            yield spec, content
+        return
+
+    futures = {_pool().submit(_render, spec): spec for spec in missing}
+    try:
+        for future in as_completed(futures):
+            spec    = futures[future]
+            content = future.result()
+            cache.set(spec.cache_key, content, timeout=ttl)
+            yield spec, content
+    finally:
+        for future in futures:
+            future.cancel()   # mijoz uzilsa — navbatdagilar chizilmaydi
+
+
+# ============================================================
+# OQIMLI ZIP
+# ============================================================
+
+class _ZipSink(io.RawIOBase):
+    """ZipFile yozadigan baytlarni yig'ib, har fayldan keyin bo'shatiladi (seek qilinmaydi)."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def stream_zip(entries):
+    """
+    (fayl nomi, bytes) iteratori → ZIP bo'laklari (StreamingHttpResponse uchun).
+    PNG allaqachon siqilgan — ZIP_STORED (qayta siqish CPU ni behuda sarflaydi).
+    """
+    sink = _ZipSink()
+    with zipfile.ZipFile(sink, 'w', zipfile.ZIP_STORED) as zf:
+        for name, content in entries:
+            zf.writestr(name, content)
+            yield sink.drain()
+    yield sink.drain()
+
+
+# ============================================================
+# PDF STIKER VARAG'I
+# ============================================================
+
+def _format_price(value) -> str:
+    return f"{value:,.0f}".replace(',', ' ') if value is not None else ''
+
+
+def render_sticker_sheet(products, copies: int = 1, per_page: int = 24, kind: str = QR) -> bytes:
+    """
+    Narx yorliqlari varag'i (A4). Har mahsulot copies marta, per_page ta / sahifa.
+    Har stiker bir marta chiziladi (PDF form XObject), nusxalar unga havola —
+    fayl hajmi va vaqt nusxalar soniga deyarli bog'liq emas.
+    products: name, sale_price, barcode, pk atributli obyektlar.
+    """
+    from reportlab.graphics import renderPDF
+    from reportlab.graphics.barcode import createBarcodeDrawing
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.units import mm
+    from reportlab.lib.utils import simpleSplit
+    from reportlab.pdfgen import canvas as pdf_canvas
+
+    from export.utils import pdf as pdf_utils
+
+    pdf_utils._try_register_font()
+    font = pdf_utils._FONT_NAME
+
+    columns, rows = SHEET_LAYOUTS[per_page]
+    page_w, page_h = A4
+    margin  = 8 * mm
+    cell_w  = (page_w - 2 * margin) / columns
+    cell_h  = (page_h - 2 * margin) / rows
+    pad     = 2 * mm
+
+    buffer = io.BytesIO()
+    c      = pdf_canvas.Canvas(buffer, pagesize=A4, pageCompression=1)
+    c.setTitle('Yorliqlar')
+
+    forms = []
+    for product in products:
+        name    = f'sticker_{product.pk}'
+        code    = product.barcode or str(product.pk)
+        c.beginForm(name, 0, 0, cell_w, cell_h)
+        c.setStrokeGray(0.8)
+        c.rect(0, 0, cell_w, cell_h)
+
+        text_size = max(5, min(9, cell_h / mm * 0.35))
+        c.setFont(font, text_size)
+        c.setFillGray(0)
+        lines = simpleSplit(product.name, font, text_size, cell_w - 2 * pad)[:2]
+        for i, line in enumerate(lines):
+            c.drawString(pad, cell_h - pad - text_size * (i + 1), line)
+        c.setFont(font, text_size + 3)
+        c.drawRightString(cell_w - pad, pad, _format_price(product.sale_price))
+
+        code_h  = cell_h - 2 * pad - text_size * 2.5 - (text_size + 3)
+        if kind == EAN13 and len(code) in (12, 13) and code.isdigit():
+            drawing = createBarcodeDrawing('EAN13', value=code[:12], barHeight=code_h * 0.75)
+        else:
+            drawing = createBarcodeDrawing('QR', value=code, width=code_h, height=code_h)
+        scale = min(1, (cell_w - 2 * pad) / drawing.width)
+        drawing.scale(scale, scale)
+        renderPDF.draw(drawing, c, pad, pad + text_size + 3)
+        c.endForm()
+        forms.append(name)
+
+    slot = 0
+    for name in forms:
+        for _ in range(copies):
+            if slot and slot % per_page == 0:
+                c.showPage()
+            col, row = slot % columns, (slot % per_page) // columns
+            c.saveState()
+            c.translate(margin + col * cell_w, page_h - margin - (row + 1) * cell_h)
+            c.doForm(name)
+            c.restoreState()
+            slot += 1
+
+    c.showPage()
+    c.save()
+    return buffer.getvalue()
@@ -0,0 +1,136 @@
+"""
+============================================================
+WAREHOUSE — Mahsulot qidiruvi benchmarki
+============================================================
+Vaqtinchalik do'konda N ta (default 100 000) mahsulot yaratadi va
+quyidagilarni o'lchaydi (p50 / p95 / maks, millisekund):
+
+  icontains    — eski usul: name ILIKE '%q%' (sequential scan)
+  ranked       — search_products(): search_name/barcode prefiks + trigram (PG)
+  prefix_index — PrefixIndex (xotirada, DB siz) + indeks qurish vaqti
+
+Ishlatish:
+  python manage.py benchmark_product_search
+  python manage.py benchmark_product_search --products 100000 --repeat 20
+  python manage.py benchmark_product_search --keep   # ma'lumotni o'chirmaslik
+
+⚠️ Trigram/prefiks indekslari faqat PostgreSQL da — SQLite natijalari
+   faqat taqqoslash uchun (indekssiz).
+"""
+
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from config.search_utils import PrefixIndex, normalize_search_text
+
+
+# Mahsulot nomlari generatori uchun so'zlar (lotin + kirill aralash)
+_WORDS = [
+    'coca', 'cola', 'pepsi', 'fanta', 'sprite', 'choy', 'qahva', 'shakar',
+    'un', 'guruch', 'yog', 'sut', 'qatiq', 'non', 'tuxum', 'kolbasa',
+    'pishloq', 'sovun', 'shampun', 'tish', 'pasta', 'salfetka', 'konfet',
+    'shokolad', 'pechenye', 'sharbat', 'suv', 'makaron', 'tuz', 'murch',
+    'чой', 'шакар', 'сут', 'нон', 'ўзбекистон', 'гуруч', 'қатиқ', 'ёғ',
+]
+_SIZES = ['0.5L', '1L', '1.5L', '2L', '100g', '250g', '500g', '1kg', '5kg']
+
+# O'lchanadigan so'rovlar: qisqa prefiks, so'z o'rtasi, kirill, barcode bo'lagi
+_QUERIES = ['co', 'cola', 'choy 1', 'чой', 'ozbek', 'shok', 'pishloq 500', '200001', '2000012']
+
+
+def _percentiles(samples: list) -> str:
+    samples = sorted(samples)
+    p95     = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+    return (
+        f"p50={statistics.median(samples) * 1000:7.2f}ms  "
+        f"p95={p95 * 1000:7.2f}ms  "
+        f"max={samples[-1] * 1000:7.2f}ms"
+    )
+
+
+class Command(BaseCommand):
+    help = "Mahsulot qidiruvi benchmarki (icontains vs ranked vs xotiradagi prefiks indeksi)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--products', type=int, default=100_000, help="Mahsulotlar soni")
+        parser.add_argument('--repeat',   type=int, default=20,      help="Har bir so'rov takrorlanishi")
+        parser.add_argument('--limit',    type=int, default=20,      help="Natijalar soni (LIMIT)")
+        parser.add_argument('--seed',     type=int, default=42,      help="Tasodifiy generator urug'i")
+        parser.add_argument('--keep', action='store_true', help="Benchmark do'konini o'chirmaslik")
+
+    def handle(self, *args, **options):
+        from store.models import Store
+        from warehouse.models import Product
+        from warehouse.utils import search_products
+
+        rng   = random.Random(options['seed'])
+        count = options['products']
+        limit = options['limit']
+
+        self.stdout.write(f"DB: {connection.vendor} | mahsulotlar: {count:,} | takror: {options['repeat']}")
+
+        store = Store.objects.create(name='Benchmark: mahsulot qidiruvi')
+        try:
+            # ── 1. Katalog yaratish (bulk_create — save() chaqirilmaydi) ──
+            started = time.perf_counter()
+            batch   = []
+            with transaction.atomic():
+                for i in range(count):
+                    name = ' '.join(rng.sample(_WORDS, 3)) + f" {rng.choice(_SIZES)} #{i}"
+                    batch.append(Product(
+                        store       = store,
+                        name        = name,
+                        search_name = normalize_search_text(name),
+                        barcode     = f"2{store.id % 100000:05d}{i:06d}",
+                        sale_price  = rng.randint(1, 500) * 1000,
+                    ))
+                    if len(batch) >= 5000:
+                        Product.objects.bulk_create(batch)
+                        batch = []
+                if batch:
+                    Product.objects.bulk_create(batch)
+            if connection.vendor == 'postgresql':
+                with connection.cursor() as cursor:
+                    cursor.execute('ANALYZE warehouse_product;')
+            self.stdout.write(f"Katalog yaratildi: {time.perf_counter() - started:.1f}s")
+
+            base_qs = Product.objects.filter(store=store)
+
+            # ── 2. DB so'rovlari ──────────────────────────────────
+            for label, build in (
+                ('icontains', lambda q: base_qs.filter(name__icontains=q).order_by('name')),
+                ('ranked',    lambda q: search_products(base_qs, q)),
+            ):
+                self.stdout.write(self.style.MIGRATE_HEADING(f"\n{label}"))
+                for q in _QUERIES:
+                    samples = []
+                    for _ in range(options['repeat']):
+                        t0 = time.perf_counter()
+                        list(build(q).values_list('id', flat=True)[:limit])
+                        samples.append(time.perf_counter() - t0)
+                    self.stdout.write(f"  {q!r:16} {_percentiles(samples)}")
+
+            # ── 3. Xotiradagi prefiks indeksi ─────────────────────
+            self.stdout.write(self.style.MIGRATE_HEADING('\nprefix_index'))
+            t0    = time.perf_counter()
+            rows  = base_qs.values_list('id', 'name', 'search_name', 'barcode').iterator(chunk_size=5000)
+            index = PrefixIndex(
+                (obj_id, search_name, barcode, {'id': obj_id, 'name': name})
+                for obj_id, name, search_name, barcode in rows
+            )
+            self.stdout.write(f"  indeks qurildi: {len(index):,} ta, {time.perf_counter() - t0:.2f}s")
+            for q in _QUERIES:
+                samples = []
+                for _ in range(options['repeat']):
+                    t0 = time.perf_counter()
+                    index.search(q, limit=limit)
+                    samples.append(time.perf_counter() - t0)
+                self.stdout.write(f"  {q!r:16} {_percentiles(samples)}")
+        finally:
+            if not options['keep']:
+                store.delete()
+                self.stdout.write("\nBenchmark do'koni o'chirildi.")
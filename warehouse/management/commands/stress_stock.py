@@ -0,0 +1,121 @@
+"""
+============================================================
+WAREHOUSE — Qoldiq izchilligi stress testi (config/stress.py)
+============================================================
+Vaqtinchalik test bazasida sintetik do'kon quradi, N ta ishchi bir vaqtda bir xil
+issiq SKU lar ustida sotuv / qaytarish / transfer / kirim / hisobdan chiqarish
+bajaradi. O'lchaydi: o'tkazuvchanlik, latency, FOR UPDATE vaqti, qulf kutish,
+deadlock / lock_timeout soni. Oxirida: Stock == harakatlar daftari == ochiq
+partiyalar va muvaffaqiyatli amallar soni == bazadagi yozuvlar.
+
+Ishlatish:
+  python manage.py stress_stock --workers 16 --duration 60 --output stress.json
+  python manage.py stress_stock --mode process --workers 32 --lock-timeout 2000
+  python manage.py stress_stock --mix sale=80,transfer=20 --hot 5 --basket 10
+  python manage.py stress_stock --baseline stress-before.json --output stress-after.json
+
+Invariant buzilsa — xato kodi bilan tugaydi. --baseline — faqat farqlar jadvali
+(o'tkazuvchanlik muhitga bog'liq, chegara yo'q).
+
+⚠️ Lokal PostgreSQL da ishga tushiring (SQLite da faqat --workers 1).
+   Test bazasini yaratish huquqi kerak (CREATEDB) — ish bazasiga tegilmaydi.
+"""
+
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+
+class Command(BaseCommand):
+    help = "Parallel kassirlar yuklamasi: qulf kutish, deadlock va qoldiq invariantlari."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers',  type=int,   default=8,    help="Parallel ishchilar soni")
+        parser.add_argument('--duration', type=float, default=30.0, help="Yuklama davomiyligi (soniya)")
+        parser.add_argument('--ops',      type=int,   default=None, help="Ishchi boshiga amallar chegarasi")
+        parser.add_argument('--mode',     choices=('thread', 'process'), default='thread',
+                            help="thread — bitta jarayon (GIL), process — fork")
+        parser.add_argument('--lock-timeout', type=int, default=0, help="PostgreSQL lock_timeout, ms (0 — cheksiz)")
+        parser.add_argument('--mix',      default=None, help="Amallar ulushi: sale=60,return=8,...")
+        parser.add_argument('--hot',      type=int, default=None, help="Issiq SKU lar soni")
+        parser.add_argument('--basket',   type=int, default=None, help="Savat / transferdagi ko'pi bilan SKU")
+        parser.add_argument('--seed',     type=int, default=42,   help="Sintetik ma'lumot va amallar urug'i")
+        parser.add_argument('--output',   default=None, help="Hisobot JSON fayli")
+        parser.add_argument('--baseline', default=None, help="Oldingi hisobot — farqlar jadvali")
+        parser.add_argument('--keepdb',   action='store_true', help="Test bazasini qayta ishlatish (sxema)")
+
+    def handle(self, *args, **options):
+        from config.benchmark import benchmark_database, load_report, write_report
+        from config.stress import BASKET, HOT_SKUS, StressError, StressHarness, compare_runs, parse_mix
+
+        if options['workers'] < 1:
+            raise CommandError("--workers kamida 1.")
+        if options['workers'] > 1 and connection.vendor != 'postgresql':
+            raise CommandError(f"{connection.vendor}: parallel yuklama faqat PostgreSQL da (--workers 1).")
+        try:
+            mix = parse_mix(options['mix']) if options['mix'] else None
+        except ValueError as exc:
+            raise CommandError(str(exc))
+        baseline = None
+        if options['baseline']:
+            if not os.path.exists(options['baseline']):
+                raise CommandError(f"Baseline topilmadi: {options['baseline']}")
+            baseline = load_report(options['baseline'])
+
+        harness = StressHarness(
+            seed   = options['seed'],
+            mix    = mix,
+            hot    = options['hot'] or HOT_SKUS,
+            basket = options['basket'] or BASKET,
+            log    = self.stdout.write,
+        )
+        with benchmark_database(keepdb=options['keepdb']):
+            self.stdout.write(f"DB: {connection.vendor} | {options['workers']} ishchi ({options['mode']})")
+            try:
+                harness.prepare()
+                report = harness.run(
+                    workers      = options['workers'],
+                    duration     = options['duration'],
+                    ops          = options['ops'],
+                    mode         = options['mode'],
+                    lock_timeout = options['lock_timeout'],
+                )
+            except StressError as exc:
+                raise CommandError(str(exc))
+
+        self._print(report)
+        if options['output']:
+            write_report(report, options['output'])
+            self.stdout.write(f"Hisobot: {options['output']}")
+        if baseline:
+            self.stdout.write("\nBaseline bilan farq:")
+            for metric, before, after in compare_runs(report, baseline):
+                self.stdout.write(f"  {metric:32} {before!s:>12} → {after!s:<12}")
+
+        if report['invariants']:
+            for problem in report['invariants'][:50]:
+                self.stdout.write(self.style.ERROR(f"  {problem}"))
+            raise CommandError(f"Qoldiq izchilligi buzildi: {len(report['invariants'])} ta nomuvofiqlik.")
+        self.stdout.write(self.style.SUCCESS("Invariantlar: Stock == harakatlar == partiyalar, amallar soni mos."))
+
+    def _print(self, report: dict) -> None:
+        self.stdout.write(
+            f"\n{'amal':10} {'ok':>7} {'rad':>6} {'deadlk':>6} {'timeout':>7} {'xato':>5} "
+            f"{'amal/s':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'qulf p95':>9}"
+        )
+        rows = list(report['operations'].items()) + [('JAMI', report['totals'])]
+        for name, op in rows:
+            self.stdout.write(
+                f"{name:10} {op['ok']:>7} {op['rejected']:>6} {op['deadlock']:>6} {op['lock_timeout']:>7} "
+                f"{op['error']:>5} {op['throughput_ops']:>8} {op.get('p50_ms', '-'):>8} "
+                f"{op.get('p95_ms', '-'):>8} {op.get('p99_ms', '-'):>8} {op.get('lock_ms_p95', '-'):>9}"
+            )
+        totals = report['totals']
+        if 'lock_wait_s' in totals:
+            self.stdout.write(
+                f"Qulf kutish: {totals['lock_wait_s']} backend-s, ko'pi bilan {totals['max_lock_waiters']} "
+                f"bir vaqtda | server deadlocklari: {totals.get('server_deadlocks')}"
+            )
+        for note in report['notes']:
+            self.stdout.write(self.style.WARNING(f"  {note}"))
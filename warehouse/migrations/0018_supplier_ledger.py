@@ -0,0 +1,111 @@
+# Generated by Django 5.2.11 on 2026-10-19 02:59
+
+import django.db.models.deletion
+import django.utils.timezone
+from collections import deque
+from decimal import Decimal
+
+from django.db import migrations, models
+
+
+def fill_supplier_ledger(apps, schema_editor):
+    """
+    Mavjud kirimlar (IN, supplier, unit_cost) va to'lovlardan daftar yozuvlari:
+    vaqt bo'yicha running balance, to'lovlar ochiq kirimlarni FIFO yopadi.
+    Supplier.debt_balance bilan farq bo'lsa — bitta 'adjustment' yozuvi.
+    """
+    Supplier            = apps.get_model('warehouse', 'Supplier')
+    StockMovement       = apps.get_model('warehouse', 'StockMovement')
+    SupplierPayment     = apps.get_model('warehouse', 'SupplierPayment')
+    SupplierLedgerEntry = apps.get_model('warehouse', 'SupplierLedgerEntry')
+
+    events = {}
+    for mv in (
+        StockMovement.objects
+        .filter(movement_type='in', supplier__isnull=False, unit_cost__isnull=False)
+        .values('id', 'supplier_id', 'quantity', 'unit_cost', 'created_on')
+        .iterator(chunk_size=2000)
+    ):
+        events.setdefault(mv['supplier_id'], []).append(
+            (mv['created_on'], 'receipt', mv['quantity'] * mv['unit_cost'], {'movement_id': mv['id']}, f"Kirim #{mv['id']}")
+        )
+    for pay in SupplierPayment.objects.values('id', 'supplier_id', 'amount', 'created_on').iterator(chunk_size=2000):
+        events.setdefault(pay['supplier_id'], []).append(
+            (pay['created_on'], 'payment', -pay['amount'], {'payment_id': pay['id']}, f"To'lov #{pay['id']}")
+        )
+
+    for supplier in Supplier.objects.values('id', 'store_id', 'debt_balance').iterator(chunk_size=2000):
+        rows    = sorted(events.get(supplier['id'], []), key=lambda e: e[0])
+        balance = Decimal('0')
+        entries = []
+        opened  = deque()   # ochiq musbat yozuvlar (FIFO)
+
+        def add(created_on, entry_type, amount, refs, description):
+            nonlocal balance
+            balance += amount
+            entry = SupplierLedgerEntry(
+                store_id    = supplier['store_id'],
+                supplier_id = supplier['id'],
+                entry_type  = entry_type,
+                amount      = amount,
+                balance     = balance,
+                description = description,
+                created_on  = created_on,
+                **refs,
+            )
+            if amount > 0:
+                entry.open_amount = min(amount, max(balance, Decimal('0')))
+                if entry.open_amount:
+                    opened.append(entry)
+            else:
+                rest = -amount
+                while rest > 0 and opened:
+                    take                   = min(opened[0].open_amount, rest)
+                    opened[0].open_amount -= take
+                    rest                  -= take
+                    if not opened[0].open_amount:
+                        opened.popleft()
+            entries.append(entry)
+
+        for created_on, entry_type, amount, refs, description in rows:
+            add(created_on, entry_type, amount, refs, description)
+        if supplier['debt_balance'] != balance:
+            add(
+                django.utils.timezone.now(), 'adjustment', supplier['debt_balance'] - balance, {},
+                "Daftar ochilishidagi qoldiq tuzatishi",
+            )
+        SupplierLedgerEntry.objects.bulk_create(entries, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('store', '0008_rename_note_to_description'),
+        ('warehouse', '0017_product_search_name'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SupplierLedgerEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('entry_type', models.CharField(choices=[('receipt', 'Kirim (tovar qabul qilindi)'), ('payment', "To'lov"), ('adjustment', 'Tuzatish')], max_length=12, verbose_name='Yozuv turi')),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=20, verbose_name="Summa (+ qarz, − to'lov)")),
+                ('balance', models.DecimalField(decimal_places=2, max_digits=20, verbose_name='Yozuvdan keyingi qoldiq')),
+                ('open_amount', models.DecimalField(decimal_places=2, default=0, max_digits=20, verbose_name="To'lanmagan qism")),
+                ('description', models.CharField(blank=True, max_length=255, verbose_name='Izoh')),
+                ('created_on', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Yaratilgan vaqti')),
+                ('movement', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='supplier_ledger_entries', to='warehouse.stockmovement', verbose_name='Kirim harakati')),
+                ('payment', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='ledger_entries', to='warehouse.supplierpayment', verbose_name="To'lov")),
+                ('store', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='supplier_ledger', to='store.store', verbose_name="Do'koni")),
+                ('supplier', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ledger_entries', to='warehouse.supplier', verbose_name='Yetkazib beruvchi')),
+            ],
+            options={
+                'verbose_name': 'Yetkazib beruvchi daftari yozuvi',
+                'verbose_name_plural': 'Yetkazib beruvchi daftari',
+                'ordering': ['created_on', 'id'],
+                'indexes': [models.Index(fields=['supplier', 'created_on'], name='sup_ledger_supplier_idx'), models.Index(condition=models.Q(('open_amount__gt', 0)), fields=['store', 'created_on'], name='sup_ledger_open_idx')],
+            },
+        ),
+        migrations.RunPython(fill_supplier_ledger, migrations.RunPython.noop),
+    ]
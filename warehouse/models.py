@@ -26,6 +26,7 @@ Modellar:
   StockAuditItem       — Inventarizatsiya satri (expected_qty vs actual_qty)
   Supplier             — Yetkazib beruvchi (B13, qarz balansi, soft delete)
   SupplierPayment      — Yetkazib beruvchiga to'lov tarixi (B13, immutable)
+  SupplierLedgerEntry  — Yetkazib beruvchi daftari (running balance, FIFO ochiq kirimlar, aging)
   Promotion            — Aksiya/chegirma (muddatli, kategoriya yoki mahsulot bo'yicha)
 
 Muhim farq:
@@ -49,6 +50,7 @@ FIFO (StockBatch):
 
 from django.db import models
 from django.db.models import Q, CheckConstraint, UniqueConstraint
+from django.utils import timezone
 
 from store.models import Branch, Store
 
@@ -301,6 +303,7 @@ class Product(models.Model):
 
     Shtrix-kod:
       - do'kon ichida unikal (null=True — bir nechta null ruxsat)
+      - PostgreSQL da (store_id, barcode varchar_pattern_ops) prefiks indeksi
       - avtomatik generatsiya: EAN-13, prefix 2XXXXX (GS1 in-store)
       - ProductViewSet.perform_create da barcode yo'q bo'lsa auto-generate
 
@@ -312,6 +315,14 @@ class Product(models.Model):
         max_length=300,
         verbose_name="Nomi"
     )
+    # Qidiruv uchun normallashtirilgan nom (kirill→lotin, kichik harf) — save() to'ldiradi
+    search_name    = models.CharField(
+        max_length=300,
+        blank=True,
+        default='',
+        editable=False,
+        verbose_name="Qidiruv nomi"
+    )
     category       = models.ForeignKey(
         Category,
         on_delete=models.SET_NULL,
@@ -392,6 +403,15 @@ class Product(models.Model):
     def __str__(self) -> str:
         return f"{self.name} ({self.get_unit_display()})"
 
+    def save(self, *args, **kwargs):
+        """search_name har doim name dan hosil qilinadi (config/search_utils.py)."""
+        from config.search_utils import normalize_search_text
+        self.search_name = normalize_search_text(self.name)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'name' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'search_name'}
+        super().save(*args, **kwargs)
+
 
 # ============================================================
 # OMBOR (ANBAR) — Alohida saqlash joyi
@@ -1149,9 +1169,11 @@ class Supplier(models.Model):
     Har bir yetkazib beruvchi bitta do'konga tegishli (multi-tenant).
     Soft delete — o'chirish o'rniga status='inactive' ga o'tkaziladi.
 
-    debt_balance — qancha qarz qolganligi (kirim + SupplierPayment orqali boshqariladi):
+    debt_balance — qancha qarz qolganligi; SupplierLedgerEntry daftarining keshi
+                   (faqat SupplierLedgerEntry.post() orqali o'zgaradi):
       StockMovement(IN, supplier=X) yaratilganda → debt_balance += quantity * unit_cost
       SupplierPayment yaratilganda               → debt_balance -= amount
+      Tekshiruv: SupplierLedgerEntry.verify_balances() / verify_supplier_ledger buyrug'i
 
     unique_together: bir do'konda bir xil nomli yetkazib beruvchi bo'lmaydi.
     """
@@ -1219,7 +1241,7 @@ class SupplierPayment(models.Model):
     Yetkazib beruvchiga to'lov tarixi.
 
     ⚠️ Immutable — yaratilgandan keyin o'zgartirib yoki o'chirib bo'lmaydi.
-    ⚠️ Yaratilganda AVTOMATIK Supplier.debt_balance kamayadi.
+    ⚠️ Yaratilganda AVTOMATIK Supplier.debt_balance kamayadi (SupplierLedgerEntry 'payment').
 
     Xatolik tuzatish: yangi teskari to'lov (debet yozuvi) yarating.
     """
@@ -1277,6 +1299,288 @@ class SupplierPayment(models.Model):
         )
 
 
+class SupplierLedgerEntryType(models.TextChoices):
+    RECEIPT    = 'receipt',    'Kirim (tovar qabul qilindi)'
+    PAYMENT    = 'payment',    "To'lov"
+    ADJUSTMENT = 'adjustment', 'Tuzatish'
+
+
+class SupplierLedgerEntry(models.Model):
+    """
+    Yetkazib beruvchi bilan hisob-kitob daftari (kreditorlik qarzi).
+
+    amount      — ishorali: + qarz oshdi (kirim), − kamaydi (to'lov).
+    balance     — yozuvdan KEYINGI qoldiq (running balance).
+    open_amount — musbat yozuvning hali to'lanmagan qismi. To'lovlar eng eski
+                  ochiq yozuvdan boshlab yopadi (FIFO) — "qaysi kirim uchun
+                  qancha qarz, qancha vaqtdan beri" shu maydondan.
+                  Invariant: SUM(open_amount) == max(balance, 0).
+
+    Supplier.debt_balance — daftarning keshlangan proyeksiyasi (oxirgi balance).
+    Faqat post() orqali o'zgaradi; verify_balances() farqlarni topadi.
+
+    Yozuv manbalari:
+      StockMovement(IN, supplier, unit_cost) → receipt (+quantity × unit_cost)
+      SupplierPayment                        → payment (−amount)
+    ⚠️ Immutable (open_amount dan tashqari) — xato 'adjustment' bilan tuzatiladi.
+    """
+    store       = models.ForeignKey(
+        Store,
+        on_delete=models.CASCADE,
+        related_name='supplier_ledger',
+        verbose_name="Do'koni"
+    )
+    supplier    = models.ForeignKey(
+        Supplier,
+        on_delete=models.CASCADE,
+        related_name='ledger_entries',
+        verbose_name="Yetkazib beruvchi"
+    )
+    entry_type  = models.CharField(
+        max_length=12,
+        choices=SupplierLedgerEntryType.choices,
+        verbose_name="Yozuv turi"
+    )
+    amount      = models.DecimalField(
+        max_digits=20,
+        decimal_places=2,
+        verbose_name="Summa (+ qarz, − to'lov)"
+    )
+    balance     = models.DecimalField(
+        max_digits=20,
+        decimal_places=2,
+        verbose_name="Yozuvdan keyingi qoldiq"
+    )
+    open_amount = models.DecimalField(
+        max_digits=20,
+        decimal_places=2,
+        default=0,
+        verbose_name="To'lanmagan qism"
+    )
+    movement    = models.ForeignKey(
+        StockMovement,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='supplier_ledger_entries',
+        verbose_name="Kirim harakati"
+    )
+    payment     = models.ForeignKey(
+        SupplierPayment,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='ledger_entries',
+        verbose_name="To'lov"
+    )
+    description = models.CharField(
+        max_length=255,
+        blank=True,
+        verbose_name="Izoh"
+    )
+    created_on  = models.DateTimeField(
+        default=timezone.now,
+        verbose_name="Yaratilgan vaqti"
+    )
+
+    class Meta:
+        verbose_name        = "Yetkazib beruvchi daftari yozuvi"
+        verbose_name_plural = "Yetkazib beruvchi daftari"
+        ordering            = ['created_on', 'id']
+        indexes             = [
+            models.Index(fields=['supplier', 'created_on'], name='sup_ledger_supplier_idx'),
+            models.Index(
+                fields=['store', 'created_on'],
+                name='sup_ledger_open_idx',
+                condition=Q(open_amount__gt=0),
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.get_entry_type_display()}: {self.amount:+} → {self.balance}"
+
+    @classmethod
+    def post(cls, supplier_id: int, entry_type: str, amount, **refs) -> 'SupplierLedgerEntry':
+        """
+        Yozuv qo'shish + Supplier.debt_balance yangilash + FIFO yopish.
+        ⚠️ Faqat transaction.atomic ichida — Supplier qatori qulflanadi.
+        refs: movement, payment, description, created_on.
+        """
+        from decimal import Decimal
+
+        supplier = (
+            Supplier.objects
+            .select_for_update()
+            .only('id', 'store_id', 'debt_balance')
+            .get(pk=supplier_id)
+        )
+        balance = supplier.debt_balance + amount
+        Supplier.objects.filter(pk=supplier_id).update(debt_balance=balance)
+
+        if amount > 0:
+            # Oldindan to'lov (manfiy qoldiq) bo'lsa — kirimning shu qismi yopiq
+            open_amount = min(amount, max(balance, Decimal('0')))
+        else:
+            open_amount = Decimal('0')
+            cls._settle_fifo(supplier_id, -amount)
+
+        return cls.objects.create(
+            store_id    = supplier.store_id,
+            supplier_id = supplier_id,
+            entry_type  = entry_type,
+            amount      = amount,
+            balance     = balance,
+            open_amount = open_amount,
+            **refs,
+        )
+
+    @classmethod
+    def post_many(cls, supplier_id: int, entry_type: str, entries: list) -> list:
+        """
+        Bir yetkazib beruvchiga bir nechta qarz yozuvi — guruhlangan post().
+        entries: [(amount, refs), ...] — amount >= 0 (kirimlar), refs — post() dagi kabi.
+        Supplier bir marta qulflanadi, qoldiq xotirada yuritiladi, debt_balance
+        bitta UPDATE, yozuvlar bitta bulk_create.
+        ⚠️ Faqat transaction.atomic ichida.
+        """
+        from decimal import Decimal
+
+        if any(amount < 0 for amount, _ in entries):
+            raise ValueError("post_many faqat musbat (qarz oshiruvchi) yozuvlar uchun.")
+
+        supplier = (
+            Supplier.objects
+            .select_for_update()
+            .only('id', 'store_id', 'debt_balance')
+            .get(pk=supplier_id)
+        )
+        balance = supplier.debt_balance
+        objs    = []
+        for amount, refs in entries:
+            balance += amount
+            objs.append(cls(
+                store_id    = supplier.store_id,
+                supplier_id = supplier_id,
+                entry_type  = entry_type,
+                amount      = amount,
+                balance     = balance,
+                open_amount = min(amount, max(balance, Decimal('0'))),
+                **refs,
+            ))
+        Supplier.objects.filter(pk=supplier_id).update(debt_balance=balance)
+        return cls.objects.bulk_create(objs)
+
+    @classmethod
+    def _settle_fifo(cls, supplier_id: int, amount) -> None:
+        """To'lov summasini eng eski ochiq yozuvlardan boshlab yopish (bitta bulk_update)."""
+        changed = []
+        for entry in (
+            cls.objects
+            .select_for_update()
+            .filter(supplier_id=supplier_id, open_amount__gt=0)
+            .order_by('created_on', 'id')
+            .only('id', 'open_amount')
+        ):
+            if amount <= 0:
+                break
+            take               = min(entry.open_amount, amount)
+            entry.open_amount -= take
+            amount            -= take
+            changed.append(entry)
+        if changed:
+            cls.objects.bulk_update(changed, ['open_amount'])
+
+    @classmethod
+    def balance_as_of(cls, supplier_id: int, moment):
+        """moment vaqtidagi qoldiq — oxirgi yozuvning balance (indeksli bitta qator)."""
+        from decimal import Decimal
+        last = (
+            cls.objects
+            .filter(supplier_id=supplier_id, created_on__lte=moment)
+            .order_by('-created_on', '-id')
+            .values_list('balance', flat=True)
+            .first()
+        )
+        return last if last is not None else Decimal('0')
+
+    @classmethod
+    def aging(cls, store_id: int, now=None) -> list:
+        """
+        Ochiq kirimlar yoshi, yetkazib beruvchi bo'yicha — bitta guruhlangan so'rov.
+        Buckets: 0-30, 31-60, 61-90, 90+ kun (kirim sanasidan).
+        """
+        from datetime import timedelta
+        from decimal import Decimal
+        from django.db.models import Min, Sum
+
+        now  = now or timezone.now()
+        d30  = now - timedelta(days=30)
+        d60  = now - timedelta(days=60)
+        d90  = now - timedelta(days=90)
+        zero = Decimal('0')
+
+        rows = (
+            cls.objects
+            .filter(store_id=store_id, open_amount__gt=0)
+            .values('supplier_id', 'supplier__name', 'supplier__company')
+            .annotate(
+                days_0_30    = Sum('open_amount', filter=Q(created_on__gte=d30)),
+                days_31_60   = Sum('open_amount', filter=Q(created_on__lt=d30, created_on__gte=d60)),
+                days_61_90   = Sum('open_amount', filter=Q(created_on__lt=d60, created_on__gte=d90)),
+                days_90_plus = Sum('open_amount', filter=Q(created_on__lt=d90)),
+                total        = Sum('open_amount'),
+                oldest       = Min('created_on'),
+            )
+            .order_by('-total')
+        )
+        return [
+            {
+                'supplier_id':  row['supplier_id'],
+                'name':         row['supplier__name'],
+                'company':      row['supplier__company'],
+                'days_0_30':    row['days_0_30'] or zero,
+                'days_31_60':   row['days_31_60'] or zero,
+                'days_61_90':   row['days_61_90'] or zero,
+                'days_90_plus': row['days_90_plus'] or zero,
+                'total':        row['total'] or zero,
+                'oldest_open':  row['oldest'],
+            }
+            for row in rows
+        ]
+
+    @classmethod
+    def verify_balances(cls, store_id=None) -> list:
+        """
+        Supplier.debt_balance (kesh) == SUM(daftar amount) tekshiruvi — bitta so'rov.
+        Qaytaradi: [{'supplier_id', 'cached', 'ledger'}, ...] — faqat farqlilar.
+        """
+        from decimal import Decimal
+        from django.db.models import DecimalField, OuterRef, Subquery, Sum, Value
+        from django.db.models.functions import Coalesce
+
+        ledger_sum = (
+            cls.objects
+            .filter(supplier_id=OuterRef('pk'))
+            .order_by()
+            .values('supplier_id')
+            .annotate(s=Sum('amount'))
+            .values('s')
+        )
+        qs = Supplier.objects.all()
+        if store_id is not None:
+            qs = qs.filter(store_id=store_id)
+        money = DecimalField(max_digits=20, decimal_places=2)
+        rows  = (
+            qs.annotate(ledger=Coalesce(Subquery(ledger_sum, output_field=money), Value(Decimal('0')), output_field=money))
+            .exclude(debt_balance=models.F('ledger'))
+            .values('id', 'debt_balance', 'ledger')
+        )
+        return [
+            {'supplier_id': row['id'], 'cached': row['debt_balance'], 'ledger': row['ledger']}
+            for row in rows
+        ]
+
+
 # ============================================================
 # AKSIYA / CHEGIRMA (PROMOTION)
 # ============================================================
@@ -1393,3 +1697,76 @@ class Promotion(models.Model):
             .order_by('-discount_pct')
             .first()
         )
+
+    @classmethod
+    def get_active_map(cls, products, store_id) -> dict:
+        """
+        Mahsulotlar ro'yxati uchun aktiv aksiyalarni bitta to'plamda qaytaradi.
+
+        get_active_for_product() ning batch varianti — ro'yxat endpointida
+        har bir qator uchun alohida so'rov yubormaslik uchun.
+        So'rovlar soni sahifa hajmiga bog'liq emas (maks. 4 ta):
+          1. Do'konning hozir aktiv aksiyalari
+          2-4. products / categories / subcategories bog'lanishlari
+
+        Qaytaradi: {product_id: Promotion} — aksiyasi yo'q mahsulotlar kiritilmaydi.
+        """
+        from collections import defaultdict
+        from django.utils import timezone
+
+        products = list(products)
+        if not products:
+            return {}
+
+        now    = timezone.now()
+        promos = {
+            promo.id: promo
+            for promo in cls.objects.filter(
+                store_id=store_id,
+                is_active=True,
+                valid_from__lte=now,
+                valid_to__gte=now,
+            )
+        }
+        if not promos:
+            return {}
+
+        product_ids     = {p.id for p in products}
+        category_ids    = {p.category_id for p in products if p.category_id is not None}
+        subcategory_ids = {p.subcategory_id for p in products if p.subcategory_id is not None}
+
+        by_product     = defaultdict(list)
+        by_category    = defaultdict(list)
+        by_subcategory = defaultdict(list)
+
+        links = cls.products.through.objects.filter(
+            promotion_id__in=promos, product_id__in=product_ids,
+        ).values_list('product_id', 'promotion_id')
+        for target_id, promo_id in links:
+            by_product[target_id].append(promos[promo_id])
+
+        if category_ids:
+            links = cls.categories.through.objects.filter(
+                promotion_id__in=promos, category_id__in=category_ids,
+            ).values_list('category_id', 'promotion_id')
+            for target_id, promo_id in links:
+                by_category[target_id].append(promos[promo_id])
+
+        if subcategory_ids:
+            links = cls.subcategories.through.objects.filter(
+                promotion_id__in=promos, subcategory_id__in=subcategory_ids,
+            ).values_list('subcategory_id', 'promotion_id')
+            for target_id, promo_id in links:
+                by_subcategory[target_id].append(promos[promo_id])
+
+        result = {}
+        for product in products:
+            candidates = (
+                by_product.get(product.id, [])
+                + by_category.get(product.category_id, [])
+                + by_subcategory.get(product.subcategory_id, [])
+            )
+            if candidates:
+                # Bir nechta aksiya — eng katta chegirma (get_active_for_product bilan bir xil)
+                result[product.id] = max(candidates, key=lambda promo: promo.discount_pct)
+        return result
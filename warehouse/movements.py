@@ -0,0 +1,293 @@
+"""
+============================================================
+WAREHOUSE APP — Bulk harakat dvigateli
+============================================================
+Funksiyalar:
+  apply_movements(lines, store, worker, partial, check_only) — ko'p qatorli
+      kirim/chiqimni bitta o'tishda qayd etish: StockMovement + Stock +
+      StockBatch (FIFO) + AVCO (Product.purchase_price) + SupplierLedgerEntry.
+      check_only=True — faqat qoldiq tekshiruvi (import dry-run), hech narsa yozilmaydi
+
+Nima uchun:
+  Qatorma-qator _apply_movement har bir harakat uchun ~8 so'rov qiladi
+  (get_or_create, UPDATE, partiya kodi, INSERT, AVCO aggregate, supplier lock ...).
+  5000 qatorli yetkazib berish — 40 000 so'rov. Dvigatel so'rovlar sonini
+  qatorlarga emas, jadvallarga bog'laydi:
+
+    1. Qatorlar (joy, mahsulot) bo'yicha barqaror tartiblanadi — bir joy/mahsulot
+       ichidagi fayl tartibi saqlanadi, qulflar doim bir xil tartibda olinadi
+       (parallel importlar o'zaro deadlock qilmaydi)
+    2. Stock qatorlari bitta SELECT ... FOR UPDATE bilan qulflanadi
+       (yo'qlari bitta bulk_create bilan yaratiladi)
+    3. Qoldiq xotirada yuritiladi — chiqim uchun yetarlilik tekshiriladi
+    4. Chiqim uchun ochiq partiyalar bitta so'rovda qulflanadi, FIFO xotirada
+       (shu paketdagi kirim partiyalari ham navbatga qo'shiladi)
+    5. Yozish: movements / batches — bulk_create, partiyalar qoldig'i va
+       Stock — bulk_update, AVCO — bitta guruhlangan aggregate,
+       yetkazib beruvchi qarzi — har bir supplier uchun bitta post_many()
+
+⚠️ transaction.atomic ichida chaqirilishi SHART (select_for_update).
+"""
+
+import functools
+import operator
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from decimal import Decimal
+
+from django.db.models import F, Q, Sum
+from django.utils import timezone
+
+from .models import (
+    MovementType,
+    Product,
+    Stock,
+    StockBatch,
+    StockMovement,
+    SupplierLedgerEntry,
+    SupplierLedgerEntryType,
+)
+from .utils import allocate_batch_codes
+
+MOVEMENT_CHUNK_SIZE = 1000
+
+
+@dataclass
+class MovementLine:
+    """Bitta kirim/chiqim qatori. ref — xato xabari uchun (qator raqami / item indeksi)."""
+    product:       Product
+    movement_type: str
+    quantity:      Decimal
+    branch:        object = None
+    warehouse:     object = None
+    unit_cost:     Decimal | None = None
+    supplier:      object = None
+    description:   str = ''
+    ref:           object = None
+
+    @property
+    def stock_key(self) -> tuple:
+        return (self.product.id, self.branch.id if self.branch else None, self.warehouse.id if self.warehouse else None)
+
+    @property
+    def location_name(self) -> str:
+        return self.branch.name if self.branch else self.warehouse.name
+
+
+@dataclass
+class MovementResult:
+    movements: list = field(default_factory=list)   # yaratilgan StockMovement lar (tartiblangan)
+    shortages: list = field(default_factory=list)   # [(MovementLine, xabar), ...]
+
+
+def _sort_key(line: MovementLine) -> tuple:
+    product_id, branch_id, warehouse_id = line.stock_key
+    return (branch_id is None, branch_id or warehouse_id, product_id)
+
+
+def _location_q(keys) -> Q:
+    """{(product_id, branch_id, warehouse_id)} → joy bo'yicha guruhlangan OR filtri."""
+    by_location = defaultdict(set)
+    for product_id, branch_id, warehouse_id in keys:
+        by_location[(branch_id, warehouse_id)].add(product_id)
+    return functools.reduce(operator.or_, (
+        Q(branch_id=branch_id, warehouse_id__isnull=True, product_id__in=product_ids)
+        if branch_id else
+        Q(branch_id__isnull=True, warehouse_id=warehouse_id, product_id__in=product_ids)
+        for (branch_id, warehouse_id), product_ids in by_location.items()
+    ))
+
+
+def _stock_key(obj) -> tuple:
+    return (obj.product_id, obj.branch_id, obj.warehouse_id)
+
+
+def _lock_stocks(keys: set, create: bool = True) -> dict:
+    """
+    Stock qatorlarini qulflash (id tartibida); yo'qlarini bitta bulk_create bilan yaratish.
+    create=False — qulfsiz o'qish, yo'q qatorlar xotirada 0 qoldiq bilan (tekshiruv uchun).
+    """
+    def locked(key_set):
+        qs = Stock.objects.filter(_location_q(key_set)).order_by('id')
+        if create:
+            qs = qs.select_for_update()
+        return {_stock_key(s): s for s in qs}
+
+    stocks  = locked(keys)
+    missing = keys - stocks.keys()
+    if missing and not create:
+        stocks.update({(p, b, w): Stock(product_id=p, branch_id=b, warehouse_id=w, quantity=0) for p, b, w in missing})
+    elif missing:
+        Stock.objects.bulk_create(
+            [Stock(product_id=p, branch_id=b, warehouse_id=w, quantity=0) for p, b, w in missing],
+            ignore_conflicts=True,   # parallel so'rov shu lahzada yaratgan bo'lishi mumkin
+        )
+        stocks.update(locked(missing))
+    return stocks
+
+
+def _lock_open_batches(keys: set) -> dict:
+    """Chiqim bo'ladigan joy/mahsulotlarning ochiq partiyalari — FIFO navbatlar."""
+    queues = defaultdict(deque)
+    if keys:
+        qs = (
+            StockBatch.objects
+            .select_for_update()
+            .filter(_location_q(keys), qty_left__gt=0)
+            .order_by('received_at', 'id')   # FIFO: eng eski birinchi
+            .only('id', 'product_id', 'branch_id', 'warehouse_id', 'unit_cost', 'qty_left')
+        )
+        for batch in qs:
+            queues[_stock_key(batch)].append(batch)
+    return queues
+
+
+def apply_movements(lines: list, store, worker=None, partial: bool = False, check_only: bool = False) -> MovementResult:
+    """
+    Harakatlarni bulk qayd etish. Qaytaradi: MovementResult.
+
+    partial=False — birorta chiqimga qoldiq yetmasa hech narsa yozilmaydi
+                    (result.shortages to'ldiriladi, movements bo'sh).
+    partial=True  — qoldig'i yetmagan qatorlar shortages ga tushadi, qolganlari yoziladi.
+    check_only    — faqat 1-qadam (qoldiq tekshiruvi): shortages qaytadi, yozuv yo'q.
+
+    Semantika _apply_movement bilan bir xil:
+      IN  — Stock += qty; unit_cost (va store) bo'lsa partiya + AVCO; supplier bo'lsa qarz
+      OUT — Stock -= qty; FIFO partiyalardan yechiladi, unit_cost = o'rtacha tannarx
+    """
+    result = MovementResult()
+    if not lines:
+        return result
+
+    ordered = sorted(lines, key=_sort_key)
+    stocks  = _lock_stocks({line.stock_key for line in ordered}, create=not check_only)
+
+    # ── 1. Qoldiq tekshiruvi (xotirada) ───────────────────────
+    running  = {key: stock.quantity for key, stock in stocks.items()}
+    accepted = []
+    for line in ordered:
+        key = line.stock_key
+        if line.movement_type == MovementType.OUT:
+            if running[key] < line.quantity:
+                result.shortages.append((line, (
+                    f"'{line.product.name}' qoldig'i yetarli emas ({line.location_name}): "
+                    f"mavjud {running[key]}, so'ralgan {line.quantity}."
+                )))
+                continue
+            running[key] -= line.quantity
+        else:
+            running[key] += line.quantity
+        accepted.append(line)
+
+    if check_only or (result.shortages and not partial) or not accepted:
+        return result
+
+    # ── 2. FIFO va yangi partiyalar (xotirada) ────────────────
+    queues  = _lock_open_batches({line.stock_key for line in accepted if line.movement_type == MovementType.OUT})
+    # Partiya kodi do'kon bo'yicha — store siz (superuser) partiya ochilmaydi (_apply_movement kabi)
+    costed  = [line for line in accepted if line.movement_type == MovementType.IN and line.unit_cost is not None]
+    codes   = iter(allocate_batch_codes(store, len(costed)) if costed and store else ())
+    now     = timezone.now()
+
+    movements     = []
+    new_batches   = []
+    touched       = {}              # pk → mavjud partiya (qty_left o'zgargan)
+    ledger        = defaultdict(list)
+    avco_products = set()
+
+    for line in accepted:
+        movement = StockMovement(
+            product       = line.product,
+            branch        = line.branch,
+            warehouse     = line.warehouse,
+            movement_type = line.movement_type,
+            quantity      = line.quantity,
+            unit_cost     = line.unit_cost,
+            description   = line.description,
+            supplier      = line.supplier,
+            worker        = worker,
+        )
+        movements.append(movement)
+
+        if line.movement_type == MovementType.IN:
+            if line.unit_cost is not None and store:
+                batch = StockBatch(
+                    batch_code   = next(codes),
+                    product      = line.product,
+                    branch       = line.branch,
+                    warehouse    = line.warehouse,
+                    unit_cost    = line.unit_cost,
+                    qty_received = line.quantity,
+                    qty_left     = line.quantity,
+                    movement     = movement,
+                    store        = store,
+                )
+                new_batches.append(batch)
+                queues[line.stock_key].append(batch)
+                avco_products.add(line.product.id)
+            if line.supplier and line.unit_cost is not None:
+                ledger[line.supplier.id].append(movement)
+            continue
+
+        # OUT — FIFO yechish
+        queue      = queues[line.stock_key]
+        remaining  = line.quantity
+        total_cost = Decimal('0')
+        while remaining > 0 and queue:
+            batch           = queue[0]
+            use             = min(batch.qty_left, remaining)
+            batch.qty_left -= use
+            total_cost     += use * batch.unit_cost
+            remaining      -= use
+            if batch.pk:
+                touched[batch.pk] = batch
+            if batch.qty_left <= 0:
+                queue.popleft()
+        if line.quantity > 0:
+            movement.unit_cost = total_cost / line.quantity
+
+    # ── 3. Yozish ─────────────────────────────────────────────
+    StockMovement.objects.bulk_create(movements, batch_size=MOVEMENT_CHUNK_SIZE)
+    if new_batches:
+        StockBatch.objects.bulk_create(new_batches, batch_size=MOVEMENT_CHUNK_SIZE)
+    if touched:
+        StockBatch.objects.bulk_update(touched.values(), ['qty_left'], batch_size=MOVEMENT_CHUNK_SIZE)
+
+    changed = []
+    for key, stock in stocks.items():
+        if running[key] != stock.quantity:
+            stock.quantity   = running[key]
+            stock.updated_on = now
+            changed.append(stock)
+    Stock.objects.bulk_update(changed, ['quantity', 'updated_on'], batch_size=MOVEMENT_CHUNK_SIZE)
+
+    # AVCO — yangi partiyali mahsulotlar uchun bitta guruhlangan aggregate
+    if avco_products:
+        averages = (
+            StockBatch.objects
+            .filter(product_id__in=avco_products, qty_left__gt=0)
+            .values('product_id')
+            .annotate(total_value=Sum(F('unit_cost') * F('qty_left')), total_qty=Sum('qty_left'))
+        )
+        Product.objects.bulk_update(
+            [
+                Product(id=row['product_id'], purchase_price=row['total_value'] / row['total_qty'])
+                for row in averages if row['total_qty']
+            ],
+            ['purchase_price'],
+            batch_size=MOVEMENT_CHUNK_SIZE,
+        )
+
+    # Yetkazib beruvchi qarzi — supplier bo'yicha bitta post_many (id tartibida qulflanadi)
+    for supplier_id in sorted(ledger):
+        SupplierLedgerEntry.post_many(supplier_id, SupplierLedgerEntryType.RECEIPT, [
+            (mv.quantity * mv.unit_cost, {
+                'movement':    mv,
+                'description': f"Kirim #{mv.id}: {mv.product.name} × {mv.quantity}",
+                'created_on':  mv.created_on,
+            })
+            for mv in ledger[supplier_id]
+        ])
+
+    result.movements = movements
+    return result
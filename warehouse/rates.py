@@ -0,0 +1,151 @@
+"""
+============================================================
+WAREHOUSE APP — Valyuta kurslari jadvali (jarayon keshi)
+============================================================
+Klasslar / funksiyalar:
+  RateTable                 — sana uchun barcha valyutalar kursi (1 birlik = X UZS)
+  get_rate_table(day=None)  — jarayon xotirasidagi jadval (sana bo'yicha), bitta so'rov bilan quriladi
+  invalidate_rates()        — jadvalni eskirtirish (kurs yozilganda: task, API, admin)
+  shown_currencies(settings)— StoreSettings.show_*_price bayroqlari → ['USD', ...]
+  convert_prices(products, codes, table) — sahifa narxlarini bir o'tishda konvertatsiya
+
+Nima uchun:
+  get_today_rate har chaqiriqda 2 tagacha so'rov qilardi, valyuta serializeri —
+  har valyuta uchun bittadan. Kurslar kuniga bir marta (CBU, 09:00) o'zgaradi:
+  jadval jarayonda saqlanadi, faqat kurs yozilganda qayta quriladi.
+
+Eskirish (config/search_utils.PrefixIndexRegistry bilan bir xil sxema):
+  - invalidate_rates() shu jarayonda darhol o'chiradi va keshdagi versiyani
+    oshiradi — boshqa worker'lar keyingi murojaatda qayta quradi
+  - zaxira: EXCHANGE_RATE_CACHE_TTL soniyadan keyin baribir qayta quriladi
+"""
+
+import threading
+import time
+from dataclasses import dataclass, field
+from decimal import Decimal
+
+from django.conf import settings
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
+
+_VERSION_KEY = 'exchange_rates_version'
+_CENT        = Decimal('0.01')
+_RATE_PLACES = Decimal('0.0001')
+
+# StoreSettings bayrog'i → valyuta kodi
+SHOW_PRICE_FLAGS = (
+    ('show_usd_price', 'USD'),
+    ('show_rub_price', 'RUB'),
+    ('show_eur_price', 'EUR'),
+    ('show_cny_price', 'CNY'),
+)
+
+
+@dataclass(frozen=True)
+class RateTable:
+    day:   object                                  # datetime.date
+    rates: dict = field(default_factory=dict)      # {'USD': Decimal('12650.36'), 'UZS': Decimal('1'), ...}
+    dates: dict = field(default_factory=dict)      # {'USD': date, ...} — kurs qaysi kunniki
+    ids:   dict = field(default_factory=dict)      # {currency_id: 'USD', ...}
+
+    def rate(self, code: str) -> Decimal | None:
+        return self.rates.get(code.upper())
+
+
+_tables = {}                     # day → (RateTable, version, qurilgan vaqt)
+_lock   = threading.Lock()
+
+
+def _current_version():
+    from django.core.cache import cache
+    return cache.get(_VERSION_KEY)
+
+
+def _build(day) -> RateTable:
+    """Har valyuta uchun day gacha bo'lgan eng so'nggi kurs — bitta so'rov (korrelyatsiyalangan subquery)."""
+    from .models import Currency, ExchangeRate
+
+    latest = ExchangeRate.objects.filter(currency=OuterRef('pk'), date__lte=day).order_by('-date')
+    rows   = Currency.objects.annotate(
+        last_rate = Subquery(latest.values('rate')[:1]),
+        last_date = Subquery(latest.values('date')[:1]),
+    ).values_list('id', 'code', 'is_base', 'last_rate', 'last_date')
+
+    rates, dates, ids = {'UZS': Decimal('1')}, {}, {}
+    for currency_id, code, is_base, rate, rate_date in rows:
+        ids[currency_id] = code
+        if is_base or code == 'UZS':
+            rates[code] = Decimal('1')
+        elif rate is not None:
+            rates[code] = Decimal(rate).quantize(_RATE_PLACES)   # SQLite subquery aniqlikni yo'qotadi
+            dates[code] = rate_date
+    return RateTable(day=day, rates=rates, dates=dates, ids=ids)
+
+
+def get_rate_table(day=None) -> RateTable:
+    """Sana (standart — bugun) uchun kurslar jadvali. Jarayonda keshlanadi."""
+    day     = day or timezone.localdate()
+    version = _current_version()
+    item    = _tables.get(day)
+    if item is not None:
+        table, built_version, built_at = item
+        if built_version == version and time.monotonic() - built_at < settings.EXCHANGE_RATE_CACHE_TTL:
+            return table
+
+    table = _build(day)
+    with _lock:
+        if len(_tables) > 7:          # eski kunlar to'planib qolmasin
+            _tables.clear()
+        _tables[day] = (table, version, time.monotonic())
+    return table
+
+
+def invalidate_rates() -> None:
+    """Kurs yozilganda: shu jarayon jadvali o'chadi, boshqa jarayonlar versiya orqali biladi."""
+    from django.core.cache import cache
+    with _lock:
+        _tables.clear()
+    try:
+        cache.incr(_VERSION_KEY)
+    except ValueError:
+        cache.set(_VERSION_KEY, 1, timeout=None)
+
+
+def shown_currencies(store_settings) -> list[str]:
+    """StoreSettings bayroqlari bo'yicha ko'rsatiladigan valyutalar."""
+    if store_settings is None:
+        return []
+    return [code for flag, code in SHOW_PRICE_FLAGS if getattr(store_settings, flag, False)]
+
+
+def convert_prices(products, codes, table: RateTable | None = None) -> dict:
+    """
+    Mahsulotlar sotish narxi → codes valyutalarida. Qaytaradi: {product_id: {'USD': Decimal, ...}}.
+
+    Narx price_currency da saqlanadi (null → UZS). Har (manba, maqsad) juftligi uchun
+    koeffitsient bir marta hisoblanadi: k = kurs[manba] / kurs[maqsad], keyin har narx
+    bitta ko'paytma + yaxlitlash. Kurs yo'q bo'lsa — None.
+    """
+    if not codes:
+        return {}
+    table   = table or get_rate_table()
+    targets = [(code, table.rate(code)) for code in codes]
+    factors = {}
+
+    def factor(source_id):
+        if source_id not in factors:
+            source_rate = table.rate(table.ids.get(source_id, 'UZS')) if source_id else Decimal('1')
+            factors[source_id] = [
+                (code, source_rate / target_rate if source_rate is not None and target_rate else None)
+                for code, target_rate in targets
+            ]
+        return factors[source_id]
+
+    return {
+        product.id: {
+            code: (product.sale_price * k).quantize(_CENT) if k is not None else None
+            for code, k in factor(product.price_currency_id)
+        }
+        for product in products
+    }
@@ -22,12 +22,17 @@ Tartib:
   11. WastageRecord serializers (B7 — isrof)
   12. StockAudit serializers    (B8 — inventarizatsiya)
   13. Supplier serializers      (B13 — yetkazib beruvchi)
-  14. SupplierPayment serializers (B13 — to'lov tarixi)
+  14. SupplierPayment serializers (B13 — to'lov tarixi, daftar yozuvlari)
   15. Promotion serializers      (Aksiya — muddatli chegirma)
 """
 
+from decimal import Decimal
+
+from django.db.models import Manager
+
 from rest_framework import serializers
 
+from config.cache_utils import get_store_settings
 from store.models import Branch
 
 from .models import (
@@ -45,6 +50,7 @@ from .models import (
     StockMovement,
     SubCategory,
     Supplier,
+    SupplierLedgerEntry,
     SupplierPayment,
     SupplierPaymentType,
     Transfer,
@@ -54,6 +60,39 @@ from .models import (
     WastageReason,
     WastageRecord,
 )
+from .rates import convert_prices, get_rate_table, shown_currencies
+
+
+# ============================================================
+# YORDAMCHI FUNKSIYALAR
+# ============================================================
+
+def _annotated_or(obj, attr: str, fallback):
+    """
+    View get_queryset() da annotatsiya qilingan qiymatni qaytaradi.
+    Annotatsiya yo'q bo'lsa (create/update javobi) — fallback() so'rovi.
+    """
+    value = getattr(obj, attr, None)
+    return fallback() if value is None else value
+
+
+def _prices_payload(prices: dict) -> dict:
+    """{'USD': Decimal} → {'USD': '0.95'} (sale_price kabi satr; kurs yo'q → None)."""
+    return {code: str(value) if value is not None else None for code, value in prices.items()}
+
+
+def _promotion_payload(product, promo):
+    """Aksiya ma'lumoti + chegirmali narx (ProductList/Detail uchun)."""
+    if not promo:
+        return None
+    discounted = (product.sale_price * (1 - promo.discount_pct / 100)).quantize(Decimal('0.01'))
+    return {
+        'id':               promo.id,
+        'name':             promo.name,
+        'discount_pct':     promo.discount_pct,
+        'discounted_price': discounted,
+        'valid_to':         promo.valid_to,
+    }
 
 
 # ============================================================
@@ -70,10 +109,10 @@ class CategoryListSerializer(serializers.ModelSerializer):
         fields = ('id', 'name', 'status', 'status_display', 'product_count', 'subcategory_count')
 
     def get_product_count(self, obj):
-        return obj.products.count()
+        return _annotated_or(obj, 'product_count', lambda: obj.products.count())
 
     def get_subcategory_count(self, obj):
-        return obj.subcategories.count()
+        return _annotated_or(obj, 'subcategory_count', lambda: obj.subcategories.count())
 
 
 class CategoryDetailSerializer(serializers.ModelSerializer):
@@ -91,10 +130,10 @@ class CategoryDetailSerializer(serializers.ModelSerializer):
         )
 
     def get_product_count(self, obj):
-        return obj.products.count()
+        return _annotated_or(obj, 'product_count', lambda: obj.products.count())
 
     def get_subcategory_count(self, obj):
-        return obj.subcategories.count()
+        return _annotated_or(obj, 'subcategory_count', lambda: obj.subcategories.count())
 
 
 class CategoryCreateSerializer(serializers.ModelSerializer):
@@ -166,7 +205,7 @@ class SubCategoryListSerializer(serializers.ModelSerializer):
         )
 
     def get_product_count(self, obj):
-        return obj.products.count()
+        return _annotated_or(obj, 'product_count', lambda: obj.products.count())
 
 
 class SubCategoryDetailSerializer(serializers.ModelSerializer):
@@ -186,7 +225,7 @@ class SubCategoryDetailSerializer(serializers.ModelSerializer):
         )
 
     def get_product_count(self, obj):
-        return obj.products.count()
+        return _annotated_or(obj, 'product_count', lambda: obj.products.count())
 
 
 class SubCategoryCreateSerializer(serializers.ModelSerializer):
@@ -298,9 +337,10 @@ class CurrencyDetailSerializer(serializers.ModelSerializer):
     def get_latest_rate(self, obj):
         if obj.is_base:
             return {'rate': '1.0000', 'date': None}
-        latest = obj.rates.order_by('-date').first()
-        if latest:
-            return {'rate': str(latest.rate), 'date': str(latest.date)}
+        table = get_rate_table()
+        rate  = table.rate(obj.code)
+        if rate is not None:
+            return {'rate': str(rate), 'date': str(table.dates.get(obj.code))}
         return None
 
 
@@ -378,6 +418,26 @@ class ExchangeRateCreateSerializer(serializers.ModelSerializer):
 # MAHSULOT SERIALIZERLARI
 # ============================================================
 
+class ProductListBatchSerializer(serializers.ListSerializer):
+    """
+    many=True uchun ListSerializer.
+    Sahifadagi barcha mahsulotlar uchun aktiv aksiyalarni bitta batch da
+    (Promotion.get_active_map) oladi va har bir obyektga biriktiradi —
+    sahifa hajmidan qat'i nazar so'rovlar soni o'zgarmaydi.
+    """
+
+    def to_representation(self, data):
+        items    = list(data.all() if isinstance(data, Manager) else data)
+        store_id = self.child._get_store_id()
+        if store_id:
+            promo_map = Promotion.get_active_map(items, store_id)
+            prices    = convert_prices(items, shown_currencies(get_store_settings(store_id)))
+            for product in items:
+                product._active_promotion = promo_map.get(product.id)
+                product._converted_prices = prices.get(product.id, {})
+        return super().to_representation(items)
+
+
 class ProductListSerializer(serializers.ModelSerializer):
     category_name    = serializers.CharField(source='category.name', read_only=True)
     subcategory_name = serializers.CharField(source='subcategory.name', read_only=True)
@@ -386,6 +446,7 @@ class ProductListSerializer(serializers.ModelSerializer):
     currency_code     = serializers.SerializerMethodField()
     barcode_image_url = serializers.SerializerMethodField()
     active_promotion  = serializers.SerializerMethodField()
+    converted_prices  = serializers.SerializerMethodField()
 
     class Meta:
         model  = Product
@@ -393,12 +454,13 @@ class ProductListSerializer(serializers.ModelSerializer):
             'id', 'name',
             'category_name', 'subcategory_name',
             'unit', 'unit_display',
-            'sale_price', 'currency_code',
+            'sale_price', 'currency_code', 'converted_prices',
             'active_promotion',
             'barcode', 'barcode_image_url',
             'status', 'status_display',
             'image',
         )
+        list_serializer_class = ProductListBatchSerializer
 
     def get_currency_code(self, obj):
         return obj.price_currency.code if obj.price_currency else None
@@ -412,26 +474,29 @@ class ProductListSerializer(serializers.ModelSerializer):
             return request.build_absolute_uri(url)
         return url
 
-    def get_active_promotion(self, obj):
+    def _get_store_id(self):
         store_id = self.context.get('store_id')
         if not store_id:
             request = self.context.get('request')
             if request and hasattr(request, 'user') and hasattr(request.user, 'worker'):
                 store_id = request.user.worker.store_id
+        return store_id
+
+    def get_active_promotion(self, obj):
+        # Ro'yxatda ProductListBatchSerializer oldindan biriktiradi (1 ta batch)
+        if hasattr(obj, '_active_promotion'):
+            return _promotion_payload(obj, obj._active_promotion)
+        store_id = self._get_store_id()
         if not store_id:
             return None
-        promo = Promotion.get_active_for_product(obj, store_id)
-        if not promo:
-            return None
-        from decimal import Decimal
-        discounted = (obj.sale_price * (1 - promo.discount_pct / 100)).quantize(Decimal('0.01'))
-        return {
-            'id':               promo.id,
-            'name':             promo.name,
-            'discount_pct':     promo.discount_pct,
-            'discounted_price': discounted,
-            'valid_to':         promo.valid_to,
-        }
+        return _promotion_payload(obj, Promotion.get_active_for_product(obj, store_id))
+
+    def get_converted_prices(self, obj):
+        # Ro'yxatda ProductListBatchSerializer butun sahifa uchun bir o'tishda hisoblaydi
+        if hasattr(obj, '_converted_prices'):
+            return _prices_payload(obj._converted_prices)
+        codes = shown_currencies(get_store_settings(obj.store_id))
+        return _prices_payload(convert_prices([obj], codes).get(obj.id, {}))
 
 
 class ProductDetailSerializer(serializers.ModelSerializer):
@@ -448,6 +513,7 @@ class ProductDetailSerializer(serializers.ModelSerializer):
     stock_total      = serializers.SerializerMethodField()
     barcode_image_url = serializers.SerializerMethodField()
     active_promotion  = serializers.SerializerMethodField()
+    converted_prices  = serializers.SerializerMethodField()
 
     class Meta:
         model  = Product
@@ -457,7 +523,7 @@ class ProductDetailSerializer(serializers.ModelSerializer):
             'subcategory_id', 'subcategory_name',
             'unit', 'unit_display',
             'purchase_price', 'sale_price',
-            'currency_id', 'currency_code', 'currency_symbol',
+            'currency_id', 'currency_code', 'currency_symbol', 'converted_prices',
             'active_promotion',
             'barcode', 'barcode_image_url', 'image',
             'store_name', 'status', 'status_display',
@@ -473,10 +539,15 @@ class ProductDetailSerializer(serializers.ModelSerializer):
     def get_currency_symbol(self, obj):
         return obj.price_currency.symbol if obj.price_currency else None
 
+    def get_converted_prices(self, obj):
+        codes = shown_currencies(get_store_settings(obj.store_id))
+        return _prices_payload(convert_prices([obj], codes).get(obj.id, {}))
+
     def get_stock_total(self, obj):
-        from django.db.models import Sum
-        result = obj.stocks.aggregate(total=Sum('quantity'))
-        return result['total'] or 0
+        def _aggregate():
+            from django.db.models import Sum
+            return obj.stocks.aggregate(total=Sum('quantity'))['total'] or 0
+        return _annotated_or(obj, 'stock_total', _aggregate)
 
     def get_barcode_image_url(self, obj):
         if not obj.barcode:
@@ -492,17 +563,7 @@ class ProductDetailSerializer(serializers.ModelSerializer):
         if not request or not hasattr(request.user, 'worker'):
             return None
         promo = Promotion.get_active_for_product(obj, request.user.worker.store_id)
-        if not promo:
-            return None
-        from decimal import Decimal
-        discounted = (obj.sale_price * (1 - promo.discount_pct / 100)).quantize(Decimal('0.01'))
-        return {
-            'id':               promo.id,
-            'name':             promo.name,
-            'discount_pct':     promo.discount_pct,
-            'discounted_price': discounted,
-            'valid_to':         promo.valid_to,
-        }
+        return _promotion_payload(obj, promo)
 
 
 class ProductCreateSerializer(serializers.ModelSerializer):
@@ -667,7 +728,7 @@ class WarehouseListSerializer(serializers.ModelSerializer):
         fields = ('id', 'name', 'address', 'status', 'stock_count')
 
     def get_stock_count(self, obj):
-        return obj.stocks.count()
+        return _annotated_or(obj, 'stock_count', lambda: obj.stocks.count())
 
 
 class WarehouseStockItemSerializer(serializers.ModelSerializer):
@@ -717,10 +778,14 @@ class WarehouseDetailSerializer(serializers.ModelSerializer):
         )
 
     def get_stock_count(self, obj):
-        return obj.stocks.count()
+        return _annotated_or(obj, 'stock_count', lambda: obj.stocks.count())
 
     def get_products(self, obj):
-        stocks = obj.stocks.select_related('product').order_by('product__name')
+        # retrieve da view Prefetch('stocks') beradi — qo'shimcha so'rov yo'q
+        if 'stocks' in getattr(obj, '_prefetched_objects_cache', {}):
+            stocks = obj.stocks.all()
+        else:
+            stocks = obj.stocks.select_related('product').order_by('product__name')
         return WarehouseStockItemSerializer(stocks, many=True, context=self.context).data
 
 
@@ -2073,6 +2138,20 @@ class SupplierPaymentSerializer(serializers.ModelSerializer):
         return value
 
 
+class SupplierLedgerEntrySerializer(serializers.ModelSerializer):
+    """Yetkazib beruvchi daftari yozuvi. GET /api/v1/warehouse/suppliers/{id}/ledger/"""
+    entry_type_display = serializers.CharField(source='get_entry_type_display', read_only=True)
+
+    class Meta:
+        model  = SupplierLedgerEntry
+        fields = (
+            'id', 'entry_type', 'entry_type_display',
+            'amount', 'balance', 'open_amount',
+            'movement', 'payment',
+            'description', 'created_on',
+        )
+
+
 # ============================================================
 # 15. PROMOTION SERIALIZERLARI
 # ============================================================
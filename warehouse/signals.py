@@ -0,0 +1,47 @@
+"""
+============================================================
+WAREHOUSE APP — Signallar
+============================================================
+Signallar:
+  invalidate_product_prefix_index — Mahsulot saqlanganda/o'chirilganda
+                                    do'konning autocomplete indeksini eskirtiradi
+  invalidate_exchange_rates       — Kurs saqlanganda/o'chirilganda warehouse.rates
+                                    jadvalini eskirtiradi (bulk upsert — task o'zi chaqiradi)
+
+Bu signal warehouse/apps.py da WarehouseConfig.ready() orqali ulanadi.
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import ExchangeRate, Product
+
+
+# ============================================================
+# AUTOCOMPLETE INDEKSI (PrefixIndex) — ESKIRTIRISH
+# ============================================================
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+def invalidate_product_prefix_index(sender, instance: Product, **kwargs) -> None:
+    """
+    Mahsulot yaratilganda/yangilanganda/o'chirilganda indeks qayta quriladi.
+    Indeks umuman ishlatilmagan bo'lsa ham versiya oshiriladi — arzon (1 ta INCR).
+    """
+    from django.conf import settings
+    if not getattr(settings, 'PRODUCT_SEARCH_INDEX_ENABLED', True):
+        return
+    from .utils import product_prefix_index
+    product_prefix_index.invalidate(instance.store_id)
+
+
+# ============================================================
+# VALYUTA KURSLARI JADVALI (warehouse.rates) — ESKIRTIRISH
+# ============================================================
+
+@receiver(post_save, sender=ExchangeRate)
+@receiver(post_delete, sender=ExchangeRate)
+def invalidate_exchange_rates(sender, instance: ExchangeRate, **kwargs) -> None:
+    """API / admin orqali kurs o'zgarganda barcha worker'lar jadvalni qayta quradi."""
+    from .rates import invalidate_rates
+    invalidate_rates()
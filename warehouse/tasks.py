@@ -5,10 +5,12 @@ WAREHOUSE APP — Celery Tasklar
 Tasklar:
   update_exchange_rates  — CBU API dan valyuta kurslarini olish (kunlik)
   check_low_stock        — Kam qoldiq mahsulotlarni tekshirish (har 6 soatda)
+  verify_supplier_ledger — Supplier.debt_balance == daftar yig'indisi tekshiruvi (kunlik)
 
 Celery Beat jadval (config/settings/base.py da belgilangan):
-  update_exchange_rates → har kuni 09:00 da
-  check_low_stock       → har 6 soatda (00:00, 06:00, 12:00, 18:00)
+  update_exchange_rates  → har kuni 09:00 da
+  check_low_stock        → har 6 soatda (00:00, 06:00, 12:00, 18:00)
+  verify_supplier_ledger → har kuni 03:30 da
 """
 
 import logging
@@ -37,16 +39,21 @@ def update_exchange_rates(self):
 
     Jarayon:
       1. CBU API ga so'rov yuborish
-      2. Har bir valyuta uchun Currency modeli borligini tekshirish
-      3. ExchangeRate.update_or_create — bugungi kurs yangilanadi
-      4. Yangilangan va yangi kurslar soni log'ga yoziladi
+      2. Tizimdagi valyutalar bitta so'rovda olinadi (kod → id)
+      3. Barcha bugungi kurslar bitta bulk_create(update_conflicts=True) bilan
+         yoziladi (currency, date bo'yicha upsert)
+      4. warehouse.rates jadvali eskirtiriladi (barcha worker'lar)
+      5. Yangilangan va yangi kurslar soni log'ga yoziladi
 
     Retry: muvaffaqiyatsiz bo'lsa 5 daqiqadan keyin 3 martagacha qayta urinadi.
     """
     import requests
+    from decimal import Decimal, InvalidOperation
+
     from django.utils import timezone
 
     from .models import Currency, ExchangeRate
+    from .rates import invalidate_rates
 
     CBU_API_URL = 'https://cbu.uz/uz/arkhiv-kursov-valyut/json/'
     today       = timezone.now().date()
@@ -64,8 +71,8 @@ def update_exchange_rates(self):
         logger.error(f"CBU API javobini o'qishda xato: {exc}")
         raise self.retry(exc=exc)
 
-    updated_count = 0
-    created_count = 0
+    currencies    = dict(Currency.objects.values_list('code', 'id'))
+    rates         = {}
     skipped_count = 0
 
     for item in data:
@@ -76,30 +83,34 @@ def update_exchange_rates(self):
             continue
 
         # Faqat bizning tizimda mavjud valyutalar uchun
-        try:
-            currency = Currency.objects.get(code=code)
-        except Currency.DoesNotExist:
+        if code not in currencies:
             skipped_count += 1
             continue
 
         try:
-            rate_value = float(rate_str.replace(',', '.'))
-        except (ValueError, AttributeError):
+            rate_value = Decimal(rate_str.replace(',', '.'))
+        except (InvalidOperation, AttributeError):
             logger.warning(f"Noto'g'ri kurs qiymati: {code} = {rate_str!r}")
             continue
 
-        _, created = ExchangeRate.objects.update_or_create(
-            currency=currency,
-            date=today,
-            defaults={
-                'rate': rate_value,
-            },
-        )
+        rates[currencies[code]] = rate_value
+
+    existing = set(
+        ExchangeRate.objects
+        .filter(date=today, currency_id__in=rates)
+        .values_list('currency_id', flat=True)
+    )
+    ExchangeRate.objects.bulk_create(
+        [ExchangeRate(currency_id=currency_id, date=today, rate=rate) for currency_id, rate in rates.items()],
+        update_conflicts=True,
+        unique_fields=['currency', 'date'],
+        update_fields=['rate'],
+    )
+    if rates:
+        invalidate_rates()
 
-        if created:
-            created_count += 1
-        else:
-            updated_count += 1
+    created_count = len(rates.keys() - existing)
+    updated_count = len(existing)
 
     logger.info(
         f"Valyuta kurslari yangilandi ({today}): "
@@ -214,3 +225,40 @@ def check_low_stock(self):
     except Exception as exc:
         logger.error(f"check_low_stock xatosi: {exc}")
         raise self.retry(exc=exc)
+
+
+# ============================================================
+# YETKAZIB BERUVCHI DAFTARI TEKSHIRUVI
+# ============================================================
+
+@shared_task(name='warehouse.tasks.verify_supplier_ledger')
+def verify_supplier_ledger(store_id=None, fix=False):
+    """
+    Supplier.debt_balance (kesh) ni SupplierLedgerEntry yig'indisi bilan solishtirish.
+    Bitta so'rov (korrelyatsiyalangan SUM). Farqlar log'ga yoziladi.
+
+    fix=True — kesh daftar yig'indisiga tenglashtiriladi (daftar — asosiy manba).
+
+    Qaytaradi: {'mismatched': int, 'fixed': int, 'details': [...]}
+    """
+    from .models import Supplier, SupplierLedgerEntry
+
+    mismatches = SupplierLedgerEntry.verify_balances(store_id=store_id)
+    fixed      = 0
+    for row in mismatches:
+        logger.warning(
+            f"[DAFTAR FARQI] Yetkazib beruvchi #{row['supplier_id']}: "
+            f"debt_balance={row['cached']} | daftar={row['ledger']}"
+        )
+        if fix:
+            fixed += Supplier.objects.filter(pk=row['supplier_id']).update(debt_balance=row['ledger'])
+
+    logger.info(f"Yetkazib beruvchi daftari tekshirildi: farq={len(mismatches)}, tuzatildi={fixed}")
+    return {
+        'mismatched': len(mismatches),
+        'fixed':      fixed,
+        'details':    [
+            {key: str(value) if key != 'supplier_id' else value for key, value in row.items()}
+            for row in mismatches
+        ],
+    }
@@ -1,3 +1,625 @@
-from django.test import TestCase
+"""
+============================================================
+WAREHOUSE APP — Testlar
+============================================================
+Test guruhlari:
+  1. Ro'yxat endpointlari — so'rovlar soni sahifa hajmiga bog'liq emasligi
+  2. Mahsulot qidiruvi — ?q= reytingi, normallashtirish, autocomplete indeksi
+  3. Yetkazib beruvchi daftari — running balance, FIFO ochiq kirimlar, aging, dalolatnoma
+  4. Harakatlar — bulk dvigatel (partiya, FIFO, AVCO, supplier qarzi, import)
+  5. Yorliqlar — QR/EAN-13 keshi va ETag, oqimli ZIP (process pool), PDF stiker varag'i
+  6. Valyuta kurslari — jarayon keshidagi jadval, eskirtirish, show_*_price konvertatsiyasi
+"""
 
-# Create your tests here.
+import io
+from datetime import timedelta
+from decimal import Decimal
+
+import openpyxl
+
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from rest_framework.test import APITestCase
+
+from accaunt.models import ALL_PERMISSIONS, CustomUser, Worker, WorkerRole
+from store.models import Store
+
+from .models import (
+    Category,
+    Product,
+    Promotion,
+    Stock,
+    StockBatch,
+    StockMovement,
+    SubCategory,
+    Supplier,
+    SupplierLedgerEntry,
+    Warehouse,
+)
+
+
+class WarehouseTestMixin:
+    """Do'kon + owner hodim + autentifikatsiya — barcha testlar uchun umumiy."""
+
+    def setUp(self):
+        self.store = Store.objects.create(name="Test do'kon")
+        self.user  = CustomUser.objects.create_user(
+            username='owner', email='owner@test.uz',
+            phone1='+998901234567', password='Test12345',
+        )
+        self.worker = Worker.objects.create(
+            user=self.user, store=self.store,
+            role=WorkerRole.OWNER, permissions=list(ALL_PERMISSIONS),
+        )
+        self.client.force_authenticate(self.user)
+
+    def _make_products(self, count: int, category=None, subcategory=None, warehouse=None):
+        """count ta mahsulot (ixtiyoriy: ombordagi qoldiq bilan) yaratadi."""
+        start    = Product.objects.filter(store=self.store).count()
+        products = []
+        for i in range(start, start + count):
+            product = Product.objects.create(
+                store=self.store, name=f"Mahsulot {i:03d}",
+                category=category, subcategory=subcategory,
+                sale_price=Decimal('10000'), barcode=f"20{i:011d}",
+            )
+            if warehouse:
+                Stock.objects.create(product=product, warehouse=warehouse, quantity=Decimal('5'))
+            products.append(product)
+        return products
+
+    def _subscribe(self, **features):
+        """Do'konga faol obuna (PRO reja, berilgan has_* funksiyalar bilan)."""
+        from subscription.models import PlanType, Subscription, SubscriptionPlan, SubscriptionStatus
+        plan = SubscriptionPlan.objects.create(plan_type=PlanType.PRO, name='Pro', **features)
+        today = timezone.localdate()
+        Subscription.objects.update_or_create(
+            store=self.store,
+            defaults=dict(plan=plan, status=SubscriptionStatus.ACTIVE,
+                          start_date=today, end_date=today + timedelta(days=30)),
+        )
+
+    def _upload(self, url: str, headers: list, rows: list):
+        """Xotirada .xlsx yasab import endpointiga yuboradi → (data, so'rovlar soni)."""
+        wb = openpyxl.Workbook()
+        ws = wb.active
+        ws.append(headers)
+        for row in rows:
+            ws.append(row)
+        buffer = io.BytesIO()
+        wb.save(buffer)
+        buffer.seek(0)
+        buffer.name = 'import.xlsx'
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(url, {'file': buffer}, format='multipart')
+        self.assertEqual(response.status_code, 200, getattr(response, 'data', None))
+        return response.data, len(ctx.captured_queries)
+
+    def _count_queries(self, url: str) -> int:
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, response.data)
+        return len(ctx.captured_queries)
+
+
+# ============================================================
+# 1. RO'YXAT ENDPOINTLARI — N+1 YO'Q
+# ============================================================
+
+class ListQueryCountTest(WarehouseTestMixin, APITestCase):
+    """Hisoblanadigan maydonlar annotatsiya/batch orqali — so'rovlar soni o'zgarmas."""
+
+    def test_product_list_with_promotions_constant_queries(self):
+        """Mahsulot ro'yxati: active_promotion sahifa hajmidan qat'i nazar bir xil so'rovlar."""
+        category = Category.objects.create(store=self.store, name='Ichimliklar')
+        now      = timezone.now()
+        promo    = Promotion.objects.create(
+            store=self.store, name='Yozgi aksiya', discount_pct=Decimal('10'),
+            valid_from=now - timedelta(days=1), valid_to=now + timedelta(days=1),
+        )
+        promo.categories.add(category)
+
+        self._make_products(2, category=category)
+        small = self._count_queries('/api/v1/warehouse/products/')
+        self._make_products(8, category=category)
+        large = self._count_queries('/api/v1/warehouse/products/')
+        self.assertEqual(small, large)
+
+        response = self.client.get('/api/v1/warehouse/products/')
+        first    = response.data['results'][0]
+        self.assertEqual(first['active_promotion']['id'], promo.id)
+        self.assertEqual(first['active_promotion']['discounted_price'], Decimal('9000.00'))
+
+    def test_product_promotion_picks_largest_discount(self):
+        """Bir nechta aksiya — eng katta chegirma tanlanadi (get_active_for_product bilan bir xil)."""
+        category = Category.objects.create(store=self.store, name='Shirinliklar')
+        product  = self._make_products(1, category=category)[0]
+        now      = timezone.now()
+        window   = dict(valid_from=now - timedelta(days=1), valid_to=now + timedelta(days=1))
+        small    = Promotion.objects.create(store=self.store, name='5%', discount_pct=Decimal('5'), **window)
+        big      = Promotion.objects.create(store=self.store, name='20%', discount_pct=Decimal('20'), **window)
+        small.products.add(product)
+        big.categories.add(category)
+
+        promo_map = Promotion.get_active_map([product], self.store.id)
+        self.assertEqual(promo_map[product.id], big)
+        self.assertEqual(Promotion.get_active_for_product(product, self.store.id), big)
+
+    def test_product_detail_stock_total(self):
+        """Mahsulot detail: stock_total annotatsiyadan."""
+        warehouse = Warehouse.objects.create(store=self.store, name='Asosiy ombor')
+        product   = self._make_products(1, warehouse=warehouse)[0]
+        response  = self.client.get(f'/api/v1/warehouse/products/{product.id}/')
+        self.assertEqual(Decimal(str(response.data['stock_total'])), Decimal('5'))
+
+    def test_category_list_constant_queries(self):
+        """Kategoriya ro'yxati: product_count / subcategory_count annotatsiya."""
+        for i in range(2):
+            category = Category.objects.create(store=self.store, name=f"Kategoriya {i}")
+            SubCategory.objects.create(store=self.store, category=category, name=f"Sub {i}")
+            self._make_products(3, category=category)
+        small = self._count_queries('/api/v1/warehouse/categories/')
+        for i in range(2, 8):
+            Category.objects.create(store=self.store, name=f"Kategoriya {i}")
+        large = self._count_queries('/api/v1/warehouse/categories/')
+        self.assertEqual(small, large)
+
+        response = self.client.get('/api/v1/warehouse/categories/')
+        counts   = {row['name']: (row['product_count'], row['subcategory_count']) for row in response.data['results']}
+        self.assertEqual(counts['Kategoriya 0'], (3, 1))
+        self.assertEqual(counts['Kategoriya 7'], (0, 0))
+
+    def test_subcategory_list_constant_queries(self):
+        """Subkategoriya ro'yxati: product_count annotatsiya."""
+        category = Category.objects.create(store=self.store, name='Asosiy')
+        sub      = SubCategory.objects.create(store=self.store, category=category, name='Sub 0')
+        self._make_products(4, category=category, subcategory=sub)
+        small = self._count_queries('/api/v1/warehouse/subcategories/')
+        for i in range(1, 9):
+            SubCategory.objects.create(store=self.store, category=category, name=f"Sub {i}")
+        large = self._count_queries('/api/v1/warehouse/subcategories/')
+        self.assertEqual(small, large)
+
+        response = self.client.get('/api/v1/warehouse/subcategories/')
+        counts   = {row['name']: row['product_count'] for row in response.data['results']}
+        self.assertEqual(counts['Sub 0'], 4)
+
+    def test_warehouse_list_and_detail_constant_queries(self):
+        """Ombor ro'yxati: stock_count annotatsiya; detail: products bitta prefetch."""
+        warehouse = Warehouse.objects.create(store=self.store, name='Ombor 0')
+        self._make_products(2, warehouse=warehouse)
+        small_list   = self._count_queries('/api/v1/warehouse/warehouses/')
+        small_detail = self._count_queries(f'/api/v1/warehouse/warehouses/{warehouse.id}/')
+
+        for i in range(1, 6):
+            Warehouse.objects.create(store=self.store, name=f"Ombor {i}")
+        self._make_products(8, warehouse=warehouse)
+        self.assertEqual(small_list, self._count_queries('/api/v1/warehouse/warehouses/'))
+        self.assertEqual(small_detail, self._count_queries(f'/api/v1/warehouse/warehouses/{warehouse.id}/'))
+
+        response = self.client.get(f'/api/v1/warehouse/warehouses/{warehouse.id}/')
+        self.assertEqual(response.data['stock_count'], 10)
+        self.assertEqual(len(response.data['products']), 10)
+
+
+# ============================================================
+# 2. MAHSULOT QIDIRUVI (?q=, autocomplete)
+# ============================================================
+
+class ProductSearchTest(WarehouseTestMixin, APITestCase):
+    """Reytingli qidiruv: normallashtirish, barcode prefiksi, limit, autocomplete."""
+
+    def setUp(self):
+        super().setUp()
+        for name, barcode in (
+            ('Coca-Cola 0.5L',   '4870001000011'),
+            ('Coca-Cola 1.5L',   '4870001000028'),
+            ('Pepsi Cola 1L',    '4870002000010'),
+            ("O'zbekiston choy", '4870003000017'),
+            ('Kokos pechenye',   '4870004000014'),
+        ):
+            Product.objects.create(store=self.store, name=name, barcode=barcode)
+
+    def _names(self, url: str) -> list:
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, response.data)
+        return [row['name'] for row in response.data['results']]
+
+    def test_normalize_search_text(self):
+        """Kirill/lotin, apostrof va belgilar bir xil shaklga keltiriladi."""
+        from config.search_utils import normalize_search_text
+        self.assertEqual(normalize_search_text('Oʻzbekiston Choy'), 'ozbekiston choy')
+        self.assertEqual(normalize_search_text('Ўзбекистон чой'), 'ozbekiston choy')
+        self.assertEqual(normalize_search_text('Coca-Cola 0.5L'), 'coca cola 0 5l')
+
+    def test_search_name_filled_on_save(self):
+        """search_name save() da name dan hosil qilinadi (update_fields bilan ham)."""
+        product = Product.objects.get(barcode='4870004000014')
+        self.assertEqual(product.search_name, 'kokos pechenye')
+        product.name = 'Кокос печенье'
+        product.save(update_fields=['name'])
+        product.refresh_from_db()
+        self.assertEqual(product.search_name, 'kokos pechene')
+
+    def test_prefix_ranked_before_word_match(self):
+        """Nom boshidagi moslik so'z o'rtasidagidan yuqorida."""
+        names = self._names('/api/v1/warehouse/products/?q=cola')
+        self.assertEqual(set(names), {'Coca-Cola 0.5L', 'Coca-Cola 1.5L', 'Pepsi Cola 1L'})
+        names = self._names('/api/v1/warehouse/products/?q=coca')
+        self.assertEqual(names, ['Coca-Cola 0.5L', 'Coca-Cola 1.5L'])
+
+    def test_cyrillic_query_matches_latin_name(self):
+        """Kirillcha so'rov lotincha nomni topadi."""
+        self.assertEqual(self._names('/api/v1/warehouse/products/?q=ўзбек'), ["O'zbekiston choy"])
+
+    def test_multi_word_query(self):
+        """Har bir so'z nomdagi biror so'z boshida bo'lishi kerak."""
+        self.assertEqual(self._names('/api/v1/warehouse/products/?q=coca 1'), ['Coca-Cola 1.5L'])
+
+    def test_barcode_exact_ranked_first(self):
+        """Barcode aniq moslik birinchi, prefiks — keyin."""
+        names = self._names('/api/v1/warehouse/products/?q=4870001000028')
+        self.assertEqual(names, ['Coca-Cola 1.5L'])
+        names = self._names('/api/v1/warehouse/products/?q=4870001')
+        self.assertEqual(set(names), {'Coca-Cola 0.5L', 'Coca-Cola 1.5L'})
+
+    def test_limit(self):
+        """?limit= natijalar sonini cheklaydi."""
+        response = self.client.get('/api/v1/warehouse/products/?q=co&limit=2')
+        self.assertEqual(len(response.data['results']), 2)
+        self.assertEqual(response.data['count'], 2)
+
+    def test_autocomplete_index_matches_db_search(self):
+        """Xotiradagi prefiks indeksi DB qidiruvi bilan bir xil tartib beradi."""
+        from django.test import override_settings
+        for q in ('coca', 'cola', '4870001', 'чой'):
+            indexed = [r['name'] for r in self.client.get(f'/api/v1/warehouse/products/autocomplete/?q={q}').data['results']]
+            with override_settings(PRODUCT_SEARCH_INDEX_ENABLED=False):
+                db_rows = [r['name'] for r in self.client.get(f'/api/v1/warehouse/products/autocomplete/?q={q}').data['results']]
+            self.assertEqual(indexed, db_rows, q)
+
+    def test_autocomplete_index_refreshed_on_save(self):
+        """Mahsulot yaratilganda/o'chirilganda indeks yangilanadi."""
+        url = '/api/v1/warehouse/products/autocomplete/?q=sprite'
+        self.assertEqual(self.client.get(url).data['results'], [])
+        product = Product.objects.create(store=self.store, name='Sprite 1L', barcode='4870005000011')
+        self.assertEqual([r['id'] for r in self.client.get(url).data['results']], [product.id])
+        product.delete()
+        self.assertEqual(self.client.get(url).data['results'], [])
+
+
+# ============================================================
+# 3. YETKAZIB BERUVCHI DAFTARI (SupplierLedgerEntry)
+# ============================================================
+
+class SupplierLedgerTest(WarehouseTestMixin, APITestCase):
+    """debt_balance — daftarning keshi; to'lovlar eng eski kirimni birinchi yopadi."""
+
+    def setUp(self):
+        super().setUp()
+        self.warehouse = Warehouse.objects.create(store=self.store, name='Asosiy ombor')
+        self.product   = self._make_products(1)[0]
+        self.supplier  = Supplier.objects.create(store=self.store, name='Ulgurji savdo')
+
+    def _receive(self, quantity, unit_cost) -> int:
+        response = self.client.post('/api/v1/warehouse/movements/', {
+            'product': self.product.id, 'warehouse': self.warehouse.id, 'movement_type': 'in',
+            'quantity': str(quantity), 'unit_cost': str(unit_cost), 'supplier': self.supplier.id,
+        }, format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+        return response.data['data']['id']
+
+    def _pay(self, amount):
+        response = self.client.post('/api/v1/warehouse/supplier-payments/', {
+            'supplier': self.supplier.id, 'amount': str(amount), 'payment_type': 'cash',
+        }, format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+
+    def _open_amounts(self) -> list:
+        return list(
+            SupplierLedgerEntry.objects.filter(supplier=self.supplier, entry_type='receipt')
+            .values_list('open_amount', flat=True)
+        )
+
+    def test_payment_settles_oldest_receipt_first(self):
+        """Ikki kirim + to'lov: birinchi kirim yopiladi, ikkinchisidan qoladi."""
+        self._receive(10, 100)   # 1000
+        self._receive(5, 100)    #  500
+        self._pay(1200)
+
+        self.supplier.refresh_from_db()
+        self.assertEqual(self.supplier.debt_balance, Decimal('300'))
+        self.assertEqual(self._open_amounts(), [Decimal('0'), Decimal('300')])
+        balances = list(SupplierLedgerEntry.objects.filter(supplier=self.supplier).values_list('balance', flat=True))
+        self.assertEqual(balances, [Decimal('1000'), Decimal('1500'), Decimal('300')])
+        self.assertEqual(SupplierLedgerEntry.verify_balances(self.store.id), [])
+
+    def test_prepayment_reduces_next_receipt(self):
+        """Oldindan to'lov (manfiy qoldiq) keyingi kirimning ochiq qismini kamaytiradi."""
+        self._pay(100)
+        self._receive(5, 100)
+        self.assertEqual(self._open_amounts(), [Decimal('400')])
+
+    def test_aging_single_grouped_query(self):
+        """Aging: ochiq kirimlar kirim sanasi bo'yicha, bitta so'rov."""
+        old_id = self._receive(10, 100)
+        self._receive(2, 100)
+        SupplierLedgerEntry.objects.filter(movement_id=old_id).update(
+            created_on=timezone.now() - timedelta(days=75),
+        )
+        self._pay(400)   # eski kirimdan 400 yopiladi → 600 qoladi
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/api/v1/warehouse/suppliers/aging/')
+        self.assertEqual(response.status_code, 200, response.data)
+        row = response.data['results'][0]
+        self.assertEqual((row['days_0_30'], row['days_61_90'], row['total']), (Decimal('200'), Decimal('600'), Decimal('800')))
+        self.assertEqual(response.data['totals']['total'], Decimal('800'))
+        ledger_queries = [q for q in ctx.captured_queries if 'warehouse_supplierledgerentry' in q['sql']]
+        self.assertEqual(len(ledger_queries), 1)
+
+    def test_verify_detects_and_fixes_drift(self):
+        """Kesh qo'lda buzilsa — verify topadi, task tuzatadi."""
+        from warehouse.tasks import verify_supplier_ledger
+        self._receive(3, 100)
+        Supplier.objects.filter(pk=self.supplier.pk).update(debt_balance=Decimal('999'))
+        self.assertEqual(len(SupplierLedgerEntry.verify_balances(self.store.id)), 1)
+        result = verify_supplier_ledger(store_id=self.store.id, fix=True)
+        self.assertEqual(result['fixed'], 1)
+        self.supplier.refresh_from_db()
+        self.assertEqual(self.supplier.debt_balance, Decimal('300'))
+
+    def test_statement_streamed_csv(self):
+        """Dalolatnoma: boshlang'ich qoldiq, yozuvlar, yakuniy qoldiq — oqimli CSV."""
+        self._subscribe(has_export=True)
+        self._receive(10, 100)
+        self._pay(250)
+        response = self.client.get(f'/api/v1/export/suppliers/{self.supplier.id}/statement/')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        lines = b''.join(response.streaming_content).decode('utf-8-sig').splitlines()
+        self.assertEqual(len(lines), 1 + 2 + 2 + 1)
+        self.assertTrue(lines[-1].endswith(',750.00,'))
+
+
+# ============================================================
+# 4. HARAKATLAR — BULK DVIGATEL
+# ============================================================
+
+class BulkMovementTest(WarehouseTestMixin, APITestCase):
+    """Kirim/chiqim paketi: partiya, FIFO tannarx, AVCO, supplier qarzi — so'rovlar qatorlarga bog'liq emas."""
+
+    URL = '/api/v1/warehouse/movements/bulk/'
+
+    def setUp(self):
+        super().setUp()
+        self.warehouse = Warehouse.objects.create(store=self.store, name='Asosiy ombor')
+        self.supplier  = Supplier.objects.create(store=self.store, name='Maysara')
+        self.products  = self._make_products(2)
+
+    def _post(self, movement_type: str, items: list, expected: int = 201):
+        response = self.client.post(self.URL, {
+            'movement_type': movement_type, 'warehouse': self.warehouse.id, 'items': items,
+        }, format='json')
+        self.assertEqual(response.status_code, expected, getattr(response, 'data', None))
+        return response
+
+    def test_in_then_out_fifo_avco_and_supplier_debt(self):
+        first, second = self.products
+        self._post('in', [
+            {'product': first.id, 'quantity': '10', 'unit_cost': '100', 'supplier': self.supplier.id},
+            {'product': first.id, 'quantity': '10', 'unit_cost': '200', 'supplier': self.supplier.id},
+            {'product': second.id, 'quantity': '4', 'unit_cost': '50'},
+        ])
+
+        batches = list(StockBatch.objects.filter(product=first).order_by('id'))
+        self.assertEqual([b.qty_left for b in batches], [Decimal('10'), Decimal('10')])
+        self.assertEqual(len({b.batch_code for b in StockBatch.objects.all()}), 3)
+        first.refresh_from_db()
+        self.assertEqual(first.purchase_price, Decimal('150'))
+
+        self.supplier.refresh_from_db()
+        self.assertEqual(self.supplier.debt_balance, Decimal('3000'))
+        entries = SupplierLedgerEntry.objects.filter(supplier=self.supplier).order_by('id')
+        self.assertEqual([e.balance for e in entries], [Decimal('1000'), Decimal('3000')])
+        self.assertTrue(all(e.movement_id for e in entries))
+
+        # Chiqim: 15 = 10×100 + 5×200 → o'rtacha 133.33
+        response = self._post('out', [{'product': first.id, 'quantity': '15'}])
+        out = StockMovement.objects.get(pk=response.data['data'][0]['id'])
+        self.assertEqual(out.unit_cost, Decimal('133.33'))
+        self.assertEqual(
+            [b.qty_left for b in StockBatch.objects.filter(product=first).order_by('id')],
+            [Decimal('0'), Decimal('5')],
+        )
+        self.assertEqual(Stock.objects.get(product=first, warehouse=self.warehouse).quantity, Decimal('5'))
+
+    def test_shortage_rolls_back_whole_request(self):
+        first, second = self.products
+        self._post('in', [{'product': first.id, 'quantity': '3', 'unit_cost': '10'}])
+
+        response = self._post('out', [
+            {'product': first.id, 'quantity': '2'},
+            {'product': second.id, 'quantity': '1'},
+        ], expected=400)
+        self.assertIn('items[2]', response.data)
+        self.assertEqual(StockMovement.objects.filter(movement_type='out').count(), 0)
+        self.assertEqual(Stock.objects.get(product=first, warehouse=self.warehouse).quantity, Decimal('3'))
+
+    def test_in_without_store_skips_batches(self):
+        """store=None (superuser) — partiya/AVCO yo'q, qoldiq va supplier qarzi yoziladi (_apply_movement kabi)."""
+        from django.db import transaction
+        from .movements import MovementLine, apply_movements
+
+        first = self.products[0]
+        with transaction.atomic():
+            result = apply_movements([MovementLine(
+                product=first, movement_type='in', quantity=Decimal('2'),
+                warehouse=self.warehouse, unit_cost=Decimal('100'), supplier=self.supplier,
+            )], store=None)
+        self.assertEqual(len(result.movements), 1)
+        self.assertFalse(StockBatch.objects.exists())
+        self.assertEqual(Stock.objects.get(product=first, warehouse=self.warehouse).quantity, Decimal('2'))
+        self.supplier.refresh_from_db()
+        self.assertEqual(self.supplier.debt_balance, Decimal('200'))
+
+    def test_import_uses_engine_and_queries_do_not_scale(self):
+        from export.views import MOVEMENT_HEADERS
+
+        self._subscribe(has_export=True)
+        self._make_products(60)
+        url = '/api/v1/export/stock-movements/import/'
+
+        def rows(start, count):
+            return [
+                [f"Mahsulot {i:03d}", '2', 'in', 'Asosiy ombor', 'warehouse', '1000', 'Maysara', '']
+                for i in range(start, start + count)
+            ]
+
+        _, small = self._upload(url, MOVEMENT_HEADERS, rows(2, 5))
+        _, large = self._upload(url, MOVEMENT_HEADERS, rows(7, 55))
+        self.assertEqual(small, large)
+
+        # Shu faylda kirim + undan chiqim; qoldiq yetmagan chiqim — qator xatosi
+        data, _ = self._upload(url, MOVEMENT_HEADERS, [
+            ['Mahsulot 000', '4', 'in', 'Asosiy ombor', 'warehouse', '500', 'Maysara', ''],
+            ['Mahsulot 000', '3', 'out', 'Asosiy ombor', 'warehouse', '', '', ''],
+            ['Mahsulot 001', '1', 'out', 'Asosiy ombor', 'warehouse', '', '', ''],
+        ])
+        self.assertEqual(data['created'], 2)
+        self.assertEqual([e['row'] for e in data['errors']], [4])
+
+        out = StockMovement.objects.get(product=self.products[0], movement_type='out')
+        self.assertEqual(out.unit_cost, Decimal('500'))
+        self.supplier.refresh_from_db()
+        self.assertEqual(self.supplier.debt_balance, Decimal('2000') * 60 + Decimal('2000'))
+
+
+# ============================================================
+# 5. YORLIQLAR — KESH, ETAG, OQIMLI ZIP, PDF VARAQ
+# ============================================================
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class LabelTest(WarehouseTestMixin, APITestCase):
+    """QR/EAN-13 rasmlari keshlanadi (ETag → 304), bulk-qr oqimli ZIP yoki PDF stiker varag'i."""
+
+    def setUp(self):
+        super().setUp()
+        from django.core.cache import cache
+        cache.clear()
+        self.products = self._make_products(5)
+
+    def test_single_label_cached_with_etag(self):
+        from django.core.cache import cache
+        from warehouse.labels import EAN13, QR, label_spec
+
+        product  = self.products[0]
+        url      = f'/api/v1/warehouse/products/{product.id}/qr/?size=4'
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.content.startswith(b'\x89PNG'))
+        self.assertIsNotNone(cache.get(label_spec(product.barcode, QR, 'png', 4).cache_key))
+
+        etag = response['ETag']
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+        self.assertNotEqual(self.client.get(f'/api/v1/warehouse/products/{product.id}/qr/').get('ETag'), etag)
+
+        response = self.client.get(f'/api/v1/warehouse/products/{product.id}/barcode/?format=svg')
+        self.assertEqual(response['Content-Type'], 'image/svg+xml')
+        self.assertIsNotNone(cache.get(label_spec(product.barcode, EAN13, 'svg').cache_key))
+        self.assertEqual(
+            self.client.get(f'/api/v1/warehouse/products/{product.id}/barcode/?size=5000').status_code, 400,
+        )
+
+    @override_settings(LABEL_RENDER_WORKERS=2, LABEL_POOL_MIN_BATCH=2)
+    def test_bulk_qr_streamed_zip_rendered_in_pool(self):
+        import zipfile
+
+        ids      = [p.id for p in self.products]
+        response = self.client.post('/api/v1/warehouse/products/bulk-qr/', {'product_ids': ids, 'copies': 3}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+
+        archive = zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
+        self.assertEqual(sorted(archive.namelist()), sorted(f"{p.name}_x3.png" for p in self.products))
+        self.assertTrue(all(archive.read(name).startswith(b'\x89PNG') for name in archive.namelist()))
+
+    def test_bulk_qr_pdf_sticker_sheet(self):
+        import re
+
+        ids      = [p.id for p in self.products]
+        response = self.client.post('/api/v1/warehouse/products/bulk-qr/', {
+            'product_ids': ids, 'copies': 3, 'output': 'pdf', 'per_page': 12, 'code': 'ean13',
+        }, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+        self.assertEqual(len(re.findall(rb'/Type /Page\b', response.content)), 2)   # 15 stiker / 12
+
+        response = self.client.post('/api/v1/warehouse/products/bulk-qr/', {
+            'product_ids': ids, 'output': 'pdf', 'per_page': 7,
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
+
+
+# ============================================================
+# 6. VALYUTA KURSLARI — JARAYON KESHI, KONVERTATSIYA
+# ============================================================
+
+class ExchangeRateCacheTest(WarehouseTestMixin, APITestCase):
+    """Kurslar jadvali sana bo'yicha jarayonda; show_*_price bo'yicha narxlar sahifa uchun bir o'tishda."""
+
+    def setUp(self):
+        super().setUp()
+        from warehouse.rates import invalidate_rates
+        from .models import Currency, ExchangeRate
+
+        invalidate_rates()
+        self.addCleanup(invalidate_rates)
+        self.usd = Currency.objects.get(code='USD')
+        ExchangeRate.objects.create(
+            currency=self.usd, rate=Decimal('12650'), date=timezone.localdate() - timedelta(days=1),
+        )
+
+    def test_rate_table_cached_until_rate_written(self):
+        from warehouse.utils import get_today_rate
+        from .models import ExchangeRate
+
+        self.assertEqual(get_today_rate('USD'), 12650.0)   # kechagi kurs — oxirgi mavjud
+        with self.assertNumQueries(0):
+            self.assertEqual(get_today_rate('usd'), 12650.0)
+            self.assertEqual(get_today_rate('UZS'), 1.0)
+            self.assertIsNone(get_today_rate('EUR'))
+
+        ExchangeRate.objects.create(currency=self.usd, rate=Decimal('12700'), date=timezone.localdate())
+        self.assertEqual(get_today_rate('USD'), 12700.0)
+
+        response = self.client.get(f'/api/v1/warehouse/currencies/{self.usd.id}/')
+        self.assertEqual(response.data['latest_rate'], {'rate': '12700.0000', 'date': str(timezone.localdate())})
+
+    def test_product_list_converted_prices_follow_store_flags(self):
+        from store.models import StoreSettings
+
+        uzs_product = self._make_products(1)[0]
+        Product.objects.filter(pk=uzs_product.pk).update(sale_price=Decimal('126500'))
+        usd_product = self._make_products(1)[0]
+        Product.objects.filter(pk=usd_product.pk).update(sale_price=Decimal('2.5'), price_currency=self.usd)
+
+        results = self.client.get('/api/v1/warehouse/products/').data['results']
+        self.assertTrue(all(row['converted_prices'] == {} for row in results))
+
+        StoreSettings.objects.filter(store=self.store).update(show_usd_price=True, show_eur_price=True)
+        results = {row['id']: row for row in self.client.get('/api/v1/warehouse/products/').data['results']}
+        small   = self._count_queries('/api/v1/warehouse/products/')   # jadval allaqachon jarayonda
+        self.assertEqual(results[uzs_product.id]['converted_prices'], {'USD': '10.00', 'EUR': None})
+        self.assertEqual(results[usd_product.id]['converted_prices'], {'USD': '2.50', 'EUR': None})
+
+        self._make_products(6)
+        self.assertEqual(self._count_queries('/api/v1/warehouse/products/'), small)
+
+        detail = self.client.get(f'/api/v1/warehouse/products/{usd_product.id}/').data
+        self.assertEqual(detail['converted_prices'], {'USD': '2.50', 'EUR': None})
@@ -4,15 +4,23 @@ WAREHOUSE APP — Yordamchi funksiyalar
 ============================================================
 Funksiyalar:
   generate_unique_barcode(store_id)  — EAN-13 barcode generatsiya
+  allocate_barcodes(store_id, count) — EAN-13 barcode bloki (import uchun)
   get_barcode_image(barcode_value)   — PNG rasm qaytaradi
   get_barcode_svg(barcode_value)     — SVG qaytaradi
   get_today_rate(currency_code)      — Bugungi valyuta kursini olish
   generate_batch_code(store)         — FIFO partiya kodi generatsiya
+  allocate_batch_codes(store, count) — partiya kodlari bloki (bulk kirim uchun)
   fifo_deduct(product, loc_kwargs, qty_needed) — FIFO bo'yicha partiyadan yechib olish
+  search_products(qs, q)             — reytingli mahsulot qidiruvi (nom/barcode)
+  product_prefix_index               — do'kon bo'yicha xotiradagi autocomplete indeksi
 """
 
+import itertools
 from decimal import Decimal
-from io import BytesIO
+
+from django.conf import settings
+
+from config.search_utils import PrefixIndexRegistry, ranked_search
 
 
 # ============================================================
@@ -35,9 +43,12 @@ def _ean13_check_digit(code_12: str) -> str:
     return str(check)
 
 
-def generate_unique_barcode(store_id: int) -> str:
+BARCODE_MAX_SEQ = 99999
+
+
+def allocate_barcodes(store_id: int, count: int, reserved=()) -> list[str]:
     """
-    Do'kon uchun unikal EAN-13 barcode generatsiya qilish.
+    Do'kon uchun ketma-ket `count` ta unikal EAN-13 barcode (blok).
 
     Format (13 raqam):
       20XXXXXYYYYY C
@@ -47,11 +58,17 @@ def generate_unique_barcode(store_id: int) -> str:
         │     └─────── 5 ta do'kon ID (00001-99999)
         └───────────── GS1 in-store prefix "20"
 
+    Mavjud maksimal ketma-ketlik raqami bitta so'rovda topiladi, blok undan
+    keyin ajratiladi — import minglab mahsulotga bitta so'rov bilan barcode beradi.
+    reserved — hali saqlanmagan, lekin band barcodelar (masalan, import faylidagilar).
     Natija: Hech qachon real GS1 mahsulot barcodeiga to'qnashmaydi.
     Maksimal: har bir do'kon uchun 99,999 ta barcode.
     """
     from .models import Product
 
+    if count <= 0:
+        return []
+
     prefix = f"20{store_id:05d}"  # 7 ta raqam: "20" + 5 ta store_id
 
     # Mavjud barcodelardan maksimal ketma-ketlik raqamini topish
@@ -63,7 +80,7 @@ def generate_unique_barcode(store_id: int) -> str:
     )
 
     max_seq = 0
-    for bc in existing_barcodes:
+    for bc in itertools.chain(existing_barcodes, (r for r in reserved if r and r.startswith(prefix))):
         try:
             # 7-12 pozitsiyalar — 5 ta ketma-ketlik raqami
             seq = int(str(bc)[7:12])
@@ -72,74 +89,40 @@ def generate_unique_barcode(store_id: int) -> str:
         except (ValueError, IndexError):
             pass
 
-    next_seq = max_seq + 1
-    if next_seq > 99999:
+    if max_seq + count > BARCODE_MAX_SEQ:
         raise ValueError(
             f"Do'kon {store_id} uchun barcode limiti to'ldi (maksimal: 99,999)."
         )
 
-    # 12 ta raqam (check digit qo'shilmagan)
-    code_12 = f"{prefix}{next_seq:05d}"
-    check   = _ean13_check_digit(code_12)
+    barcodes = []
+    for seq in range(max_seq + 1, max_seq + count + 1):
+        # 12 ta raqam (check digit qo'shilmagan)
+        code_12 = f"{prefix}{seq:05d}"
+        barcodes.append(f"{code_12}{_ean13_check_digit(code_12)}")  # 13 ta raqam
+    return barcodes
 
-    return f"{code_12}{check}"  # 13 ta raqam
+
+def generate_unique_barcode(store_id: int) -> str:
+    """Do'kon uchun bitta unikal EAN-13 barcode (allocate_barcodes ga qarang)."""
+    return allocate_barcodes(store_id, 1)[0]
 
 
 def get_barcode_image(barcode_value: str) -> bytes:
     """
-    Barcode PNG rasmi generatsiya qilish.
-    python-barcode + Pillow ishlatiladi.
-
-    Qaytaradi: PNG format bytes
+    Barcode PNG rasmi (300 dpi) — warehouse.labels orqali, keshlangan.
+    Qaytaradi: PNG format bytes. Xato — ValueError.
     """
-    try:
-        import barcode as barcode_lib
-        from barcode.writer import ImageWriter
-
-        # EAN-13: 12 ta raqam berish kerak (check digit auto qo'shiladi)
-        code_12 = barcode_value[:12] if len(barcode_value) == 13 else barcode_value
-
-        writer = ImageWriter()
-        ean = barcode_lib.get('ean13', code_12, writer=writer)
-
-        output = BytesIO()
-        ean.write(output, options={
-            'write_text': True,
-            'font_size':  10,
-            'text_distance': 5,
-            'quiet_zone': 6,
-            'dpi': 300,
-        })
-        output.seek(0)
-        return output.read()
-
-    except Exception as e:
-        raise ValueError(f"Barcode PNG generatsiya xatosi: {e}")
+    from .labels import EAN13, PNG, label_spec, get_label
+    return get_label(label_spec(barcode_value, EAN13, PNG))
 
 
 def get_barcode_svg(barcode_value: str) -> bytes:
     """
-    Barcode SVG generatsiya qilish.
-    python-barcode ishlatiladi (Pillow shart emas).
-
-    Qaytaradi: SVG format bytes
+    Barcode SVG — warehouse.labels orqali, keshlangan (Pillow shart emas).
+    Qaytaradi: SVG format bytes. Xato — ValueError.
     """
-    try:
-        import barcode as barcode_lib
-        from barcode.writer import SVGWriter
-
-        code_12 = barcode_value[:12] if len(barcode_value) == 13 else barcode_value
-
-        writer = SVGWriter()
-        ean    = barcode_lib.get('ean13', code_12, writer=writer)
-
-        output = BytesIO()
-        ean.write(output)
-        output.seek(0)
-        return output.read()
-
-    except Exception as e:
-        raise ValueError(f"Barcode SVG generatsiya xatosi: {e}")
+    from .labels import EAN13, SVG, label_spec, get_label
+    return get_label(label_spec(barcode_value, EAN13, SVG))
 
 
 # ============================================================
@@ -153,52 +136,26 @@ def get_today_rate(currency_code: str) -> float | None:
     UZS uchun → 1.0 qaytaradi.
     Topilmasa → None qaytaradi.
 
+    Kurslar warehouse.rates jadvalidan (jarayon keshi) — odatda so'rovsiz.
+
     Ishlatish:
       rate = get_today_rate('USD')
       if rate:
           uzs_price = usd_price * rate
     """
-    if currency_code.upper() == 'UZS':
-        return 1.0
+    from .rates import get_rate_table
 
-    from .models import ExchangeRate
-    from django.utils import timezone
-
-    today = timezone.now().date()
-
-    # Bugungi kurs
-    rate_obj = (
-        ExchangeRate.objects
-        .filter(currency__code=currency_code.upper(), date=today)
-        .select_related('currency')
-        .first()
-    )
-
-    if rate_obj:
-        return float(rate_obj.rate)
-
-    # Oxirgi mavjud kurs
-    last_rate = (
-        ExchangeRate.objects
-        .filter(currency__code=currency_code.upper())
-        .select_related('currency')
-        .order_by('-date')
-        .first()
-    )
-
-    if last_rate:
-        return float(last_rate.rate)
-
-    return None
+    rate = get_rate_table().rate(currency_code)
+    return float(rate) if rate is not None else None
 
 
 # ============================================================
 # FIFO PARTIYA KODI GENERATSIYA
 # ============================================================
 
-def generate_batch_code(store) -> str:
+def allocate_batch_codes(store, count: int) -> list[str]:
     """
-    Do'kon uchun FIFO partiya kodi generatsiya qilish.
+    Do'kon uchun bugungi `count` ta ketma-ket FIFO partiya kodi (bulk kirim uchun).
 
     Format: S{store_id}-{YY}-{MM}-{DD}-{seq:04d}
     Misol:  S1-26-03-10-0001
@@ -206,17 +163,13 @@ def generate_batch_code(store) -> str:
       26-03-10 — 2026-yil 10-mart (qisqa sana formati)
       0001   — shu kun uchun birinchi partiya
 
-    Eski format: {DO'KON[:5].upper()}-YY-MM-DD-seq — bir xil nomdagi
-    do'konlar to'qnashishi mumkin edi. Yangi format store.id orqali
-    har doim unikal.
-
-    Thread-safe: select_for_update() + transaction.atomic() ichida ishlaydi.
+    Bitta so'rov: bugungi oxirgi kod qulflanadi (select_for_update), qolgani
+    xotirada hisoblanadi. 9999 dan oshsa seq 5 xonali bo'ladi — oxirgi kod
+    uzunlik + qiymat bo'yicha olinadi, shuning uchun tartib buzilmaydi.
     Kod benzersizligi: unique=True bilan DB darajasida kafolatlanadi.
-
-    Maksimal kuniga: 9999 ta partiya (bir do'kon uchun).
     """
     from django.db import transaction
-    from django.db.models import Q
+    from django.db.models.functions import Length
     from django.utils import timezone
     from .models import StockBatch
 
@@ -224,24 +177,33 @@ def generate_batch_code(store) -> str:
     prefix = f"S{store.id}-{today.strftime('%y-%m-%d')}-"
 
     with transaction.atomic():
-        # Bugungi kundagi so'nggi partiyani toping (select_for_update — thread-safe)
         last = (
             StockBatch.objects
             .filter(batch_code__startswith=prefix)
             .select_for_update()
-            .order_by('-batch_code')
+            .order_by(Length('batch_code').desc(), '-batch_code')
+            .values_list('batch_code', flat=True)
             .first()
         )
-        if last:
-            # Oxirgi ketma-ketlik raqamini ajratib oling va 1 ga oshiring
-            try:
-                seq = int(last.batch_code.rsplit('-', 1)[1]) + 1
-            except (ValueError, IndexError):
-                seq = 1
-        else:
-            seq = 1
+        try:
+            seq = int(last.rsplit('-', 1)[1]) if last else 0
+        except (ValueError, IndexError):
+            seq = 0
+
+        return [f"{prefix}{n:04d}" for n in range(seq + 1, seq + count + 1)]
+
+
+def generate_batch_code(store) -> str:
+    """
+    Do'kon uchun bitta FIFO partiya kodi — allocate_batch_codes(store, 1).
+
+    Eski format: {DO'KON[:5].upper()}-YY-MM-DD-seq — bir xil nomdagi
+    do'konlar to'qnashishi mumkin edi. Yangi format store.id orqali
+    har doim unikal.
 
-        return f"{prefix}{seq:04d}"
+    Thread-safe: select_for_update() + transaction.atomic() ichida ishlaydi.
+    """
+    return allocate_batch_codes(store, 1)[0]
 
 
 # ============================================================
@@ -301,3 +263,42 @@ def fifo_deduct(product, location_kwargs: dict, qty_needed: Decimal):
         remaining -= use
 
     return deductions, total_cost
+
+
+# ============================================================
+# MAHSULOT QIDIRUVI
+# ============================================================
+
+def search_products(queryset, q: str):
+    """
+    Mahsulotlarni nom (search_name) va barcode prefiksi bo'yicha reytingli qidirish.
+    Tartib: barcode aniq > barcode prefiks > nom aniq > nom boshi > so'z boshi > trigram.
+    """
+    return ranked_search(queryset, q, name_field='search_name', code_field='barcode')
+
+
+def _load_product_index_entries(store_id: int):
+    """PrefixIndex uchun do'konning faol mahsulotlari (bitta .values() so'rovi)."""
+    from .models import Product
+    rows = (
+        Product.objects
+        .filter(store_id=store_id, status='active')
+        .values_list('id', 'name', 'search_name', 'barcode', 'sale_price', 'unit')
+        .iterator(chunk_size=5000)
+    )
+    for obj_id, name, search_name, barcode, sale_price, unit in rows:
+        yield obj_id, search_name, barcode, {
+            'id':         obj_id,
+            'name':       name,
+            'barcode':    barcode,
+            'sale_price': sale_price,
+            'unit':       unit,
+        }
+
+
+# Mahsulot o'zgarganda warehouse/signals.py invalidate() chaqiradi
+product_prefix_index = PrefixIndexRegistry(
+    'product_prefix_index',
+    _load_product_index_entries,
+    ttl=getattr(settings, 'PRODUCT_SEARCH_INDEX_TTL', 300),
+)
@@ -7,7 +7,7 @@ ViewSet'lar:
   SubCategoryViewSet    — Subkategoriyalarni boshqarish (BOSQICH 1.1)
   CurrencyViewSet       — Valyutalarni boshqarish (BOSQICH 1.3)
   ExchangeRateViewSet   — Valyuta kurslarini boshqarish (BOSQICH 1.3)
-  ProductViewSet        — Mahsulotlarni boshqarish + barcode_image action (BOSQICH 1.2)
+  ProductViewSet        — Mahsulotlarni boshqarish + barcode_image / qr / bulk_qr (warehouse/labels.py)
   WarehouseViewSet      — Omborlarni boshqarish (BOSQICH 6)
   StockViewSet          — Ombor qoldiqlarini boshqarish (branch|warehouse)
   StockMovementViewSet  — Kirim/chiqim harakatlarini boshqarish (branch|warehouse, FIFO)
@@ -30,12 +30,13 @@ StockMovement:
   OUT harakatda FIFO dan narx hisoblanadi → unit_cost saqlashadi.
 """
 
+from datetime import timedelta
 from decimal import Decimal
 
 from django.conf import settings
 from django.db import transaction
-from django.db.models import F, Sum
-from django.http import HttpResponse
+from django.db.models import F, OuterRef, Prefetch, Sum
+from django.http import HttpResponse, StreamingHttpResponse
 from django.utils import timezone
 
 from rest_framework import status, viewsets
@@ -54,7 +55,8 @@ from accaunt.permissions import (
     WarehouseLimitPermission,
 )
 
-from config.cache_utils import get_store_settings
+from config.query_utils import SubqueryCount, SubquerySum, parse_day_start
+from config.tenant import get_request_tenant
 
 from .models import (
     AuditStatus,
@@ -71,12 +73,26 @@ from .models import (
     StockMovement,
     SubCategory,
     Supplier,
+    SupplierLedgerEntry,
+    SupplierLedgerEntryType,
     SupplierPayment,
     Transfer,
     TransferStatus,
     Warehouse,
     WastageRecord,
 )
+from .labels import (
+    EAN13,
+    QR,
+    SHEET_LAYOUTS,
+    LabelSpec,
+    get_label,
+    label_spec,
+    render_many,
+    render_sticker_sheet,
+    stream_zip,
+)
+from .movements import MovementLine, apply_movements
 from .serializers import (
     CategoryCreateSerializer,
     CategoryDetailSerializer,
@@ -113,6 +129,7 @@ from .serializers import (
     SubCategoryUpdateSerializer,
     SupplierCreateSerializer,
     SupplierDetailSerializer,
+    SupplierLedgerEntrySerializer,
     SupplierListSerializer,
     SupplierPaymentSerializer,
     SupplierUpdateSerializer,
@@ -171,7 +188,21 @@ class CategoryViewSet(AuditMixin, viewsets.ModelViewSet):
         worker = getattr(self.request.user, 'worker', None)
         if not worker or not worker.store:
             return Category.objects.none()
-        return Category.objects.filter(store=worker.store).order_by('status', 'name')
+        # Sonlar annotatsiya orqali — har bir qator uchun COUNT so'rovi yo'q
+        return (
+            Category.objects
+            .filter(store=worker.store)
+            .select_related('store')
+            .annotate(
+                product_count=SubqueryCount(
+                    Product.objects.filter(category=OuterRef('pk'))
+                ),
+                subcategory_count=SubqueryCount(
+                    SubCategory.objects.filter(category=OuterRef('pk'))
+                ),
+            )
+            .order_by('status', 'name')
+        )
 
     def get_serializer_context(self):
         context = super().get_serializer_context()
@@ -285,7 +316,11 @@ class SubCategoryViewSet(AuditMixin, viewsets.ModelViewSet):
         qs = SubCategory.objects.filter(
             store=worker.store,
             category__status='active'
-        ).select_related('category', 'store')
+        ).select_related('category', 'store').annotate(
+            product_count=SubqueryCount(
+                Product.objects.filter(subcategory=OuterRef('pk'))
+            ),
+        )
 
         # Kategoriya bo'yicha filter
         category_id = self.request.query_params.get('category')
@@ -517,6 +552,19 @@ class ExchangeRateViewSet(AuditMixin, viewsets.ModelViewSet):
         )
 
 
+def _label_response(request, spec, disposition: str) -> HttpResponse:
+    """Yorliq rasmi (keshdan) + ETag; If-None-Match mos kelsa — 304, rasm o'qilmaydi ham."""
+    etag = f'"{spec.etag}"'
+    if etag in request.headers.get('If-None-Match', ''):
+        response = HttpResponse(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        response = HttpResponse(get_label(spec), content_type=spec.content_type)
+        response['Content-Disposition'] = disposition
+    response['ETag']          = etag
+    response['Cache-Control'] = f'private, max-age={settings.LABEL_CACHE_TTL}'
+    return response
+
+
 # ============================================================
 # MAHSULOT VIEWSET (BOSQICH 1.2 — barcode action qo'shildi)
 # ============================================================
@@ -532,6 +580,7 @@ class ProductViewSet(AuditMixin, viewsets.ModelViewSet):
       PATCH  /api/v1/warehouse/products/{id}/           — yangilash (manager+)
       DELETE /api/v1/warehouse/products/{id}/           — o'chirish (manager+, hard delete)
       GET    /api/v1/warehouse/products/{id}/barcode/   — barcode PNG rasm (BOSQICH 1.2)
+      GET    /api/v1/warehouse/products/autocomplete/   — xotiradagi prefiks qidiruv (kassa)
 
     Barcode (BOSQICH 1.2):
       - Yaratishda barcode yuborilmasa → EAN-13 AUTO-GENERATE (prefix 2XXXXX)
@@ -539,20 +588,30 @@ class ProductViewSet(AuditMixin, viewsets.ModelViewSet):
       - Format: 20 + store_id(5) + seq(5) + check(1) = 13 ta raqam
 
     Filter/Search:
-      ?search=mahsulot_nomi
+      ?q=coca         — reytingli qidiruv (nom/barcode), ?limit= bilan, sahifalanmaydi
+      ?search=coca    — ?q= bilan bir xil (eski nom)
       ?category=<id>
       ?subcategory=<id>
       ?status=active
+
+    Qidiruv reytingi (config/search_utils.py):
+      barcode aniq > barcode prefiks > nom aniq > nom boshi > so'z boshi > trigram (PG)
+      Nom kirill/lotin farqisiz: "кола" == "kola".
     """
     http_method_names = ['get', 'post', 'patch', 'delete']
 
     def get_permissions(self):
-        if self.action in ('list', 'retrieve', 'barcode_image', 'qr', 'scan'):
+        if self.action in ('list', 'retrieve', 'barcode_image', 'qr', 'scan', 'autocomplete'):
             return [IsAuthenticated(), CanAccess('mahsulotlar')]
         if self.action == 'create':
             return [IsAuthenticated(), IsManagerOrAbove(), ProductLimitPermission()]
         return [IsAuthenticated(), IsManagerOrAbove()]
 
+    def perform_content_negotiation(self, request, force=False):
+        # barcode/?format=svg — rasm formati, DRF renderer tanlovi emas
+        # (URL_FORMAT_OVERRIDE='format' sababli aks holda 404)
+        return super().perform_content_negotiation(request, force=force or self.action == 'barcode_image')
+
     def get_serializer_class(self):
         if self.action == 'list':
             return ProductListSerializer
@@ -588,6 +647,14 @@ class ProductViewSet(AuditMixin, viewsets.ModelViewSet):
         if status_val:
             qs = qs.filter(status=status_val)
 
+        # Detail: jami qoldiq bitta subquery bilan (alohida aggregate yo'q)
+        if self.action == 'retrieve':
+            qs = qs.annotate(
+                stock_total=SubquerySum(
+                    Stock.objects.filter(product=OuterRef('pk')), 'quantity'
+                ),
+            )
+
         return qs.order_by('status', 'name')
 
     def get_serializer_context(self):
@@ -666,11 +733,62 @@ class ProductViewSet(AuditMixin, viewsets.ModelViewSet):
             status=status.HTTP_200_OK,
         )
 
+    def list(self, request, *args, **kwargs):
+        """
+        ?q= berilsa — reytingli qidiruv natijalari (?limit= ta, sahifalanmaydi).
+        Javob shakli sahifalangan ro'yxat bilan bir xil (count/next/previous/results).
+        """
+        q = (request.query_params.get('q') or request.query_params.get('search') or '').strip()
+        if not q:
+            return super().list(request, *args, **kwargs)
+
+        from config.search_utils import get_search_limit
+        from .utils import search_products
+
+        products   = search_products(self.get_queryset(), q)[:get_search_limit(request)]
+        serializer = self.get_serializer(products, many=True)
+        return Response({
+            'count':    len(serializer.data),
+            'next':     None,
+            'previous': None,
+            'results':  serializer.data,
+        })
+
+    # ── AUTOCOMPLETE ACTION ──────────────────────────────────
+    @action(methods=['get'], detail=False, url_path='autocomplete')
+    def autocomplete(self, request):
+        """
+        Kassa uchun tezkor qidiruv — har bir harf bosilganda chaqiriladi.
+
+        GET /api/v1/warehouse/products/autocomplete/?q=cola&limit=10
+
+        PRODUCT_SEARCH_INDEX_ENABLED=True bo'lsa — do'konning xotiradagi
+        prefiks indeksidan (DB ga bormasdan), aks holda DB reytingli qidiruvi.
+        Faqat faol mahsulotlar. Javob: {"results": [{id, name, barcode, sale_price, unit}]}
+        """
+        from config.search_utils import get_search_limit
+        from .utils import product_prefix_index, search_products
+
+        q = request.query_params.get('q', '').strip()
+        if not q:
+            return Response({'results': []})
+
+        worker = request.user.worker
+        limit  = get_search_limit(request)
+        if getattr(settings, 'PRODUCT_SEARCH_INDEX_ENABLED', True):
+            results = product_prefix_index.get(worker.store_id).search(q, limit=limit)
+        else:
+            results = list(
+                search_products(Product.objects.filter(store=worker.store, status='active'), q)
+                .values('id', 'name', 'barcode', 'sale_price', 'unit')[:limit]
+            )
+        return Response({'results': results})
+
     # ── BARCODE IMAGE ACTION (BOSQICH 1.2) ──────────────────
     @action(detail=True, methods=['get'], url_path='barcode')
     def barcode_image(self, request, pk=None):
         """
-        Mahsulotning EAN-13 barcode rasmini qaytaradi.
+        Mahsulotning EAN-13 barcode rasmini qaytaradi (warehouse.labels, keshlangan).
 
         GET /api/v1/warehouse/products/{id}/barcode/
         GET /api/v1/warehouse/products/{id}/barcode/?format=svg
@@ -678,9 +796,11 @@ class ProductViewSet(AuditMixin, viewsets.ModelViewSet):
         Parametrlar:
           ?format=png  — PNG rasm (standart, Pillow kerak)
           ?format=svg  — SVG vektor (Pillow shart emas)
+          ?size=300    — PNG dpi (72..600)
 
         Javob:
           Content-Type: image/png  yoki  image/svg+xml
+          ETag — If-None-Match mos kelsa 304 (rasm qayta yuborilmaydi)
         """
         product = self.get_object()
 
@@ -690,24 +810,12 @@ class ProductViewSet(AuditMixin, viewsets.ModelViewSet):
                 status=status.HTTP_404_NOT_FOUND,
             )
 
-        fmt = request.query_params.get('format', 'png').lower()
-
         try:
-            from .utils import get_barcode_image, get_barcode_svg
-
-            if fmt == 'svg':
-                content      = get_barcode_svg(product.barcode)
-                content_type = 'image/svg+xml'
-            else:
-                content      = get_barcode_image(product.barcode)
-                content_type = 'image/png'
-
-            response = HttpResponse(content, content_type=content_type)
-            response['Content-Disposition'] = (
-                f'inline; filename="barcode_{product.barcode}.{fmt}"'
+            spec = label_spec(
+                product.barcode, EAN13,
+                request.query_params.get('format', 'png'), request.query_params.get('size'),
             )
-            return response
-
+            return _label_response(request, spec, f'inline; filename="barcode_{product.barcode}.{spec.fmt}"')
         except ValueError as e:
             return Response(
                 {'error': str(e)},
@@ -718,26 +826,22 @@ class ProductViewSet(AuditMixin, viewsets.ModelViewSet):
     @action(methods=['get'], detail=True, url_path='qr')
     def qr(self, request, pk=None):
         """
-        Mahsulot QR kod rasmi (PNG).
+        Mahsulot QR kod rasmi (PNG, keshlangan + ETag).
         Barcode qiymati QR kodga kodlanadi.
 
         GET /api/v1/warehouse/products/{id}/qr/
+          ?size=10 — modul o'lchami pikselda (2..20)
         """
-        import io
-        import qrcode as qrcode_lib
-
         product  = self.get_object()
         code_val = product.barcode or str(product.pk)
 
-        qr_img  = qrcode_lib.make(code_val)
-        buf     = io.BytesIO()
-        qr_img.save(buf, format='PNG')
-        buf.seek(0)
+        try:
+            spec = label_spec(code_val, QR, 'png', request.query_params.get('size'))
+        except ValueError as e:
+            raise ValidationError({'size': str(e)})
 
         safe_name = product.name.replace(' ', '_')[:60]
-        response  = HttpResponse(buf.read(), content_type='image/png')
-        response['Content-Disposition'] = f'attachment; filename="qr_{safe_name}.png"'
-        return response
+        return _label_response(request, spec, f'attachment; filename="qr_{safe_name}.png"')
 
     # ── SCAN ACTION ──────────────────────────────────────────
     @action(methods=['get'], detail=False, url_path='scan')
@@ -773,52 +877,77 @@ class ProductViewSet(AuditMixin, viewsets.ModelViewSet):
     @action(methods=['post'], detail=False, url_path='bulk-qr')
     def bulk_qr(self, request):
         """
-        Bir nechta mahsulot QR kodlarini ZIP arxivida qaytaradi.
+        Bir nechta mahsulot QR kodlari: ZIP arxiv yoki bosishga tayyor PDF varaq.
 
         POST /api/v1/warehouse/products/bulk-qr/
-        Body: {"product_ids": [1, 2, 3], "copies": 10}
+        Body: {"product_ids": [1, 2, 3], "copies": 10, "output": "zip"}
           product_ids — mahsulotlar ID ro'yxati (maks. 500)
-          copies      — har bir mahsulot uchun stiker soni (faylga yoziladi)
+          copies      — har bir mahsulot uchun stiker soni
+          output      — zip (standart) | pdf
+          per_page    — pdf: sahifadagi stikerlar soni (12 | 24 | 40 | 65, standart 24)
+          code        — pdf: qr (standart) | ean13 (barcode bo'lsa)
 
-        Javob: products_qr_YYYY-MM-DD.zip
+        Javob (zip): products_qr_YYYY-MM-DD.zip — oqim bilan, rasmlar tayyor bo'lishi bilan
           Har fayl nomi: "{mahsulot_nomi}_x{copies}.png"
+          Rasmlar keshlanadi, keshda yo'qlari process pool da chiziladi (warehouse/labels.py)
+        Javob (pdf): products_labels_YYYY-MM-DD.pdf — A4, nom + narx + kod, copies marta
         """
-        import io
-        import zipfile
         from datetime import date as _date
-        import qrcode as qrcode_lib
 
         product_ids = request.data.get('product_ids', [])
         try:
             copies = max(1, int(request.data.get('copies', 1)))
         except (ValueError, TypeError):
             copies = 1
+        output = request.data.get('output', 'zip')
 
         if not product_ids:
             raise ValidationError({'product_ids': "Mahsulotlar ro'yxati bo'sh."})
         if len(product_ids) > settings.QR_BULK_MAX_PRODUCTS:
             raise ValidationError({'product_ids': f"Bir vaqtda maksimal {settings.QR_BULK_MAX_PRODUCTS} ta mahsulot."})
+        if output not in ('zip', 'pdf'):
+            raise ValidationError({'output': "output 'zip' yoki 'pdf' bo'lishi kerak."})
 
         worker   = request.user.worker
         products = (
             Product.objects
             .filter(store=worker.store, pk__in=product_ids)
-            .only('id', 'name', 'barcode')
-        )
-
-        zip_buf = io.BytesIO()
-        with zipfile.ZipFile(zip_buf, 'w', zipfile.ZIP_DEFLATED) as zf:
-            for product in products:
-                code_val  = product.barcode or str(product.pk)
-                qr_img    = qrcode_lib.make(code_val)
-                img_buf   = io.BytesIO()
-                qr_img.save(img_buf, format='PNG')
-                img_buf.seek(0)
-                safe_name = product.name.replace('/', '-').replace('\\', '-')[:60]
-                zf.writestr(f"{safe_name}_x{copies}.png", img_buf.read())
-
-        zip_buf.seek(0)
-        response = HttpResponse(zip_buf.read(), content_type='application/zip')
+            .only('id', 'name', 'barcode', 'sale_price')
+            .order_by('name', 'id')
+        )
+
+        if output == 'pdf':
+            try:
+                per_page = int(request.data.get('per_page', 24))
+            except (ValueError, TypeError):
+                per_page = 0
+            if per_page not in SHEET_LAYOUTS:
+                allowed = ', '.join(str(n) for n in SHEET_LAYOUTS)
+                raise ValidationError({'per_page': f"per_page quyidagilardan biri bo'lishi kerak: {allowed}."})
+            if copies * len(product_ids) > settings.LABEL_SHEET_MAX_STICKERS:
+                raise ValidationError(
+                    {'copies': f"Bir varaqda maksimal {settings.LABEL_SHEET_MAX_STICKERS} ta stiker."}
+                )
+            kind     = EAN13 if request.data.get('code') == EAN13 else QR
+            content  = render_sticker_sheet(list(products), copies=copies, per_page=per_page, kind=kind)
+            response = HttpResponse(content, content_type='application/pdf')
+            response['Content-Disposition'] = (
+                f'attachment; filename="products_labels_{_date.today()}.pdf"'
+            )
+            return response
+
+        names = {}
+        for product in products:
+            spec = LabelSpec(product.barcode or str(product.pk))
+            safe = product.name.replace('/', '-').replace('\\', '-')[:60]
+            names.setdefault(spec, []).append(f"{safe}_x{copies}.png")
+
+        entries  = (
+            (name, content)
+            for spec, content in render_many(names)
+            for name in names[spec]
+        )
+        response = StreamingHttpResponse(stream_zip(entries), content_type='application/zip')
         response['Content-Disposition'] = (
             f'attachment; filename="products_qr_{_date.today()}.zip"'
         )
@@ -950,7 +1079,25 @@ class WarehouseViewSet(AuditMixin, viewsets.ModelViewSet):
         worker = getattr(self.request.user, 'worker', None)
         if not worker or not worker.store:
             return Warehouse.objects.none()
-        return Warehouse.objects.filter(store=worker.store).order_by('status', 'name')
+        qs = (
+            Warehouse.objects
+            .filter(store=worker.store)
+            .select_related('store')
+            .annotate(
+                stock_count=SubqueryCount(
+                    Stock.objects.filter(warehouse=OuterRef('pk'))
+                ),
+            )
+        )
+        # Detail: ombordagi mahsulotlar bitta prefetch so'rovida
+        if self.action == 'retrieve':
+            qs = qs.prefetch_related(
+                Prefetch(
+                    'stocks',
+                    queryset=Stock.objects.select_related('product').order_by('product__name'),
+                )
+            )
+        return qs.order_by('status', 'name')
 
     def get_serializer_context(self):
         context = super().get_serializer_context()
@@ -1173,13 +1320,11 @@ class StockViewSet(AuditMixin, viewsets.ModelViewSet):
           ...
         ]
         """
-        from config.cache_utils import get_store_settings
-
         worker = getattr(request.user, 'worker', None)
         if not worker or not worker.store:
             return Response([])
 
-        store_settings = get_store_settings(worker.store_id)
+        store_settings = get_request_tenant(request).settings
 
         if not store_settings.low_stock_enabled:
             return Response([])
@@ -1358,10 +1503,15 @@ class StockMovementViewSet(AuditMixin, viewsets.ModelViewSet):
 
             # ── B13: Supplier debt_balance yangilash ──
             # IN harakatda supplier ko'rsatilgan bo'lsa, qarz oshadi
+            # (SupplierLedgerEntry — daftar yozuvi + debt_balance keshi)
             if supplier_id and unit_cost is not None:
-                total_cost = instance.quantity * unit_cost
-                Supplier.objects.filter(pk=supplier_id).update(
-                    debt_balance=F('debt_balance') + total_cost
+                SupplierLedgerEntry.post(
+                    supplier_id,
+                    SupplierLedgerEntryType.RECEIPT,
+                    instance.quantity * unit_cost,
+                    movement    = instance,
+                    description = f"Kirim #{instance.id}: {instance.product.name} × {instance.quantity}",
+                    created_on  = instance.created_on,
                 )
         else:
             Stock.objects.filter(pk=stock.pk).update(
@@ -1388,6 +1538,19 @@ class StockMovementViewSet(AuditMixin, viewsets.ModelViewSet):
             f"{instance.get_movement_type_display()}: '{instance.product.name}' × {instance.quantity} ({self._location_name(instance)})",
         )
 
+    def _audit_movements(self, movements: list) -> None:
+        """Bulk harakatlar uchun AuditLog — bitta bulk_create (_audit_log bilan bir xil format)."""
+        AuditLog.objects.bulk_create([
+            AuditLog(
+                actor        = self.request.user,
+                action       = AuditLog.Action.CREATE,
+                target_model = StockMovement.__name__,
+                target_id    = mv.pk,
+                description  = f"{mv.get_movement_type_display()}: '{mv.product.name}' × {mv.quantity} ({self._location_name(mv)})",
+            )
+            for mv in movements
+        ])
+
     @transaction.atomic
     def perform_create(self, serializer):
         worker      = getattr(self.request.user, 'worker', None)
@@ -1422,7 +1585,8 @@ class StockMovementViewSet(AuditMixin, viewsets.ModelViewSet):
     @transaction.atomic
     def bulk_create(self, request):
         """
-        Bir vaqtda bir necha mahsulot kirim/chiqim.
+        Bir vaqtda bir necha mahsulot kirim/chiqim — warehouse.movements.apply_movements
+        (stocklar bir marta qulflanadi, partiya/FIFO/AVCO/supplier qarzi bulk).
         Bitta item xato bo'lsa — barchasi rollback qilinadi.
         Throttle: BulkOperationThrottle (minutiga 20 ta)
 
@@ -1443,48 +1607,33 @@ class StockMovementViewSet(AuditMixin, viewsets.ModelViewSet):
         description   = data.get('description', '')
         items         = data['items']
 
-        # 1. Avval barcha itemlarni validatsiya qilamiz (qoldiq yetarliligi)
+        # 1. Store tegishliligini tekshirish
+        lines = []
         for idx, item in enumerate(items, start=1):
-            product  = item['product']
-            quantity = item['quantity']
-
-            # Store tegishliligini tekshirish
-            if store and product.store != store:
+            product = item['product']
+            if store and product.store_id != store.id:
                 raise ValidationError(
                     {f"items[{idx}]": f"'{product.name}' mahsuloti sizning do'koningizga tegishli emas."}
                 )
-
-            # OUT: qoldiq yetarliligini tekshirish
-            if movement_type == MovementType.OUT:
-                stock_qs = Stock.objects.filter(product=product)
-                stock_qs = stock_qs.filter(branch=branch) if branch else stock_qs.filter(warehouse=warehouse)
-                current_qty = stock_qs.values_list('quantity', flat=True).first() or 0
-                if current_qty < quantity:
-                    location_name = branch.name if branch else warehouse.name
-                    raise ValidationError(
-                        {f"items[{idx}]": f"'{product.name}' qoldig'i yetarli emas ({location_name}): mavjud {current_qty}, so'ralgan {quantity}."}
-                    )
-
-        # 2. Hammasi to'g'ri — saqlash
-        created = []
-        for item in items:
-            unit_cost   = item.get('unit_cost')
-            supplier    = item.get('supplier')
-            supplier_id = supplier.pk if supplier else None
-
-            instance = StockMovement.objects.create(
-                product       = item['product'],
-                branch        = branch,
-                warehouse     = warehouse,
+            lines.append(MovementLine(
+                product       = product,
                 movement_type = movement_type,
                 quantity      = item['quantity'],
-                unit_cost     = unit_cost,
+                branch        = branch,
+                warehouse     = warehouse,
+                unit_cost     = item.get('unit_cost'),
+                supplier      = item.get('supplier'),
                 description   = description,
-                supplier      = supplier,
-                worker        = worker,
-            )
-            self._apply_movement(instance, unit_cost, supplier_id, store)
-            created.append(instance)
+                ref           = idx,
+            ))
+
+        # 2. Bulk dvigatel — qoldiq yetmasa hech narsa yozilmaydi
+        result = apply_movements(lines, store, worker)
+        if result.shortages:
+            raise ValidationError({f"items[{line.ref}]": message for line, message in result.shortages})
+
+        created = sorted(result.movements, key=lambda mv: mv.pk)
+        self._audit_movements(created)
 
         return Response(
             {
@@ -1912,7 +2061,7 @@ class WastageRecordViewSet(AuditMixin, viewsets.ModelViewSet):
     def perform_create(self, serializer):
         worker   = getattr(self.request.user, 'worker', None)
         store    = getattr(worker, 'store', None)
-        settings = get_store_settings(store.id) if store else None
+        settings = get_request_tenant(self.request).settings if store else None
 
         # StoreSettings: isrof yoqilganligini tekshirish
         if settings and not settings.wastage_enabled:
@@ -2063,7 +2212,7 @@ class StockAuditViewSet(AuditMixin, viewsets.ModelViewSet):
     def perform_create(self, serializer):
         worker   = getattr(self.request.user, 'worker', None)
         store    = getattr(worker, 'store', None)
-        settings = get_store_settings(store.id) if store else None
+        settings = get_request_tenant(self.request).settings if store else None
 
         # StoreSettings: inventarizatsiya yoqilganligini tekshirish
         if settings and not settings.stock_audit_enabled:
@@ -2386,13 +2535,17 @@ class SupplierViewSet(AuditMixin, viewsets.ModelViewSet):
       GET    /api/v1/warehouse/suppliers/{id}/  — tafsilotlar
       PATCH  /api/v1/warehouse/suppliers/{id}/  — yangilash (manager+)
       DELETE /api/v1/warehouse/suppliers/{id}/  — o'chirish (manager+, soft delete)
+      GET    /api/v1/warehouse/suppliers/{id}/ledger/   — daftar (?date_from, ?date_to, ?open=1)
+      GET    /api/v1/warehouse/suppliers/{id}/balance/  — sana bo'yicha qoldiq (?as_of=)
+      GET    /api/v1/warehouse/suppliers/aging/         — qarz yoshi (bitta guruhlangan so'rov)
 
     Soft delete: status='inactive' ga o'tkaziladi (debt tarixi saqlanadi).
+    debt_balance — SupplierLedgerEntry daftarining keshi.
     """
     http_method_names = ['get', 'post', 'patch', 'delete']
 
     def get_permissions(self):
-        if self.action in ('list', 'retrieve'):
+        if self.action in ('list', 'retrieve', 'ledger', 'balance', 'aging'):
             return [IsAuthenticated(), CanAccess('ombor')]
         return [IsAuthenticated(), IsManagerOrAbove()]
 
@@ -2480,6 +2633,65 @@ class SupplierViewSet(AuditMixin, viewsets.ModelViewSet):
             status=status.HTTP_200_OK,
         )
 
+    @action(methods=['get'], detail=True, url_path='ledger')
+    def ledger(self, request, pk=None):
+        """
+        Yetkazib beruvchi daftari — sahifalangan, vaqt bo'yicha (running balance).
+
+        GET /api/v1/warehouse/suppliers/{id}/ledger/
+        GET /api/v1/warehouse/suppliers/{id}/ledger/?date_from=2026-01-01&date_to=2026-01-31
+        GET /api/v1/warehouse/suppliers/{id}/ledger/?open=1   — faqat to'lanmagan kirimlar
+        """
+        supplier = self.get_object()
+        qs = SupplierLedgerEntry.objects.filter(supplier=supplier).order_by('created_on', 'id')
+
+        date_from = parse_day_start(request.query_params.get('date_from'), 'date_from')
+        date_to   = parse_day_start(request.query_params.get('date_to'), 'date_to')
+        if date_from:
+            qs = qs.filter(created_on__gte=date_from)
+        if date_to:
+            qs = qs.filter(created_on__lt=date_to + timedelta(days=1))
+        if request.query_params.get('open') in ('1', 'true'):
+            qs = qs.filter(open_amount__gt=0)
+
+        page = self.paginate_queryset(qs)
+        return self.get_paginated_response(SupplierLedgerEntrySerializer(page, many=True).data)
+
+    @action(methods=['get'], detail=True, url_path='balance')
+    def balance(self, request, pk=None):
+        """
+        Berilgan sana oxiridagi qarz qoldig'i.
+
+        GET /api/v1/warehouse/suppliers/{id}/balance/?as_of=2026-01-31
+        as_of berilmasa — joriy qoldiq (Supplier.debt_balance).
+        """
+        supplier = self.get_object()
+        as_of    = parse_day_start(request.query_params.get('as_of'), 'as_of')
+        if as_of is None:
+            return Response({'supplier': supplier.id, 'as_of': None, 'balance': supplier.debt_balance})
+
+        moment = as_of + timedelta(days=1) - timedelta(microseconds=1)
+        return Response({
+            'supplier': supplier.id,
+            'as_of':    as_of.date(),
+            'balance':  SupplierLedgerEntry.balance_as_of(supplier.id, moment),
+        })
+
+    @action(methods=['get'], detail=False, url_path='aging')
+    def aging(self, request):
+        """
+        Kreditorlik qarzi yoshi: har bir yetkazib beruvchi bo'yicha 0-30 / 31-60 / 61-90 / 90+ kun.
+
+        GET /api/v1/warehouse/suppliers/aging/
+
+        Ochiq kirimlar (open_amount > 0) bo'yicha bitta guruhlangan so'rov.
+        """
+        worker  = request.user.worker
+        rows    = SupplierLedgerEntry.aging(worker.store_id)
+        buckets = ('days_0_30', 'days_31_60', 'days_61_90', 'days_90_plus', 'total')
+        totals  = {key: sum((row[key] for row in rows), Decimal('0')) for key in buckets}
+        return Response({'totals': totals, 'results': rows})
+
 
 # ============================================================
 # YETKAZIB BERUVCHI TO'LOV VIEWSET  B13
@@ -2535,9 +2747,14 @@ class SupplierPaymentViewSet(AuditMixin, viewsets.ModelViewSet):
         worker   = getattr(self.request.user, 'worker', None)
         instance = serializer.save(worker=worker)
 
-        # Supplier.debt_balance avtomatik kamaytirish
-        Supplier.objects.filter(pk=instance.supplier_id).update(
-            debt_balance=F('debt_balance') - instance.amount
+        # Supplier.debt_balance avtomatik kamaytirish (daftar orqali, FIFO yopish)
+        SupplierLedgerEntry.post(
+            instance.supplier_id,
+            SupplierLedgerEntryType.PAYMENT,
+            -instance.amount,
+            payment     = instance,
+            description = f"To'lov #{instance.id} ({instance.get_payment_type_display()})",
+            created_on  = instance.created_on,
         )
         self._audit_log(
             AuditLog.Action.CREATE, instance,